@@ -25,7 +25,6 @@ from qf_lib.analysis.error_handling import ErrorHandling
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
 from qf_lib.backtesting.contract.contract import Contract
 from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
-from qf_lib.backtesting.portfolio.backtest_position import BacktestPositionSummary
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
@@ -104,7 +103,7 @@ class PortfolioTradingSheet(AbstractDocument):
         position_decorator = AxesPositionDecorator(*self.full_image_axis_position)
         chart.add_decorator(position_decorator)
 
-        positions_history = self.backtest_result.portfolio.positions_eod_history()
+        positions_history = self.backtest_result.portfolio.positions_eod_values("total_exposure")
 
         # Find all not NaN values (not NaN values indicate that the position was open for this contract at that time)
         # and count their number for each row (for each of the dates)
@@ -170,12 +169,11 @@ class PortfolioTradingSheet(AbstractDocument):
         chart.add_decorator(label_decorator)
 
         # Add top asset contribution
-        positions_history = self.backtest_result.portfolio.positions_eod_history()
+        positions_history = self.backtest_result.portfolio.positions_eod_values("total_exposure")
         if positions_history.empty:
             raise ValueError("No positions found in positions history")
 
-        positions_history = positions_history.applymap(
-            lambda x: x.total_exposure if isinstance(x, BacktestPositionSummary) else 0)
+        positions_history = positions_history.fillna(0)
 
         # Map all the single contracts onto tickers (including future tickers) and take the maximal total exposure for
         # each of the groups - in case if two contracts for a single asset will be included in the open positions in
@@ -214,12 +212,12 @@ class PortfolioTradingSheet(AbstractDocument):
         self.document.add_element(ChartElement(chart, figsize=self.full_image_size, dpi=self.dpi))
 
     def _add_number_of_transactions_chart(self, pandas_freq: str, title: str):
-        transactions = self.backtest_result.portfolio.transactions_series()
+        transactions = self.backtest_result.portfolio.transactions_frame()
         if transactions.empty:
             raise ValueError("Transactions series is empty")
 
         # Compute the number of transactions per day
-        transactions = transactions.resample(Frequency.DAILY.to_pandas_freq()).count()
+        transactions = transactions["quantity"].resample(Frequency.DAILY.to_pandas_freq()).count()
 
         # Aggregate the transactions using the given frequency
         if to_offset(pandas_freq) > to_offset('D'):
@@ -238,13 +236,12 @@ class PortfolioTradingSheet(AbstractDocument):
         self._add_line_chart_element(transactions, title)
 
     def _add_volume_traded(self):
-        transactions = self.backtest_result.portfolio.transactions_series()
+        transactions = self.backtest_result.portfolio.transactions_frame()
         if transactions.empty:
             raise ValueError("Transactions series is empty")
 
         # Add the chart containing the volume traded in terms of quantity
-        quantities = [abs(t.quantity) for t in transactions]
-        quantities_series = QFSeries(data=quantities, index=transactions.index)
+        quantities_series = QFSeries(data=transactions["quantity"].abs().values, index=transactions.index)
 
         # Aggregate the quantities for each day
         quantities_series = quantities_series.resample(Frequency.DAILY.to_pandas_freq()).sum()
@@ -253,7 +250,7 @@ class PortfolioTradingSheet(AbstractDocument):
         self._add_line_chart_element(quantities_series, "Volume traded per day [in contracts]")
 
         # Add the chart containing the exposure of the traded assets
-        total_exposures = [abs(t.quantity) * t.price * t.contract.contract_size for t in transactions]
+        total_exposures = (transactions["quantity"].abs() * transactions["price"] * transactions["contract_size"]).values
         total_exposures_series = QFSeries(data=total_exposures, index=transactions.index)
         total_exposures_series = total_exposures_series.resample(Frequency.DAILY.to_pandas_freq()).sum()
 
@@ -267,9 +264,7 @@ class PortfolioTradingSheet(AbstractDocument):
         chart.add_decorator(position_decorator)
 
         # Get the assets history
-        assets_history = self.backtest_result.portfolio.positions_eod_history()
-        assets_history = assets_history.applymap(
-            lambda x: x.total_exposure if isinstance(x, BacktestPositionSummary) else 0)
+        assets_history = self.backtest_result.portfolio.positions_eod_values("total_exposure").fillna(0)
 
         def gini(group):
             # Function computing the Gini coefficients for each row
@@ -296,9 +291,7 @@ class PortfolioTradingSheet(AbstractDocument):
         self.document.add_element(NewPageElement())
         self.document.add_element(HeadingElement(level=2, text="Average time in the market per asset"))
         # Get the assets history
-        assets_history = self.backtest_result.portfolio.positions_eod_history()
-        assets_history = assets_history.applymap(
-            lambda x: x.direction if isinstance(x, BacktestPositionSummary) else 0)
+        assets_history = self.backtest_result.portfolio.positions_eod_values("direction").fillna(0)
 
         table = Table(column_names=['Tickers name', 'Longs', 'Shorts', 'Out'], css_class="table stats-table left-align")
 
@@ -363,8 +356,9 @@ class PortfolioTradingSheet(AbstractDocument):
         }
 
         # Get all tickers used across the backtest
-        positions_history = self.backtest_result.portfolio.positions_eod_history()
-        all_contracts = list(positions_history.columns)
+        unrealised_pnls = self.backtest_result.portfolio.positions_eod_values("unrealised_pnl")
+        directions = self.backtest_result.portfolio.positions_eod_values("direction")
+        all_contracts = list(unrealised_pnls.columns)
         all_contracts.sort(key=lambda contract: contract.symbol)
 
         # Generate plot for each ticker
@@ -373,7 +367,8 @@ class PortfolioTradingSheet(AbstractDocument):
                 lambda c: self.backtest_result.portfolio.contract_ticker_mapper.contract_to_ticker(c, strictly_to_specific_ticker=False)
         ):
             contracts_list = list(contracts_list)
-            performance_details_dict = self._add_performance_plot_for_ticker(ticker, positions_history[contracts_list],
+            performance_details_dict = self._add_performance_plot_for_ticker(ticker, unrealised_pnls[contracts_list],
+                                                                             directions[contracts_list],
                                                                              contracts_list, title_to_exposures)
             performance_data.append(performance_details_dict)
 
@@ -394,8 +389,8 @@ class PortfolioTradingSheet(AbstractDocument):
         table.add_columns_classes(["Ticker"], 'wide-column')
         self.document.add_element(table)
 
-    def _add_performance_plot_for_ticker(self, ticker: Ticker, df: QFDataFrame, contracts_list: List[Contract],
-                                         title_to_exposures: Dict[str, Tuple[List[Exposure], Dict]]):
+    def _add_performance_plot_for_ticker(self, ticker: Ticker, unrealised_pnls: QFDataFrame, directions: QFDataFrame,
+                                         contracts_list: List[Contract], title_to_exposures: Dict[str, Tuple[List[Exposure], Dict]]):
         ticker_name = ticker.name if isinstance(ticker, FutureTicker) else ticker.ticker
         performance_results = {"Ticker": ticker_name}
         for title in title_to_exposures.keys():
@@ -413,8 +408,7 @@ class PortfolioTradingSheet(AbstractDocument):
                                                        sign(trade.quantity) in exposure_values]
 
             # Compute the unrealized pnl of each contract
-            directional_df = df.applymap(lambda x: x.unrealised_pnl if (isinstance(x, BacktestPositionSummary)
-                                                                        and x.direction in exposure_values) else None)
+            directional_df = unrealised_pnls.where(directions.isin(exposure_values))
 
             # check if any transaction in this direction were made
             trades_in_the_direction = not directional_df.dropna(how="all").empty
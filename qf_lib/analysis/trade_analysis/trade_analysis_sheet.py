@@ -15,7 +15,7 @@
 from datetime import datetime
 from math import sqrt
 from os.path import join
-from typing import Union, Tuple
+from typing import Union, Tuple, Optional
 
 import matplotlib as plt
 import numpy as np
@@ -23,6 +23,8 @@ from matplotlib.ticker import FormatStrFormatter, MaxNLocator
 from pandas import Timedelta, to_timedelta
 
 from qf_lib.analysis.error_handling import ErrorHandling
+from qf_lib.backtesting.fast_alpha_model_tester.monte_carlo_simulator import MonteCarloSimulator, \
+    MonteCarloSimulationResults
 from qf_lib.backtesting.fast_alpha_model_tester.scenarios_generator import ScenariosGenerator
 from qf_lib.common.enums.plotting_mode import PlottingMode
 from qf_lib.common.enums.trade_field import TradeField
@@ -32,6 +34,7 @@ from qf_lib.common.utils.returns.annualise_total_return import annualise_total_r
 from qf_lib.common.utils.returns.max_drawdown import max_drawdown
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.series.qf_series import QFSeries
 from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
 from qf_lib.documents_utils.document_exporting.document import Document
 from qf_lib.documents_utils.document_exporting.element.grid import GridElement
@@ -75,11 +78,21 @@ class TradeAnalysisSheet(object):
         nr_of_instruments_traded informs on how many instruments at the same time the model was traded.
     title: str
         title of the document, will be a part of the filename. Do not use special characters
+    num_of_scenarios: int
+        number of scenarios generated in the Monte Carlo simulation
+    monte_carlo_simulator: Optional[MonteCarloSimulator]
+        if provided, the scenarios are simulated in chunks using the MonteCarloSimulator, instead of being generated
+        all at once into a DataFrame by the ScenariosGenerator. In that case only the first num_of_plotted_scenarios
+        scenarios are plotted, which makes it possible to run a much larger number of scenarios
+    num_of_plotted_scenarios: int
+        maximal number of scenarios plotted on the Monte Carlo simulations chart (used only together with
+        the monte_carlo_simulator)
 
     """
 
     def __init__(self, settings: Settings, pdf_exporter: PDFExporter, trades_df: QFDataFrame, start_date: datetime,
-                 end_date: datetime, nr_of_assets_traded: int = 1, title: str = "Trades"):
+                 end_date: datetime, nr_of_assets_traded: int = 1, title: str = "Trades", num_of_scenarios: int = 2500,
+                 monte_carlo_simulator: Optional[MonteCarloSimulator] = None, num_of_plotted_scenarios: int = 2500):
 
         self.trades_df = trades_df.sort_values([TradeField.EndDate, TradeField.StartDate]).reset_index(drop=True)
         self.start_date = start_date
@@ -89,6 +102,10 @@ class TradeAnalysisSheet(object):
         self.returns_of_trades.name = "Returns of Trades"
         self.title = title
 
+        self.num_of_scenarios = num_of_scenarios
+        self.monte_carlo_simulator = monte_carlo_simulator
+        self.num_of_plotted_scenarios = num_of_plotted_scenarios
+
         self.document = Document(title)
 
         # position is linked to the position of axis in tearsheet.mplstyle
@@ -274,38 +291,53 @@ class TradeAnalysisSheet(object):
             self.document.add_element(table)
 
     def _add_simulation_results(self):
-        # Generate a data frame consisting of a certain number of "scenarios" (each scenario denotes one single equity
-        # curve)
-        scenarios_df, total_returns = self._get_scenarios()
+        # Generate a certain number of "scenarios" (each scenario denotes one single equity curve)
+        simulation_results = self._get_simulation_results()
 
-        self._add_simulation_plots(scenarios_df, total_returns)
+        self._add_simulation_plots(simulation_results.paths, simulation_results.total_returns)
 
-        simulations_summary_table = self._get_monte_carlos_simulator_outputs(scenarios_df, total_returns)
+        simulations_summary_table = self._get_monte_carlos_simulator_outputs(simulation_results)
         self.document.add_element(simulations_summary_table)
 
         # Extract the results of each of the scenarios and summarize the data in the tables
-        dist_summary_tables = self._get_distribution_summary_table(total_returns)
+        dist_summary_tables = self._get_distribution_summary_table(simulation_results.total_returns)
         self.document.add_element(dist_summary_tables)
 
         # Add the "Chances of dropping below" and "Simulations summary" tables
-        ruin_chances_table = self._get_chances_of_dropping_below_table(scenarios_df)
+        ruin_chances_table = self._get_chances_of_dropping_below_table(simulation_results.breach_probabilities)
         self.document.add_element(ruin_chances_table)
 
+    def _get_simulation_results(self) -> MonteCarloSimulationResults:
+        thresholds = np.linspace(0.1, 0.9, 9)
+
+        if self.monte_carlo_simulator is not None:
+            return self.monte_carlo_simulator.simulate(
+                self.returns_of_trades.values,
+                scenarios_length=self._get_avg_number_of_trades_per_year(),
+                num_of_scenarios=self.num_of_scenarios,
+                thresholds=thresholds,
+                num_of_paths=self.num_of_plotted_scenarios
+            )
+
+        scenarios_df, total_returns = self._get_scenarios(self.num_of_scenarios)
+
+        # Scenarios, whose returns at some point of time dropped to or below the (1 - threshold) * initial value
+        min_values = scenarios_df.min().values
+        breach_probabilities = QFSeries([(min_values <= 1.0 - threshold).mean() for threshold in thresholds],
+                                        index=thresholds)
+
+        return MonteCarloSimulationResults(total_returns, max_drawdown(scenarios_df), breach_probabilities,
+                                           scenarios_df)
+
     def _get_scenarios(self, num_of_scenarios: int = 2500) -> Tuple[PricesDataFrame, SimpleReturnsSeries]:
         # Generate scenarios, each of which consists of a certain number of trades, equal to the average number
         # of trades per year
         scenarios_generator = ScenariosGenerator()
 
-        # Compute the average number of trades per year
-        number_of_trades = self.returns_of_trades.count()
-        period_length = Timedelta(self.end_date - self.start_date)
-        period_length_in_years = to_days(period_length) / DAYS_PER_YEAR_AVG
-        avg_number_of_trades = int(number_of_trades / period_length_in_years)
-
         # Generate the scenarios
         scenarios_df = scenarios_generator.make_scenarios(
             self.returns_of_trades,
-            scenarios_length=avg_number_of_trades,
+            scenarios_length=self._get_avg_number_of_trades_per_year(),
             num_of_scenarios=num_of_scenarios
         )
 
@@ -313,6 +345,12 @@ class TradeAnalysisSheet(object):
 
         return scenarios_df, scenarios_df.iloc[-1] / scenarios_df.iloc[0] - 1.0
 
+    def _get_avg_number_of_trades_per_year(self) -> int:
+        number_of_trades = self.returns_of_trades.count()
+        period_length = Timedelta(self.end_date - self.start_date)
+        period_length_in_years = to_days(period_length) / DAYS_PER_YEAR_AVG
+        return int(number_of_trades / period_length_in_years)
+
     def _add_simulation_plots(self, scenarios_df: PricesDataFrame, total_returns: SimpleReturnsSeries):
         grid = GridElement(mode=PlottingMode.PDF, figsize=self.half_image_size, dpi=self.dpi)
 
@@ -367,16 +405,10 @@ class TradeAnalysisSheet(object):
 
         return grid
 
-    def _get_chances_of_dropping_below_table(self, scenarios_df: PricesDataFrame) -> Table:
+    def _get_chances_of_dropping_below_table(self, breach_probabilities: QFSeries) -> Table:
         table = Table(column_names=["Chances of dropping below", "Probability"], css_class="table stats-table")
-        _, all_scenarios_number = scenarios_df.shape
-
-        for percentage in np.linspace(0.1, 0.9, 9):
-            # Count number of scenarios, whose returns at some point of time dropped below the percentage * initial
-            # value
-            _, scenarios_above_percentage = scenarios_df.where(scenarios_df > (1.0 - percentage)).dropna(axis=1).shape
-            probability = (all_scenarios_number - scenarios_above_percentage) / all_scenarios_number
 
+        for percentage, probability in breach_probabilities.items():
             table.add_row(["{:.0%}".format(percentage), "{:.2%}".format(probability)])
 
             if probability < 1.0 and percentage > 0.1:
@@ -384,18 +416,16 @@ class TradeAnalysisSheet(object):
 
         return table
 
-    def _get_monte_carlos_simulator_outputs(self, scenarios_df: PricesDataFrame, total_returns: SimpleReturnsSeries) -> \
-            Table:
+    def _get_monte_carlos_simulator_outputs(self, simulation_results: MonteCarloSimulationResults) -> Table:
         table = Table(column_names=["Measure", "Value"], css_class="table stats-table")
-        _, all_scenarios_number = scenarios_df.shape
+        total_returns = simulation_results.total_returns
 
         # Add the Median Return value
         median_return = np.median(total_returns)
         table.add_row(["Median Return", "{:.2%}".format(median_return)])
 
         # Add the Median Drawdown
-        max_drawdowns = max_drawdown(scenarios_df)
-        median_drawdown = np.median(max_drawdowns)
+        median_drawdown = np.median(simulation_results.max_drawdowns)
         table.add_row(["Median Maximum Drawdown", "{:.2%}".format(median_drawdown)])
 
         # Add the Median Return / Median Drawdown
@@ -403,7 +433,7 @@ class TradeAnalysisSheet(object):
 
         # Probability, that the return will be > 0
         scenarios_with_positive_result = total_returns[total_returns > 1.0].count()
-        probability = scenarios_with_positive_result / all_scenarios_number
+        probability = scenarios_with_positive_result / simulation_results.num_of_scenarios
         table.add_row(["Probability > 0", "{:.2%}".format(probability)])
 
         return table
@@ -13,7 +13,10 @@
 #     limitations under the License.
 
 from abc import abstractmethod, ABCMeta
-from typing import Sequence, Dict
+from typing import Sequence, Dict, List
+
+import numpy as np
+import pandas as pd
 
 from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
 from qf_lib.backtesting.alpha_model.signal import Signal
@@ -21,6 +24,7 @@ from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.miscellaneous.average_true_range import average_true_range
+from qf_lib.containers.qf_data_array import QFDataArray
 
 
 class AlphaModelSettings(object):
@@ -98,6 +102,33 @@ class AlphaModel(object, metaclass=ABCMeta):
         signal = Signal(ticker, suggested_exposure, fraction_at_risk, alpha_model=self)
         return signal
 
+    def get_signals(self, tickers: Sequence[Ticker], current_exposures: Dict[Ticker, Exposure]) -> List[Signal]:
+        """
+        Returns the Signals calculated for all the given Tickers. If the AlphaModel implements the batch
+        calculate_exposures method, the exposures and fractions at risk of all the tickers are computed at once
+        (using calculate_exposures and calculate_fractions_at_risk). Otherwise get_signal is called for every ticker.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            tickers of assets for which the Signals should be generated
+        current_exposures: Dict[Ticker, Exposure]
+            the actual exposures of all the tickers, based on which the AlphaModel should return its Signals
+
+        Returns
+        -------
+        List[Signal]
+            Signals for all the tickers (in the same order as the tickers)
+        """
+        if not self.implements_batch_exposures():
+            return [self.get_signal(ticker, current_exposures[ticker]) for ticker in tickers]
+
+        suggested_exposures = self.calculate_exposures(tickers, current_exposures)
+        fractions_at_risk = self.calculate_fractions_at_risk(tickers)
+
+        return [Signal(ticker, suggested_exposures[ticker], fractions_at_risk[ticker], alpha_model=self)
+                for ticker in tickers]
+
     @abstractmethod
     def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure) -> Exposure:
         """
@@ -117,6 +148,62 @@ class AlphaModel(object, metaclass=ABCMeta):
         """
         pass
 
+    def calculate_exposures(self, tickers: Sequence[Ticker], current_exposures: Dict[Ticker, Exposure]) \
+            -> Dict[Ticker, Exposure]:
+        """
+        Optional, batch version of calculate_exposure, which returns the expected Exposures for all the given tickers
+        at once. It should be implemented by the models, which are able to compute all the exposures using
+        a single data request (e.g. one QFDataArray returned by the DataHandler.historical_price for all the tickers).
+        If it is implemented, get_signals uses it instead of calling get_signal for each ticker separately.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            tickers for which suggested signal exposures are calculated
+        current_exposures: Dict[Ticker, Exposure]
+            the actual exposures of all the tickers
+
+        Returns
+        -------
+        Dict[Ticker, Exposure]
+            suggested exposures for all the tickers
+        """
+        raise NotImplementedError()
+
+    def calculate_exposures_matrix(self, tickers: Sequence[Ticker], prices_data_array: QFDataArray) -> pd.DataFrame:
+        """
+        Optional, vectorized version of calculate_exposure, which returns the expected Exposures of all the given
+        tickers for all the dates of the prices_data_array at once. It is used by the FastAlphaModelTester instead of
+        calling calculate_exposure for every date and every ticker. The exposure suggested for a given date may only
+        be based on the prices up to (and including) this date. As the exposures are computed at once, the models,
+        whose suggestions depend on the current exposure, need to track it themselves.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            tickers for which suggested signal exposures are calculated
+        prices_data_array: QFDataArray
+            prices (dates x tickers x fields) of all the tickers preloaded for the whole backtest
+
+        Returns
+        -------
+        pandas.DataFrame
+            values of the suggested exposures (dates x tickers), e.g. Exposure.LONG.value
+        """
+        raise NotImplementedError()
+
+    def implements_exposures_matrix(self) -> bool:
+        """
+        Returns True if the model overrides calculate_exposures_matrix and False otherwise.
+        """
+        return type(self).calculate_exposures_matrix is not AlphaModel.calculate_exposures_matrix
+
+    def implements_batch_exposures(self) -> bool:
+        """
+        Returns True if the model overrides calculate_exposures and False otherwise.
+        """
+        return type(self).calculate_exposures is not AlphaModel.calculate_exposures
+
     def calculate_fraction_at_risk(self, ticker: Ticker) -> float:
         """
         Returns the float value which determines the risk factor for an AlphaModel and a specified Ticker,
@@ -141,6 +228,30 @@ class AlphaModel(object, metaclass=ABCMeta):
         time_period = 5
         return self._atr_fraction_at_risk(ticker, time_period)
 
+    def calculate_fractions_at_risk(self, tickers: Sequence[Ticker]) -> Dict[Ticker, float]:
+        """
+        Batch version of calculate_fraction_at_risk, which returns the fractions at risk for all the given tickers.
+        By default the ATR based fractions at risk are computed for all the tickers using a single data request.
+        If calculate_fraction_at_risk (or _atr_fraction_at_risk) is overridden, it is called for each ticker instead.
+
+        Parameters
+        ----------
+        tickers: Sequence[Ticker]
+            tickers for which the calculation should be made
+
+        Returns
+        -------
+        Dict[Ticker, float]
+            fraction_at_risk values for all the tickers
+        """
+        model_type = type(self)
+        if model_type.calculate_fraction_at_risk is not AlphaModel.calculate_fraction_at_risk or \
+                model_type._atr_fraction_at_risk is not AlphaModel._atr_fraction_at_risk:
+            return {ticker: self.calculate_fraction_at_risk(ticker) for ticker in tickers}
+
+        time_period = 5
+        return self._atr_fractions_at_risk(tickers, time_period)
+
     def _atr_fraction_at_risk(self, ticker, time_period):
         """
         Parameters
@@ -162,5 +273,61 @@ class AlphaModel(object, metaclass=ABCMeta):
         fraction_at_risk = average_true_range(prices_df, normalized=True) * self.risk_estimation_factor
         return fraction_at_risk
 
+    def _atr_fractions_at_risk(self, tickers: Sequence[Ticker], time_period: int) -> Dict[Ticker, float]:
+        """
+        Computes the same values as _atr_fraction_at_risk for all the tickers, using one QFDataArray of prices.
+        The bars of each ticker are taken from the common array after removing the dates on which the ticker was not
+        quoted. If afterwards fewer bars than needed remain for some tickers, their fractions at risk are computed
+        using _atr_fraction_at_risk.
+        """
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+
+        num_of_bars_needed = time_period + 1
+        fields = [PriceField.High, PriceField.Low, PriceField.Close]
+        try:
+            prices_data_array = self.data_handler.historical_price(
+                tickers, fields, num_of_bars_needed)  # type: QFDataArray
+        except ValueError:
+            return {ticker: self._atr_fraction_at_risk(ticker, time_period) for ticker in tickers}
+
+        fractions_at_risk = {}
+        complete_tickers = []
+        complete_prices = []
+
+        prices = prices_data_array.values  # type: np.ndarray
+        for ticker_index, ticker in enumerate(tickers):
+            ticker_prices = prices[:, ticker_index, :]
+            ticker_prices = ticker_prices[~np.isnan(ticker_prices).all(axis=1)]
+
+            if ticker_prices.shape[0] < num_of_bars_needed:
+                fractions_at_risk[ticker] = self._atr_fraction_at_risk(ticker, time_period)
+            else:
+                complete_tickers.append(ticker)
+                complete_prices.append(ticker_prices[-num_of_bars_needed:])
+
+        if complete_tickers:
+            # tickers x bars x fields
+            complete_prices = np.stack(complete_prices)
+            high = complete_prices[:, 1:, 0]
+            low = complete_prices[:, 1:, 1]
+            prev_close = complete_prices[:, :-1, 2]
+
+            # the true range is the maximum of three ranges (with the same NaN handling as the built-in max function)
+            true_range = high - low
+            high_close_range = abs(high - prev_close)
+            low_close_range = abs(low - prev_close)
+            true_range = np.where(high_close_range > true_range, high_close_range, true_range)
+            true_range = np.where(low_close_range > true_range, low_close_range, true_range)
+
+            normalized_true_range = true_range / prev_close[:, -1:]
+            atr_values = np.mean(normalized_true_range, axis=1)
+
+            for ticker, atr in zip(complete_tickers, atr_values):
+                fractions_at_risk[ticker] = atr.item() * self.risk_estimation_factor
+
+        return fractions_at_risk
+
     def __str__(self):
         return self.__class__.__name__
@@ -182,10 +182,14 @@ class AlphaModelStrategy(object):
             tickers_and_contracts = zip(tickers, contracts)
             valid_tickers_and_contracts = [(t, c) for t, c in tickers_and_contracts if c is not None]
 
-            for ticker, contract in valid_tickers_and_contracts:
-                current_exposure = self._get_current_exposure(contract, current_positions)
-                signal = model.get_signal(ticker, current_exposure)
-                signals.append(signal)
+            valid_tickers = [ticker for ticker, _ in valid_tickers_and_contracts]
+            current_exposures = {
+                ticker: self._get_current_exposure(contract, current_positions)
+                for ticker, contract in valid_tickers_and_contracts
+            }
+
+            # models implementing the batch exposures calculation generate signals for all the tickers at once
+            signals.extend(model.get_signals(valid_tickers, current_exposures))
 
         return signals
 
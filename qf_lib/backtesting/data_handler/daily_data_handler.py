@@ -13,27 +13,63 @@
 #     limitations under the License.
 
 from datetime import datetime
-from typing import Union, Sequence
+from typing import Union, Sequence, Dict, Tuple, Optional
 
 import pandas as pd
 
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.data_handler.rolling_window_buffer import RollingWindowBuffer
 from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import Timer
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.cast_series import cast_series
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.data_provider import DataProvider
 
 
 class DailyDataHandler(DataHandler):
+    """
+    DataHandler used with the daily data.
+
+    Parameters
+    -----------
+    data_provider: DataProvider
+        the underlying data provider
+    timer: Timer
+        timer used to keep track of the data "from the future"
+    use_rolling_window_cache: bool
+        if True, the bars returned by historical_price are cached in a ring buffer for each combination of tickers,
+        fields, number of bars and frequency. Every following call only downloads the bars, which were closed since
+        the previous call, and serves the remaining ones from memory. It should be used only if the data of the
+        underlying data provider does not change over time (e.g. in a backtest).
+    """
+
+    def __init__(self, data_provider: DataProvider, timer: Timer, use_rolling_window_cache: bool = False):
+        super().__init__(data_provider, timer)
+        self._use_rolling_window_cache = use_rolling_window_cache
+        self._rolling_windows = {}  # type: Dict[Tuple, RollingWindowBuffer]
+
+    def use_data_bundle(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
+                        start_date: datetime, end_date: datetime, frequency: Frequency = Frequency.DAILY,
+                        use_array_storage: bool = False, cache_directory: Optional[str] = None,
+                        chunk_length: Optional[RelativeDelta] = None, cache_namespace: Optional[str] = None):
+        super().use_data_bundle(tickers, fields, start_date, end_date, frequency, use_array_storage, cache_directory,
+                                chunk_length, cache_namespace)
+        self._rolling_windows.clear()
+
+    def use_memory_mapped_data_bundle(self, directory: str, use_array_storage: bool = False):
+        super().use_memory_mapped_data_bundle(directory, use_array_storage)
+        self._rolling_windows.clear()
 
     def _check_frequency(self, frequency):
         if frequency and frequency > Frequency.DAILY:
@@ -68,6 +104,12 @@ class DailyDataHandler(DataHandler):
         end_date = self._get_end_date_without_look_ahead()
         start_date = end_date - RelativeDelta(days=nr_of_days_to_go_back)
 
+        if self._use_rolling_window_cache and self._is_cacheable(tickers, nr_of_bars):
+            cached_container = self._get_bars_from_rolling_window(tickers, fields, nr_of_bars, start_date, end_date,
+                                                                  frequency)
+            if cached_container is not None:
+                return cached_container
+
         container = self.data_provider.get_price(tickers, fields, start_date, end_date, frequency)
 
         num_of_dates_available = container.shape[0]
@@ -81,9 +123,49 @@ class DailyDataHandler(DataHandler):
                                  tickers_as_strings, end_date, nr_of_bars, num_of_dates_available))
 
         if isinstance(container, QFDataArray):
-            return container.isel(dates=slice(-nr_of_bars, None))
+            container = container.isel(dates=slice(-nr_of_bars, None))
         else:
-            return container.tail(nr_of_bars)  # type: Union[PricesSeries, PricesDataFrame]
+            container = container.tail(nr_of_bars)  # type: Union[PricesSeries, PricesDataFrame]
+
+        if self._use_rolling_window_cache and self._is_cacheable(tickers, nr_of_bars):
+            key = self._rolling_window_key(tickers, fields, nr_of_bars, frequency)
+            self._rolling_windows[key] = RollingWindowBuffer(container, end_date)
+
+        return container
+
+    def _get_bars_from_rolling_window(self, tickers, fields, nr_of_bars, start_date, end_date, frequency):
+        """
+        Returns the bars from the rolling window cache, after appending all the bars closed since the last query.
+        Returns None if the cached window can not be used to create the result identical to the one computed from
+        scratch (e.g. the timer moved backwards or the cached bars are older than start_date).
+        """
+        key = self._rolling_window_key(tickers, fields, nr_of_bars, frequency)
+        rolling_window = self._rolling_windows.get(key)
+
+        if rolling_window is None or rolling_window.end_date > end_date:
+            return None
+
+        if rolling_window.end_date < end_date:
+            new_bars_start_date = rolling_window.end_date + RelativeDelta(microseconds=1)
+            new_bars = self.data_provider.get_price(tickers, fields, new_bars_start_date, end_date, frequency)
+            rolling_window.append(new_bars, end_date)
+
+        if rolling_window.first_date < start_date:
+            return None
+
+        return rolling_window.to_container()
+
+    @staticmethod
+    def _is_cacheable(tickers, nr_of_bars) -> bool:
+        # The specific tickers of FutureTickers change over time, so the cached bars could belong to other contracts
+        tickers, _ = convert_to_list(tickers, Ticker)
+        return nr_of_bars > 0 and not any(isinstance(ticker, FutureTicker) for ticker in tickers)
+
+    @staticmethod
+    def _rolling_window_key(tickers, fields, nr_of_bars, frequency) -> Tuple:
+        tickers_key = tickers if isinstance(tickers, Ticker) else tuple(tickers)
+        fields_key = fields if isinstance(fields, PriceField) else tuple(fields)
+        return tickers_key, fields_key, nr_of_bars, frequency
 
     def get_price(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
                   start_date: datetime, end_date: datetime = None, frequency: Frequency = Frequency.DAILY) -> \
@@ -31,8 +31,10 @@ from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.chunked_prefetching_data_provider import ChunkedPrefetchingDataProvider
 from qf_lib.data_providers.data_provider import DataProvider
 from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
 
 class DataHandler(DataProvider):
@@ -64,9 +66,29 @@ class DataHandler(DataProvider):
         self.time_helper = _DataHandlerTimeHelper(timer)
 
         self.is_optimised = False
+        # MarketSnapshot shared by the components reading the market data (see use_market_snapshot)
+        self.market_snapshot = None
+
+    def use_market_snapshot(self, window_length: int = 20, lookback_period: Optional[RelativeDelta] = None):
+        """
+        Creates the MarketSnapshot, which keeps the current bars, average daily volumes and volatilities of the traded
+        universe, so that they are computed only once per bar and shared by all the components reading them
+        (executors, slippage models, orders filters).
+
+        Parameters
+        ----------
+        window_length
+            number of the most recent daily bars used to compute the average daily volume and the volatility
+        lookback_period
+            only the daily bars from this period before today are used to compute the statistics (by default 60 days)
+        """
+        from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
+        self.market_snapshot = MarketSnapshot(self, window_length, lookback_period)
 
     def use_data_bundle(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
-                        start_date: datetime, end_date: datetime, frequency: Frequency = Frequency.DAILY):
+                        start_date: datetime, end_date: datetime, frequency: Frequency = Frequency.DAILY,
+                        use_array_storage: bool = False, cache_directory: Optional[str] = None,
+                        chunk_length: Optional[RelativeDelta] = None, cache_namespace: Optional[str] = None):
         """
         Optimises running of the backtest. All the data will be downloaded before the backtest.
         Note that requesting during the backtest any other ticker or price field than the ones in the params
@@ -84,6 +106,19 @@ class DataHandler(DataProvider):
             last date that should be downloaded
         frequency
             frequency of the data
+        use_array_storage
+            if True, the data bundle is kept in a columnar, numpy-based storage, which significantly lowers the latency
+            of all the data queries (see PresetDataProvider)
+        cache_directory
+            if provided, the data bundle is stored in a persistent cache in this directory and only the data missing
+            in the cache is downloaded (see DataBundleCache)
+        chunk_length
+            if provided, the data bundle is not downloaded at once, but in chunks of the given length, whenever the
+            data is requested (see ChunkedPrefetchingDataProvider). Recommended for the long backtests using
+            intraday data.
+        cache_namespace
+            namespace of the data in the persistent cache; needs to be provided if different data providers of the same
+            type (e.g. connected to different databases) use the same cache_directory
         """
         assert not self.is_optimised, "Multiple calls on use_data_bundle() are forbidden"
 
@@ -93,9 +128,37 @@ class DataHandler(DataProvider):
         self._check_frequency(frequency)
         self.fixed_data_provider_frequency = frequency
 
-        self.data_provider = PrefetchingDataProvider(self.data_provider, tickers, fields, start_date, end_date,
-                                                     frequency)
+        if chunk_length is not None:
+            self.data_provider = ChunkedPrefetchingDataProvider(self.data_provider, tickers, fields, start_date,
+                                                                end_date, frequency, chunk_length, use_array_storage,
+                                                                cache_directory, cache_namespace)
+        else:
+            self.data_provider = PrefetchingDataProvider(self.data_provider, tickers, fields, start_date, end_date,
+                                                         frequency, use_array_storage, cache_directory,
+                                                         cache_namespace)
+
+        self.is_optimised = True
+
+    def use_memory_mapped_data_bundle(self, directory: str, use_array_storage: bool = False):
+        """
+        Optimises running of the backtest, just like use_data_bundle, but instead of downloading the data, it uses
+        the data bundle saved before with PresetDataProvider.save_memory_mapped_bundle. The bundle is memory-mapped,
+        so the backtests running in parallel processes share the same data in memory.
 
+        Parameters
+        ----------
+        directory
+            path to the directory, in which the bundle was saved
+        use_array_storage
+            if True, the data bundle is kept in a columnar, numpy-based storage (see PresetDataProvider)
+        """
+        assert not self.is_optimised, "Multiple calls on use_data_bundle() are forbidden"
+
+        data_provider = PresetDataProvider.from_memory_mapped_bundle(directory, use_array_storage)
+        self._check_frequency(data_provider.frequency)
+        self.fixed_data_provider_frequency = data_provider.frequency
+
+        self.data_provider = data_provider
         self.is_optimised = True
 
     @abstractmethod
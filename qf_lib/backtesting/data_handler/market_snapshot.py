@@ -0,0 +1,156 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from collections import deque
+from datetime import datetime
+from typing import Sequence, Optional, Dict, Deque, Tuple, List
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.miscellaneous.annualise_with_sqrt import annualise_with_sqrt
+
+
+class MarketSnapshot(object):
+    """
+    Snapshot of the market data of the traded universe, shared by the execution handler, slippage models and orders
+    filters, so that the same data is not downloaded by each of them separately in every orders cycle.
+
+    For the current time the snapshot keeps the current bars of all tickers requested so far. For the current day it
+    keeps the average daily volume and the annualised volatility of each ticker, computed over the window_length most
+    recent daily bars (from the lookback_period before today). The statistics are updated incrementally - every day
+    only the daily bars closed since the previous day are downloaded.
+
+    Parameters
+    ----------
+    data_handler: DataHandler
+        data handler used to download the data
+    window_length: int
+        number of the most recent daily bars used to compute the average daily volume and the volatility
+    lookback_period: RelativeDelta
+        only the daily bars from this period before today are used to compute the statistics (by default 60 days)
+    """
+
+    def __init__(self, data_handler: DataHandler, window_length: int = 20,
+                 lookback_period: Optional[RelativeDelta] = None):
+        self._data_handler = data_handler
+        self._window_length = window_length
+        self._lookback_period = lookback_period if lookback_period is not None else RelativeDelta(days=60)
+
+        self._bars_time = None  # type: Optional[datetime]
+        self._current_bars = {}  # type: Dict[Ticker, np.ndarray]
+
+        self._statistics_date = None  # type: Optional[datetime]
+        self._average_daily_volumes = {}  # type: Dict[Ticker, float]
+        self._volatilities = {}  # type: Dict[Ticker, float]
+
+        # the most recent available daily close prices and volumes (together with their dates) of every ticker
+        self._close_prices = {}  # type: Dict[Ticker, Deque[Tuple[datetime, float]]]
+        self._volumes = {}  # type: Dict[Ticker, Deque[Tuple[datetime, float]]]
+        self._daily_bars_end_date = None  # type: Optional[datetime]
+
+    def current_bar(self, tickers: Sequence[Ticker]) -> pd.DataFrame:
+        """
+        Returns the current bars of the tickers, indexed with tickers and with PriceFields (OHLCV) as columns (just like
+        DataHandler.get_current_bar). The bars of each ticker are downloaded only once per timestamp.
+        """
+        current_time = self._data_handler.timer.now()
+        if current_time != self._bars_time:
+            self._bars_time = current_time
+            self._current_bars.clear()
+
+        missing_tickers = [ticker for ticker in dict.fromkeys(tickers) if ticker not in self._current_bars]
+        if missing_tickers:
+            bars_df = self._data_handler.get_current_bar(missing_tickers)
+            bars_df = bars_df.reindex(index=missing_tickers, columns=PriceField.ohlcv())
+            self._current_bars.update(zip(missing_tickers, bars_df.values))
+
+        return pd.DataFrame([self._current_bars[ticker] for ticker in tickers], index=tickers,
+                            columns=PriceField.ohlcv())
+
+    def average_daily_volume(self, tickers: Sequence[Ticker]) -> np.ndarray:
+        """
+        Returns the average daily volumes of the tickers (NaN if there is no volume data). Negative volumes are ignored.
+        """
+        self._update_statistics(tickers)
+        return np.array([self._average_daily_volumes[ticker] for ticker in tickers], dtype=float)
+
+    def volatility(self, tickers: Sequence[Ticker]) -> np.ndarray:
+        """
+        Returns the annualised volatilities of the daily log returns of the tickers (NaN if there are less than three
+        close prices available).
+        """
+        self._update_statistics(tickers)
+        return np.array([self._volatilities[ticker] for ticker in tickers], dtype=float)
+
+    def _update_statistics(self, tickers: Sequence[Ticker]):
+        today = self._data_handler.timer.now() + RelativeDelta(hour=0, minute=0, second=0, microsecond=0)
+        oldest_date = today - self._lookback_period
+
+        if today != self._statistics_date:
+            self._statistics_date = today
+            self._average_daily_volumes.clear()
+            self._volatilities.clear()
+
+            # Download only the daily bars closed since the last update
+            if self._daily_bars_end_date is not None and self._daily_bars_end_date < today:
+                start_date = max(self._daily_bars_end_date, oldest_date)
+                self._append_daily_bars(list(self._close_prices.keys()), start_date, today)
+            self._daily_bars_end_date = today
+
+        new_tickers = [ticker for ticker in dict.fromkeys(tickers) if ticker not in self._close_prices]
+        if new_tickers:
+            for ticker in new_tickers:
+                self._close_prices[ticker] = deque(maxlen=self._window_length)
+                self._volumes[ticker] = deque(maxlen=self._window_length)
+            self._append_daily_bars(new_tickers, oldest_date, today)
+
+        for ticker in tickers:
+            if ticker not in self._volatilities:
+                close_prices = np.array([price for date, price in self._close_prices[ticker] if date > oldest_date])
+                volumes = np.array([volume for date, volume in self._volumes[ticker] if date > oldest_date])
+
+                self._volatilities[ticker] = self._compute_volatility(close_prices)
+                self._average_daily_volumes[ticker] = volumes[volumes >= 0].mean() if volumes.size > 0 else np.nan
+
+    def _append_daily_bars(self, tickers: List[Ticker], start_date: datetime, end_date: datetime):
+        """
+        Appends the daily close prices and volumes from the [start_date, end_date) period to the buffers of tickers.
+        """
+        data_array = self._data_handler.get_price(tickers, [PriceField.Close, PriceField.Volume], start_date,
+                                                  end_date - RelativeDelta(microseconds=1), Frequency.DAILY)
+        dates = data_array.dates.to_index()
+        close_prices = data_array.loc[:, tickers, PriceField.Close].values
+        volumes = data_array.loc[:, tickers, PriceField.Volume].values
+
+        for ticker_index, ticker in enumerate(tickers):
+            self._append_values(self._close_prices[ticker], dates, close_prices[:, ticker_index])
+            self._append_values(self._volumes[ticker], dates, volumes[:, ticker_index])
+
+    @staticmethod
+    def _append_values(buffer: Deque[Tuple[datetime, float]], dates: pd.DatetimeIndex, values: np.ndarray):
+        is_available = ~np.isnan(values.astype(float))
+        buffer.extend(zip(dates[is_available], values[is_available].astype(float)))
+
+    @staticmethod
+    def _compute_volatility(close_prices: np.ndarray) -> float:
+        if close_prices.size < 3:
+            return np.nan
+
+        log_returns = np.diff(np.log(close_prices))
+        return annualise_with_sqrt(np.std(log_returns, ddof=1), Frequency.DAILY)
@@ -0,0 +1,100 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.prices_series import PricesSeries
+
+
+class RollingWindowBuffer(object):
+    """
+    Ring buffer keeping the most recent bars of a container returned by DataProvider.get_price (PricesSeries,
+    PricesDataFrame or QFDataArray). The buffer has a fixed number of bars - appending new bars overwrites the oldest
+    ones. Containers of the same type and with the same labels as the initial container may be recreated from the
+    buffer at any time.
+
+    Parameters
+    ----------
+    container
+        container with exactly the number of bars, which should be kept in the buffer; it is used as a template for all
+        the containers returned by the buffer
+    end_date
+        end date of the query, which returned the container
+    """
+
+    def __init__(self, container: Union[PricesSeries, PricesDataFrame, QFDataArray], end_date: datetime):
+        self._container_type = type(container)
+        self._name = container.name if not isinstance(container, pd.DataFrame) else None
+
+        if isinstance(container, QFDataArray):
+            self._dates_name = container.dates.to_index().name
+            self._tickers = container.tickers.values
+            self._fields = container.fields.values
+        else:
+            self._dates_name = container.index.name
+            self._columns = container.columns if isinstance(container, pd.DataFrame) else None
+
+        self._dates = np.array(self._get_dates(container), dtype='datetime64[ns]')
+        self._values = np.array(container.values)
+        self._size = len(self._dates)
+        self._oldest_position = 0
+
+        self.end_date = end_date
+
+    @property
+    def first_date(self) -> datetime:
+        return pd.Timestamp(self._dates[self._oldest_position])
+
+    def append(self, container: Union[PricesSeries, PricesDataFrame, QFDataArray], end_date: datetime):
+        """
+        Adds the bars from the container at the end of the buffer and removes the same number of the oldest bars.
+        The container needs to be of the same type and shape (apart from the number of dates) as the initial one.
+        Bars which are not more recent than the last bar stored in the buffer are skipped (data providers with daily
+        granularity may return the last cached bar once again).
+        """
+        new_dates = np.array(self._get_dates(container), dtype='datetime64[ns]')
+        is_new_bar = new_dates > self._dates[(self._oldest_position - 1) % self._size]
+        new_dates = new_dates[is_new_bar][-self._size:]
+        new_values = np.asarray(container.values)[is_new_bar][-self._size:]
+
+        positions = (self._oldest_position + np.arange(len(new_dates))) % self._size
+        self._dates[positions] = new_dates
+        self._values[positions] = new_values
+        self._oldest_position = (self._oldest_position + len(new_dates)) % self._size
+
+        self.end_date = end_date
+
+    def to_container(self) -> Union[PricesSeries, PricesDataFrame, QFDataArray]:
+        """
+        Returns a new container with all the bars stored in the buffer (sorted from the oldest to the most recent one).
+        """
+        positions = (self._oldest_position + np.arange(self._size)) % self._size
+        dates_index = pd.DatetimeIndex(self._dates[positions], name=self._dates_name)
+        values = self._values[positions]
+
+        if issubclass(self._container_type, QFDataArray):
+            return QFDataArray.create(dates_index, self._tickers, self._fields, values, self._name)
+        elif issubclass(self._container_type, pd.DataFrame):
+            return self._container_type(data=values, index=dates_index, columns=self._columns)
+        else:
+            return self._container_type(data=values, index=dates_index, name=self._name)
+
+    @staticmethod
+    def _get_dates(container):
+        return container.dates.values if isinstance(container, QFDataArray) else container.index.values
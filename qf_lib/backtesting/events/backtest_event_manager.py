@@ -0,0 +1,70 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import logging
+from collections import deque
+from typing import Dict, Sequence
+
+from qf_lib.backtesting.events.empty_queue_event.empty_queue_event import EmptyQueueEvent
+from qf_lib.backtesting.events.end_trading_event.end_trading_event import EndTradingEvent
+from qf_lib.backtesting.events.event_base import Event, EventNotifier
+from qf_lib.backtesting.events.event_manager import EventManager, _EventType
+from qf_lib.backtesting.events.time_event.time_event import TimeEvent
+from qf_lib.common.utils.dateutils.timer import Timer
+
+
+class BacktestEventManager(EventManager):
+    """
+    EventManager meant to be used in backtests, in which all the components run in a single thread. The events are kept
+    in a deque instead of the thread-safe queue.Queue, the same EmptyQueueEvent is dispatched every time the queue
+    is empty and the notifier corresponding to each type of event is looked up only once.
+    """
+
+    def __init__(self, timer: Timer) -> None:
+        super().__init__(timer)
+        self.events_queue = deque()  # type: deque
+
+        self._empty_queue_event = EmptyQueueEvent()
+        self._event_type_to_resolved_notifier = {}  # type: Dict[_EventType, EventNotifier]
+        """
+        Mapping: concrete event type to the notifier, which should be notified about the events of this type.
+        """
+
+    def register_notifiers(self, notifiers_list: Sequence[EventNotifier]):
+        super().register_notifiers(notifiers_list)
+        self._event_type_to_resolved_notifier.clear()
+
+    def publish(self, event: Event):
+        self.events_queue.append(event)
+
+    def _get_next_event(self):
+        if self.events_queue:
+            return self.events_queue.popleft()
+        return self._empty_queue_event
+
+    def _dispatch_event(self, event: Event):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug('Dispatching event: {}'.format(event))
+
+        event_type = type(event)
+        try:
+            notifier = self._event_type_to_resolved_notifier[event_type]
+        except KeyError:
+            notifier_event_type = TimeEvent if issubclass(event_type, TimeEvent) else event_type
+            notifier = self._events_to_notifiers[notifier_event_type]
+            self._event_type_to_resolved_notifier[event_type] = notifier
+
+        if event_type is EndTradingEvent:
+            self.continue_trading = False
+
+        notifier.notify_all(event)
@@ -73,10 +73,12 @@ class PeriodicEvent(TimeEvent, metaclass=ABCMeta):
     def set_start_and_end_time(cls, start_time: Dict[str, int], end_time: Dict[str, int]):
         cls.start_time = start_time
         cls.end_time = end_time
+        cls._trigger_settings_changed()
 
     @classmethod
     def set_frequency(cls, frequency: Frequency):
         cls.frequency = frequency
+        cls._trigger_settings_changed()
 
     def _init_events_list(self):
         """
@@ -102,6 +104,9 @@ class PeriodicEvent(TimeEvent, metaclass=ABCMeta):
             self._start_time = start_time
             self._end_time = end_time
             self._trigger_time_rule = RegularDateTimeRule(**trigger_time)
+            self._start_time_rule = RegularDateTimeRule(**start_time)
+            self._start_time_delta = RelativeDelta(**start_time)
+            self._end_time_delta = RelativeDelta(**end_time)
 
         @classmethod
         def trigger_time(cls) -> RelativeDelta:
@@ -110,10 +115,9 @@ class PeriodicEvent(TimeEvent, metaclass=ABCMeta):
         def next_trigger_time(self, now: datetime) -> datetime:
 
             def _within_time_frame(_time):
-                return (_time + RelativeDelta(**self._end_time) >= _time) and \
-                       (_time + RelativeDelta(**self._start_time) <= _time)
+                return (_time + self._end_time_delta >= _time) and (_time + self._start_time_delta <= _time)
 
-            _start_time_rule = RegularDateTimeRule(**self._start_time)
+            _start_time_rule = self._start_time_rule
 
             # Before midnight and after end time or after midnight and before start time (e.g. after the market
             # close and before the market open), the next trigger time should always point to the next time
@@ -35,6 +35,7 @@ class DailyMarketEvent(RegularTimeEvent, metaclass=ABCMeta):
     def set_trigger_time(cls, trigger_time_dict: Dict[str, int]):
         cls._trigger_time = trigger_time_dict
         cls._trigger_time_rule = RegularDateTimeRule(**trigger_time_dict)
+        cls._trigger_settings_changed()
 
     @classmethod
     def trigger_time(cls) -> RelativeDelta:
@@ -11,13 +11,18 @@
 #     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
-import operator
+import heapq
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, Type, TypeVar, List, Any, Generator, Tuple
+from itertools import count
+from typing import Dict, Type, TypeVar, List, Any, Tuple, Sequence, Collection
 
 from qf_lib.backtesting.events.time_event.periodic_event.intraday_bar_event import IntradayBarEvent
+from qf_lib.backtesting.events.time_event.periodic_event.periodic_event import PeriodicEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.regular_time_event import RegularTimeEvent
 from qf_lib.backtesting.events.time_event.single_time_event.schedule_order_execution_event import \
     ScheduleOrderExecutionEvent
 from qf_lib.backtesting.events.time_event.time_event import TimeEvent
@@ -35,8 +40,25 @@ class Scheduler(object):
 
     Normally time events are generated whenever the EventManager's queue is empty. The generation will be triggered
     by TimeFlowController.
+
+    The next trigger times of RegularTimeEvents and PeriodicEvents are kept in a heap. As these events are triggered
+    according to the fixed date time rules, their next trigger time changes only after they are triggered, so it is
+    recomputed only for the events which were already triggered (or if the time moved backwards or the trigger settings
+    of any TimeEvent changed, e.g. after MarketOpenEvent.set_trigger_time was called). The next trigger times of all
+    other TimeEvents (e.g. SingleTimeEvents, which can be scheduled at any moment) are computed each time
+    get_next_time_events is called.
+
+    In backtests the whole timeline of RegularTimeEvents and PeriodicEvents may be also precomputed at once
+    (see use_precomputed_timeline).
     """
 
+    _time_events_priority = {
+        ScheduleOrderExecutionEvent: 0,
+        IntradayBarEvent: 1,
+        MarketOpenEvent: 1,
+        MarketCloseEvent: 1
+    }
+
     def __init__(self, timer: Timer):
         self.timer = timer
         self.logger = qf_logger.getChild(self.__class__.__name__)
@@ -44,6 +66,19 @@ class Scheduler(object):
         self._time_event_type_to_subscribers = {}  # type: Dict[TypeOfEvent, List[Any]]
         self._time_event_type_to_object = {}
 
+        self._time_events_heap = []  # type: List[Tuple[datetime, int, ConcreteTimeEvent]]
+        self._time_events_to_reschedule = []  # type: List[ConcreteTimeEvent]
+        self._not_cached_time_events = []  # type: List[ConcreteTimeEvent]
+        self._heap_entries_counter = count()  # makes the heap entries with equal trigger times comparable
+        self._last_update_time = None  # type: datetime
+        self._trigger_settings_version = TimeEvent._trigger_settings_version
+
+        self._timeline_times = []  # type: List[datetime]
+        self._timeline_events = []  # type: List[List[ConcreteTimeEvent]]
+        self._timeline_position = 0
+        self._timeline_end_time = None  # type: datetime
+        self._time_events_in_timeline = []  # type: List[ConcreteTimeEvent]
+
     @classmethod
     def events_type(cls):
         return TimeEvent
@@ -70,7 +105,13 @@ class Scheduler(object):
 
         # Check if it is necessary to initialize a new object of type_of_time_event type
         if type_of_time_event not in self._time_event_type_to_object.keys():
-            self._time_event_type_to_object[type_of_time_event] = type_of_time_event()
+            time_event = type_of_time_event()
+            self._time_event_type_to_object[type_of_time_event] = time_event
+
+            if isinstance(time_event, (RegularTimeEvent, PeriodicEvent)):
+                self._time_events_to_reschedule.append(time_event)
+            else:
+                self._not_cached_time_events.append(time_event)
 
     def get_next_time_events(self) -> Tuple[List[ConcreteTimeEvent], datetime]:
         """
@@ -85,27 +126,154 @@ class Scheduler(object):
         time will be already processed and accepted.
         """
         now = self.timer.now()
+        self._update_time_events_heap(now)
 
-        times_and_events = [
-            (time_event.next_trigger_time(now), time_event) for time_event in self._time_event_type_to_object.values()
-            if time_event.next_trigger_time(now) is not None
-        ]  # type: Generator[Tuple[datetime, ConcreteTimeEvent]]
-
-        next_trigger_time, _ = min(times_and_events, key=operator.itemgetter(0))  # type: datetime
+        times_and_events = [(time, event) for time, _, event in self._time_events_heap]
+        for time_event in self._not_cached_time_events:
+            next_trigger_time = time_event.next_trigger_time(now)
+            if next_trigger_time is not None:
+                times_and_events.append((next_trigger_time, time_event))
 
-        next_time_events = [event for time, event in times_and_events if time == next_trigger_time]
-        # type: List[ConcreteTimeEvent]
+        if self._timeline_times:
+            next_timeline_time = self._timeline_times[self._timeline_position]
+            if all(time > next_timeline_time for time, _ in times_and_events):
+                # the events from the timeline are already sorted
+                return list(self._timeline_events[self._timeline_position]), next_timeline_time
 
-        time_events_priority = {
-            ScheduleOrderExecutionEvent: 0,
-            IntradayBarEvent: 1,
-            MarketOpenEvent: 1,
-            MarketCloseEvent: 1
-        }
+            times_and_events.extend((next_timeline_time, event)
+                                    for event in self._timeline_events[self._timeline_position])
 
-        next_time_events.sort(key=lambda ev: time_events_priority.get(type(ev), float('inf')))
+        next_trigger_time = min(time for time, _ in times_and_events)  # type: datetime
+        next_time_events = self._sorted_time_events(
+            {event for time, event in times_and_events if time == next_trigger_time})
         return next_time_events, next_trigger_time
 
+    def use_precomputed_timeline(self, end_time: datetime, trading_dates: Sequence[datetime] = None):
+        """
+        Precomputes the timeline of all the subscribed RegularTimeEvents and PeriodicEvents, which are triggered after
+        the current time and not later than the end_time. Until the end_time these events are taken directly from the
+        timeline instead of being scheduled one by one. All the other TimeEvents (e.g. SingleTimeEvents) and the events
+        subscribed after the timeline was created are scheduled as usual.
+
+        Parameters
+        ----------
+        end_time
+            the last time of the timeline (e.g. end of the backtest)
+        trading_dates
+            if provided, the events are not triggered on the days, which are not among the trading dates (e.g. on the
+            days for which there is no data in the preloaded data bundle)
+        """
+        now = self.timer.now()
+        self._update_time_events_heap(now)
+        self._time_events_in_timeline.extend(event for _, _, event in self._time_events_heap)
+        self._time_events_heap = []
+
+        time_to_events = defaultdict(list)  # type: Dict[datetime, List[ConcreteTimeEvent]]
+        for time_event in self._time_events_in_timeline:
+            for trigger_time in self._get_trigger_times(time_event, now, end_time):
+                time_to_events[trigger_time].append(time_event)
+
+        timeline_times = sorted(time_to_events.keys())
+        if trading_dates is not None:
+            trading_days = {date.date() for date in trading_dates}
+            timeline_times = [time for time in timeline_times if time.date() in trading_days]
+
+        self._timeline_times = timeline_times
+        self._timeline_events = [self._sorted_time_events(time_to_events[time]) for time in timeline_times]
+        self._timeline_position = 0
+        self._timeline_end_time = end_time
+        self._update_timeline_position(now)
+
+    def _sorted_time_events(self, time_events: Collection[ConcreteTimeEvent]) -> List[ConcreteTimeEvent]:
+        """
+        Returns the simultaneously triggered TimeEvents in the order, in which they should be triggered
+        (see get_next_time_events).
+        """
+        # keep the order, in which the events were subscribed, for the events with the same priority
+        sorted_time_events = [event for event in self._time_event_type_to_object.values() if event in time_events]
+        sorted_time_events.sort(key=lambda ev: self._time_events_priority.get(type(ev), float('inf')))
+        return sorted_time_events
+
+    @staticmethod
+    def _get_trigger_times(time_event: ConcreteTimeEvent, start_time: datetime, end_time: datetime) -> List[datetime]:
+        """
+        Returns all the trigger times of the event after the start_time and not later than the end_time.
+        """
+        if isinstance(time_event, PeriodicEvent):
+            # PeriodicEvent is triggered whenever any of its constituent events is triggered. Generating the trigger
+            # times of every constituent separately is much faster than calling next_trigger_time of the PeriodicEvent
+            trigger_times = set()
+            for constituent_event in time_event._events_list:
+                trigger_times.update(Scheduler._get_trigger_times(constituent_event, start_time, end_time))
+            return sorted(trigger_times)
+
+        trigger_times = []
+        trigger_time = time_event.next_trigger_time(start_time)
+        while trigger_time is not None and trigger_time <= end_time:
+            trigger_times.append(trigger_time)
+            trigger_time = time_event.next_trigger_time(trigger_time)
+
+        return trigger_times
+
+    def _update_timeline_position(self, now: datetime):
+        """
+        Moves the timeline position to the first time of the timeline, which is later than now. The events from the
+        timeline are scheduled as usual as soon as the whole timeline is used.
+        """
+        if not self._time_events_in_timeline:
+            return
+
+        moved_backwards = self._last_update_time is not None and now < self._last_update_time
+        lowest_position = 0 if moved_backwards else self._timeline_position
+        self._timeline_position = bisect_right(self._timeline_times, now, lowest_position)
+
+        if self._timeline_position == len(self._timeline_times):
+            # the events are not triggered before the end of the timeline, even if the last days were skipped
+            start_time = max(now, self._timeline_end_time)
+            for time_event in self._time_events_in_timeline:
+                next_trigger_time = time_event.next_trigger_time(start_time)
+                if next_trigger_time is not None:
+                    heapq.heappush(self._time_events_heap,
+                                   (next_trigger_time, next(self._heap_entries_counter), time_event))
+
+            self._timeline_times = []
+            self._timeline_events = []
+            self._time_events_in_timeline = []
+
+    def _update_time_events_heap(self, now: datetime):
+        """
+        Recomputes the next trigger times of the cached TimeEvents, which were already triggered (their trigger time
+        is not later than now) and of the newly subscribed ones. All the cached trigger times (including the precomputed
+        timeline) are recomputed if the trigger settings of any TimeEvent changed.
+        """
+        if self._trigger_settings_version != TimeEvent._trigger_settings_version:
+            self._time_events_to_reschedule.extend(event for _, _, event in self._time_events_heap)
+            self._time_events_to_reschedule.extend(self._time_events_in_timeline)
+            self._time_events_heap.clear()
+            self._timeline_times = []
+            self._timeline_events = []
+            self._time_events_in_timeline = []
+            self._trigger_settings_version = TimeEvent._trigger_settings_version
+
+        self._update_timeline_position(now)
+
+        if self._last_update_time is not None and now < self._last_update_time:
+            # the time moved backwards, so none of the cached trigger times is valid anymore
+            self._time_events_to_reschedule.extend(event for _, _, event in self._time_events_heap)
+            self._time_events_heap.clear()
+
+        while self._time_events_heap and self._time_events_heap[0][0] <= now:
+            _, _, time_event = heapq.heappop(self._time_events_heap)
+            self._time_events_to_reschedule.append(time_event)
+
+        for time_event in self._time_events_to_reschedule:
+            next_trigger_time = time_event.next_trigger_time(now)
+            if next_trigger_time is not None:
+                heapq.heappush(self._time_events_heap, (next_trigger_time, next(self._heap_entries_counter), time_event))
+
+        self._time_events_to_reschedule = []
+        self._last_update_time = now
+
     def notify_all(self, time_event: ConcreteTimeEvent):
         """
         Notifies each listener of the occurrence of the given concrete event.
@@ -23,6 +23,14 @@ class TimeEvent(Event, metaclass=ABCMeta):
     Represents an event associated with certain date/time (e.g. 2017-05-13 13:00).
     """
 
+    # changed whenever the trigger settings of any TimeEvent type change (e.g. MarketOpenEvent.set_trigger_time),
+    # which invalidates the trigger times cached by the Scheduler
+    _trigger_settings_version = 0
+
+    @staticmethod
+    def _trigger_settings_changed():
+        TimeEvent._trigger_settings_version += 1
+
     @abstractmethod
     def next_trigger_time(self, now: datetime) -> datetime:
         pass
@@ -15,6 +15,7 @@
 import time
 from abc import ABCMeta, abstractmethod
 from datetime import datetime
+from typing import Sequence
 
 from qf_lib.backtesting.events.empty_queue_event.empty_queue_event import EmptyQueueEvent
 from qf_lib.backtesting.events.empty_queue_event.empty_queue_event_listener import EmptyQueueEventListener
@@ -57,7 +58,28 @@ class BacktestTimeFlowController(TimeFlowController):
         self.settable_timer = settable_timer
         self.backtest_end_datetime = self._end_of_the_day(backtest_end_date)
 
+        self._use_precomputed_timeline = False
+        self._trading_dates = None
+
+    def use_precomputed_timeline(self, trading_dates: Sequence[datetime] = None):
+        """
+        Makes the Scheduler precompute the whole timeline of regular and periodic TimeEvents until the end of the
+        backtest, instead of scheduling them one by one. The timeline is created when the first TimeEvent is generated,
+        so that it contains all the events subscribed before the start of trading.
+
+        Parameters
+        ----------
+        trading_dates
+            if provided, the TimeEvents are not generated on the days, which are not among the trading dates
+        """
+        self._use_precomputed_timeline = True
+        self._trading_dates = trading_dates
+
     def generate_time_event(self):
+        if self._use_precomputed_timeline:
+            self.scheduler.use_precomputed_timeline(self.backtest_end_datetime, self._trading_dates)
+            self._use_precomputed_timeline = False
+
         time_events_list, next_time_of_event = self.scheduler.get_next_time_events()
 
         if next_time_of_event > self.backtest_end_datetime:
@@ -0,0 +1,166 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from itertools import count
+from typing import List, Sequence, Optional, Tuple
+
+import numpy as np
+
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
+from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
+from qf_lib.backtesting.execution_handler.order_book import OrderBook
+from qf_lib.backtesting.execution_handler.simulated_executor import SimulatedExecutor
+from qf_lib.backtesting.execution_handler.slippage.base import Slippage
+from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
+from qf_lib.backtesting.order.execution_style import LimitOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.timer import Timer
+from qf_lib.common.utils.numberutils.is_finite_number import is_finite_number
+
+
+class LimitOrdersExecutor(SimulatedExecutor):
+    """
+    Executes the LimitOrders. The resting orders are kept in the OrderBook indexed by ticker and limit price, so that
+    on every bar only the orders, which limit prices were reached (lie inside the [low, high] range of the bar), are
+    checked, instead of all open orders.
+    """
+
+    def __init__(self, contracts_to_tickers_mapper: ContractTickerMapper, data_handler: DataHandler,
+                 monitor: AbstractMonitor, portfolio: Portfolio, timer: Timer, order_id_generator: count,
+                 commission_model: CommissionModel, slippage_model: Slippage):
+
+        super().__init__(contracts_to_tickers_mapper, data_handler, monitor, portfolio, timer,
+                         order_id_generator, commission_model, slippage_model)
+        self._order_book = OrderBook()
+
+    def assign_order_ids(self, orders: Sequence[Order]) -> List[int]:
+        order_id_list = []
+        for order in orders:
+            self._check_order_validity(order)
+
+            order.id = next(self._order_id_generator)
+            order_id_list.append(order.id)
+
+        return order_id_list
+
+    def accept_orders(self, orders: Sequence[Order]):
+        super().accept_orders(orders)
+        for order in orders:
+            ticker = self._contracts_to_tickers_mapper.contract_to_ticker(order.contract)
+            # buy limit orders are triggered when the price falls down to the limit price, sell limit orders - when
+            # the price rises up to it
+            self._order_book.add(order.id, ticker, order.execution_style.limit_price, order.quantity > 0)
+
+    def cancel_all_open_orders(self):
+        super().cancel_all_open_orders()
+        self._order_book.clear()
+
+    def cancel_order(self, order_id: int) -> Optional[Order]:
+        cancelled_order = super().cancel_order(order_id)
+        if cancelled_order is not None:
+            self._order_book.remove(order_id)
+        return cancelled_order
+
+    def _remove_awaiting_orders(self, order_ids: Sequence[int]):
+        super()._remove_awaiting_orders(order_ids)
+        for order_id in order_ids:
+            self._order_book.remove(order_id)
+
+    def _match_orders(self, market_open: bool, market_close: bool) -> Tuple[List[float], List[Order], List[int]]:
+        # Only the orders, which limit prices are inside the [low, high] range of the current bar, can be executed
+        tickers = self._order_book.tickers()
+        price_bars = self._get_current_price_bars(tickers)
+
+        triggered_orders_ids = []
+        for ticker, (_, high_price, low_price, _) in zip(tickers, price_bars):
+            if is_finite_number(low_price) and is_finite_number(high_price):
+                triggered_orders_ids.extend(self._order_book.triggered_orders_ids(ticker, low_price, high_price))
+
+        # Preserve the order in which the orders were accepted
+        triggered_orders_ids.sort()
+        triggered_orders = [self._awaiting_orders[order_id] for order_id in triggered_orders_ids]
+        triggered_tickers = [self._order_book.ticker(order_id) for order_id in triggered_orders_ids]
+
+        no_slippage_fill_prices, to_be_executed_orders, expired_orders = \
+            self._get_orders_with_fill_prices_without_slippage(triggered_orders, triggered_tickers, market_open,
+                                                               market_close)
+
+        if market_close:
+            # the orders, which were not triggered, may expire as well
+            triggered_orders_ids = set(triggered_orders_ids)
+            expired_orders.extend(order_id for order_id, order in self._awaiting_orders.items()
+                                  if order_id not in triggered_orders_ids and self._order_expires(order))
+
+        return no_slippage_fill_prices, to_be_executed_orders, expired_orders
+
+    def _get_orders_with_fill_prices_without_slippage(self, open_orders_list: List[Order], tickers: List[Ticker],
+                                                      market_open: bool, market_close: bool) \
+            -> Tuple[List[float], List[Order], List[int]]:
+        if not open_orders_list:
+            return [], [], []
+
+        unique_tickers = list(set(tickers))
+        price_bars = self._get_current_price_bars(unique_tickers)
+        ticker_indices = {ticker: index for index, ticker in enumerate(unique_tickers)}
+        orders_bars = price_bars[[ticker_indices[ticker] for ticker in tickers]]
+
+        no_slippage_fill_prices = self._calculate_no_slippage_fill_prices(open_orders_list, orders_bars)
+        is_executed = ~np.isnan(no_slippage_fill_prices)
+        to_be_executed_orders = [open_orders_list[index] for index in np.flatnonzero(is_executed)]
+
+        expired_orders = []  # type: List[int]
+        if market_close:
+            expired_orders = [open_orders_list[index].id for index in np.flatnonzero(~is_executed)
+                              if self._order_expires(open_orders_list[index])]
+
+        return no_slippage_fill_prices[is_executed].tolist(), to_be_executed_orders, expired_orders
+
+    @staticmethod
+    def _calculate_no_slippage_fill_prices(orders: Sequence[Order], price_bars: np.ndarray) -> np.ndarray:
+        """
+        Returns the prices which should be used for calculating the real fill prices of the orders later on (price_bars
+        contain the Open, High, Low and Close prices corresponding to each of the orders). Each of them can be either:
+        OPEN or limit price. If the market opens at the price better than (or equal to) the limit price, the OPEN price
+        is returned. Otherwise if the LOW price (for Buy Limit) or HIGH price (for Sell Limit) reaches the limit price,
+        the limit price is returned. If none of the above conditions is met, NaN is returned (which means that
+        LimitOrder shouldn't be executed at any price).
+        """
+        limit_prices = np.array([order.execution_style.limit_price for order in orders], dtype=float)
+        is_buy_limit = np.array([order.quantity > 0 for order in orders], dtype=bool)
+        open_prices, high_prices, low_prices = price_bars[:, 0], price_bars[:, 1], price_bars[:, 2]
+
+        with np.errstate(invalid="ignore"):
+            reached_at_open = np.where(is_buy_limit, open_prices <= limit_prices, open_prices >= limit_prices)
+            reached_during_bar = np.where(is_buy_limit, low_prices <= limit_prices, high_prices >= limit_prices)
+
+        return np.where(reached_at_open, open_prices, np.where(reached_during_bar, limit_prices, np.nan))
+
+    def _check_order_validity(self, order):
+        assert order.time_in_force == TimeInForce.DAY or order.time_in_force == TimeInForce.GTC, \
+            "Only TimeInForce.DAY or TimeInForce.GTC Time in Force is accepted by LimitOrdersExecutor"
+        assert isinstance(order.execution_style, LimitOrder), \
+            "Only LimitOrder ExecutionStyle is supported by LimitOrdersExecutor"
+        if order.quantity == 0:
+            raise ValueError("Incorrect order quantity (quantity: 0)")
+
+    @staticmethod
+    def _order_expires(order: Order):
+        """
+        In case of on market close orders execution, the orders should expire if their TimeInForce is not equal to GTC.
+        DAY orders will be dropped at this moment.
+        """
+        return order.time_in_force != TimeInForce.GTC
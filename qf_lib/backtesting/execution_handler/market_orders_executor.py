@@ -15,6 +15,8 @@
 from itertools import count
 from typing import List, Sequence
 
+import numpy as np
+
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
@@ -26,7 +28,6 @@ from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
 from qf_lib.common.utils.dateutils.timer import Timer
-from qf_lib.common.utils.numberutils.is_finite_number import is_finite_number
 
 
 class MarketOrdersExecutor(SimulatedExecutor):
@@ -51,28 +52,21 @@ class MarketOrdersExecutor(SimulatedExecutor):
         unique_tickers = list(set(tickers))
         current_prices_series = self._data_handler.get_current_price(unique_tickers)
 
-        expired_orders = []  # type: List[int]
-        to_be_executed_orders = []
-        no_slippage_prices = []
+        # prices corresponding to the orders
+        security_prices = current_prices_series.reindex(tickers).values.astype(float)
+        is_executed = np.isfinite(security_prices)
+
+        to_be_executed_orders = [market_orders_list[index] for index in np.flatnonzero(is_executed)]
+        no_slippage_prices = security_prices[is_executed].tolist()
 
         # Check at first if at this moment of time, expiry checks should be made or not (optimization reasons)
+        expired_orders = []  # type: List[int]
         if market_open or market_close:
             # In case of market open or market close, some of the orders may expire
-            for order, ticker in zip(market_orders_list, tickers):
-                security_price = current_prices_series[ticker]
-
-                if is_finite_number(security_price):
-                    to_be_executed_orders.append(order)
-                    no_slippage_prices.append(security_price)
-                elif self._order_expires(order, market_open, market_close):
-                    expired_orders.append(order.id)
-        else:
-            for order, ticker in zip(market_orders_list, tickers):
-                security_price = current_prices_series[ticker]
-
-                if is_finite_number(security_price):
-                    to_be_executed_orders.append(order)
-                    no_slippage_prices.append(security_price)
+            expired_orders = [
+                market_orders_list[index].id for index in np.flatnonzero(~is_executed)
+                if self._order_expires(market_orders_list[index], market_open, market_close)
+            ]
 
         return no_slippage_prices, to_be_executed_orders, expired_orders
 
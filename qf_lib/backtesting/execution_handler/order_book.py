@@ -0,0 +1,111 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from bisect import insort, bisect_left, bisect_right
+from typing import Dict, List, Tuple
+
+from qf_lib.common.tickers.tickers import Ticker
+
+
+class OrderBook(object):
+    """
+    Keeps the resting orders indexed by ticker and price level. For every ticker the orders are stored in two lists
+    of (trigger price, order id) pairs sorted by the price: the orders triggered when the price falls down to their
+    trigger price (e.g. buy limit orders) and the orders triggered when the price rises up to it (e.g. sell limit
+    orders). Thanks to that only the orders, which trigger prices fall inside the [low, high] range of the current bar,
+    are found, without scanning all resting orders.
+    """
+
+    def __init__(self):
+        self._orders_triggered_by_fall = {}  # type: Dict[Ticker, List[Tuple[float, int]]]
+        self._orders_triggered_by_rise = {}  # type: Dict[Ticker, List[Tuple[float, int]]]
+
+        # mapping: order_id -> (ticker, trigger price, triggered_by_fall)
+        self._orders_levels = {}  # type: Dict[int, Tuple[Ticker, float, bool]]
+
+    def __len__(self):
+        return len(self._orders_levels)
+
+    def add(self, order_id: int, ticker: Ticker, trigger_price: float, triggered_by_fall: bool):
+        """
+        Adds the order to the book.
+
+        Parameters
+        ----------
+        order_id: int
+            id of the order
+        ticker: Ticker
+            ticker of the traded security
+        trigger_price: float
+            price at which the order is triggered
+        triggered_by_fall: bool
+            True if the order is triggered when the price falls down to the trigger price (e.g. buy limit orders),
+            False if it is triggered when the price rises up to it (e.g. sell limit orders)
+        """
+        orders_by_ticker = self._orders_triggered_by_fall if triggered_by_fall else self._orders_triggered_by_rise
+        insort(orders_by_ticker.setdefault(ticker, []), (trigger_price, order_id))
+        self._orders_levels[order_id] = (ticker, trigger_price, triggered_by_fall)
+
+    def remove(self, order_id: int) -> bool:
+        """
+        Removes the order from the book. Returns False if there was no order of the given id in the book.
+        """
+        order_level = self._orders_levels.pop(order_id, None)
+        if order_level is None:
+            return False
+
+        ticker, trigger_price, triggered_by_fall = order_level
+        orders_by_ticker = self._orders_triggered_by_fall if triggered_by_fall else self._orders_triggered_by_rise
+        price_levels = orders_by_ticker[ticker]
+        del price_levels[bisect_left(price_levels, (trigger_price, order_id))]
+        if not price_levels:
+            del orders_by_ticker[ticker]
+
+        return True
+
+    def clear(self):
+        self._orders_triggered_by_fall.clear()
+        self._orders_triggered_by_rise.clear()
+        self._orders_levels.clear()
+
+    def ticker(self, order_id: int) -> Ticker:
+        """
+        Returns the ticker of the order of given id.
+        """
+        return self._orders_levels[order_id][0]
+
+    def tickers(self) -> List[Ticker]:
+        """
+        Returns all tickers, for which there are any orders in the book.
+        """
+        return list(self._orders_triggered_by_fall.keys() | self._orders_triggered_by_rise.keys())
+
+    def triggered_orders_ids(self, ticker: Ticker, low_price: float, high_price: float) -> List[int]:
+        """
+        Returns ids of the orders for the given ticker, which trigger prices fall inside the [low_price, high_price]
+        range: the orders triggered by fall with trigger prices greater or equal to the low price and the orders
+        triggered by rise with trigger prices lower or equal to the high price.
+        """
+        triggered_orders_ids = []
+
+        price_levels = self._orders_triggered_by_fall.get(ticker)
+        if price_levels:
+            first_triggered_index = bisect_left(price_levels, (low_price,))
+            triggered_orders_ids.extend(order_id for _, order_id in price_levels[first_triggered_index:])
+
+        price_levels = self._orders_triggered_by_rise.get(ticker)
+        if price_levels:
+            last_triggered_index = bisect_right(price_levels, (high_price, float("inf")))
+            triggered_orders_ids.extend(order_id for _, order_id in price_levels[:last_triggered_index])
+
+        return triggered_orders_ids
@@ -13,10 +13,11 @@
 #     limitations under the License.
 
 from itertools import count, groupby
-from typing import List, Sequence, Dict
+from typing import List, Sequence, Dict, Optional
 
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.events.time_event.periodic_event.intraday_bar_event import IntradayBarEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.after_market_close_event import AfterMarketCloseEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
@@ -26,6 +27,7 @@ from qf_lib.backtesting.events.time_event.single_time_event.schedule_order_execu
     ScheduleOrderExecutionEvent
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.execution_handler.execution_handler import ExecutionHandler
+from qf_lib.backtesting.execution_handler.limit_orders_executor import LimitOrdersExecutor
 from qf_lib.backtesting.execution_handler.market_on_close_orders_executor import MarketOnCloseOrdersExecutor
 from qf_lib.backtesting.execution_handler.market_on_open_orders_executor import MarketOnOpenOrdersExecutor
 from qf_lib.backtesting.execution_handler.market_orders_executor import MarketOrdersExecutor
@@ -33,7 +35,7 @@ from qf_lib.backtesting.execution_handler.simulated_executor import SimulatedExe
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
 from qf_lib.backtesting.execution_handler.stop_orders_executor import StopOrdersExecutor
 from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
-from qf_lib.backtesting.order.execution_style import StopOrder, MarketOrder, MarketOnCloseOrder
+from qf_lib.backtesting.order.execution_style import StopOrder, MarketOrder, MarketOnCloseOrder, LimitOrder
 from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
@@ -48,14 +50,16 @@ class SimulatedExecutionHandler(ExecutionHandler):
     """
     The simulated execution handler which executes an Order on the open of next bar, unless it is the ExecutionStyle
     is the StopOrder. Then the Order is executed if the Low field for the price is lower then the limit of that Order.
-    StopOrders are executed at the MarketClose (if applicable) with the Low price.
+    StopOrders are executed at the MarketClose (if applicable) with the Low price. LimitOrders are executed at the
+    MarketClose (and on every bar in case of intraday trading) if the price of the bar reached the limit price.
+    If the market_snapshot is provided, the executors read the current bars from it instead of the data handler.
     """
 
     def __init__(self, data_handler: DataHandler, timer: Timer, scheduler: Scheduler, monitor: AbstractMonitor,
                  commission_model: CommissionModel, contracts_to_tickers_mapper: ContractTickerMapper,
                  portfolio: Portfolio, slippage_model: Slippage,
                  scheduling_time_delay: RelativeDelta = RelativeDelta(minutes=1),
-                 frequency: Frequency = Frequency.DAILY) -> None:
+                 frequency: Frequency = Frequency.DAILY, market_snapshot: Optional[MarketSnapshot] = None) -> None:
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
@@ -89,6 +93,10 @@ class SimulatedExecutionHandler(ExecutionHandler):
             contracts_to_tickers_mapper, data_handler, monitor, portfolio,
             timer, order_id_generator, commission_model, slippage_model)
 
+        self._limit_orders_executor = LimitOrdersExecutor(
+            contracts_to_tickers_mapper, data_handler, monitor, portfolio,
+            timer, order_id_generator, commission_model, slippage_model)
+
         self._market_on_close_orders_executor = MarketOnCloseOrdersExecutor(
             contracts_to_tickers_mapper, data_handler, monitor, portfolio,
             timer, order_id_generator, commission_model, slippage_model)
@@ -97,6 +105,11 @@ class SimulatedExecutionHandler(ExecutionHandler):
             contracts_to_tickers_mapper, data_handler, monitor, portfolio,
             timer, order_id_generator, commission_model, slippage_model)
 
+        if market_snapshot is not None:
+            for executor in (self._market_orders_executor, self._stop_orders_executor, self._limit_orders_executor,
+                             self._market_on_close_orders_executor, self._market_on_open_orders_executor):
+                executor.set_market_snapshot(market_snapshot)
+
     def on_after_market_close(self, _: AfterMarketCloseEvent):
         # Update the portfolio and record its state, current assets and positions
         self.portfolio.update(record=True)
@@ -104,6 +117,7 @@ class SimulatedExecutionHandler(ExecutionHandler):
 
     def on_market_close(self, _: MarketCloseEvent):
         self._stop_orders_executor.execute_orders(market_close=True)
+        self._limit_orders_executor.execute_orders(market_close=True)
         self._market_orders_executor.execute_orders(market_close=True)
         self._market_on_close_orders_executor.execute_orders(market_close=True)
 
@@ -114,6 +128,7 @@ class SimulatedExecutionHandler(ExecutionHandler):
     def on_new_bar(self, _: IntradayBarEvent):
         self._market_orders_executor.execute_orders()
         self._stop_orders_executor.execute_orders()
+        self._limit_orders_executor.execute_orders()
 
     def on_orders_accept(self, event: ScheduleOrderExecutionEvent):
         executors_to_orders_dict = event.get_executors_to_orders_dict(self.timer.now())  # type: Dict[SimulatedExecutor, List[Order]]
@@ -144,6 +159,9 @@ class SimulatedExecutionHandler(ExecutionHandler):
             elif order_style_type == StopOrder:
                 partial_order_id_list = self._stop_orders_executor.assign_order_ids(orders_list)
                 scheduled_event_data[self._stop_orders_executor] = orders_list
+            elif order_style_type == LimitOrder:
+                partial_order_id_list = self._limit_orders_executor.assign_order_ids(orders_list)
+                scheduled_event_data[self._limit_orders_executor] = orders_list
             elif order_style_type == MarketOnCloseOrder:
                 partial_order_id_list = self._market_on_close_orders_executor.assign_order_ids(orders_list)
                 scheduled_event_data[self._market_on_close_orders_executor] = orders_list
@@ -168,6 +186,10 @@ class SimulatedExecutionHandler(ExecutionHandler):
         if removed_order is not None:
             return
 
+        removed_order = self._limit_orders_executor.cancel_order(order_id)
+        if removed_order is not None:
+            return
+
         removed_order = self._market_on_close_orders_executor.cancel_order(order_id)
         if removed_order is not None:
             return
@@ -181,6 +203,7 @@ class SimulatedExecutionHandler(ExecutionHandler):
     def get_open_orders(self) -> List[Order]:
         orders = self._market_orders_executor.get_open_orders() \
             + self._stop_orders_executor.get_open_orders() \
+            + self._limit_orders_executor.get_open_orders() \
             + self._market_on_close_orders_executor.get_open_orders() \
             + self._market_on_open_orders_executor.get_open_orders()
         return orders
@@ -188,5 +211,6 @@ class SimulatedExecutionHandler(ExecutionHandler):
     def cancel_all_open_orders(self):
         self._market_orders_executor.cancel_all_open_orders()
         self._stop_orders_executor.cancel_all_open_orders()
+        self._limit_orders_executor.cancel_all_open_orders()
         self._market_on_close_orders_executor.cancel_all_open_orders()
         self._market_on_open_orders_executor.cancel_all_open_orders()
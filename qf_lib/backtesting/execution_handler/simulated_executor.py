@@ -16,14 +16,19 @@ import abc
 from itertools import count
 from typing import List, Sequence, Optional, Dict, Tuple
 
+import numpy as np
+import pandas as pd
+
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.execution_handler.commission_models.commission_model import CommissionModel
 from qf_lib.backtesting.execution_handler.slippage.base import Slippage
 from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
 from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
 from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.timer import Timer
 from qf_lib.common.utils.numberutils.is_finite_number import is_finite_number
@@ -44,6 +49,19 @@ class SimulatedExecutor(metaclass=abc.ABCMeta):
 
         # mappings: order_id -> order
         self._awaiting_orders = {}  # type: Dict[int, Order]
+        # incremented every time the set of awaiting orders changes (lets the executors cache data about the orders)
+        self._awaiting_orders_version = 0
+        # open orders and their tickers, cached for the given version of awaiting orders
+        self._cached_orders_version = None  # type: Optional[int]
+        self._cached_orders_and_tickers = ([], [])  # type: Tuple[List[Order], List[Ticker]]
+
+        self._market_snapshot = None  # type: Optional[MarketSnapshot]
+
+    def set_market_snapshot(self, market_snapshot: Optional[MarketSnapshot]):
+        """
+        Sets the MarketSnapshot, which should be used to read the current bars instead of the data handler.
+        """
+        self._market_snapshot = market_snapshot
 
     @abc.abstractmethod
     def assign_order_ids(self, orders: Sequence[Order]) -> List[int]:
@@ -55,12 +73,14 @@ class SimulatedExecutor(metaclass=abc.ABCMeta):
     def accept_orders(self, orders: Sequence[Order]):
         for order in orders:
             self._awaiting_orders[order.id] = order
+        self._awaiting_orders_version += 1
 
     def cancel_all_open_orders(self):
         """
         Cancels all open orders
         """
         self._awaiting_orders.clear()
+        self._awaiting_orders_version += 1
 
     def cancel_order(self, order_id: int) -> Optional[Order]:
         """
@@ -68,6 +88,8 @@ class SimulatedExecutor(metaclass=abc.ABCMeta):
         of given id.
         """
         cancelled_order = self._awaiting_orders.pop(order_id, None)
+        if cancelled_order is not None:
+            self._awaiting_orders_version += 1
         return cancelled_order
 
     def get_open_orders(self) -> List[Order]:
@@ -80,46 +102,104 @@ class SimulatedExecutor(metaclass=abc.ABCMeta):
         """
         Converts Orders into Transactions. Preserves the dictionary of unexecuted Orders (order_id -> Order)
         """
-        open_orders_list = self.get_open_orders()
-        if not open_orders_list:
+        if not self._awaiting_orders:
             return
 
-        tickers = [self._contracts_to_tickers_mapper.contract_to_ticker(order.contract) for order in open_orders_list]
-
         no_slippage_fill_prices_list, to_be_executed_orders, expired_orders_list = \
-            self._get_orders_with_fill_prices_without_slippage(open_orders_list, tickers, market_open, market_close)
+            self._match_orders(market_open, market_close)
 
         if len(to_be_executed_orders) > 0:
             current_time = self._timer.now()
             fill_prices, fill_volumes = self._slippage_model.apply_slippage(current_time, to_be_executed_orders,
                                                                             no_slippage_fill_prices_list)
 
+            executed_orders = []
+            executed_fill_prices = []
+            executed_fill_volumes = []
             for order, fill_price, fill_volume in zip(to_be_executed_orders, fill_prices, fill_volumes):
                 if fill_volume != 0 and is_finite_number(fill_price):
-                    self._execute_order(order, fill_price, fill_volume)
-                    # Delete the executed orders from awaiting orders dictionary
-                    del self._awaiting_orders[order.id]
+                    executed_orders.append(order)
+                    executed_fill_prices.append(fill_price)
+                    executed_fill_volumes.append(fill_volume)
+
+            if executed_orders:
+                self._execute_orders(executed_orders, executed_fill_prices, executed_fill_volumes)
+                # Delete the executed orders from awaiting orders dictionary
+                self._remove_awaiting_orders([order.id for order in executed_orders])
 
             # If any orders have been executed - update the portfolio
             self._portfolio.update()
 
         # Delete all expired orders
-        for expired_order_id in expired_orders_list:
-            del self._awaiting_orders[expired_order_id]
+        if expired_orders_list:
+            self._remove_awaiting_orders(expired_orders_list)
 
-    def _execute_order(self, order: Order, fill_price: float, fill_volume: int):
+    def _match_orders(self, market_open: bool, market_close: bool) -> Tuple[List[float], List[Order], List[int]]:
         """
-        Simulates execution of a single Order by converting the Order into Transaction.
+        Finds the orders, which should be executed (together with their fill prices without slippage) and the orders,
+        which expire. By default all open orders are checked.
         """
-        timestamp = self._timer.now()
-        contract = order.contract
+        open_orders_list, tickers = self._get_open_orders_and_tickers()
+        return self._get_orders_with_fill_prices_without_slippage(open_orders_list, tickers, market_open, market_close)
+
+    def _remove_awaiting_orders(self, order_ids: Sequence[int]):
+        """
+        Removes the executed or expired orders from the awaiting orders.
+        """
+        for order_id in order_ids:
+            del self._awaiting_orders[order_id]
+        self._awaiting_orders_version += 1
 
-        commission = self._commission_model.calculate_commission(order, fill_price)
+    def _get_open_orders_and_tickers(self) -> Tuple[List[Order], List[Ticker]]:
+        """
+        Returns all open orders together with their tickers. The contracts are mapped onto tickers only after
+        the awaiting orders change, and not on every bar.
+        """
+        if self._cached_orders_version != self._awaiting_orders_version:
+            open_orders_list = self.get_open_orders()
+            tickers = [self._contracts_to_tickers_mapper.contract_to_ticker(order.contract)
+                       for order in open_orders_list]
+            self._cached_orders_and_tickers = (open_orders_list, tickers)
+            self._cached_orders_version = self._awaiting_orders_version
 
-        transaction = Transaction(timestamp, contract, fill_volume, fill_price, commission)
+        return self._cached_orders_and_tickers
 
-        self._monitor.record_transaction(transaction)
-        self._portfolio.transact_transaction(transaction)
+    def _get_current_price_bars(self, tickers: List[Ticker]) -> np.ndarray:
+        """
+        Returns the current Open, High, Low and Close prices of the given (unique) tickers as an array with one row
+        per ticker. The bars, which are not available (contain None values), are filled with NaNs. The Volume is not
+        included, as it is not available for currencies.
+        """
+        # index=tickers, columns=fields
+        if self._market_snapshot is not None:
+            current_bars_df = self._market_snapshot.current_bar(tickers)
+        else:
+            current_bars_df = self._data_handler.get_current_bar(tickers)  # type: pd.DataFrame
+        price_bars = current_bars_df.reindex(
+            index=tickers, columns=[PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close]).values
+
+        if price_bars.dtype == object:
+            is_missing_bar = np.array([None in price_bar for price_bar in price_bars.tolist()], dtype=bool)
+            price_bars = price_bars.astype(float)
+            price_bars[is_missing_bar] = np.nan
+
+        return price_bars
+
+    def _execute_orders(self, orders: Sequence[Order], fill_prices: Sequence[float], fill_volumes: Sequence[int]):
+        """
+        Simulates execution of the Orders by converting them into Transactions, which are then recorded by the monitor
+        and applied to the portfolio (one by one, in the order of the Orders).
+        """
+        timestamp = self._timer.now()
+        transactions = [
+            Transaction(timestamp, order.contract, fill_volume, fill_price,
+                        self._commission_model.calculate_commission(order, fill_price))
+            for order, fill_price, fill_volume in zip(orders, fill_prices, fill_volumes)
+        ]
+
+        for transaction in transactions:
+            self._monitor.record_transaction(transaction)
+            self._portfolio.transact_transaction(transaction)
 
     @abc.abstractmethod
     def _get_orders_with_fill_prices_without_slippage(self, open_orders_list: List[Order], tickers: List[Ticker],
@@ -20,6 +20,7 @@ from itertools import groupby
 from typing import Sequence, Tuple, Optional
 
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
+from qf_lib.backtesting.data_handler.market_snapshot import MarketSnapshot
 from qf_lib.backtesting.order.order import Order
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
@@ -53,6 +54,7 @@ class Slippage(object, metaclass=ABCMeta):
 
         self._contract_ticker_mapper = contract_ticker_mapper
         self._data_provider = data_provider
+        self._market_snapshot = None  # type: Optional[MarketSnapshot]
 
         self._logger = qf_logger.getChild(self.__class__.__name__)
 
@@ -96,6 +98,10 @@ class Slippage(object, metaclass=ABCMeta):
         """Sets the data provider."""
         self._data_provider = data_provider
 
+    def set_market_snapshot(self, market_snapshot: Optional[MarketSnapshot]):
+        """Sets the MarketSnapshot, from which the market statistics (e.g. average daily volume) should be read."""
+        self._market_snapshot = market_snapshot
+
     @abstractmethod
     def _get_fill_prices(self, date: datetime, orders: Sequence[Order], no_slippage_fill_prices: Sequence[float],
                          fill_volumes: Sequence[int]) -> Sequence[float]:
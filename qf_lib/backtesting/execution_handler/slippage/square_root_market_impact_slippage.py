@@ -50,6 +50,9 @@ class SquareRootMarketImpactSlippage(Slippage):
         number from range [0,1] which denotes how big (volume-wise) the Order can be i.e. if it's 0.5 and a daily
         volume for a given asset is 1,000,000 USD, then max volume of the Order can be 500,000 USD. If not provided, no
         volume checks are performed.
+
+    If the MarketSnapshot is set (see set_market_snapshot), the volatility and the average daily volume are read
+    from it.
     """
     def __init__(self, price_impact: float, data_provider: DataProvider, contract_ticker_mapper: ContractTickerMapper,
                  max_volume_share_limit: Optional[float] = None):
@@ -76,18 +79,23 @@ class SquareRootMarketImpactSlippage(Slippage):
         Market Impact is positive for buys and negative for sells.
         MI = +/- price_impact * volatility * sqrt (fill volume / average daily volume)
         """
-        start_date = date - RelativeDelta(days=60)
-        end_date = date - RelativeDelta(days=1)
-
-        # Download close price and volume values
-        data_array = self._data_provider.get_price(tickers, [PriceField.Close, PriceField.Volume],
-                                                   start_date, end_date, Frequency.DAILY)
-
-        close_prices = data_array.loc[:, tickers, PriceField.Close].to_pandas()
-        volumes = data_array.loc[:, tickers, PriceField.Volume].to_pandas()
-        close_prices_volatility = close_prices.apply(self._compute_volatility).values
-
-        average_volumes = volumes.apply(self._compute_average_volume).values
+        if self._market_snapshot is not None:
+            # The statistics are computed once per day and shared with other components
+            close_prices_volatility = self._market_snapshot.volatility(tickers)
+            average_volumes = self._market_snapshot.average_daily_volume(tickers)
+        else:
+            start_date = date - RelativeDelta(days=60)
+            end_date = date - RelativeDelta(days=1)
+
+            # Download close price and volume values
+            data_array = self._data_provider.get_price(tickers, [PriceField.Close, PriceField.Volume],
+                                                       start_date, end_date, Frequency.DAILY)
+
+            close_prices = data_array.loc[:, tickers, PriceField.Close].to_pandas()
+            volumes = data_array.loc[:, tickers, PriceField.Volume].to_pandas()
+            close_prices_volatility = close_prices.apply(self._compute_volatility).values
+
+            average_volumes = volumes.apply(self._compute_average_volume).values
 
         abs_fill_volumes = np.abs(fill_volumes)
         volatility_volume_ratio = np.divide(abs_fill_volumes, average_volumes)
@@ -13,9 +13,9 @@
 #     limitations under the License.
 
 from itertools import count
-from typing import List, Sequence
+from typing import List, Sequence, Dict, Optional
 
-import pandas as pd
+import numpy as np
 
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
@@ -27,7 +27,7 @@ from qf_lib.backtesting.order.execution_style import StopOrder
 from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.portfolio.portfolio import Portfolio
-from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.timer import Timer
 
 
@@ -40,6 +40,15 @@ class StopOrdersExecutor(SimulatedExecutor):
         super().__init__(contracts_to_tickers_mapper, data_handler, monitor, portfolio, timer,
                          order_id_generator, commission_model, slippage_model)
 
+        # parallel arrays describing the open orders (see _update_orders_arrays)
+        self._orders_arrays_version = None  # type: Optional[int]
+        self._orders = []  # type: List[Order]
+        self._unique_tickers = []  # type: List[Ticker]
+        self._ticker_indices = np.empty(0, dtype=int)
+        self._quantities = np.empty(0)
+        self._stop_prices = np.empty(0)
+        self._expires = np.empty(0, dtype=bool)
+
     def assign_order_ids(self, orders: Sequence[Order]) -> List[int]:
         tickers = [self._contracts_to_tickers_mapper.contract_to_ticker(order.contract) for order in orders]
 
@@ -78,72 +87,61 @@ class StopOrdersExecutor(SimulatedExecutor):
         return order_id_list
 
     def _get_orders_with_fill_prices_without_slippage(self, open_orders_list, tickers, market_open, market_close):
-        no_slippage_fill_prices_list = []
-        to_be_executed_orders = []
-        expired_stop_orders = []  # type: List[int]
+        self._update_orders_arrays(open_orders_list, tickers)
+
+        price_bars = self._get_current_price_bars(self._unique_tickers)
+        no_slippage_fill_prices = self._calculate_no_slippage_fill_prices(price_bars)
+        is_executed = ~np.isnan(no_slippage_fill_prices)
 
-        unique_tickers = list(set(tickers))
-        # index=tickers, columns=fields
-        current_bars_df = self._data_handler.get_current_bar(unique_tickers)
-        # type: pd.DataFrame
+        to_be_executed_orders = [self._orders[index] for index in np.flatnonzero(is_executed)]
+        no_slippage_fill_prices_list = no_slippage_fill_prices[is_executed].tolist()
 
         # Check at first if at this moment of time, expiry checks should be made or not (optimization reasons)
+        expired_stop_orders = []  # type: List[int]
         if market_close:
-            for order, ticker in zip(open_orders_list, tickers):
-                current_bar = current_bars_df.loc[ticker, :]
-                no_slippage_fill_price = self._calculate_no_slippage_fill_price(current_bar, order)
-
-                if no_slippage_fill_price is not None:
-                    to_be_executed_orders.append(order)
-                    no_slippage_fill_prices_list.append(no_slippage_fill_price)
-                else:
-                    # the Order cannot be executed
-                    if self._order_expires(order):
-                        expired_stop_orders.append(order.id)
-        else:
-            for order, ticker in zip(open_orders_list, tickers):
-                current_bar = current_bars_df.loc[ticker, :]
-                no_slippage_fill_price = self._calculate_no_slippage_fill_price(current_bar, order)
-
-                if no_slippage_fill_price is not None:
-                    to_be_executed_orders.append(order)
-                    no_slippage_fill_prices_list.append(no_slippage_fill_price)
+            expired_stop_orders = [self._orders[index].id for index in np.flatnonzero(~is_executed & self._expires)]
 
         return no_slippage_fill_prices_list, to_be_executed_orders, expired_stop_orders
 
-    def _calculate_no_slippage_fill_price(self, current_bar, order):
+    def _update_orders_arrays(self, open_orders_list: List[Order], tickers: List[Ticker]):
         """
-        Returns the price which should be used for calculating the real fill price later on. It can return either:
-        OPEN or stop price. If the market opens at the price which triggers StopOrders instantly, the OPEN price
-        is returned. Otherwise if the LOW price (for Sell Stop) or HIGH price (for Buy Stop) exceeds the stop price,
-        the stop price is returned. If none of the above conditions is met, None is returned (which means that
-        StopOrder shouldn't be executed at any price).
+        Stores the open orders in parallel arrays (ticker index, quantity, stop price, expiry), which are used to match
+        all the orders against the current bars at once. The arrays are rebuilt only if the open orders changed.
         """
-        # Make sure that at least all values except Volume are available. Volume is not available for currencies.
-        price_bar = tuple(current_bar.loc[[PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close]])
-        if None in price_bar:
-            return None
+        if self._orders_arrays_version == self._awaiting_orders_version:
+            return
 
-        open_price, high_price, low_price, close_price = price_bar
+        ticker_to_index = {}  # type: Dict[Ticker, int]
+        ticker_indices = [ticker_to_index.setdefault(ticker, len(ticker_to_index)) for ticker in tickers]
 
-        stop_price = order.execution_style.stop_price
-        is_sell_stop = order.quantity < 0
-        no_slippage_fill_price = None
+        self._orders = open_orders_list
+        self._unique_tickers = list(ticker_to_index.keys())
+        self._ticker_indices = np.array(ticker_indices, dtype=int)
+        self._quantities = np.array([order.quantity for order in open_orders_list], dtype=float)
+        self._stop_prices = np.array([order.execution_style.stop_price for order in open_orders_list], dtype=float)
+        self._expires = np.array([self._order_expires(order) for order in open_orders_list], dtype=bool)
+        self._orders_arrays_version = self._awaiting_orders_version
 
-        if is_sell_stop:
-            if open_price <= stop_price:
-                no_slippage_fill_price = open_price
-            else:
-                if low_price <= stop_price:
-                    no_slippage_fill_price = stop_price
-        else:  # is buy stop
-            if open_price >= stop_price:
-                no_slippage_fill_price = open_price
-            else:
-                if high_price >= stop_price:
-                    no_slippage_fill_price = stop_price
-
-        return no_slippage_fill_price
+    def _calculate_no_slippage_fill_prices(self, price_bars: np.ndarray) -> np.ndarray:
+        """
+        Returns the prices which should be used for calculating the real fill prices of all open orders later on.
+        Each of them can be either: OPEN or stop price. If the market opens at the price which triggers StopOrder
+        instantly, the OPEN price is returned. Otherwise if the LOW price (for Sell Stop) or HIGH price (for Buy Stop)
+        exceeds the stop price, the stop price is returned. If none of the above conditions is met, NaN is returned
+        (which means that StopOrder shouldn't be executed at any price).
+        """
+        price_bars = price_bars[self._ticker_indices]
+        open_prices, high_prices, low_prices = price_bars[:, 0], price_bars[:, 1], price_bars[:, 2]
+        stop_prices = self._stop_prices
+        is_sell_stop = self._quantities < 0
+
+        with np.errstate(invalid="ignore"):
+            triggered_at_open = np.where(is_sell_stop, open_prices <= stop_prices, open_prices >= stop_prices)
+            triggered_during_bar = np.where(is_sell_stop, low_prices <= stop_prices, high_prices >= stop_prices)
+
+        no_slippage_fill_prices = np.where(triggered_at_open, open_prices,
+                                           np.where(triggered_during_bar, stop_prices, np.nan))
+        return no_slippage_fill_prices
 
     def _check_order_validity(self, order):
         assert order.time_in_force == TimeInForce.DAY or order.time_in_force == TimeInForce.GTC, \
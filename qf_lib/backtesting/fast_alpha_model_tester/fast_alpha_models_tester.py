@@ -12,8 +12,13 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 from itertools import count
+from tempfile import TemporaryDirectory
 from time import time
 from typing import Sequence, Tuple, Type
 
@@ -35,6 +40,7 @@ from qf_lib.containers.dataframe.cast_dataframe import cast_dataframe
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
 from qf_lib.containers.dimension_names import TICKERS
+from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.portfolio_construction.portfolio_models.portfolio import Portfolio
 
 
@@ -42,11 +48,18 @@ class FastAlphaModelTester(object):
     """
     ModelTester in which portfolio construction is simulated by always following the suggested Exposures from
     AlphaModels. All Tickers are traded with same weights (weights are constant across time).
+
+    If num_of_workers is greater than 1, the parameter sets are tested in parallel by a pool of processes. The prices
+    loaded for the backtest are shared with the worker processes through a memory-mapped file and the alpha model
+    factory (together with its DataHandler) and the timer are stored in a file, which is loaded only once by every
+    worker process. Thus only the parameter sets are sent to the workers with every task. The results are the same
+    as in the serial mode.
     """
 
     def __init__(self, model_type: Type[AlphaModel], parameter_sets: Sequence[Tuple],
                  tickers: Sequence[Ticker], start_date: datetime, end_date: datetime,
-                 data_handler: FastDataHandler, timer: SettableTimer, alpha_model_factory: AlphaModelFactory):
+                 data_handler: FastDataHandler, timer: SettableTimer, alpha_model_factory: AlphaModelFactory,
+                 num_of_workers: int = 1):
         self._tickers = tickers
         self._start_date = start_date
         self._end_date = end_date
@@ -56,9 +69,10 @@ class FastAlphaModelTester(object):
         self._data_handler = data_handler
         self._timer = timer
         self._alpha_model_factory = alpha_model_factory
+        self._num_of_workers = num_of_workers
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
-        if type(self._data_handler) is not FastDataHandler:
+        if self._data_handler is not None and type(self._data_handler) is not FastDataHandler:
             self.logger.warning("You are using a deprecated type of DataHandler. In FastAlphaModelsTester "
                                 "use of FastDataHandler is suggested.")
 
@@ -67,12 +81,16 @@ class FastAlphaModelTester(object):
         print("{} parameters sets to be tested".format(nr_of_param_sets))
         prices_data_array = self._get_data_for_backtest()
 
-        backtest_dates = prices_data_array.dates.to_index()
+        if self._num_of_workers > 1:
+            backtest_summary_elem_list = self._test_params_sets_in_parallel(prices_data_array, nr_of_param_sets)
+        else:
+            backtest_dates = prices_data_array.dates.to_index()
+
+            exposure_values_df_list = self._generate_exposures_for_all_params_sets(
+                self._alpha_model_factory, backtest_dates, nr_of_param_sets, prices_data_array)
+            backtest_summary_elem_list = self._calculate_backtest_summary_elements(
+                exposure_values_df_list, nr_of_param_sets, prices_data_array)
 
-        exposure_values_df_list = self._generate_exposures_for_all_params_sets(
-            self._alpha_model_factory, backtest_dates, nr_of_param_sets)
-        backtest_summary_elem_list = self._calculate_backtest_summary_elements(
-            exposure_values_df_list, nr_of_param_sets, prices_data_array)
         backtest_summary = BacktestSummary(
             self._tickers, self._model_type, backtest_summary_elem_list, self._start_date, self._end_date)
         return backtest_summary
@@ -83,7 +101,48 @@ class FastAlphaModelTester(object):
             self._tickers, PriceField.ohlcv(), self._start_date, self._end_date)
         return prices_data_array
 
-    def _generate_exposures_for_all_params_sets(self, alpha_model_factory, backtest_dates, nr_of_param_sets):
+    def _test_params_sets_in_parallel(self, prices_data_array, nr_of_param_sets):
+        print("Generating exposures and backtest summaries ({} workers):".format(self._num_of_workers))
+        backtest_summary_elem_list = []
+
+        with TemporaryDirectory() as temp_dir:
+            prices_file_path = os.path.join(temp_dir, "prices.dat")
+            prices_memmap = np.memmap(prices_file_path, dtype=np.float64, mode='w+', shape=prices_data_array.shape)
+            prices_memmap[:] = prices_data_array.values
+            prices_memmap.flush()
+            del prices_memmap
+
+            # the arguments needed to recreate the tester are loaded from the file once by every worker process,
+            # so that the alpha model factory (and its DataHandler) is not sent together with every parameter set
+            worker_args_file_path = os.path.join(temp_dir, "worker_args.pickle")
+            with open(worker_args_file_path, "wb") as worker_args_file:
+                pickle.dump((self._model_type, self._alpha_model_factory, self._timer, self._tickers,
+                             self._start_date, self._end_date, prices_data_array.dates.to_index(),
+                             prices_data_array.tickers.values, prices_data_array.fields.values), worker_args_file)
+            test_param_set = partial(_test_param_set, prices_file_path, worker_args_file_path)
+
+            # parameter sets are sent to the workers in chunks to limit the number of round trips between processes
+            chunksize = max(1, nr_of_param_sets // (4 * self._num_of_workers))
+
+            with ProcessPoolExecutor(max_workers=self._num_of_workers) as executor:
+                # map keeps the order of parameter sets
+                for param_set_ctr, backtest_summary_elem in enumerate(
+                        executor.map(test_param_set, self._parameter_sets, chunksize=chunksize), start=1):
+                    backtest_summary_elem_list.append(backtest_summary_elem)
+                    print("{} / {} parameters sets tested".format(param_set_ctr, nr_of_param_sets))
+
+        return backtest_summary_elem_list
+
+    def _test_param_set(self, param_set, prices_data_array, open_to_open_returns_df):
+        model = self._alpha_model_factory.make_model(self._model_type, *param_set)
+        backtest_dates = prices_data_array.dates.to_index()
+        exposure_values_df = self._generate_exposures(model, backtest_dates, prices_data_array)
+
+        return self._calculate_backtest_summary(
+            param_set, prices_data_array, open_to_open_returns_df, exposure_values_df)
+
+    def _generate_exposures_for_all_params_sets(self, alpha_model_factory, backtest_dates, nr_of_param_sets,
+                                                prices_data_array):
         exposure_values_df_list = []
         print("Generating exposures:")
         param_set_ctr = 1
@@ -91,7 +150,7 @@ class FastAlphaModelTester(object):
         for param_set in self._parameter_sets:
             start_time = time()
             model = alpha_model_factory.make_model(self._model_type, *param_set)
-            exposure_values_df = self._generate_exposure_values(model, backtest_dates)
+            exposure_values_df = self._generate_exposures(model, backtest_dates, prices_data_array)
             exposure_values_df_list.append(exposure_values_df)
             end_time = time()
 
@@ -134,6 +193,34 @@ class FastAlphaModelTester(object):
 
         return backtest_summary
 
+    def _generate_exposures(self, model: AlphaModel, backtest_dates, prices_data_array):
+        if model.implements_exposures_matrix():
+            return self._generate_exposure_values_matrix(model, backtest_dates, prices_data_array)
+        else:
+            return self._generate_exposure_values(model, backtest_dates)
+
+    def _generate_exposure_values_matrix(self, model: AlphaModel, backtest_dates, prices_data_array):
+        """
+        Generates the exposures for all the dates and tickers using a single call to the vectorized
+        calculate_exposures_matrix method of the model. Missing dates and tickers are logged and left without
+        the exposures (NaN).
+        """
+        exposure_values_df = model.calculate_exposures_matrix(self._tickers, prices_data_array)
+
+        missing_dates = backtest_dates.difference(exposure_values_df.index)
+        missing_tickers = [ticker for ticker in self._tickers if ticker not in exposure_values_df.columns]
+        if len(missing_dates) > 0 or len(missing_tickers) > 0:
+            self.logger.warning("{} returned no exposures for {} of {} dates and for the tickers: {}".format(
+                model, len(missing_dates), len(backtest_dates), missing_tickers))
+
+        exposure_values_df = DataFrame(
+            data=exposure_values_df.reindex(index=backtest_dates, columns=self._tickers).values.astype(np.float64),
+            index=backtest_dates,
+            columns=pd.Index(self._tickers, name=TICKERS)
+        )
+
+        return exposure_values_df
+
     def _generate_exposure_values(self, model: AlphaModel, backtest_dates):
         current_exposures_values = pd.Series(index=pd.Index(self._tickers, name=TICKERS))
         current_exposures_values[:] = 0.0
@@ -291,6 +378,35 @@ class FastAlphaModelTester(object):
         return historical_data
 
 
+# state of the worker processes used by FastAlphaModelTester in the parallel mode (path of the prices file, tester,
+# prices and open to open returns), created lazily by the first task run by the worker
+_worker_state = None  # type: Tuple[str, FastAlphaModelTester, QFDataArray, SimpleReturnsDataFrame]
+
+
+def _get_worker_state(prices_file_path: str, worker_args_file_path: str):
+    global _worker_state
+
+    if _worker_state is None or _worker_state[0] != prices_file_path:
+        with open(worker_args_file_path, "rb") as worker_args_file:
+            model_type, alpha_model_factory, timer, tickers, start_date, end_date, dates, prices_tickers, fields = \
+                pickle.load(worker_args_file)
+
+        prices_values = np.memmap(prices_file_path, dtype=np.float64, mode='r',
+                                  shape=(len(dates), len(prices_tickers), len(fields)))
+        prices_data_array = QFDataArray.create(dates, prices_tickers, fields, prices_values)
+
+        tester = FastAlphaModelTester(model_type, (), tickers, start_date, end_date, None, timer, alpha_model_factory)
+        open_to_open_returns_df = tester._get_open_prices(prices_data_array).to_simple_returns()
+        _worker_state = prices_file_path, tester, prices_data_array, open_to_open_returns_df
+
+    return _worker_state[1:]
+
+
+def _test_param_set(prices_file_path: str, worker_args_file_path: str, param_set) -> BacktestSummaryElement:
+    tester, prices_data_array, open_to_open_returns_df = _get_worker_state(prices_file_path, worker_args_file_path)
+    return tester._test_param_set(param_set, prices_data_array, open_to_open_returns_df)
+
+
 class _TradeData(object):
     def __init__(self):
         self.ticker = None
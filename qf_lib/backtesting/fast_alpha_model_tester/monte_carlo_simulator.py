@@ -0,0 +1,144 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from typing import Sequence, Optional
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.containers.series.simple_returns_series import SimpleReturnsSeries
+
+
+class MonteCarloSimulationResults(object):
+    """
+    Statistics of all scenarios simulated by the MonteCarloSimulator.
+
+    Parameters
+    ----------
+    total_returns: SimpleReturnsSeries
+        total return of each of the scenarios (indexed by the scenario number)
+    max_drawdowns: QFSeries
+        maximal drawdown of each of the scenarios, expressed as the percentage value (e.g. 0.5 corresponds
+        to the 50% drawdown)
+    breach_probabilities: QFSeries
+        indexed by the thresholds; contains the fraction of scenarios, in which the value of the equity curve dropped
+        at some point of time to or below (1 - threshold) * initial value
+    paths: PricesDataFrame
+        equity curves (starting at 1.0) of the first scenarios, one scenario in each column
+    """
+
+    def __init__(self, total_returns: SimpleReturnsSeries, max_drawdowns: QFSeries, breach_probabilities: QFSeries,
+                 paths: PricesDataFrame):
+        self.total_returns = total_returns
+        self.max_drawdowns = max_drawdowns
+        self.breach_probabilities = breach_probabilities
+        self.paths = paths
+
+    @property
+    def num_of_scenarios(self) -> int:
+        return len(self.total_returns)
+
+
+class MonteCarloSimulator(object):
+    """
+    Simulates scenarios of Trades (the same way as the ScenariosGenerator does, by randomly choosing returns with
+    replacement from the original sequence of Trade's returns), but instead of building a DataFrame of all scenarios
+    computes the equity curves, their running maxima, drawdowns and threshold breaches with numpy, in chunks
+    of scenarios. Thus the memory usage depends only on the chunk size and not on the number of scenarios, while
+    the results (for the same seed) do not depend on the chunk size.
+
+    Parameters
+    ----------
+    seed: int
+        seed of the random number generator. If provided, the results of the simulation are reproducible
+    chunk_size: int
+        maximal number of scenarios simulated at once
+    """
+
+    def __init__(self, seed: Optional[int] = None, chunk_size: int = 10000):
+        assert chunk_size > 0, "chunk_size must be positive"
+        self._random_state = np.random.RandomState(seed)
+        self._chunk_size = chunk_size
+
+    def simulate(self, trade_rets: Sequence[float], scenarios_length: int = 100, num_of_scenarios: int = 10000,
+                 thresholds: Sequence[float] = (), num_of_paths: int = 0) -> MonteCarloSimulationResults:
+        """
+        Simulates the given number of scenarios and computes their statistics.
+
+        Parameters
+        ----------
+        trade_rets: Sequence[float]
+            sequence of floats which represent the returns on Trades performed by some investment strategy
+        scenarios_length: int
+            number of Trades which should simulated for each scenario
+        num_of_scenarios: int
+            number of scenarios which should be generated
+        thresholds: Sequence[float]
+            fractions of the initial value (e.g. 0.1 for 10%), for which the chances of dropping below
+            should be computed
+        num_of_paths: int
+            number of scenarios, whose whole equity curves should be returned (e.g. in order to plot them)
+
+        Returns
+        -------
+        MonteCarloSimulationResults
+            statistics of the simulated scenarios
+        """
+        trade_rets = np.asarray(trade_rets, dtype=np.float64)
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        num_of_paths = min(num_of_paths, num_of_scenarios)
+
+        total_returns = np.empty(num_of_scenarios)
+        max_drawdowns = np.empty(num_of_scenarios)
+        breaches_count = np.zeros(len(thresholds), dtype=np.int64)
+        paths = np.ones((scenarios_length + 1, num_of_paths))
+
+        for chunk_start in range(0, num_of_scenarios, self._chunk_size):
+            chunk_end = min(chunk_start + self._chunk_size, num_of_scenarios)
+            chunk_paths = self._simulate_paths(trade_rets, scenarios_length, chunk_end - chunk_start)
+
+            total_returns[chunk_start:chunk_end] = chunk_paths[-1] - 1.0
+
+            running_max = np.maximum.accumulate(chunk_paths, axis=0)
+            max_drawdowns[chunk_start:chunk_end] = (1.0 - chunk_paths / running_max).max(axis=0)
+
+            min_values = chunk_paths.min(axis=0)
+            breaches_count += (min_values[np.newaxis, :] <= 1.0 - thresholds[:, np.newaxis]).sum(axis=1)
+
+            if chunk_start < num_of_paths:
+                paths_end = min(chunk_end, num_of_paths)
+                paths[:, chunk_start:paths_end] = chunk_paths[:, :paths_end - chunk_start]
+
+        breach_probabilities = breaches_count / num_of_scenarios if num_of_scenarios > 0 else \
+            np.full(len(thresholds), np.nan)
+
+        return MonteCarloSimulationResults(
+            total_returns=SimpleReturnsSeries(total_returns),
+            max_drawdowns=QFSeries(max_drawdowns),
+            breach_probabilities=QFSeries(breach_probabilities, index=pd.Index(thresholds)),
+            paths=PricesDataFrame(paths, index=pd.RangeIndex(-1, scenarios_length))
+        )
+
+    def _simulate_paths(self, trade_rets: np.ndarray, scenarios_length: int, num_of_scenarios: int) -> np.ndarray:
+        """
+        Returns the array of (scenarios_length + 1) x num_of_scenarios values of the equity curves, each of them
+        starting at 1.0. The returns are drawn scenario by scenario, so the results do not depend on the chunk size.
+        """
+        returns_indices = self._random_state.randint(0, len(trade_rets), (num_of_scenarios, scenarios_length)).T
+        paths = np.empty((scenarios_length + 1, num_of_scenarios))
+        paths[0] = 1.0
+        np.cumprod(1.0 + trade_rets[returns_indices], axis=0, out=paths[1:])
+        return paths
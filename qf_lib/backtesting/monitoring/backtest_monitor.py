@@ -17,6 +17,7 @@ import traceback
 from datetime import datetime
 from io import TextIOWrapper
 from os import path, makedirs
+from typing import List
 
 import matplotlib.pyplot as plt
 
@@ -41,10 +42,24 @@ class BacktestMonitor(AbstractMonitor):
     This Monitor will be used to monitor backtest run from the script.
     It will display the portfolio value as the backtest progresses and generate a PDF at the end.
     It is not suitable for the Web application
+
+    Parameters
+    ----------
+    backtest_result: BacktestResult
+        result of the monitored backtest
+    settings: Settings
+        settings of the project
+    pdf_exporter: PDFExporter
+        exporter used to save the PDF documents
+    excel_exporter: ExcelExporter
+        exporter used to save the portfolio timeseries
+    transactions_buffer_size: int
+        number of transactions, which are buffered in memory and written to the CSV trade log at once
+        (by default each transaction is written when it is recorded)
     """
 
     def __init__(self, backtest_result: BacktestResult, settings: Settings,
-                 pdf_exporter: PDFExporter, excel_exporter: ExcelExporter):
+                 pdf_exporter: PDFExporter, excel_exporter: ExcelExporter, transactions_buffer_size: int = 1):
 
         self.backtest_result = backtest_result
         self.logger = qf_logger.getChild(self.__class__.__name__)
@@ -74,6 +89,8 @@ class BacktestMonitor(AbstractMonitor):
 
         self._csv_file = self._init_csv_file()
         self._csv_writer = csv.writer(self._csv_file)
+        self._transactions_buffer_size = transactions_buffer_size
+        self._transactions_buffer = []  # type: List[List]
 
     def set_benchmark(self, benchmark: QFSeries):
         self.benchmark_tms = benchmark
@@ -135,6 +152,7 @@ class BacktestMonitor(AbstractMonitor):
 
     def _close_csv_file(self):
         if self._csv_file is not None:  # close the csv file
+            self._flush_transactions_buffer()
             self._csv_file.close()
 
     def end_of_day_update(self, timestamp: datetime = None):
@@ -193,12 +211,20 @@ class BacktestMonitor(AbstractMonitor):
 
     def _save_trade_to_file(self, transaction: Transaction):
         """
-        Append all details about the Transaction to the CSV trade log.
+        Append all details about the Transaction to the CSV trade log. The transactions are buffered and written to
+        the file in batches of transactions_buffer_size.
         """
-        self._csv_writer.writerow([
+        self._transactions_buffer.append([
             transaction.time,
             transaction.contract.symbol,
             transaction.quantity,
             transaction.price,
             transaction.commission
         ])
+
+        if len(self._transactions_buffer) >= self._transactions_buffer_size:
+            self._flush_transactions_buffer()
+
+    def _flush_transactions_buffer(self):
+        self._csv_writer.writerows(self._transactions_buffer)
+        self._transactions_buffer = []
@@ -32,8 +32,8 @@ class LightBacktestMonitor(BacktestMonitor):
     """
 
     def __init__(self, backtest_result: BacktestResult, settings: Settings,
-                 pdf_exporter: PDFExporter, excel_exporter: ExcelExporter):
-        super().__init__(backtest_result, settings, pdf_exporter, excel_exporter)
+                 pdf_exporter: PDFExporter, excel_exporter: ExcelExporter, transactions_buffer_size: int = 1):
+        super().__init__(backtest_result, settings, pdf_exporter, excel_exporter, transactions_buffer_size)
 
         self._nr_of_days = 20
         self._ctr = 0
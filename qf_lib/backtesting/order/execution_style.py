@@ -44,3 +44,20 @@ class StopOrder(ExecutionStyle):
             return False
 
         return self.stop_price == other.stop_price
+
+
+class LimitOrder(ExecutionStyle):
+    def __init__(self, limit_price: float):
+        self.limit_price = limit_price
+
+    def __str__(self):
+        return "{} - limit price: {}".format(self.__class__.__name__, self.limit_price)
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+
+        if not isinstance(other, LimitOrder):
+            return False
+
+        return self.limit_price == other.limit_price
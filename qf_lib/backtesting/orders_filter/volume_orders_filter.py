@@ -37,13 +37,20 @@ class VolumeOrdersFilter(OrdersFilter):
         used to download the volume data
     volume_percentage_limit: float
         defines the maximum percentage of the volume value, that the orders size should not exceed
+    use_market_snapshot: bool
+        if True, the average daily volume computed by the MarketSnapshot of the data handler (see
+        DataHandler.use_market_snapshot) is used instead of the average volume of the last 5 days
     """
 
     def __init__(self, data_handler: DataHandler, contract_ticker_mapper: ContractTickerMapper,
-                 volume_percentage_limit: float):
+                 volume_percentage_limit: float, use_market_snapshot: bool = False):
         super().__init__(data_handler, contract_ticker_mapper)
         self._volume_percentage_limit = volume_percentage_limit
 
+        if use_market_snapshot:
+            assert data_handler.market_snapshot is not None, "The MarketSnapshot of the data handler is not created"
+        self._use_market_snapshot = use_market_snapshot
+
     def adjust_orders(self, orders: List[Order]) -> List[Order]:
         """ Takes list of orders and based on them creates a new list with orders, whose size does not to exceed the
         given volume limits. The Orders are changed in place.
@@ -59,13 +66,14 @@ class VolumeOrdersFilter(OrdersFilter):
             list of orders, that do not exceed the given volume percentage limit
         """
         tickers = [self._contract_ticker_mapper.contract_to_ticker(order.contract) for order in orders]
-        start_time = self._data_handler.timer.now() - RelativeDelta(days=5)
-        volume_df = self._data_handler.get_price(tickers, PriceField.Volume, start_time)
+        past_volumes = dict(zip(tickers, self._average_past_volumes(tickers)))
 
         # The stop orders will be adjusted only along with corresponding market orders
         stop_orders_dict = {order.contract: order for order in orders if isinstance(order.execution_style, StopOrder)}
-        adjusted_orders_tuples = [self._adjust_quantity(order, stop_orders_dict.get(order.contract, None), volume_df)
-                                  for order in orders if not isinstance(order.execution_style, StopOrder)]
+        adjusted_orders_tuples = [
+            self._adjust_quantity(order, stop_orders_dict.get(order.contract, None), past_volumes[ticker])
+            for order, ticker in zip(orders, tickers) if not isinstance(order.execution_style, StopOrder)
+        ]
 
         # Flatten the list of orders tuples
         adjusted_orders = [order for orders_tuple in adjusted_orders_tuples
@@ -73,10 +81,13 @@ class VolumeOrdersFilter(OrdersFilter):
 
         return adjusted_orders
 
-    def _adjust_quantity(self, order: Order, stop_order: Optional[Order], volume_df: QFDataFrame) -> \
-            Tuple[Order, Order]:
-        """Returns order with adjusted quantity if applicable."""
-        ticker = self._contract_ticker_mapper.contract_to_ticker(order.contract)
+    def _average_past_volumes(self, tickers: List[Ticker]) -> List[float]:
+        """Returns the average past volume of each of the tickers."""
+        if self._use_market_snapshot:
+            return self._data_handler.market_snapshot.average_daily_volume(tickers).tolist()
+
+        start_time = self._data_handler.timer.now() - RelativeDelta(days=5)
+        volume_df = self._data_handler.get_price(tickers, PriceField.Volume, start_time)  # type: QFDataFrame
 
         def average_past_volume(ticker: Ticker) -> Optional[float]:
             volume_series = volume_df[ticker]
@@ -84,8 +95,11 @@ class VolumeOrdersFilter(OrdersFilter):
             volume_series = volume_series[volume_series >= 0]
             return volume_series.mean()
 
-        past_volume = average_past_volume(ticker)
+        return [average_past_volume(ticker) for ticker in tickers]
 
+    def _adjust_quantity(self, order: Order, stop_order: Optional[Order], past_volume: Optional[float]) -> \
+            Tuple[Order, Order]:
+        """Returns order with adjusted quantity if applicable."""
         if is_finite_number(past_volume):
             volume_limit: int = math.floor(past_volume * self._volume_percentage_limit)
 
@@ -38,8 +38,11 @@ class BacktestPosition(Position, metaclass=ABCMeta):
         """ Number of shares or contracts held currently in the portfolio. Positive value means this is a Long position
         Negative value corresponds to a Short position"""
 
-        self.current_price = 0.0  # type: float
-        """ Current price of the asset used for market value calculation. Includes the Bid-Ask spread"""
+        self._current_price = 0.0  # type: float
+
+        self._position_book = None
+        """ PositionBook, which stores the current price of the position (if the position was added to any book) """
+        self._slot = None  # type: int
 
         self.direction = 0  # type: int
         """ Direction of the position: Long = 1, Short = -1, Not defined = 0"""
@@ -50,6 +53,20 @@ class BacktestPosition(Position, metaclass=ABCMeta):
         self._remaining_total_commission_to_build_position = 0.0  # type: float
         self._avg_price_per_unit = 0.0
 
+    @property
+    def current_price(self) -> float:
+        """ Current price of the asset used for market value calculation. Includes the Bid-Ask spread"""
+        if self._position_book is None:
+            return self._current_price
+        return self._position_book.current_prices[self._slot].item()
+
+    @current_price.setter
+    def current_price(self, current_price: float):
+        if self._position_book is None:
+            self._current_price = current_price
+        else:
+            self._position_book.current_prices[self._slot] = current_price
+
     @property
     def unrealised_pnl(self) -> float:
         """
@@ -226,3 +243,17 @@ class BacktestPositionSummary:
         self.market_values = backtest_position.market_value()
         self.unrealised_pnl = backtest_position.unrealised_pnl
         self.direction = backtest_position.direction
+        self.quantity = backtest_position.quantity()
+
+    @classmethod
+    def from_values(cls, contract: Contract, total_exposure: float, market_value: float, unrealised_pnl: float,
+                    direction: int, quantity: float) -> "BacktestPositionSummary":
+        """ Creates the summary of a position out of the already computed values. """
+        summary = cls.__new__(cls)
+        summary.contract = contract
+        summary.total_exposure = total_exposure
+        summary.market_values = market_value
+        summary.unrealised_pnl = unrealised_pnl
+        summary.direction = direction
+        summary.quantity = quantity
+        return summary
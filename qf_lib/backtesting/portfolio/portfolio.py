@@ -14,18 +14,22 @@
 
 import copy
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
 
 import numpy as np
+import pandas as pd
 from numpy import sign
 
 from qf_lib.backtesting.contract.contract import Contract
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition, BacktestPositionSummary
+from qf_lib.backtesting.portfolio.position_book import PositionBook
 from qf_lib.backtesting.portfolio.position_factory import BacktestPositionFactory
+from qf_lib.backtesting.portfolio.positions_history import PositionsHistory
 from qf_lib.backtesting.portfolio.trade import Trade
 from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.backtesting.portfolio.transactions_log import TransactionsLog, TradesLog
 from qf_lib.common.utils.dateutils.timer import Timer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
@@ -35,10 +39,34 @@ from qf_lib.containers.series.qf_series import QFSeries
 
 class Portfolio(object):
     def __init__(self, data_handler: DataHandler, initial_cash: float, timer: Timer,
-                 contract_ticker_mapper: ContractTickerMapper):
+                 contract_ticker_mapper: ContractTickerMapper, use_position_book: bool = False,
+                 use_columnar_log: bool = False, use_columnar_positions_history: bool = False):
         """
         On creation, the Portfolio object contains no positions and all values are "reset" to the initial
         cash, with no PnL.
+
+        Parameters
+        ----------
+        data_handler
+            data handler used to get the prices of the assets in the portfolio
+        initial_cash
+            initial value of the portfolio
+        timer
+            timer used to get the current time
+        contract_ticker_mapper
+            object mapping contracts to tickers
+        use_position_book
+            if True, the open positions are additionally kept in the PositionBook and the market values and exposures
+            of all the positions are computed at once (with numpy) in each update of the portfolio, instead of being
+            computed position by position. Recommended for the portfolios consisting of many positions.
+        use_columnar_log
+            if True, the transactions and trades are stored in the columnar TransactionsLog and TradesLog instead of
+            the lists of objects (the objects are created only when they are accessed). Recommended for the
+            backtests generating many transactions.
+        use_columnar_positions_history
+            if True, the positions history is stored in the columnar PositionsHistory instead of the list of
+            dictionaries mapping contracts to BacktestPositionSummaries (the summaries are created only when
+            positions_eod_history is called). Recommended for the backtests of many assets.
         """
         self.initial_cash = initial_cash
         self.data_handler = data_handler
@@ -57,17 +85,24 @@ class Portfolio(object):
         """represents all open positions at the moment"""
         self.open_positions_dict = {}  # type: Dict[Contract, BacktestPosition]
 
+        self._position_book = PositionBook() if use_position_book else None
+
         # dates and portfolio values are keep separately because it is inefficient to append to the QFSeries
         # use get_portfolio_timeseries() to get them as a series.
         self._dates = []  # type: List[datetime]
         self._portfolio_values = []  # type: List[float]
         self._leverage_list = []  # type: List[float]
-        self._transactions = []  # type: List[Transaction]
-        self._trades = []  # type: List[Trade]
+        self._transactions = []  # type: Union[List[Transaction], TransactionsLog]
+        self._trades = []  # type: Union[List[Trade], TradesLog]
+        if use_columnar_log:
+            self._transactions = TransactionsLog()
+            self._trades = TradesLog()
 
         # A list containing dictionaries with summarized assets information (contains a mapping from
-        # contracts to market value at the specific time)
-        self.positions_history = []
+        # contracts to market value at the specific time) or its columnar equivalent
+        self.positions_history = []  # type: Union[List[Dict[Contract, BacktestPositionSummary]], PositionsHistory]
+        if use_columnar_positions_history:
+            self.positions_history = PositionsHistory()
 
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
@@ -84,6 +119,7 @@ class Portfolio(object):
         if existing_position is None:  # open new, empty position
             new_position = self._create_new_position(transaction)
             transaction_cost += new_position.transact_transaction(transaction)
+            self._add_to_position_book(new_position)
         else:  # there is already an existing position
             results_in_opposite_direction, basic_transaction, remaining_transaction \
                 = self._split_if_results_in_opposite_direction(existing_position, transaction)
@@ -97,10 +133,15 @@ class Portfolio(object):
 
             if existing_position.is_closed:
                 self.open_positions_dict.pop(transaction.contract)
+                if self._position_book is not None:
+                    self._position_book.remove_position(existing_position)
+            elif self._position_book is not None:
+                self._position_book.update_position(existing_position)
 
             if results_in_opposite_direction:  # means we were going from Long to Short in one transaction
                 new_position = self._create_new_position(remaining_transaction)
                 transaction_cost += new_position.transact_transaction(remaining_transaction)
+                self._add_to_position_book(new_position)
 
         self.current_cash += transaction_cost
 
@@ -111,6 +152,10 @@ class Portfolio(object):
         If the flag record is set to True, it records the current assets values and the portfolio value (this is
         performed once per day, after the market close).
         """
+        if self._position_book is not None:
+            self._update_using_position_book(record)
+            return
+
         self.net_liquidation = self.current_cash
         self.gross_exposure_of_positions = 0
 
@@ -123,7 +168,6 @@ class Portfolio(object):
 
         self._remove_positions_acquired_or_not_active_positions(contract_to_ticker_dict, current_prices_series)
 
-        current_positions = {}
         for contract, position in self.open_positions_dict.items():
             ticker = contract_to_ticker_dict[contract]
             security_price = current_prices_series[ticker]
@@ -132,14 +176,62 @@ class Portfolio(object):
             position_exposure = position.total_exposure()
             self.net_liquidation += position_value
             self.gross_exposure_of_positions += abs(position_exposure)
-            if record:
-                current_positions[contract] = BacktestPositionSummary(position)
 
         if record:
             self._dates.append(self.timer.now())
             self._portfolio_values.append(self.net_liquidation)
             self._leverage_list.append(self.gross_exposure_of_positions / self.net_liquidation)
-            self.positions_history.append(current_positions)
+            self._record_positions_history(list(self.open_positions_dict.values()))
+
+    def _update_using_position_book(self, record: bool):
+        book = self._position_book
+        if len(book) > 0:
+            current_prices_series = self.data_handler.get_last_available_price(tickers=book.tickers)
+            current_prices = current_prices_series.reindex(book.tickers).values.astype(np.float64)
+
+            positions_without_price = [p for p, price in zip(book.positions, current_prices) if np.isnan(price)]
+            if positions_without_price:
+                for position in positions_without_price:
+                    # the price of the position is not updated, so the last known market value is used
+                    self.open_positions_dict.pop(position.contract())
+                    self.current_cash += position.market_value()
+                    book.remove_position(position)
+                    self.logger.warning("{}: position assigned to Ticker {} removed due to incomplete price data."
+                                        .format(str(self.timer.now()), position.contract().symbol))
+
+                # removing the positions changes their order in the book
+                current_prices = current_prices_series.reindex(book.tickers).values.astype(np.float64)
+
+            book.set_current_prices(current_prices)
+
+        market_values = book.market_values()
+        total_exposures = book.total_exposures()
+        self.net_liquidation = self.current_cash + float(market_values.sum())
+        self.gross_exposure_of_positions = float(np.abs(total_exposures).sum())
+
+        if record:
+            self._dates.append(self.timer.now())
+            self._portfolio_values.append(self.net_liquidation)
+            self._leverage_list.append(self.gross_exposure_of_positions / self.net_liquidation)
+            if isinstance(self.positions_history, PositionsHistory):
+                self.positions_history.record_values(
+                    self.timer.now(), [position.contract() for position in book.positions], book.quantities(),
+                    market_values, total_exposures, book.unrealised_pnls())
+            else:
+                self._record_positions_history(book.positions)
+
+    def _record_positions_history(self, positions: List[BacktestPosition]):
+        if isinstance(self.positions_history, PositionsHistory):
+            self.positions_history.record(self.timer.now(), positions)
+        else:
+            self.positions_history.append({
+                position.contract(): BacktestPositionSummary(position) for position in positions
+            })
+
+    def _add_to_position_book(self, position: BacktestPosition):
+        if self._position_book is not None:
+            ticker = self.contract_ticker_mapper.contract_to_ticker(position.contract())
+            self._position_book.add_position(position, ticker)
 
     def _remove_positions_acquired_or_not_active_positions(self, contract_to_ticker_dict, current_prices_series):
         contracts_to_be_removed = [c for c in self.open_positions_dict
@@ -163,7 +255,14 @@ class Portfolio(object):
         """
         Returns a list of Trades
         """
-        return self._trades
+        return self._trades if isinstance(self._trades, list) else list(self._trades)
+
+    def trades_frame(self) -> QFDataFrame:
+        """
+        Returns a QFDataFrame containing all the Trades (one row per trade), with the columns: start_time, end_time,
+        contract, quantity, entry_price, exit_price, commission, risk_as_percent and pnl.
+        """
+        return self._to_log(self._trades, TradesLog).to_frame()
 
     def leverage_series(self) -> QFSeries:
         """
@@ -173,20 +272,71 @@ class Portfolio(object):
 
     def positions_eod_history(self) -> QFDataFrame:
         """
-        Returns a QFDataFrame containing exposure of the positions in the portfolio for each day.
-        each day contains a dict [contract -> exposure]
+        Returns a QFDataFrame containing the summaries of the positions in the portfolio for each day.
+        Each cell contains the BacktestPositionSummary of the contract or NaN if there was no open position for the
+        contract on that day. To get the values of one field (e.g. the exposures) use positions_eod_values(), which
+        does not create the summaries objects if the columnar positions history is used.
         """
-        end_of_day_date = list(map(lambda x: datetime(x.year, x.month, x.day), self._dates))  # remove time component
-        return QFDataFrame(data=self.positions_history, index=end_of_day_date)
+        if isinstance(self.positions_history, PositionsHistory):
+            positions_history = self.positions_history.to_summaries_frame()
+            positions_history.index = self._end_of_day_dates()
+            return positions_history
+
+        return QFDataFrame(data=self.positions_history, index=self._end_of_day_dates())
+
+    def positions_eod_values(self, field: str) -> QFDataFrame:
+        """
+        Returns a QFDataFrame (dates x contracts) containing the values of the given field of the positions in the
+        portfolio for each day (NaN if there was no open position for the contract on that day).
+
+        Parameters
+        ----------
+        field
+            one of PositionsHistory.FIELDS: "quantity", "direction", "market_value", "total_exposure" or
+            "unrealised_pnl"
+        """
+        if isinstance(self.positions_history, PositionsHistory):
+            positions_values = self.positions_history.to_frame(field)
+            positions_values.index = self._end_of_day_dates()
+            return positions_values
+
+        assert field in PositionsHistory.FIELDS, "Unknown field: {}".format(field)
+        summary_attribute = "market_values" if field == "market_value" else field
+        return self.positions_eod_history().applymap(
+            lambda x: getattr(x, summary_attribute) if isinstance(x, BacktestPositionSummary) else np.nan
+        ).astype(np.float64)
+
+    def _end_of_day_dates(self) -> List[datetime]:
+        return [datetime(x.year, x.month, x.day) for x in self._dates]  # remove time component
 
     def transactions_series(self) -> QFSeries:
         """
         Returns a time series of transactions. It will have multiple entries with the same value of the
         index in more then one transaction occurred on the same day
         """
+        if isinstance(self._transactions, TransactionsLog):
+            return QFSeries(data=list(self._transactions), index=pd.DatetimeIndex(self._transactions.column("time")))
+
         time_index = (t.time for t in self._transactions)
         return QFSeries(data=self._transactions, index=time_index)
 
+    def transactions_frame(self) -> QFDataFrame:
+        """
+        Returns a QFDataFrame indexed by the times of the transactions (one row per transaction), with the columns:
+        contract, quantity, price, commission and contract_size.
+        """
+        return self._to_log(self._transactions, TransactionsLog).to_frame()
+
+    @staticmethod
+    def _to_log(objects: Union[list, TransactionsLog, TradesLog], log_type):
+        if isinstance(objects, log_type):
+            return objects
+
+        log = log_type(initial_capacity=max(len(objects), 1))
+        for obj in objects:
+            log.append(obj)
+        return log
+
     @staticmethod
     def _split_if_results_in_opposite_direction(existing_position: BacktestPosition, transaction: Transaction) \
             -> Tuple[bool, Transaction, Optional[Transaction]]:
@@ -0,0 +1,169 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from typing import List
+
+import numpy as np
+
+from qf_lib.backtesting.portfolio.backtest_future_position import BacktestFuturePosition
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition
+from qf_lib.common.tickers.tickers import Ticker
+
+
+class PositionBook(object):
+    """
+    Keeps the state of all open BacktestPositions (quantities, average prices, point values and current prices)
+    in parallel numpy arrays, so that the market values and exposures of all the positions may be computed at once.
+    Open positions occupy the first slots of the arrays. Each position added to the book reads its current price
+    from the book.
+
+    Parameters
+    ----------
+    initial_capacity
+        initial number of slots in the arrays (they are enlarged whenever necessary)
+    """
+
+    def __init__(self, initial_capacity: int = 64):
+        self._quantities = np.zeros(initial_capacity)
+        self._avg_prices = np.zeros(initial_capacity)
+        self._point_values = np.zeros(initial_capacity)
+        self._is_margin_position = np.zeros(initial_capacity, dtype=bool)
+        self.current_prices = np.zeros(initial_capacity)
+
+        self._positions = []  # type: List[BacktestPosition]
+        self._tickers = []  # type: List[Ticker]
+
+    @property
+    def positions(self) -> List[BacktestPosition]:
+        return self._positions
+
+    @property
+    def tickers(self) -> List[Ticker]:
+        """ Tickers of the open positions (in the order of positions). """
+        return self._tickers
+
+    def __len__(self):
+        return len(self._positions)
+
+    def add_position(self, position: BacktestPosition, ticker: Ticker):
+        """
+        Adds a new position to the book. From now on the current price of the position is stored in the book.
+        """
+        slot = len(self._positions)
+        if slot == len(self._quantities):
+            self._enlarge_arrays()
+
+        current_price = position.current_price
+        position._position_book = self
+        position._slot = slot
+
+        self._positions.append(position)
+        self._tickers.append(ticker)
+        self._point_values[slot] = position.contract().contract_size
+        self._is_margin_position[slot] = isinstance(position, BacktestFuturePosition)
+        self.current_prices[slot] = current_price
+        self.update_position(position)
+
+    def update_position(self, position: BacktestPosition):
+        """
+        Updates the quantity and the average price of the position (it should be called after each transaction).
+        """
+        self._quantities[position._slot] = position.quantity()
+        self._avg_prices[position._slot] = position.avg_price_per_unit()
+
+    def remove_position(self, position: BacktestPosition):
+        """
+        Removes the position from the book. The last position of the book is moved to the freed slot.
+        """
+        slot = position._slot
+        last_slot = len(self._positions) - 1
+
+        position._position_book = None
+        position._slot = None
+        position.current_price = self.current_prices[slot].item()
+
+        last_position = self._positions.pop()
+        last_ticker = self._tickers.pop()
+        if slot != last_slot:
+            self._positions[slot] = last_position
+            self._tickers[slot] = last_ticker
+            last_position._slot = slot
+
+            for array in (self._quantities, self._avg_prices, self._point_values, self._is_margin_position,
+                          self.current_prices):
+                array[slot] = array[last_slot]
+
+    def set_current_prices(self, prices: np.ndarray):
+        """
+        Sets the current prices of all the positions (prices need to be in the order of positions).
+        """
+        self.current_prices[:len(self._positions)] = prices
+
+    def market_values(self) -> np.ndarray:
+        """
+        Market values of all the positions, equivalent to BacktestPosition.market_value(). For cash securities it is
+        the value of the position, for margin securities (futures) it is the P&L of the position.
+        """
+        positions_number = len(self._positions)
+        quantities = self._quantities[:positions_number]
+        current_prices = self.current_prices[:positions_number]
+        is_margin_position = self._is_margin_position[:positions_number]
+
+        cash_securities_values = quantities * current_prices
+        margin_securities_values = (current_prices - self._avg_prices[:positions_number]) * \
+            (quantities * self._point_values[:positions_number])
+        margin_securities_values[current_prices == 0] = 0.0
+
+        return np.where(is_margin_position, margin_securities_values, cash_securities_values)
+
+    def total_exposures(self) -> np.ndarray:
+        """
+        Total exposures of all the positions, equivalent to BacktestPosition.total_exposure().
+        """
+        positions_number = len(self._positions)
+        quantities = self._quantities[:positions_number]
+        current_prices = self.current_prices[:positions_number]
+
+        cash_securities_exposures = quantities * current_prices
+        margin_securities_exposures = quantities * self._point_values[:positions_number] * current_prices
+
+        return np.where(self._is_margin_position[:positions_number], margin_securities_exposures,
+                        cash_securities_exposures)
+
+    def quantities(self) -> np.ndarray:
+        """
+        Quantities of all the positions.
+        """
+        return self._quantities[:len(self._positions)]
+
+    def unrealised_pnls(self) -> np.ndarray:
+        """
+        Unrealised P&Ls of all the positions, equivalent to BacktestPosition.unrealised_pnl.
+        """
+        positions_number = len(self._positions)
+        return (self.current_prices[:positions_number] - self._avg_prices[:positions_number]) * \
+            (self._quantities[:positions_number] * self._point_values[:positions_number])
+
+    def _enlarge_arrays(self):
+        new_capacity = 2 * len(self._quantities)
+
+        def enlarged(array):
+            new_array = np.zeros(new_capacity, dtype=array.dtype)
+            new_array[:len(array)] = array
+            return new_array
+
+        self._quantities = enlarged(self._quantities)
+        self._avg_prices = enlarged(self._avg_prices)
+        self._point_values = enlarged(self._point_values)
+        self._is_margin_position = enlarged(self._is_margin_position)
+        self.current_prices = enlarged(self.current_prices)
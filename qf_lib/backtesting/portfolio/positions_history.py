@@ -0,0 +1,163 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import List, Dict, Sequence
+
+import numpy as np
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPosition, BacktestPositionSummary
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class PositionsHistory(object):
+    """
+    Append-only, columnar history of the positions in the portfolio. Each record (e.g. the end of day state of the
+    portfolio) is stored as one row per open position, containing the index of the record, the id of the contract,
+    quantity, direction, market value, total exposure and unrealised P&L of the position. The rows are kept in
+    fixed-size numpy chunks, so the memory usage scales with the number of open positions and not with the number of
+    all contracts times the number of records.
+
+    Parameters
+    ----------
+    chunk_size
+        number of rows of each of the chunks
+    """
+
+    FIELDS = ("quantity", "direction", "market_value", "total_exposure", "unrealised_pnl")
+    """ Fields stored for every position. """
+
+    _ROW_TYPE = np.dtype([
+        ("record_index", np.int32),
+        ("contract_id", np.int32),
+        ("quantity", np.float64),
+        ("direction", np.int8),
+        ("market_value", np.float64),
+        ("total_exposure", np.float64),
+        ("unrealised_pnl", np.float64)
+    ])
+
+    def __init__(self, chunk_size: int = 65536):
+        self._chunk_size = chunk_size
+        self._full_chunks = []  # type: List[np.ndarray]
+        self._current_chunk = np.empty(chunk_size, dtype=self._ROW_TYPE)
+        self._current_chunk_length = 0
+
+        self._dates = []  # type: List[datetime]
+        self._contracts = []  # type: List[Contract]
+        self._contract_to_id = {}  # type: Dict[Contract, int]
+
+    @property
+    def dates(self) -> List[datetime]:
+        """ Times of all the records. """
+        return self._dates
+
+    @property
+    def contracts(self) -> List[Contract]:
+        """ All contracts, which appeared in the history (in the order of their first appearance). """
+        return self._contracts
+
+    def __len__(self):
+        return len(self._dates)
+
+    def record(self, time: datetime, positions: Sequence[BacktestPosition]):
+        """
+        Records the current state of the given positions.
+        """
+        self.record_values(
+            time,
+            contracts=[position.contract() for position in positions],
+            quantities=[position.quantity() for position in positions],
+            market_values=[position.market_value() for position in positions],
+            total_exposures=[position.total_exposure() for position in positions],
+            unrealised_pnls=[position.unrealised_pnl for position in positions]
+        )
+
+    def record_values(self, time: datetime, contracts: Sequence[Contract], quantities: Sequence[float],
+                      market_values: Sequence[float], total_exposures: Sequence[float],
+                      unrealised_pnls: Sequence[float]):
+        """
+        Records the current state of the positions given as the sequences of their values (all the sequences need to
+        be in the order of contracts).
+        """
+        record_index = len(self._dates)
+        self._dates.append(time)
+
+        rows = np.empty(len(contracts), dtype=self._ROW_TYPE)
+        rows["record_index"] = record_index
+        rows["contract_id"] = [self._get_contract_id(contract) for contract in contracts]
+        rows["quantity"] = quantities
+        rows["direction"] = np.sign(rows["quantity"])
+        rows["market_value"] = market_values
+        rows["total_exposure"] = total_exposures
+        rows["unrealised_pnl"] = unrealised_pnls
+
+        self._append_rows(rows)
+
+    def to_frame(self, field: str) -> QFDataFrame:
+        """
+        Returns a QFDataFrame indexed by the times of the records with the contracts as columns, containing the values
+        of the given field. The value is NaN whenever there was no open position for the contract.
+
+        Parameters
+        ----------
+        field
+            one of the FIELDS (e.g. "total_exposure")
+        """
+        assert field in self.FIELDS, "Unknown field: {}".format(field)
+
+        rows = self._all_rows()
+        values = np.full((len(self._dates), len(self._contracts)), np.nan)
+        values[rows["record_index"], rows["contract_id"]] = rows[field]
+        return QFDataFrame(data=values, index=self._dates, columns=self._contracts)
+
+    def to_summaries_frame(self) -> QFDataFrame:
+        """
+        Returns a QFDataFrame indexed by the times of the records with the contracts as columns, containing the
+        BacktestPositionSummary of each open position (or NaN if there was no open position for the contract).
+        """
+        rows = self._all_rows()
+        values = np.full((len(self._dates), len(self._contracts)), np.nan, dtype=object)
+        for row in rows:
+            contract = self._contracts[row["contract_id"]]
+            values[row["record_index"], row["contract_id"]] = BacktestPositionSummary.from_values(
+                contract, row["total_exposure"].item(), row["market_value"].item(), row["unrealised_pnl"].item(),
+                row["direction"].item(), row["quantity"].item())
+
+        return QFDataFrame(data=values, index=self._dates, columns=self._contracts)
+
+    def _get_contract_id(self, contract: Contract) -> int:
+        contract_id = self._contract_to_id.get(contract)
+        if contract_id is None:
+            contract_id = len(self._contracts)
+            self._contract_to_id[contract] = contract_id
+            self._contracts.append(contract)
+
+        return contract_id
+
+    def _append_rows(self, rows: np.ndarray):
+        while len(rows) > 0:
+            number_of_rows = min(len(rows), self._chunk_size - self._current_chunk_length)
+            new_chunk_length = self._current_chunk_length + number_of_rows
+            self._current_chunk[self._current_chunk_length:new_chunk_length] = rows[:number_of_rows]
+            self._current_chunk_length = new_chunk_length
+            rows = rows[number_of_rows:]
+
+            if self._current_chunk_length == self._chunk_size:
+                self._full_chunks.append(self._current_chunk)
+                self._current_chunk = np.empty(self._chunk_size, dtype=self._ROW_TYPE)
+                self._current_chunk_length = 0
+
+    def _all_rows(self) -> np.ndarray:
+        return np.concatenate(self._full_chunks + [self._current_chunk[:self._current_chunk_length]])
@@ -0,0 +1,206 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import List, Dict, Tuple, Iterator, Union
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class ColumnarLog(object):
+    """
+    Append-only log, which keeps each of its fields in a separate, preallocated numpy array (column). The arrays
+    are enlarged (their size is doubled) whenever necessary. Contracts are stored as ids (indices in the list of
+    all contracts, which appeared in the log).
+
+    Parameters
+    ----------
+    initial_capacity
+        initial number of rows of the columns
+    """
+
+    COLUMNS = ()  # type: Tuple[Tuple[str, np.dtype], ...]
+    """ Names and types of the columns, defined by the subclasses. """
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._length = 0
+        self._columns = {name: np.empty(initial_capacity, dtype=dtype) for name, dtype in self.COLUMNS}
+
+        self._contracts = []  # type: List[Contract]
+        self._contract_to_id = {}  # type: Dict[Contract, int]
+
+    @property
+    def contracts(self) -> List[Contract]:
+        """ All contracts, which appeared in the log (in the order of their first appearance). """
+        return self._contracts
+
+    def __len__(self):
+        return self._length
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns the view of the values of the given column (it should not be modified).
+        """
+        return self._columns[name][:self._length]
+
+    def contracts_column(self) -> List[Contract]:
+        """
+        Returns the list of contracts of all the rows.
+        """
+        return [self._contracts[contract_id] for contract_id in self.column("contract_id")]
+
+    def _append_row(self, contract: Contract, **values):
+        if self._length == len(self._columns["contract_id"]):
+            self._enlarge_columns()
+
+        self._columns["contract_id"][self._length] = self._get_contract_id(contract)
+        for name, value in values.items():
+            self._columns[name][self._length] = value
+
+        self._length += 1
+
+    def _enlarge_columns(self):
+        for name, column in self._columns.items():
+            enlarged_column = np.empty(max(2 * len(column), 1), dtype=column.dtype)
+            enlarged_column[:len(column)] = column
+            self._columns[name] = enlarged_column
+
+    def _get_contract_id(self, contract: Contract) -> int:
+        contract_id = self._contract_to_id.get(contract)
+        if contract_id is None:
+            contract_id = len(self._contracts)
+            self._contract_to_id[contract] = contract_id
+            self._contracts.append(contract)
+
+        return contract_id
+
+    def _contract_sizes(self) -> np.ndarray:
+        contract_sizes = np.array([contract.contract_size for contract in self._contracts], dtype=np.float64)
+        return contract_sizes[self.column("contract_id")]
+
+    @staticmethod
+    def _to_datetime(value: np.datetime64) -> datetime:
+        return pd.Timestamp(value).to_pydatetime()
+
+    @staticmethod
+    def _to_quantity(value: np.float64) -> Union[int, float]:
+        # quantities are stored as floats, but in most of the cases they are integers
+        value = float(value)
+        return int(value) if value.is_integer() else value
+
+
+class TransactionsLog(ColumnarLog):
+    """
+    Columnar log of Transactions (see ColumnarLog). The Transaction objects are created only when they are accessed.
+    """
+
+    COLUMNS = (
+        ("time", "datetime64[ns]"),
+        ("contract_id", np.int32),
+        ("quantity", np.float64),
+        ("price", np.float64),
+        ("commission", np.float64)
+    )
+
+    def append(self, transaction: Transaction):
+        self._append_row(transaction.contract, time=np.datetime64(transaction.time, "ns"),
+                         quantity=transaction.quantity, price=transaction.price, commission=transaction.commission)
+
+    def __getitem__(self, index: int) -> Transaction:
+        index = range(self._length)[index]
+        return Transaction(self._to_datetime(self._columns["time"][index]),
+                           self._contracts[self._columns["contract_id"][index]],
+                           self._to_quantity(self._columns["quantity"][index]),
+                           float(self._columns["price"][index]),
+                           float(self._columns["commission"][index]))
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return (self[index] for index in range(self._length))
+
+    def to_frame(self) -> QFDataFrame:
+        """
+        Returns a QFDataFrame indexed by the times of the transactions, with the columns: contract, quantity, price,
+        commission and contract_size.
+        """
+        return QFDataFrame(data={
+            "contract": self.contracts_column(),
+            "quantity": self.column("quantity"),
+            "price": self.column("price"),
+            "commission": self.column("commission"),
+            "contract_size": self._contract_sizes()
+        }, index=pd.DatetimeIndex(self.column("time")),
+            columns=["contract", "quantity", "price", "commission", "contract_size"])
+
+
+class TradesLog(ColumnarLog):
+    """
+    Columnar log of Trades (see ColumnarLog). The Trade objects are created only when they are accessed.
+    """
+
+    COLUMNS = (
+        ("start_time", "datetime64[ns]"),
+        ("end_time", "datetime64[ns]"),
+        ("contract_id", np.int32),
+        ("quantity", np.float64),
+        ("entry_price", np.float64),
+        ("exit_price", np.float64),
+        ("commission", np.float64),
+        ("risk_as_percent", np.float64)
+    )
+
+    def append(self, trade: Trade):
+        self._append_row(trade.contract, start_time=np.datetime64(trade.start_time, "ns"),
+                         end_time=np.datetime64(trade.end_time, "ns"), quantity=trade.quantity,
+                         entry_price=trade.entry_price, exit_price=trade.exit_price, commission=trade.commission,
+                         risk_as_percent=trade.risk_as_percent)
+
+    def __getitem__(self, index: int) -> Trade:
+        index = range(self._length)[index]
+        return Trade(self._to_datetime(self._columns["start_time"][index]),
+                     self._to_datetime(self._columns["end_time"][index]),
+                     self._contracts[self._columns["contract_id"][index]],
+                     self._to_quantity(self._columns["quantity"][index]),
+                     float(self._columns["entry_price"][index]),
+                     float(self._columns["exit_price"][index]),
+                     float(self._columns["commission"][index]),
+                     float(self._columns["risk_as_percent"][index]))
+
+    def __iter__(self) -> Iterator[Trade]:
+        return (self[index] for index in range(self._length))
+
+    def to_frame(self) -> QFDataFrame:
+        """
+        Returns a QFDataFrame with the columns: start_time, end_time, contract, quantity, entry_price, exit_price,
+        commission, risk_as_percent and pnl (computed for all the trades at once).
+        """
+        pnls = (self.column("exit_price") - self.column("entry_price")) * self.column("quantity") * \
+            self._contract_sizes() - self.column("commission")
+
+        return QFDataFrame(data={
+            "start_time": self.column("start_time"),
+            "end_time": self.column("end_time"),
+            "contract": self.contracts_column(),
+            "quantity": self.column("quantity"),
+            "entry_price": self.column("entry_price"),
+            "exit_price": self.column("exit_price"),
+            "commission": self.column("commission"),
+            "risk_as_percent": self.column("risk_as_percent"),
+            "pnl": pnls
+        }, columns=["start_time", "end_time", "contract", "quantity", "entry_price", "exit_price", "commission",
+                    "risk_as_percent", "pnl"])
@@ -12,13 +12,14 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
-from typing import Union, Sequence
+from typing import Union, Sequence, Optional
 
 from qf_lib.backtesting.broker.backtest_broker import BacktestBroker
 from qf_lib.backtesting.contract.contract_to_ticker_conversion.base import ContractTickerMapper
 from qf_lib.backtesting.data_handler.data_handler import DataHandler
 from qf_lib.backtesting.events.event_manager import EventManager
 from qf_lib.backtesting.events.notifiers import Notifiers
+from qf_lib.backtesting.events.time_flow_controller import BacktestTimeFlowController
 from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitor
 from qf_lib.backtesting.order.order_factory import OrderFactory
 from qf_lib.backtesting.orders_filter.orders_filter import OrdersFilter
@@ -31,6 +32,8 @@ from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
 from qf_lib.common.utils.dateutils.timer import SettableTimer
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.data_providers.chunked_prefetching_data_provider import ChunkedPrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 
 
 class BacktestTradingSession(TradingSession):
@@ -41,7 +44,8 @@ class BacktestTradingSession(TradingSession):
     def __init__(self, contract_ticker_mapper: ContractTickerMapper, start_date, end_date,
                  position_sizer: PositionSizer, orders_filters: Sequence[OrdersFilter], data_handler: DataHandler,
                  timer: SettableTimer, notifiers: Notifiers, portfolio: Portfolio, events_manager: EventManager,
-                 monitor: BacktestMonitor, broker: BacktestBroker, order_factory: OrderFactory, frequency: Frequency):
+                 monitor: BacktestMonitor, broker: BacktestBroker, order_factory: OrderFactory, frequency: Frequency,
+                 time_flow_controller: BacktestTimeFlowController = None):
         """
         Set up the backtest variables according to what has been passed in.
         """
@@ -64,10 +68,47 @@ class BacktestTradingSession(TradingSession):
         self.order_factory = order_factory
         self.broker = broker
         self.frequency = frequency
+        self.time_flow_controller = time_flow_controller
 
-    def use_data_preloading(self, tickers: Union[Ticker, Sequence[Ticker]], time_delta: RelativeDelta = None):
+    def use_data_preloading(self, tickers: Union[Ticker, Sequence[Ticker]], time_delta: RelativeDelta = None,
+                            use_array_storage: bool = False, cache_directory: Optional[str] = None,
+                            chunk_length: Optional[RelativeDelta] = None, cache_namespace: Optional[str] = None):
         if time_delta is None:
             time_delta = RelativeDelta(years=1)
         data_history_start = self.start_date - time_delta
         self.data_handler.use_data_bundle(tickers, PriceField.ohlcv(), data_history_start, self.end_date,
-                                          self.frequency)
+                                          self.frequency, use_array_storage, cache_directory, chunk_length,
+                                          cache_namespace)
+
+    def use_memory_mapped_data_preloading(self, directory: str, use_array_storage: bool = False):
+        """
+        Uses the data bundle saved with PresetDataProvider.save_memory_mapped_bundle instead of downloading the data.
+        The bundle is memory-mapped, so all the backtests running in parallel processes share the same data in memory.
+        """
+        self.data_handler.use_memory_mapped_data_bundle(directory, use_array_storage)
+
+    def use_precomputed_timeline(self, skip_non_trading_days: bool = False):
+        """
+        Precomputes the timeline of all regular and periodic TimeEvents (e.g. MarketOpenEvent, MarketCloseEvent)
+        between the start and the end of the backtest, instead of scheduling them one by one.
+
+        Parameters
+        ----------
+        skip_non_trading_days
+            if True, no TimeEvents are generated on the days, for which there is no data in the preloaded data bundle
+            (use_data_preloading needs to be called before)
+        """
+        if self.time_flow_controller is None:
+            raise ValueError("The timeline can be precomputed only by the BacktestTimeFlowController. Pass it to the "
+                             "BacktestTradingSession (BacktestTradingSessionBuilder does it by default).")
+
+        trading_dates = None
+        if skip_non_trading_days:
+            data_provider = self.data_handler.data_provider
+            if not isinstance(data_provider, PresetDataProvider) or \
+                    isinstance(data_provider, ChunkedPrefetchingDataProvider):
+                raise ValueError("Non-trading days can be skipped only if the whole data is preloaded. "
+                                 "Call use_data_preloading() without the chunk_length first.")
+            trading_dates = data_provider.data_bundle.dates.to_index()
+
+        self.time_flow_controller.use_precomputed_timeline(trading_dates)
@@ -22,7 +22,7 @@ from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper
     DummyBloombergContractTickerMapper
 from qf_lib.backtesting.data_handler.daily_data_handler import DailyDataHandler
 from qf_lib.backtesting.data_handler.intraday_data_handler import IntradayDataHandler
-from qf_lib.backtesting.events.event_manager import EventManager
+from qf_lib.backtesting.events.backtest_event_manager import BacktestEventManager
 from qf_lib.backtesting.events.notifiers import Notifiers
 from qf_lib.backtesting.events.time_event.regular_time_event.after_market_close_event import AfterMarketCloseEvent
 from qf_lib.backtesting.events.time_event.regular_time_event.before_market_open_event import BeforeMarketOpenEvent
@@ -37,6 +37,7 @@ from qf_lib.backtesting.execution_handler.slippage.price_based_slippage import P
 from qf_lib.backtesting.monitoring.abstract_monitor import AbstractMonitor
 from qf_lib.backtesting.monitoring.backtest_result import BacktestResult
 from qf_lib.backtesting.monitoring.dummy_monitor import DummyMonitor
+from qf_lib.backtesting.monitoring.backtest_monitor import BacktestMonitor
 from qf_lib.backtesting.monitoring.light_backtest_monitor import LightBacktestMonitor
 from qf_lib.backtesting.order.order_factory import OrderFactory
 from qf_lib.backtesting.orders_filter.orders_filter import OrdersFilter
@@ -74,6 +75,8 @@ class BacktestTradingSessionBuilder(object):
     - MarketOpenEvent is triggered at 13:30
     - MarketCloseEvent is triggered at 20:00
     - AfterMarketCloseEvent is triggered at 23:00
+    - bars returned by DataHandler.historical_price are not cached in rolling windows (see set_use_rolling_window_cache)
+    - events are dispatched by the single-threaded BacktestEventManager
 
     Parameters
     ------------
@@ -93,7 +96,13 @@ class BacktestTradingSessionBuilder(object):
 
         self._backtest_name = "Backtest Results"
         self._initial_cash = 10000000
+        self._use_position_book = False
+        self._use_columnar_log = False
+        self._use_columnar_positions_history = False
+        self._use_market_snapshot = False
+        self._use_rolling_window_cache = False
         self._monitor_type = LightBacktestMonitor
+        self._transactions_buffer_size = None
         self._benchmark_tms = None
 
         self._contract_ticker_mapper = DummyBloombergContractTickerMapper()
@@ -159,6 +168,58 @@ class BacktestTradingSessionBuilder(object):
         assert type(initial_cash) is int and initial_cash > 0
         self._initial_cash = initial_cash
 
+    def set_use_position_book(self, use_position_book: bool):
+        """Determines if the Portfolio should keep the open positions in the PositionBook, which computes the market
+        values and exposures of all the positions at once. Recommended for the backtests of many assets.
+
+        Parameters
+        -----------
+        use_position_book: bool
+        """
+        self._use_position_book = use_position_book
+
+    def set_use_columnar_log(self, use_columnar_log: bool):
+        """Determines if the Portfolio should keep the transactions and trades in the columnar logs instead of the lists
+        of objects. Recommended for the backtests generating many transactions.
+
+        Parameters
+        -----------
+        use_columnar_log: bool
+        """
+        self._use_columnar_log = use_columnar_log
+
+    def set_use_columnar_positions_history(self, use_columnar_positions_history: bool):
+        """Determines if the Portfolio should keep the history of the positions in the columnar PositionsHistory
+        instead of the list of dictionaries of the position summaries. Recommended for the backtests of many assets.
+
+        Parameters
+        -----------
+        use_columnar_positions_history: bool
+        """
+        self._use_columnar_positions_history = use_columnar_positions_history
+
+    def set_use_market_snapshot(self, use_market_snapshot: bool):
+        """Determines if the current bars, average daily volumes and volatilities should be computed once per bar by the
+        MarketSnapshot of the data handler and shared by the execution handler and the slippage model (see
+        DataHandler.use_market_snapshot). Recommended for the backtests generating orders in every bar.
+
+        Parameters
+        -----------
+        use_market_snapshot: bool
+        """
+        self._use_market_snapshot = use_market_snapshot
+
+    def set_use_rolling_window_cache(self, use_rolling_window_cache: bool):
+        """Determines if the DailyDataHandler should keep the bars returned by historical_price in rolling windows and
+        download only the bars closed since the previous query (see DailyDataHandler). Recommended for the strategies,
+        which request the same number of bars every day.
+
+        Parameters
+        -----------
+        use_rolling_window_cache: bool
+        """
+        self._use_rolling_window_cache = use_rolling_window_cache
+
     def set_alpha_model_backtest_name(self, model_type: Type[AlphaModel], param_set: Tuple, tickers: List[Ticker]):
         """Sets the alpha model backtest name.
 
@@ -208,6 +269,19 @@ class BacktestTradingSessionBuilder(object):
         assert issubclass(monitor_type, AbstractMonitor)
         self._monitor_type = monitor_type
 
+    def set_transactions_buffer_size(self, transactions_buffer_size: int):
+        """Sets the number of transactions, which are buffered in memory by the BacktestMonitor and written to the CSV
+        trade log at once (by default each transaction is written when it is recorded). The buffered transactions are
+        always written at the end of the backtest.
+
+        Parameters
+        -----------
+        transactions_buffer_size: int
+            number of the buffered transactions
+        """
+        assert transactions_buffer_size >= 1
+        self._transactions_buffer_size = transactions_buffer_size
+
     def set_benchmark_tms(self, benchmark_tms: QFSeries):
         """Sets the benchmark timeseries. If set, the TearsheetWithBenchamrk will be generated.
 
@@ -272,7 +346,7 @@ class BacktestTradingSessionBuilder(object):
 
     @staticmethod
     def _create_event_manager(timer, notifiers: Notifiers):
-        event_manager = EventManager(timer)
+        event_manager = BacktestEventManager(timer)
 
         event_manager.register_notifiers([
             notifiers.all_event_notifier,
@@ -286,7 +360,7 @@ class BacktestTradingSessionBuilder(object):
         if self._frequency == Frequency.MIN_1:
             data_handler = IntradayDataHandler(data_provider, timer)
         elif self._frequency == Frequency.DAILY:
-            data_handler = DailyDataHandler(data_provider, timer)
+            data_handler = DailyDataHandler(data_provider, timer, self._use_rolling_window_cache)
         else:
             raise ValueError("Invalid frequency parameter. The only frequencies supported by the DataHandler are "
                              "Frequency.DAILY and Frequency.MIN_1. "
@@ -315,15 +389,21 @@ class BacktestTradingSessionBuilder(object):
         self._events_manager = self._create_event_manager(self._timer, self._notifiers)
 
         self._data_handler = self._create_data_handler(self._data_provider, self._timer)
+        if self._use_market_snapshot:
+            self._data_handler.use_market_snapshot()
+        self._slippage_model.set_market_snapshot(self._data_handler.market_snapshot)
 
-        self._portfolio = Portfolio(self._data_handler, self._initial_cash, self._timer, self._contract_ticker_mapper)
+        self._portfolio = Portfolio(self._data_handler, self._initial_cash, self._timer, self._contract_ticker_mapper,
+                                    self._use_position_book, self._use_columnar_log,
+                                    self._use_columnar_positions_history)
         self._backtest_result = BacktestResult(self._portfolio, self._backtest_name, start_date, end_date)
         self._monitor = self._monitor_setup()
 
         self._execution_handler = SimulatedExecutionHandler(
             self._data_handler, self._timer, self._notifiers.scheduler, self._monitor, self._commission_model,
             self._contract_ticker_mapper, self._portfolio, self._slippage_model,
-            scheduling_time_delay=self._scheduling_time_delay, frequency=self._frequency)
+            scheduling_time_delay=self._scheduling_time_delay, frequency=self._frequency,
+            market_snapshot=self._data_handler.market_snapshot)
 
         self._time_flow_controller = BacktestTimeFlowController(
             self._notifiers.scheduler, self._events_manager, self._timer,
@@ -375,14 +455,23 @@ class BacktestTradingSessionBuilder(object):
             monitor=self._monitor,
             broker=self._broker,
             order_factory=self._order_factory,
-            frequency=self._frequency
+            frequency=self._frequency,
+            time_flow_controller=self._time_flow_controller
         )
         return ts
 
     def _monitor_setup(self):
         if self._monitor_type is DummyMonitor:
             return DummyMonitor()
-        monitor = self._monitor_type(self._backtest_result, self._settings, self._pdf_exporter, self._excel_exporter)
+        if self._transactions_buffer_size is not None and issubclass(self._monitor_type, BacktestMonitor):
+            monitor = self._monitor_type(self._backtest_result, self._settings, self._pdf_exporter,
+                                         self._excel_exporter, transactions_buffer_size=self._transactions_buffer_size)
+        else:
+            if self._transactions_buffer_size is not None:
+                self._logger.warning("{} does not buffer the transactions, the transactions buffer size is ignored"
+                                     .format(self._monitor_type.__name__))
+            monitor = self._monitor_type(self._backtest_result, self._settings, self._pdf_exporter,
+                                         self._excel_exporter)
         if self._benchmark_tms is not None:
             monitor.set_benchmark(self._benchmark_tms)
         return monitor
@@ -67,8 +67,10 @@ class Ticker(metaclass=ABCMeta):
         return hash((self.ticker, type(self)))
 
     def __getstate__(self):
-        self.logger = None
-        return self.__dict__
+        # the state is copied, so that neither the ticker nor its copies (e.g. created with copy.copy) share it
+        state = self.__dict__.copy()
+        state["logger"] = None
+        return state
 
     def __setstate__(self, state):
         self.__dict__ = state
@@ -12,7 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 import abc
+import copy
+from datetime import datetime
+from typing import Sequence
 
+import numpy as np
 import pandas as pd
 
 from qf_lib.common.exceptions.future_contracts_exceptions import NoValidTickerException
@@ -67,9 +71,16 @@ class FutureTicker(Ticker, metaclass=abc.ABCMeta):
         self._data_provider = None  # type: "DataProvider"
         self._ticker_initialized = False
 
-        # Date used for optimization purposes
+        # Roll dates (expiration dates shifted by the days_before_exp_date) and the corresponding tickers, precomputed
+        # once for the expiration dates and used for optimization purposes
+        self._roll_dates = None  # type: np.ndarray
+        self._roll_tickers = None  # type: np.ndarray
+        self._roll_dates_exp_dates = None  # type: QFSeries
+
+        # The current ticker and the period of time, in which it is valid, used for optimization purposes
         self._ticker = None  # type: Ticker
-        self._last_cached_date = None
+        self._ticker_valid_since = None  # type: pd.Timestamp
+        self._ticker_valid_until = None  # type: pd.Timestamp
 
     def initialize_data_provider(self, timer: Timer, data_provider: "DataProvider"):
         """ Initialize the future ticker with data provider and ticker.
@@ -90,6 +101,25 @@ class FutureTicker(Ticker, metaclass=abc.ABCMeta):
         self._exp_dates = self._get_futures_chain_tickers()
         self._ticker_initialized = True
 
+    def uninitialized_copy(self) -> "FutureTicker":
+        """
+        Returns a copy of the FutureTicker, which is not initialized with any Timer and Data Provider (e.g. in order to
+        serialize the ticker without them). The copy needs to be initialized using initialize_data_provider before
+        computing its current specific ticker.
+        """
+        ticker_copy = copy.copy(self)
+        ticker_copy._exp_dates = None
+        ticker_copy._timer = None
+        ticker_copy._data_provider = None
+        ticker_copy._ticker_initialized = False
+        ticker_copy._roll_dates = None
+        ticker_copy._roll_tickers = None
+        ticker_copy._roll_dates_exp_dates = None
+        ticker_copy._ticker = None
+        ticker_copy._ticker_valid_since = None
+        ticker_copy._ticker_valid_until = None
+        return ticker_copy
+
     @property
     def ticker(self) -> str:
         """
@@ -108,52 +138,90 @@ class FutureTicker(Ticker, metaclass=abc.ABCMeta):
         """
         Method which returns the currently valid, specific Ticker.
 
-        In order to optimize the computation of ticker value, as the contracts are assumed not to expire within
-        the day (they can expire only at 0:00 a.m.), the ticker value is being cached for a certain date.
-        If the function will be called for a date, for which the ticker value was already computed once, the cached
-        value is being returned.
+        In order to optimize the computation of ticker value, the roll dates (expiration dates shifted by the
+        days_before_exp_date) are computed only once and the ticker value is being cached together with the period of
+        time, in which it is valid (from its roll date up to the roll date of the next contract). If the function will
+        be called within this period of time, the cached value is being returned.
 
         Returns
         -------
         Ticker
             The current specific ticker.
         """
+        # If the timer or data provider were not set
+        if not self._ticker_initialized:
+            raise ValueError("Set up the timer and data provider by calling initialize_data_provider() "
+                             "before using the future ticker {}".format(self.name))
+
+        now = self._timer.now()
+        if self._update_roll_dates() or self._ticker is None or \
+                not self._ticker_valid_since <= now < self._ticker_valid_until:
+            self._ticker = None
+            roll_date_position = np.searchsorted(self._roll_dates, np.datetime64(now), side='right') - 1
+            ticker_position = roll_date_position + self._N
+
+            # The current time may precede the first roll date or there may be no N-th contract after it
+            if roll_date_position < 0 or ticker_position >= len(self._roll_tickers):
+                raise NoValidTickerException("No valid ticker for the FutureTicker {} found on {}".format(
+                    self.name,
+                    now
+                ))
+
+            self._ticker_valid_since = pd.Timestamp(self._roll_dates[roll_date_position])
+            self._ticker_valid_until = pd.Timestamp(self._roll_dates[roll_date_position + 1]) \
+                if roll_date_position + 1 < len(self._roll_dates) else pd.Timestamp.max
+            self._ticker = self._roll_tickers[ticker_position]
+
+        return self._ticker
+
+    def get_specific_tickers(self, dates: Sequence[datetime]) -> QFSeries:
+        """
+        Returns the specific tickers, which are valid on each of the given dates (the tickers, which would be returned
+        by the get_current_specific_ticker function at these dates), computed at once for all the dates. For the dates,
+        for which no valid ticker exists, None is returned.
 
-        try:
-            def _get_current_specific_ticker() -> Ticker:
-                """
-                Returns the ticker of N-th Future Contract for the provided date, assuming that days_before_exp_date
-                days before the original expiration the ticker of the next contract will be returned.
-                E.g. if days_before_exp_date = 4 and the expiry date = 16th July, then the old contract will be returned
-                up to 16 - 4 = 12th July (inclusive).
-                """
-                # Shift the index and data according to the start time and end time values
-                _exp_dates = self.get_expiration_dates()
-                date_index = _exp_dates.index - pd.Timedelta(days=self._days_before_exp_date - 1)
-                date_index_loc = date_index.get_loc(self._timer.now(), method="pad")
-                return _exp_dates.iloc[date_index_loc:].iloc[self._N]
-
-            # If the timer or data provider were not set
-            if not self._ticker_initialized:
-                raise ValueError("Set up the timer and data provider by calling initialize_data_provider() "
-                                 "before using the future ticker {}".format(self.name))
-
-            if self._last_cached_date != self._timer.now().date():
-                self._ticker = _get_current_specific_ticker()
-                self._last_cached_date = self._timer.now().date()
-            return self._ticker
-
-        except LookupError:
-            # Function "get_loc(self._timer.now(), method="pad")" may raise KeyError in case if e.g. the current time
-            # precedes the first date in the shifted_index.
-            # Function "iloc" may rise IndexError if the requested indexer is out-of-bonds (e.g. a high value of self.N)
-            # Therefore, in case if the data with expiration dates is not available for the current date, the
-            # _get_current_specific_ticker function will raise a LookupError.
-
-            raise NoValidTickerException("No valid ticker for the FutureTicker {} found on {}".format(
-                self.name,
-                self._timer.now()
-            ))
+        Parameters
+        ----------
+        dates: Sequence[datetime]
+            dates, for which the specific tickers should be returned
+
+        Returns
+        -------
+        QFSeries
+            QFSeries of specific Tickers, indexed by the given dates
+        """
+        if not self._ticker_initialized:
+            raise ValueError("Set up the timer and data provider by calling initialize_data_provider() "
+                             "before using the future ticker {}".format(self.name))
+
+        self._update_roll_dates()
+        dates = pd.DatetimeIndex(dates)
+        tickers_positions = np.searchsorted(self._roll_dates, dates.values, side='right') - 1 + self._N
+        is_valid = (tickers_positions >= self._N) & (tickers_positions < len(self._roll_tickers))
+
+        tickers = np.full(len(dates), None, dtype=object)
+        tickers[is_valid] = self._roll_tickers[tickers_positions[is_valid]]
+        return QFSeries(data=tickers, index=dates)
+
+    def _update_roll_dates(self) -> bool:
+        """
+        Computes the roll dates - the expiration dates shifted by the days_before_exp_date, since which the consecutive
+        contracts are considered. E.g. if days_before_exp_date = 4 and the expiry date = 16th July, then the old
+        contract will be used up to 16 - 4 = 12th July (inclusive). The roll dates are recomputed only if the
+        expiration dates change. Returns True if the roll dates were recomputed.
+        """
+        exp_dates = self.get_expiration_dates()
+        if exp_dates is self._roll_dates_exp_dates:
+            return False
+
+        roll_dates = exp_dates.index - pd.Timedelta(days=self._days_before_exp_date - 1)
+        if not roll_dates.is_monotonic_increasing:
+            raise ValueError("The expiration dates of the FutureTicker {} should be sorted".format(self.name))
+
+        self._roll_dates = roll_dates.values
+        self._roll_tickers = exp_dates.values
+        self._roll_dates_exp_dates = exp_dates
+        return True
 
     def get_expiration_dates(self) -> QFSeries:
         """
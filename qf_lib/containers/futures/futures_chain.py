@@ -12,17 +12,21 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 from datetime import datetime
-from typing import Union, Sequence
+from typing import Union, Sequence, List, Optional
+
+import numpy as np
 import pandas as pd
 
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.dataframe.cast_dataframe import cast_dataframe
 from qf_lib.containers.dataframe.prices_dataframe import PricesDataFrame
 from qf_lib.containers.futures.future_contract import FutureContract
 from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
 from qf_lib.containers.futures.futures_adjustment_method import FuturesAdjustmentMethod
+from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
 
@@ -40,9 +44,15 @@ class FuturesChain(pd.Series):
         Reference to the data provider, necessary to download latest prices, returned by the get_price function.
     method: FuturesAdjustmentMethod
         FuturesAdjustmentMethod corresponding to one of two available methods of chaining the futures contracts.
+    incremental: bool
+        if True, the chain is stored in a preallocated numpy buffer, to which the new prices are appended. The contracts
+        are rolled according to the roll schedule computed once from the expiration dates of the FutureTicker and on
+        each roll only the back adjustment offset of the new roll is applied to the buffer, instead of regenerating
+        the whole chain. If the roll cannot be applied incrementally (e.g. more than one contract expired since the
+        last call or there are no prices necessary to compute the offset) the chain is regenerated. By default False.
     """
     def __init__(self, future_ticker: FutureTicker, data_provider: "DataProvider", method: FuturesAdjustmentMethod =
-                 FuturesAdjustmentMethod.NTH_NEAREST):
+                 FuturesAdjustmentMethod.NTH_NEAREST, incremental: bool = False):
         """
         The index consists of expiry dates of the future contracts.
         """
@@ -58,6 +68,21 @@ class FuturesChain(pd.Series):
         self._futures_adjustment_method = method
         self._cached_fields = set()
 
+        # Used by the incremental chain generation
+        self._incremental = incremental
+        self._roll_schedule_exp_dates = None  # type: Optional[QFSeries]
+        self._roll_dates = None  # type: Optional[np.ndarray]
+        self._contracts = None  # type: Optional[List[Ticker]]
+        self._contract_position = None  # type: Optional[int]
+        self._roll_offset_pending = False
+        self._frequency = None  # type: Optional[Frequency]
+        self._buffer_fields = []  # type: List[PriceField]
+        self._buffer_dates = np.empty(0, dtype='datetime64[ns]')
+        self._buffer_values = np.empty((0, 0))
+        self._buffer_size = 0
+        self._buffer_index_name = None
+        self._buffer_columns_name = None
+
     def get_price(self, fields: Union[PriceField, Sequence[PriceField]], start_date: datetime, end_date: datetime,
                   frequency: Frequency = Frequency.DAILY) -> Union[PricesDataFrame, PricesSeries]:
         """Combines consecutive specific FutureContracts data, in order to obtain a chain of prices.
@@ -83,6 +108,9 @@ class FuturesChain(pd.Series):
         # otherwise - store the last and first available dates from the chain
         fields_list, _ = convert_to_list(fields, PriceField)
 
+        if self._incremental:
+            return self._get_price_incrementally(fields, start_date, end_date, frequency).squeeze()
+
         if self._chain is not None and not self._chain.empty:
             last_date_in_chain = self._chain.index[-1]
             first_date_in_chain = self._first_cached_date
@@ -146,6 +174,232 @@ class FuturesChain(pd.Series):
             self._specific_ticker = self._future_ticker.ticker
             return self._chain[fields_list].loc[start_date:end_date].squeeze()
 
+    def _get_price_incrementally(self, fields: Union[PriceField, Sequence[PriceField]], start_date: datetime,
+                                 end_date: datetime, frequency: Frequency) -> PricesDataFrame:
+        """
+        Version of the get_price function used by the incremental chain. The prices, which appeared since the last
+        call, are appended to the buffer and the chain is regenerated only if it is necessary (e.g. the start_date
+        precedes the first cached date or the roll could not be applied incrementally).
+        """
+        fields_list, _ = convert_to_list(fields, PriceField)
+
+        uncached_fields = set(fields_list) - self._cached_fields
+        if self._buffer_size == 0 or start_date < self._first_cached_date or uncached_fields or \
+                frequency != self._frequency or not self._append_prices(start_date, end_date):
+            self._regenerate_buffer(fields, start_date, end_date, frequency)
+
+        return self._get_buffer_slice(fields_list, start_date, end_date)
+
+    def _regenerate_buffer(self, fields: Union[PriceField, Sequence[PriceField]], start_date: datetime,
+                           end_date: datetime, frequency: Frequency):
+        """ Generates the whole chain and stores it in the buffer. """
+        self._preload_data_and_generate_chain(fields, start_date, end_date, frequency)
+        chain, self._chain = self._chain, None
+
+        self._frequency = frequency
+        self._buffer_fields = list(chain.columns)
+        self._buffer_index_name = chain.index.name
+        self._buffer_columns_name = chain.columns.name
+
+        self._buffer_size = chain.shape[0]
+        capacity = 2 * self._buffer_size + 1
+        self._buffer_dates = np.empty(capacity, dtype='datetime64[ns]')
+        self._buffer_dates[:self._buffer_size] = chain.index.values
+        self._buffer_values = np.empty((capacity, len(self._buffer_fields)))
+        self._buffer_values[:self._buffer_size] = chain.values
+
+        self._update_roll_schedule()
+        self._roll_offset_pending = False
+        if self._buffer_size == 0:
+            return
+
+        # The position of the contract is based on the last date in the buffer and not on the current date, so that the
+        # roll, for which the new contract had no prices yet, is applied once the prices become available
+        N = self._future_ticker.get_N()
+        last_date = self._buffer_dates[self._buffer_size - 1]
+        position = np.searchsorted(self._roll_dates, last_date, side='right') + N - 1
+        self._contract_position = min(position, len(self._contracts) - 1)
+
+        # If the new contract had no Open prices yet, the offset of the last roll could not be computed and the chain
+        # needs to be regenerated, until the prices become available
+        if self._futures_adjustment_method == FuturesAdjustmentMethod.BACK_ADJUSTED and self._contract_position >= N:
+            first_row_of_contract = np.searchsorted(self._buffer_dates[:self._buffer_size],
+                                                    self._roll_dates[self._contract_position - N])
+            if first_row_of_contract > 0:
+                open_column = self._buffer_fields.index(PriceField.Open)
+                contract_opens = self._buffer_values[first_row_of_contract:self._buffer_size, open_column]
+                self._roll_offset_pending = bool(np.isnan(contract_opens).all())
+
+    def _update_roll_schedule(self) -> bool:
+        """
+        Computes the roll schedule - the dates since which the consecutive contracts are used by the FutureTicker
+        (expiration dates shifted by the days_before_exp_date) and the contracts themselves. The schedule is computed
+        once and recomputed only if the expiration dates of the FutureTicker change. Returns True if the schedule
+        was recomputed.
+        """
+        exp_dates = self._future_ticker.get_expiration_dates()
+        if exp_dates is self._roll_schedule_exp_dates:
+            return False
+
+        days_before_exp_date = self._future_ticker.get_days_before_exp_date()
+        self._roll_dates = (exp_dates.index - pd.Timedelta(days=(days_before_exp_date - 1))).values
+        self._contracts = list(exp_dates.values)
+        self._roll_schedule_exp_dates = exp_dates
+        return True
+
+    def _append_prices(self, start_date: datetime, end_date: datetime) -> bool:
+        """
+        Appends to the buffer the prices since the last date in the buffer. In case of a roll, the back adjustment
+        offset of the roll is added to the prices of the previous contracts. Returns False if the prices could not be
+        appended and the chain has to be regenerated.
+        """
+        if self._update_roll_schedule() or self._roll_offset_pending:
+            return False
+
+        last_date = self._buffer_dates[self._buffer_size - 1]
+        if np.datetime64(end_date) <= last_date:
+            return True
+
+        # Check if the contract was rolled since the last call (at most one roll can be applied incrementally)
+        N = self._future_ticker.get_N()
+        position = self._contract_position
+        current_ticker = self._future_ticker.get_current_specific_ticker()
+
+        if self._contracts[position] == current_ticker:
+            roll_date = None
+        elif position + 1 < len(self._contracts) and self._contracts[position + 1] == current_ticker \
+                and position + 1 >= N and self._roll_dates[position + 1 - N] > last_date:
+            roll_date = self._roll_dates[position + 1 - N]
+        else:
+            return False
+
+        tickers = self._contracts[position:position + (1 if roll_date is None else 2)]
+        prices = self._data_provider.get_price(tickers, self._buffer_fields, pd.Timestamp(last_date), end_date,
+                                               self._frequency)
+        if not isinstance(prices, QFDataArray):
+            # Only the prices for the last date in the buffer were returned
+            return True
+
+        # Take the prices of the old contract before the roll date and the prices of the new one since the roll date
+        dates = prices.dates.values
+        contracts_indices = np.zeros(len(dates), dtype=int) if roll_date is None else (dates >= roll_date).astype(int)
+        values = prices.values[np.arange(len(dates)), contracts_indices, :]
+
+        has_prices = ~np.isnan(values).all(axis=1)
+        dates, values, contracts_indices = dates[has_prices], values[has_prices], contracts_indices[has_prices]
+
+        # The prices for the last date in the buffer may have been updated since the last call. They are replaced only
+        # if the last date in the buffer corresponds to the current contract (no adjustment offset was applied to it)
+        if len(dates) > 0 and dates[0] == last_date:
+            if position < N or self._roll_dates[position - N] <= last_date:
+                self._buffer_values[self._buffer_size - 1] = values[0]
+            dates, values, contracts_indices = dates[1:], values[1:], contracts_indices[1:]
+
+        if roll_date is None:
+            self._append_to_buffer(dates, values)
+            return True
+
+        # Similarly to the regeneration of the chain, the prices preceding the start_date are removed after the roll
+        self._remove_prices_before(start_date)
+        offset = 0.0
+        if self._futures_adjustment_method == FuturesAdjustmentMethod.BACK_ADJUSTED:
+            previous_roll_date = self._roll_dates[position - N] if position >= N else None
+            offset = self._back_adjustment_offset(roll_date, previous_roll_date, start_date, dates, values,
+                                                  contracts_indices)
+            if offset is None:
+                return False
+
+        self._append_to_buffer(dates, values)
+        if offset != 0.0:
+            # Shift the prices up to the last date preceding the day before the roll date
+            adjusted_rows = np.searchsorted(self._buffer_dates[:self._buffer_size],
+                                            roll_date - np.timedelta64(1, 'D'), side='right')
+            adjusted_columns = [index for index, field in enumerate(self._buffer_fields) if field in (
+                PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close)]
+            self._buffer_values[:adjusted_rows, adjusted_columns] += offset
+
+        self._contract_position = position + 1
+        self._specific_ticker = current_ticker.ticker
+        return True
+
+    def _back_adjustment_offset(self, roll_date: np.datetime64, previous_roll_date: Optional[np.datetime64],
+                                start_date: datetime, dates: np.ndarray, values: np.ndarray,
+                                contracts_indices: np.ndarray) -> Optional[float]:
+        """
+        Computes the back adjustment offset of the roll - the difference between the first Open price of the new
+        contract and the last Close price of the old contract (see _back_adjust). The dates and values correspond
+        to the prices, which are going to be appended to the buffer. Returns None if the offset cannot be computed
+        incrementally.
+        """
+        close_column = self._buffer_fields.index(PriceField.Close)
+        open_column = self._buffer_fields.index(PriceField.Open)
+        buffer_dates = self._buffer_dates[:self._buffer_size]
+
+        # The buffer contains prices of the old contract since the previous roll date
+        first_row_of_old_contract = 0 if previous_roll_date is None else np.searchsorted(buffer_dates,
+                                                                                         previous_roll_date)
+        old_contract_closes = np.concatenate([self._buffer_values[first_row_of_old_contract:self._buffer_size,
+                                                                  close_column],
+                                              values[contracts_indices == 0, close_column]])
+        old_contract_closes = old_contract_closes[~np.isnan(old_contract_closes)]
+
+        new_contract_opens = values[contracts_indices == 1, open_column]
+        new_contract_opens = new_contract_opens[~np.isnan(new_contract_opens)]
+
+        if len(old_contract_closes) == 0 or len(new_contract_opens) == 0:
+            return None
+
+        # The offset is applied up to the last date preceding the day before the roll date. This date should not
+        # precede the previous roll date
+        chain_dates = np.concatenate([buffer_dates, dates[contracts_indices == 0]])
+        day_before_roll_date = roll_date - np.timedelta64(1, 'D')
+        adjusted_rows = np.searchsorted(chain_dates, day_before_roll_date, side='right')
+        if adjusted_rows == 0:
+            return None
+        if previous_roll_date is not None and previous_roll_date >= np.datetime64(start_date) and \
+                chain_dates[adjusted_rows - 1] < previous_roll_date:
+            return None
+
+        return new_contract_opens[0] - old_contract_closes[-1]
+
+    def _append_to_buffer(self, dates: np.ndarray, values: np.ndarray):
+        new_size = self._buffer_size + len(dates)
+        if new_size > len(self._buffer_dates):
+            capacity = max(2 * len(self._buffer_dates), new_size)
+
+            buffer_dates = np.empty(capacity, dtype='datetime64[ns]')
+            buffer_dates[:self._buffer_size] = self._buffer_dates[:self._buffer_size]
+            self._buffer_dates = buffer_dates
+
+            buffer_values = np.empty((capacity, len(self._buffer_fields)))
+            buffer_values[:self._buffer_size] = self._buffer_values[:self._buffer_size]
+            self._buffer_values = buffer_values
+
+        self._buffer_dates[self._buffer_size:new_size] = dates
+        self._buffer_values[self._buffer_size:new_size] = values
+        self._buffer_size = new_size
+
+    def _remove_prices_before(self, start_date: datetime):
+        first_row = np.searchsorted(self._buffer_dates[:self._buffer_size], np.datetime64(start_date))
+        if first_row > 0:
+            new_size = self._buffer_size - first_row
+            self._buffer_dates[:new_size] = self._buffer_dates[first_row:self._buffer_size].copy()
+            self._buffer_values[:new_size] = self._buffer_values[first_row:self._buffer_size].copy()
+            self._buffer_size = new_size
+
+        self._first_cached_date = start_date
+
+    def _get_buffer_slice(self, fields_list: Sequence[PriceField], start_date: datetime,
+                          end_date: datetime) -> PricesDataFrame:
+        dates = self._buffer_dates[:self._buffer_size]
+        first_row = np.searchsorted(dates, np.datetime64(start_date), side='left')
+        last_row = np.searchsorted(dates, np.datetime64(end_date), side='right')
+        columns = [self._buffer_fields.index(field) for field in fields_list]
+
+        return PricesDataFrame(self._buffer_values[first_row:last_row, columns],
+                               index=pd.DatetimeIndex(dates[first_row:last_row], name=self._buffer_index_name),
+                               columns=pd.Index(fields_list, name=self._buffer_columns_name))
+
     def _preload_data_and_generate_chain(self, fields: Union[PriceField, Sequence[PriceField]], start_date: datetime,
                                          end_date: datetime, frequency: Frequency) -> \
             Union[PricesDataFrame, PricesSeries]:
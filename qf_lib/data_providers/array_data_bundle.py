@@ -0,0 +1,103 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from typing import Sequence, Tuple, Hashable
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+
+
+class ArrayDataBundle(object):
+    """
+    Columnar storage of a QFDataArray bundle. The data is kept as a single contiguous float64 numpy array
+    (dates x tickers x fields) together with precomputed positions of all tickers and fields. Dates are looked up
+    using a binary search on the sorted dates index, which makes slicing the bundle independent of the label-based
+    indexing of xarray.
+
+    Parameters
+    ----------
+    data
+        data bundle indexed by dates, (specific) tickers and fields. The dates index needs to be sorted.
+    """
+
+    def __init__(self, data: QFDataArray):
+        self._values = np.ascontiguousarray(data.values, dtype=np.float64)
+        self._dates = data.dates.to_index()
+        self._dates_values = self._dates.values
+        self._tickers = data.tickers.values
+        self._fields = data.fields.values
+        self._name = data.name
+
+        self._ticker_to_position = {ticker: i for i, ticker in enumerate(self._tickers)}
+        self._field_to_position = {field: i for i, field in enumerate(self._fields)}
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return self._dates
+
+    @property
+    def tickers(self) -> np.ndarray:
+        return self._tickers
+
+    @property
+    def fields(self) -> np.ndarray:
+        return self._fields
+
+    @property
+    def name(self):
+        return self._name
+
+    def dates_slice(self, start_date: datetime = None, end_date: datetime = None) -> slice:
+        """
+        Returns the slice of positions in the dates index, which corresponds to the [start_date, end_date] range
+        (both ends inclusive, just like label-based slicing of the QFDataArray).
+        """
+        start = 0 if start_date is None else \
+            np.searchsorted(self._dates_values, np.datetime64(start_date), side='left')
+        end = len(self._dates_values) if end_date is None else \
+            np.searchsorted(self._dates_values, np.datetime64(end_date), side='right')
+        return slice(start, end)
+
+    def tickers_positions(self, tickers: Sequence[Hashable]) -> np.ndarray:
+        return np.array([self._ticker_to_position[ticker] for ticker in tickers], dtype=np.intp)
+
+    def fields_positions(self, fields: Sequence[Hashable]) -> np.ndarray:
+        return np.array([self._field_to_position[field] for field in fields], dtype=np.intp)
+
+    def get_values(self, start_date: datetime, end_date: datetime, tickers: Sequence[Hashable],
+                   fields: Sequence[Hashable]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the dates (as numpy datetime64 values) and the 3-D array of values (dates x tickers x fields)
+        for the given date range, tickers and fields. The order of tickers and fields is the same as the order
+        of the passed sequences.
+        """
+        dates_slice = self.dates_slice(start_date, end_date)
+        tickers_positions = self.tickers_positions(tickers)
+        fields_positions = self.fields_positions(fields)
+
+        values = self._values[dates_slice, tickers_positions[:, np.newaxis], fields_positions]
+        return self._dates_values[dates_slice], values
+
+    def to_data_array(self, start_date: datetime, end_date: datetime, tickers: Sequence[Hashable],
+                      fields: Sequence[Hashable]) -> QFDataArray:
+        dates, values = self.get_values(start_date, end_date, tickers, fields)
+        return QFDataArray.create(pd.DatetimeIndex(dates, name=DATES), list(tickers), list(fields), values,
+                                  self._name)
@@ -15,12 +15,13 @@ import warnings
 
 import pandas as pd
 from datetime import datetime
-from typing import Union, Sequence, Dict, List
+from typing import Union, Sequence, Dict, List, Optional
 
 from qf_lib.common.enums.expiration_date_field import ExpirationDateField
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
 from qf_lib.common.tickers.tickers import BloombergTicker, tickers_as_strings
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
@@ -50,9 +51,22 @@ except ImportError:
 class BloombergDataProvider(AbstractPriceDataProvider, TickersUniverseProvider):
     """
     Data Provider which provides financial data from Bloomberg.
+
+    Parameters
+    ----------
+    settings: Settings
+        settings containing the host and port of the Bloomberg service
+    max_pending_requests: int
+        maximal number of historical data requests sent to Bloomberg at the same time (see HistoricalDataProvider)
+    tickers_batch_size: Optional[int]
+        maximal number of tickers in a single historical data request. If None, all tickers are requested at once
+    chunk_length: Optional[RelativeDelta]
+        maximal period of time covered by a single historical data request. If None, the whole period is requested
+        at once
     """
 
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, max_pending_requests: int = 1, tickers_batch_size: Optional[int] = None,
+                 chunk_length: Optional[RelativeDelta] = None):
         self.settings = settings
 
         self.host = settings.bloomberg.host
@@ -66,7 +80,8 @@ class BloombergDataProvider(AbstractPriceDataProvider, TickersUniverseProvider):
             session_options.setAutoRestartOnDisconnection(True)
             self.session = blpapi.Session(session_options)
 
-            self._historical_data_provider = HistoricalDataProvider(self.session)
+            self._historical_data_provider = HistoricalDataProvider(
+                self.session, max_pending_requests, tickers_batch_size, chunk_length)
             self._reference_data_provider = ReferenceDataProvider(self.session)
             self._tabular_data_provider = TabularDataProvider(self.session)
             self._futures_data_provider = FuturesDataProvider(self.session)
@@ -13,6 +13,8 @@
 #     limitations under the License.
 
 import datetime
+from itertools import count
+from typing import Iterable, Tuple, Any, Iterator, Dict
 
 import blpapi
 
@@ -134,6 +136,68 @@ def get_response_events(session):
     return response_events
 
 
+def send_pipelined_requests(session, requests: Iterable[Tuple[Any, Any]], max_pending_requests: int) \
+        -> Iterator[Tuple[Any, Any]]:
+    """
+    Sends the requests to Bloomberg, keeping up to max_pending_requests of them outstanding at the same time, and
+    yields the messages of all received (partial) responses. Each of the requests is sent with a separate
+    CorrelationId, which is used to match the received messages with the requests.
+
+    Parameters
+    ----------
+    session
+        Bloomberg session
+    requests: Iterable[Tuple[Any, Request]]
+        pairs (key, request). The requests are sent lazily, so they may be created only when they are needed
+    max_pending_requests: int
+        maximal number of requests sent to Bloomberg, for which the final response was not yet received
+
+    Returns
+    -------
+    Iterator[Tuple[Any, Message]]
+        pairs (key of the request, message of its response)
+    """
+    requests = iter(requests)
+    correlation_ids = count(1)
+    pending_requests = {}  # type: Dict[int, Any]
+
+    while True:
+        while len(pending_requests) < max_pending_requests:
+            key, request = next(requests, (None, None))
+            if request is None:
+                break
+
+            correlation_id = next(correlation_ids)
+            session.sendRequest(request, correlationId=blpapi.CorrelationId(correlation_id))
+            pending_requests[correlation_id] = key
+
+        if not pending_requests:
+            return
+
+        event = session.nextEvent()
+        event_type = event.eventType()
+        if event_type not in (blpapi.event.Event.PARTIAL_RESPONSE, blpapi.event.Event.RESPONSE):
+            continue
+
+        for message in event:
+            correlation_id = message.correlationIds()[0].value()
+            if correlation_id not in pending_requests:
+                continue
+
+            check_message_for_errors(message)
+            yield pending_requests[correlation_id], message
+
+            if event_type == blpapi.event.Event.RESPONSE:
+                del pending_requests[correlation_id]
+
+
+def check_message_for_errors(message):
+    if message.asElement().hasElement(RESPONSE_ERROR):
+        error_message = "Response error: " + str(message.asElement())
+        qf_logger.getChild(__name__).error(error_message)
+        raise BloombergError(error_message)
+
+
 def check_security_data_for_errors(security_data):
     logger = qf_logger.getChild(__name__)
     if security_data.hasElement(FIELD_EXCEPTIONS):
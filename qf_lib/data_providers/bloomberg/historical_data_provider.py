@@ -13,36 +13,57 @@
 #     limitations under the License.
 
 from datetime import datetime
-from typing import Any, Sequence, Dict
+from typing import Any, Sequence, Dict, Optional, List, Tuple, Iterator
 
 import numpy as np
 import pandas as pd
 
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
 from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dimension_names import DATES
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.data_providers.bloomberg.bloomberg_names import REF_DATA_SERVICE_URI, CURRENCY, START_DATE, END_DATE, \
     PERIODICITY_SELECTION, PERIODICITY_ADJUSTMENT, SECURITY, FIELD_DATA, DATE, \
-    START_DATE_TIME, END_DATE_TIME, INTERVAL, BAR_TICK_DATA
+    START_DATE_TIME, END_DATE_TIME, INTERVAL, BAR_TICK_DATA, SECURITY_DATA, BAR_DATA, TIME
 from qf_lib.data_providers.bloomberg.exceptions import BloombergError
 from qf_lib.data_providers.bloomberg.helpers import set_tickers, set_fields, convert_to_bloomberg_date, \
-    convert_to_bloomberg_freq, get_response_events, check_event_for_errors, check_security_data_for_errors, \
-    extract_security_data, set_ticker, extract_bar_data
-from qf_lib.data_providers.helpers import tickers_dict_to_data_array
+    convert_to_bloomberg_freq, check_security_data_for_errors, set_ticker, send_pipelined_requests
 
 
 class HistoricalDataProvider(object):
     """
     Used for providing historical data from Bloomberg.
+
+    The requests are pipelined: up to max_pending_requests of them are sent to Bloomberg at the same time and the
+    responses are matched with the requests using their CorrelationIds. Large requests can be split into batches of
+    tickers (Historical Data Requests) and into chunks of dates (both Historical Data and Intraday Bar Requests).
+    Intraday Bar Requests are always sent separately for each of the tickers.
+
+    Parameters
+    ----------
+    session
+        Bloomberg session
+    max_pending_requests: int
+        maximal number of requests sent at the same time. By default, each request is sent only after the response
+        for the previous one was received
+    tickers_batch_size: Optional[int]
+        maximal number of tickers in a single Historical Data Request. If None, all tickers are requested at once
+    chunk_length: Optional[RelativeDelta]
+        maximal period of time covered by a single request. If None, the whole period is requested at once
     """
 
     # These revert to the actual date from today (if the end date is left blank) or from the End Date
     # (see PERIODICITY_ADJUSTMENT in blpapi-developers-guide for more)
     PERIODICITY_ADJUSTMENT = "ACTUAL"
 
-    def __init__(self, session):
+    def __init__(self, session, max_pending_requests: int = 1, tickers_batch_size: Optional[int] = None,
+                 chunk_length: Optional[RelativeDelta] = None):
         self._session = session
+        self._max_pending_requests = max_pending_requests
+        self._tickers_batch_size = tickers_batch_size
+        self._chunk_length = chunk_length
         self.logger = qf_logger.getChild(self.__class__.__name__)
 
     def get(self, tickers: Sequence[str], fields: Sequence[str], start_date: datetime, end_date: datetime,
@@ -69,39 +90,55 @@ class HistoricalDataProvider(object):
 
     def _get_historical_data(self, ref_data_service, tickers, fields, start_date, end_date, frequency, currency,
                              override_name, override_value):
-        request = ref_data_service.createRequest("HistoricalDataRequest")
-        self._set_time_period(request, start_date, end_date, frequency)
+        def create_requests():
+            for tickers_batch in self._tickers_batches(tickers):
+                for chunk_start_date, chunk_end_date in self._date_chunks(start_date, end_date):
+                    request = ref_data_service.createRequest("HistoricalDataRequest")
+                    self._set_time_period(request, chunk_start_date, chunk_end_date, frequency)
 
-        set_tickers(request, tickers)
-        set_fields(request, fields)
+                    set_tickers(request, tickers_batch)
+                    set_fields(request, fields)
 
-        self._set_currency(currency, request)
+                    self._set_currency(currency, request)
 
-        if override_name is not None:
-            self._set_override(request, override_name, override_value)
+                    if override_name is not None:
+                        self._set_override(request, override_name, override_value)
 
-        self._session.sendRequest(request)
+                    yield None, request
 
-        return self._receive_historical_response(tickers, fields)
+        return self._receive_historical_response(create_requests(), tickers, fields)
 
     def _get_intraday_data(self, ref_data_service, tickers, fields, start_date, end_date, frequency):
         """
         Sends requests for each ticker and combines the outputs together.
         """
+        def create_requests():
+            for ticker_str in tickers:
+                for chunk_start_date, chunk_end_date in self._date_chunks(start_date, end_date):
+                    request = ref_data_service.createRequest("IntradayBarRequest")
+                    self._set_intraday_time_period(request, chunk_start_date, chunk_end_date, frequency)
+
+                    set_ticker(request, ticker_str)
+                    yield ticker_str, request
 
-        tickers_data_dict = dict()
+        return self._receive_intraday_response(create_requests(), tickers, fields)
 
-        for ticker_str in tickers:
-            request = ref_data_service.createRequest("IntradayBarRequest")
-            self._set_intraday_time_period(request, start_date, end_date, frequency)
+    def _tickers_batches(self, tickers: Sequence[str]) -> List[Sequence[str]]:
+        if self._tickers_batch_size is None:
+            return [tickers]
+        return [tickers[i:i + self._tickers_batch_size] for i in range(0, len(tickers), self._tickers_batch_size)]
 
-            set_ticker(request, ticker_str)
-            self._session.sendRequest(request)
+    def _date_chunks(self, start_date: datetime, end_date: datetime) -> List[Tuple[datetime, datetime]]:
+        if self._chunk_length is None:
+            return [(start_date, end_date)]
 
-            ticker = BloombergTicker.from_string(ticker_str)
-            tickers_data_dict[ticker] = self._receive_intraday_response(ticker, fields)
+        # the consecutive chunks share their boundary dates, the duplicated data is removed afterwards
+        boundaries = [start_date]
+        while boundaries[-1] + self._chunk_length < end_date:
+            boundaries.append(boundaries[-1] + self._chunk_length)
+        boundaries.append(end_date)
 
-        return tickers_dict_to_data_array(tickers_data_dict, tickers, fields)
+        return list(zip(boundaries[:-1], boundaries[1:]))
 
     @classmethod
     def _set_currency(cls, currency, request):
@@ -145,83 +182,83 @@ class HistoricalDataProvider(object):
 
         return result
 
-    def _receive_historical_response(self, requested_tickers, requested_fields):
-        response_events = get_response_events(self._session)
-
-        # mapping: ticker -> DataArray[dates, fields]
-        tickers_data_dict = dict()  # type: Dict[BloombergTicker, pd.DataFrame]
-
-        for event in response_events:
-            check_event_for_errors(event)
-            security_data = extract_security_data(event)
+    def _receive_historical_response(self, requests: Iterator[Tuple[Any, Any]], requested_tickers, requested_fields):
+        # mapping: ticker -> list of (dates, values[dates, fields]) pairs
+        tickers_data_dict = {ticker: [] for ticker in requested_tickers}  # type: Dict[str, List[Tuple]]
 
+        for _, message in send_pipelined_requests(self._session, requests, self._max_pending_requests):
+            security_data = message.getElement(SECURITY_DATA)
             security_name = security_data.getElementAsString(SECURITY)
-            ticker = BloombergTicker.from_string(security_name)
 
             try:
                 check_security_data_for_errors(security_data)
-
                 field_data_array = security_data.getElement(FIELD_DATA)
-                field_data_list = [field_data_array.getValueAsElement(i) for i in range(field_data_array.numValues())]
-                dates = [pd.to_datetime(x.getElementAsDatetime(DATE)) for x in field_data_list]
-
-                data = np.empty((len(dates), len(requested_fields)))
-                data[:] = np.nan
-
-                dates_fields_values = pd.DataFrame(data, index=dates, columns=requested_fields)
-
-                for field_name in requested_fields:
-                    dates_fields_values.loc[:, field_name] = [
-                        self._get_float_or_nan(data_of_date_elem, field_name) for data_of_date_elem in field_data_list]
-
-                if ticker not in tickers_data_dict.keys():
-                    tickers_data_dict[ticker] = dates_fields_values
-                else:
-                    tickers_data_dict[ticker] = tickers_data_dict[ticker].append(dates_fields_values)
+                tickers_data_dict.setdefault(security_name, []).append(
+                    self._read_values(field_data_array, DATE, requested_fields))
 
             except BloombergError:
                 self.logger.exception("Error in the received historical response")
 
-        return tickers_dict_to_data_array(tickers_data_dict, requested_tickers, requested_fields)
+        return self._create_data_array(tickers_data_dict, requested_tickers, requested_fields)
 
-    def _receive_intraday_response(self, requested_ticker, requested_fields):
+    def _receive_intraday_response(self, requests: Iterator[Tuple[Any, Any]], requested_tickers, requested_fields):
         """
-        The response for intraday bar is related to a single ticker.
+        The response for intraday bar is related to a single ticker, which is identified by the request.
         """
-        response_events = get_response_events(self._session)
-        tickers_data_dict = dict()
-
-        for event in response_events:
-            check_event_for_errors(event)
-            bar_data = extract_bar_data(event)
+        tickers_data_dict = {ticker: [] for ticker in requested_tickers}  # type: Dict[str, List[Tuple]]
 
+        for ticker_str, message in send_pipelined_requests(self._session, requests, self._max_pending_requests):
             try:
-                bar_tick_data_array = bar_data.getElement(BAR_TICK_DATA)
+                bar_tick_data_array = message.getElement(BAR_DATA).getElement(BAR_TICK_DATA)
+                tickers_data_dict[ticker_str].append(
+                    self._read_values(bar_tick_data_array, TIME, requested_fields))
 
-                bar_tick_data_list = [bar_tick_data_array.getValueAsElement(i) for i in
-                                      range(bar_tick_data_array.numValues())]
-                dates = [pd.to_datetime(e.getElementAsDatetime("time")) for e in bar_tick_data_list]
-
-                data = np.empty((len(dates), len(requested_fields)))
-                data[:] = np.nan
+            except BloombergError:
+                self.logger.exception("Error in the received historical response")
 
-                dates_fields_values = pd.DataFrame(data, index=dates, columns=requested_fields)
+        return self._create_data_array(tickers_data_dict, requested_tickers, requested_fields)
 
-                for field_name in requested_fields:
-                    dates_fields_values.loc[:, field_name] = [
-                        self._get_float_or_nan(data_of_date_elem, field_name)
-                        for data_of_date_elem in bar_tick_data_list
-                    ]
+    def _read_values(self, data_array_element, date_field_name, requested_fields) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reads the dates and values of all requested fields from the array of elements (one element per date) into
+        preallocated numpy arrays.
+        """
+        num_of_dates = data_array_element.numValues()
+        dates = np.empty(num_of_dates, dtype="datetime64[ns]")
+        values = np.empty((num_of_dates, len(requested_fields)))
 
-                if requested_ticker not in tickers_data_dict.keys():
-                    tickers_data_dict[requested_ticker] = dates_fields_values
-                else:
-                    tickers_data_dict[requested_ticker] = tickers_data_dict[requested_ticker].append(dates_fields_values)
+        for date_index in range(num_of_dates):
+            data_of_date_elem = data_array_element.getValueAsElement(date_index)
+            dates[date_index] = pd.Timestamp(data_of_date_elem.getElementAsDatetime(date_field_name)).to_datetime64()
+            for field_index, field_name in enumerate(requested_fields):
+                values[date_index, field_index] = self._get_float_or_nan(data_of_date_elem, field_name)
 
-            except BloombergError:
-                self.logger.exception("Error in the received historical response")
+        return dates, values
 
-        return tickers_data_dict[requested_ticker]
+    @staticmethod
+    def _create_data_array(tickers_data_dict: Dict[str, List[Tuple[np.ndarray, np.ndarray]]], requested_tickers,
+                           requested_fields) -> QFDataArray:
+        """
+        Merges the data received for all tickers into one QFDataArray. If some dates were received more than once
+        (in the overlapping chunks), the values received first are used.
+        """
+        tickers_dates_and_values = []
+        for ticker in requested_tickers:
+            data = tickers_data_dict[ticker]
+            dates = np.concatenate([dates for dates, _ in data]) if data else np.array([], dtype="datetime64[ns]")
+            values = np.concatenate([values for _, values in data]) if data else np.empty((0, len(requested_fields)))
+
+            dates, first_occurrences = np.unique(dates, return_index=True)
+            tickers_dates_and_values.append((dates, values[first_occurrences]))
+
+        all_dates = np.unique(np.concatenate([dates for dates, _ in tickers_dates_and_values])) \
+            if tickers_dates_and_values else np.array([], dtype="datetime64[ns]")
+        values = np.full((len(all_dates), len(requested_tickers), len(requested_fields)), np.nan)
+        for ticker_index, (dates, ticker_values) in enumerate(tickers_dates_and_values):
+            values[np.searchsorted(all_dates, dates), ticker_index, :] = ticker_values
+
+        tickers = [BloombergTicker.from_string(ticker) for ticker in requested_tickers]
+        return QFDataArray.create(pd.DatetimeIndex(all_dates, name=DATES), tickers, requested_fields, values)
 
     @staticmethod
     def _get_subdictionary(dictionary, key):
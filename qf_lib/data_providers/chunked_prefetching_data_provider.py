@@ -0,0 +1,224 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime, timedelta
+from typing import Sequence, Union, Optional, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.data_bundle_cache import DataBundleCache
+from qf_lib.data_providers.data_provider import DataProvider
+from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+
+
+class ChunkedPrefetchingDataProvider(PrefetchingDataProvider):
+    """
+    PrefetchingDataProvider, which instead of downloading the whole data bundle at startup, downloads it in chunks
+    (periods of chunk_length, e.g. one month) whenever the data from a chunk is requested for the first time. After
+    a chunk is loaded, the next one is downloaded in a background thread. The chunks, which end before the longest
+    period of time requested so far (counting back from the latest requested date), are removed from memory.
+    Therefore, as the data is requested chronologically in backtests, the memory usage is proportional to the longest
+    lookback period and not to the length of the backtest. It is meant to be used with the intraday data.
+
+    The background thread is stopped as soon as there are no more chunks to prefetch or when close() is called.
+
+    Parameters
+    -----------
+    data_provider: DataProvider
+        data provider used to download the data
+    tickers: Ticker, Sequence[Ticker]
+        one or a list of tickers (see PrefetchingDataProvider)
+    fields: PriceField, Sequence[PriceField]
+        fields that should be downloaded
+    start_date: datetime
+        first date to be downloaded
+    end_date: datetime
+        last date to be downloaded
+    frequency: Frequency
+        frequency of the data
+    chunk_length: RelativeDelta
+        length of the period of each of the chunks (by default one month)
+    use_array_storage: bool
+        if True, the loaded data is served from a columnar, numpy-based storage (see PresetDataProvider)
+    cache_directory: str
+        if provided, the chunks are downloaded using the persistent DataBundleCache in this directory
+    cache_namespace: str
+        namespace of the data in the DataBundleCache (see PrefetchingDataProvider)
+    """
+
+    def __init__(self, data_provider: DataProvider,
+                 tickers: Union[Ticker, Sequence[Ticker]],
+                 fields: Union[PriceField, Sequence[PriceField]],
+                 start_date: datetime, end_date: datetime,
+                 frequency: Frequency, chunk_length: RelativeDelta = None, use_array_storage: bool = False,
+                 cache_directory: Optional[str] = None, cache_namespace: Optional[str] = None):
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+        chunk_length = chunk_length if chunk_length is not None else RelativeDelta(months=1)
+
+        self._chunks_boundaries = [start_date]  # type: List[datetime]
+        while self._chunks_boundaries[-1] + chunk_length < end_date:
+            self._chunks_boundaries.append(self._chunks_boundaries[-1] + chunk_length)
+        self._chunks_boundaries.append(end_date)
+
+        self._loaded_chunks = {}  # type: Dict[int, QFDataArray]
+        self._prefetched_chunk_index = None  # type: Optional[int]
+        self._prefetched_chunk = None  # type: Optional[Future]
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+
+        self._latest_requested_date = None  # type: Optional[datetime]
+        self._longest_lookback = timedelta(0)
+
+        super().__init__(data_provider, tickers, fields, start_date, end_date, frequency, use_array_storage,
+                         cache_directory, cache_namespace)
+
+    @property
+    def loaded_chunks_dates(self) -> List[datetime]:
+        """ Start dates of all chunks, which are currently loaded into memory. """
+        return [self._chunks_boundaries[index] for index in sorted(self._loaded_chunks.keys())]
+
+    def close(self):
+        """
+        Stops the thread prefetching the chunks (after the chunk, which is currently being downloaded, is downloaded).
+        The data provider may be still used afterwards - the thread is started again if needed.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __del__(self):
+        # the executor may not exist if the initialization failed
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=False)
+
+    def get_price(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[PriceField, Sequence[PriceField]],
+                  start_date: datetime, end_date: datetime = None, frequency: Frequency = Frequency.DAILY):
+        # if the start_date is not provided, all the data since the beginning of the bundle is returned
+        start_date = start_date if start_date is not None else self._start_date
+        self._load_chunks(start_date, end_date)
+        return super().get_price(tickers, fields, start_date, end_date, frequency)
+
+    def get_history(self, tickers: Union[Ticker, Sequence[Ticker]], fields: Union[str, Sequence[str]],
+                    start_date: datetime, end_date: datetime = None, frequency: Frequency = Frequency.DAILY, **kwargs
+                    ) -> Union[QFSeries, QFDataFrame, QFDataArray]:
+        start_date = start_date if start_date is not None else self._start_date
+        self._load_chunks(start_date, end_date)
+        return super().get_history(tickers, fields, start_date, end_date, frequency, **kwargs)
+
+    def _download_prices(self, data_provider: DataProvider, tickers: Sequence[Ticker], fields: Sequence[PriceField],
+                         start_date: datetime, end_date: datetime, frequency: Frequency,
+                         cache: Optional[DataBundleCache]) -> QFDataArray:
+        # nothing is downloaded at startup, the chunks are downloaded only when they are requested
+        self._data_provider = data_provider
+        self._tickers = list(tickers)
+        self._fields = list(fields)
+        self._cache = cache
+        self._frequency = frequency
+
+        return self._concatenate_chunks([])
+
+    def _load_chunks(self, start_date: datetime, end_date: Optional[datetime]):
+        end_date = min(end_date, self._end_date) if end_date is not None else self._end_date
+        start_date = max(start_date, self._start_date)
+        if start_date > end_date:
+            return
+
+        self._longest_lookback = max(self._longest_lookback, end_date - start_date)
+        self._latest_requested_date = max(self._latest_requested_date or end_date, end_date)
+
+        first_chunk_index = self._chunk_index(start_date)
+        last_chunk_index = self._chunk_index(end_date)
+        requested_chunks = range(first_chunk_index, last_chunk_index + 1)
+
+        if all(index in self._loaded_chunks for index in requested_chunks):
+            return
+
+        for index in requested_chunks:
+            if index not in self._loaded_chunks:
+                self._loaded_chunks[index] = self._get_chunk(index)
+
+        self._remove_old_chunks(first_chunk_index)
+        self._set_data_bundle(self._concatenate_chunks(
+            [self._loaded_chunks[index] for index in sorted(self._loaded_chunks.keys())]))
+
+        next_chunk_index = last_chunk_index + 1
+        if next_chunk_index < len(self._chunks_boundaries) - 1 and next_chunk_index not in self._loaded_chunks:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._prefetched_chunk_index = next_chunk_index
+            self._prefetched_chunk = self._executor.submit(self._download_chunk, next_chunk_index)
+        elif self._prefetched_chunk is None:
+            # there is nothing to prefetch, so the thread is not needed anymore
+            self.close()
+
+    def _get_chunk(self, index: int) -> QFDataArray:
+        if self._prefetched_chunk is not None:
+            # wait for the prefetching to finish, so that the data provider is never used by two threads at once
+            prefetched_chunk_index, prefetched_chunk = self._prefetched_chunk_index, self._prefetched_chunk.result()
+            self._prefetched_chunk_index = self._prefetched_chunk = None
+
+            if prefetched_chunk_index == index:
+                return prefetched_chunk
+            self._loaded_chunks[prefetched_chunk_index] = prefetched_chunk
+
+        return self._download_chunk(index)
+
+    def _download_chunk(self, index: int) -> QFDataArray:
+        chunk_start_date = self._chunks_boundaries[index]
+        chunk_end_date = self._chunks_boundaries[index + 1]
+        is_last_chunk = index == len(self._chunks_boundaries) - 2
+        self.logger.info("Downloading data from {} to {}".format(chunk_start_date, chunk_end_date))
+
+        data_array = super()._download_prices(self._data_provider, self._tickers, self._fields, chunk_start_date,
+                                              chunk_end_date, self._frequency, self._cache)
+        data_array = data_array.reindex(tickers=self._tickers, fields=self._fields)
+
+        # the end of each chunk (except of the last one) belongs to the next chunk
+        dates = data_array.dates.to_index()
+        in_chunk = (dates >= chunk_start_date) & ((dates < chunk_end_date) | is_last_chunk)
+        return data_array[in_chunk]
+
+    def _remove_old_chunks(self, first_requested_chunk_index: int):
+        """
+        Removes the chunks, which end before the longest lookback period counting back from the latest requested date.
+        """
+        oldest_needed_date = self._latest_requested_date - self._longest_lookback
+        oldest_needed_chunk_index = min(self._chunk_index(max(oldest_needed_date, self._start_date)),
+                                        first_requested_chunk_index)
+
+        for index in [index for index in self._loaded_chunks.keys() if index < oldest_needed_chunk_index]:
+            del self._loaded_chunks[index]
+
+    def _chunk_index(self, date: datetime) -> int:
+        return min(bisect_right(self._chunks_boundaries, date) - 1, len(self._chunks_boundaries) - 2)
+
+    def _concatenate_chunks(self, chunks: Sequence[QFDataArray]) -> QFDataArray:
+        if chunks:
+            dates = pd.DatetimeIndex(np.concatenate([chunk.dates.values for chunk in chunks]), name=DATES)
+            values = np.concatenate([chunk.values for chunk in chunks])
+        else:
+            dates = pd.DatetimeIndex([], name=DATES)
+            values = np.empty((0, len(self._tickers), len(self._fields)))
+
+        return QFDataArray.create(dates, self._tickers, self._fields, values)
@@ -0,0 +1,266 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import hashlib
+import os
+import pickle
+from collections import defaultdict
+from datetime import datetime
+from typing import Sequence, Dict, Optional, Tuple, List
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.expiration_date_field import ExpirationDateField
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.data_provider import DataProvider
+
+
+class _CacheEntry(object):
+    """ Cached prices of one ticker: dates x fields values and the range of dates, for which the data was fetched. """
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray, fields: List[PriceField], start_date: np.datetime64,
+                 end_date: np.datetime64):
+        self.dates = dates
+        self.values = values
+        self.fields = fields
+        self.start_date = start_date
+        self.end_date = end_date
+
+
+class DataBundleCache(object):
+    """
+    Persistent, on-disk cache of the data bundles downloaded by the PrefetchingDataProvider. The prices of each ticker
+    are kept in a separate numpy file (.npz) containing the dates, the values of all the cached fields (one column per
+    field) and the range of dates, for which the data was downloaded. The files are named after the hash of the
+    namespace, data provider type, frequency and ticker. Only the tickers, fields and date ranges, which are missing in
+    the cache, are downloaded from the data provider and merged into the cache. The bars, which are not closed yet
+    (e.g. today's bar in case of daily frequency), are downloaded again with every request. The futures chains are
+    cached as well
+    (they are downloaded again only if the last cached contract expires before the end of the requested period).
+
+    The cache does not check if the data already stored in it changed in the data provider (e.g. due to corrections).
+    In order to refresh it, remove the cache directory.
+
+    Parameters
+    ----------
+    cache_directory
+        path to the directory, in which the cached data is stored (it is created if it does not exist)
+    namespace
+        name identifying the source of the data. The data providers of the same type serving different data (e.g.
+        connected to different databases) need to use different namespaces, otherwise they share the cached data
+    """
+
+    def __init__(self, cache_directory: str, namespace: Optional[str] = None):
+        self.cache_directory = cache_directory
+        self.namespace = namespace
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+    def get_price(self, data_provider: DataProvider, tickers: Sequence[Ticker], fields: Sequence[PriceField],
+                  start_date: datetime, end_date: datetime, frequency: Frequency) -> QFDataArray:
+        """
+        Returns the prices of the given tickers as a QFDataArray (dates x tickers x fields), just like the
+        data_provider.get_price would. Only the data, which is missing in the cache, is downloaded from the data
+        provider.
+        """
+        start_date = np.datetime64(start_date, "ns")
+        end_date = np.datetime64(end_date, "ns")
+        # the bars, which are not closed yet (e.g. today's bar in case of daily frequency), may still change, so they
+        # are never marked as cached
+        cached_end_date = min(end_date, self._last_closed_bar_end_date(frequency))
+
+        entries = {ticker: self._load_entry(data_provider, ticker, frequency) for ticker in tickers}
+
+        # group the tickers with the same missing data in order to download them together
+        missing_data_to_tickers = defaultdict(list)  # type: Dict[Tuple, List[Ticker]]
+        for ticker, entry in entries.items():
+            for missing_data in self._missing_data(entry, fields, start_date, end_date):
+                missing_data_to_tickers[missing_data].append(ticker)
+
+        for (missing_fields, missing_start_date, missing_end_date), missing_tickers in \
+                missing_data_to_tickers.items():
+            self.logger.info("Downloading {} tickers from {} to {}".format(
+                len(missing_tickers), missing_start_date, missing_end_date))
+            data_array = data_provider.get_price(
+                missing_tickers, list(missing_fields), pd.Timestamp(missing_start_date).to_pydatetime(),
+                pd.Timestamp(missing_end_date).to_pydatetime(), frequency)
+            data_array = data_array.reindex(tickers=missing_tickers, fields=list(missing_fields))
+
+            for ticker_index, ticker in enumerate(missing_tickers):
+                entry = self._merged_entry(
+                    entries[ticker], data_array.dates.values, data_array.values[:, ticker_index, :],
+                    list(missing_fields), missing_start_date, min(missing_end_date, cached_end_date))
+                entries[ticker] = entry
+                self._save_entry(data_provider, ticker, frequency, entry)
+
+        return self._create_data_array(entries, tickers, fields, start_date, end_date)
+
+    def get_futures_chain_tickers(self, data_provider: DataProvider, tickers: Sequence[FutureTicker],
+                                  expiration_date_fields: Sequence[ExpirationDateField],
+                                  end_date: Optional[datetime] = None) -> Dict[FutureTicker, QFDataFrame]:
+        """
+        Returns the futures chains of the given tickers, just like the data_provider.get_futures_chain_tickers would.
+        Only the chains, which are missing in the cache (or which end before the end_date), are downloaded from the
+        data provider.
+        """
+        futures_chains = {}
+        missing_tickers = []
+
+        for ticker in tickers:
+            path = self._futures_chain_path(data_provider, ticker, expiration_date_fields)
+            futures_chain = None
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    futures_chain = pickle.load(file)
+
+            if futures_chain is None or (end_date is not None and futures_chain.max().max() < end_date):
+                missing_tickers.append(ticker)
+            else:
+                futures_chains[ticker] = futures_chain
+
+        if missing_tickers:
+            missing_futures_chains = data_provider.get_futures_chain_tickers(missing_tickers, expiration_date_fields)
+            for ticker, futures_chain in missing_futures_chains.items():
+                path = self._futures_chain_path(data_provider, ticker, expiration_date_fields)
+                self._write_atomically(path, lambda file: pickle.dump(futures_chain, file))
+                futures_chains[ticker] = futures_chain
+
+        return {ticker: futures_chains[ticker] for ticker in tickers}
+
+    @staticmethod
+    def _missing_data(entry: Optional[_CacheEntry], fields: Sequence[PriceField], start_date: np.datetime64,
+                      end_date: np.datetime64) -> List[Tuple[Tuple[PriceField, ...], np.datetime64, np.datetime64]]:
+        """
+        Returns the list of (fields, start date, end date) tuples, which need to be downloaded and merged into the
+        entry in order to contain all the requested data.
+        """
+        if entry is None:
+            return [(tuple(fields), start_date, end_date)]
+
+        if not set(fields).issubset(entry.fields):
+            # download again all the data of the ticker, so that all the cached fields cover the same dates
+            all_fields = tuple(entry.fields) + tuple(f for f in fields if f not in entry.fields)
+            return [(all_fields, min(start_date, entry.start_date), max(end_date, entry.end_date))]
+
+        missing_data = []
+        if start_date < entry.start_date:
+            missing_data.append((tuple(entry.fields), start_date, entry.start_date))
+        if end_date > entry.end_date:
+            missing_data.append((tuple(entry.fields), entry.end_date, end_date))
+
+        return missing_data
+
+    @staticmethod
+    def _merged_entry(entry: Optional[_CacheEntry], dates: np.ndarray, values: np.ndarray, fields: List[PriceField],
+                      start_date: np.datetime64, end_date: np.datetime64) -> _CacheEntry:
+        if entry is None or set(fields) != set(entry.fields):
+            # the downloaded data contains all the dates of the entry
+            return _CacheEntry(dates, values, fields, start_date, end_date)
+
+        values = values[:, [fields.index(field) for field in entry.fields]]
+
+        # the values for the dates after the end of the cached range (e.g. the bars, which were not closed yet) are
+        # replaced by the downloaded ones
+        is_outdated = (entry.dates > entry.end_date) & np.isin(entry.dates, dates)
+        entry_dates, entry_values = entry.dates[~is_outdated], entry.values[~is_outdated]
+
+        # keep the cached values for the dates, which were downloaded again
+        is_new_date = ~np.isin(dates, entry_dates)
+        all_dates = np.concatenate([entry_dates, dates[is_new_date]])
+        all_values = np.concatenate([entry_values, values[is_new_date]])
+        order = np.argsort(all_dates, kind="mergesort")
+
+        return _CacheEntry(all_dates[order], all_values[order], entry.fields, min(start_date, entry.start_date),
+                           max(end_date, entry.end_date))
+
+    @staticmethod
+    def _last_closed_bar_end_date(frequency: Frequency) -> np.datetime64:
+        """
+        Returns the latest date, up to which all the bars of the given frequency are closed. The bar, which started
+        at the beginning of the current day (or of the current intraday period), is still open.
+        """
+        now = pd.Timestamp(datetime.now())
+        if frequency > Frequency.DAILY:
+            current_bar_start_date = now.floor(frequency.to_pandas_freq())
+        else:
+            current_bar_start_date = now.normalize()
+
+        return np.datetime64(current_bar_start_date, "ns") - np.timedelta64(1, "ns")
+
+    @staticmethod
+    def _create_data_array(entries: Dict[Ticker, _CacheEntry], tickers: Sequence[Ticker],
+                           fields: Sequence[PriceField], start_date: np.datetime64,
+                           end_date: np.datetime64) -> QFDataArray:
+        entries_dates = [entries[ticker].dates for ticker in tickers]
+        all_dates = np.unique(np.concatenate(entries_dates)) if entries_dates else np.array([], dtype="datetime64[ns]")
+        all_dates = all_dates[(all_dates >= start_date) & (all_dates <= end_date)]
+
+        values = np.full((len(all_dates), len(tickers), len(fields)), np.nan)
+        for ticker_index, ticker in enumerate(tickers):
+            entry = entries[ticker]
+            in_range = (entry.dates >= start_date) & (entry.dates <= end_date)
+            dates_positions = np.searchsorted(all_dates, entry.dates[in_range])
+            fields_positions = [entry.fields.index(field) for field in fields]
+            values[dates_positions, ticker_index, :] = entry.values[in_range][:, fields_positions]
+
+        return QFDataArray.create(pd.DatetimeIndex(all_dates, name=DATES), tickers, fields, values)
+
+    def _load_entry(self, data_provider: DataProvider, ticker: Ticker, frequency: Frequency) -> Optional[_CacheEntry]:
+        path = self._entry_path(data_provider, ticker, frequency)
+        if not os.path.exists(path):
+            return None
+
+        with np.load(path) as entry_file:
+            return _CacheEntry(dates=entry_file["dates"], values=entry_file["values"],
+                               fields=[PriceField[name] for name in entry_file["fields"]],
+                               start_date=entry_file["start_date"][0], end_date=entry_file["end_date"][0])
+
+    def _save_entry(self, data_provider: DataProvider, ticker: Ticker, frequency: Frequency, entry: _CacheEntry):
+        path = self._entry_path(data_provider, ticker, frequency)
+        self._write_atomically(path, lambda file: np.savez(
+            file, dates=entry.dates.astype("datetime64[ns]"), values=entry.values.astype(np.float64),
+            fields=np.array([field.name for field in entry.fields]),
+            start_date=np.array([entry.start_date], dtype="datetime64[ns]"),
+            end_date=np.array([entry.end_date], dtype="datetime64[ns]")))
+
+    def _entry_path(self, data_provider: DataProvider, ticker: Ticker, frequency: Frequency) -> str:
+        key = "{}:{}:{}:{}".format(type(data_provider).__name__, frequency.name, type(ticker).__name__,
+                                   ticker.as_string())
+        return os.path.join(self.cache_directory, "prices", self._hash(key) + ".npz")
+
+    def _futures_chain_path(self, data_provider: DataProvider, ticker: FutureTicker,
+                            expiration_date_fields: Sequence[ExpirationDateField]) -> str:
+        key = "{}:{}:{}:{}".format(type(data_provider).__name__, type(ticker).__name__, ticker.family_id,
+                                   ",".join(field.name for field in expiration_date_fields))
+        return os.path.join(self.cache_directory, "futures_chains", self._hash(key) + ".pkl")
+
+    def _hash(self, key: str) -> str:
+        if self.namespace is not None:
+            key = "{}:{}".format(self.namespace, key)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _write_atomically(path: str, write_function):
+        """ Writes the file using the write_function, so that the partially written files are never read. """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            write_function(file)
+        os.replace(temporary_path, path)
@@ -12,9 +12,9 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from itertools import groupby
-from typing import Sequence, Union, Dict, Type
+from typing import Sequence, Union, Dict, Type, Optional, List, Tuple, Callable, Any
 
 from qf_lib.common.enums.expiration_date_field import ExpirationDateField
 from qf_lib.common.enums.frequency import Frequency
@@ -39,11 +39,37 @@ from qf_lib.data_providers.bloomberg.bloomberg_data_provider import BloombergDat
 class GeneralPriceProvider(DataProvider):
     """
     The main class that should be used in order to access prices of financial instruments.
+
+    The requested tickers are partitioned by the data provider, so that each of the data providers is called only
+    once per request. By default the data providers are called one after another. If max_workers is given, the
+    requests to different data providers are sent concurrently on a thread pool, so that the requests for tickers
+    of different types take as long as the slowest of the data providers (instead of the sum of their latencies).
+
+    Parameters
+    ----------
+    bloomberg: BloombergDataProvider
+        data provider used for the Bloomberg tickers
+    quandl: QuandlDataProvider
+        data provider used for the Quandl tickers
+    haver: HaverDataProvider
+        data provider used for the Haver tickers
+    cryptocurrency: CryptoCurrencyDataProvider
+        data provider used for the cryptocurrency tickers
+    max_workers: int
+        maximal number of data providers called concurrently. If None (default), the data providers are called
+        sequentially
+    timeout: float
+        maximal number of seconds to wait for the results of all the data providers called in one request (used only
+        if max_workers is given). If any of the data providers does not return the data in time, TimeoutError is
+        raised
     """
 
     def __init__(self, bloomberg: BloombergDataProvider = None, quandl: QuandlDataProvider = None,
-                 haver: HaverDataProvider = None, cryptocurrency: CryptoCurrencyDataProvider = None):
+                 haver: HaverDataProvider = None, cryptocurrency: CryptoCurrencyDataProvider = None,
+                 max_workers: Optional[int] = None, timeout: Optional[float] = None):
         self._ticker_type_to_data_provider_dict = {}  # type: Dict[Type[Ticker], DataProvider]
+        self._max_workers = max_workers
+        self._timeout = timeout
 
         for provider in [bloomberg, quandl, haver, cryptocurrency]:
             if provider is not None:
@@ -143,9 +169,7 @@ class GeneralPriceProvider(DataProvider):
         def get_data_func(data_prov: DataProvider, tickers_for_single_data_provider) -> Dict[FutureTicker, QFSeries]:
             return data_prov.get_futures_chain_tickers(tickers_for_single_data_provider, ExpirationDateField.all_dates())
 
-        for ticker_class, ticker_group in groupby(tickers, lambda t: type(t)):
-            data_provider = self._identify_data_provider(ticker_class)
-            partial_result = get_data_func(data_provider, list(ticker_group))
+        for partial_result in self._get_partial_results(tickers, get_data_func):
             if partial_result is not None:
                 results.update(partial_result)
 
@@ -175,20 +199,59 @@ class GeneralPriceProvider(DataProvider):
         got_single_date = start_date is not None and (
             (start_date == end_date) if frequency <= Frequency.DAILY else False
         )
-        partial_results = []
-
-        for ticker_class, ticker_group in groupby(tickers, lambda t: type(t)):
-            data_provider = self._identify_data_provider(ticker_class)
-
-            partial_result = get_data_func(data_provider, list(ticker_group))
-            if partial_result is not None:
-                partial_results.append(partial_result)
+        partial_results = [partial_result for partial_result in self._get_partial_results(tickers, get_data_func)
+                           if partial_result is not None]
 
         result = QFDataArray.concat(partial_results, dim=TICKERS)
         normalized_result = normalize_data_array(
             result, tickers, fields, got_single_date, got_single_ticker, got_single_field, use_prices_types)
         return normalized_result
 
+    def _get_partial_results(self, tickers: Sequence[Ticker],
+                             get_data_func: Callable[[DataProvider, List[Ticker]], Any]) -> List[Any]:
+        """
+        Calls the get_data_func once for each of the data providers with all the tickers it supports. If the thread
+        pool is used, all the data providers are called concurrently.
+        """
+        tickers_per_data_provider = self._partition_tickers(tickers)
+
+        if self._max_workers is None:
+            return [get_data_func(data_provider, tickers_group)
+                    for data_provider, tickers_group in tickers_per_data_provider]
+
+        # the thread pool is created for each request, so that no threads are left running between the requests
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            futures = [executor.submit(get_data_func, data_provider, tickers_group)
+                       for data_provider, tickers_group in tickers_per_data_provider]
+            _, not_done_futures = wait(futures, timeout=self._timeout)
+
+            if not_done_futures:
+                for future in not_done_futures:
+                    future.cancel()
+                late_data_providers = [type(data_provider).__name__ for (data_provider, _), future
+                                       in zip(tickers_per_data_provider, futures) if future in not_done_futures]
+                raise TimeoutError("{} did not return the data within {} seconds".format(
+                    ", ".join(late_data_providers), self._timeout))
+
+            return [future.result() for future in futures]
+        finally:
+            # do not wait for the data providers, which did not return the data in time
+            executor.shutdown(wait=False)
+
+    def _partition_tickers(self, tickers: Sequence[Ticker]) -> List[Tuple[DataProvider, List[Ticker]]]:
+        """
+        Groups the tickers by the data provider (in order of their first occurrence), keeping the order of tickers
+        within each of the groups.
+        """
+        tickers_per_data_provider = {}  # type: Dict[int, Tuple[DataProvider, List[Ticker]]]
+        for ticker in tickers:
+            data_provider = self._identify_data_provider(type(ticker))
+            _, tickers_group = tickers_per_data_provider.setdefault(id(data_provider), (data_provider, []))
+            tickers_group.append(ticker)
+
+        return list(tickers_per_data_provider.values())
+
     def _register_data_provider(self, price_provider: DataProvider):
         for ticker_class in price_provider.supported_ticker_types():
             self._ticker_type_to_data_provider_dict[ticker_class] = price_provider
@@ -14,6 +14,7 @@
 
 from typing import Union, Dict
 
+import numpy as np
 import pandas as pd
 
 from qf_lib.common.tickers.tickers import Ticker
@@ -59,6 +60,12 @@ def normalize_data_array(
     --------
     QFSeries, QFDataFrame, QFDataArray, PricesSeries, PricesDataFrame
     """
+    if _has_requested_labels_order(data_array, tickers, fields):
+        # fast path: no reindexing is needed, the result is built directly from the numpy array of values
+        return normalize_array_values(
+            data_array.values, data_array.dates.values, tickers, fields, got_single_date, got_single_ticker,
+            got_single_field, use_prices_types, data_array.name)
+
     # to keep the order of tickers and fields we reindex the data_array
     data_array = data_array.reindex(tickers=tickers, fields=fields)
     data_array = data_array.dropna(DATES, how='all')  # Delete rows, which contain only Nan values
@@ -69,6 +76,87 @@ def normalize_data_array(
     return casted_result
 
 
+def normalize_array_values(
+        values: np.ndarray, dates: np.ndarray, tickers, fields, got_single_date, got_single_ticker, got_single_field,
+        use_prices_types=False, name=None) -> Union[QFSeries, QFDataFrame, QFDataArray, PricesSeries, PricesDataFrame]:
+    """
+    Equivalent of normalize_data_array, which works directly on the 3-D numpy array of values (dates x tickers x
+    fields) instead of the QFDataArray. The tickers and fields need to be already in the requested order.
+    Containers are built directly from the numpy array, without creating any intermediate xarray objects.
+
+    Parameters
+    ----------
+    values
+        3-D array of values (dates x tickers x fields)
+    dates
+        dates corresponding to the first axis of values
+    tickers
+        list of tickers corresponding to the second axis of values
+    fields
+        list of fields corresponding to the third axis of values
+    got_single_date
+        True if a single (scalar value) date was requested (start_date==end_date); False otherwise
+    got_single_ticker
+        True if a single (scalar value) ticker was requested (e.g. "MSFT US Equity"); False otherwise
+    got_single_field
+        True if a single (scalar value) field was requested (e.g. "OPEN"); False otherwise
+    use_prices_types
+        if True then proper return types are: PricesSeries, PricesDataFrame or QFDataArray;
+        otherwise return types are: QFSeries, QFDataFrame or QFDataArray
+    name
+        name of the data, used in case if the result can not be named after the ticker
+
+    Returns
+    --------
+    QFSeries, QFDataFrame, QFDataArray, PricesSeries, PricesDataFrame
+    """
+    # Delete rows, which contain only Nan values
+    not_nan_rows = ~np.isnan(values).all(axis=(1, 2))
+    if not not_nan_rows.all():
+        values = values[not_nan_rows]
+        dates = dates[not_nan_rows]
+
+    if got_single_date and values.shape[0] != 1:
+        # the squeezing behaviour of the dates dimension is delegated to xarray in this case
+        data_array = QFDataArray.create(pd.DatetimeIndex(dates, name=DATES), tickers, fields, values, name)
+        squeezed_result = squeeze_data_array(data_array, got_single_date, got_single_ticker, got_single_field)
+        return cast_data_array_to_proper_type(squeezed_result, use_prices_types)
+
+    if len(tickers) == 1 and len(fields) == 1:
+        name = tickers[0].as_string()
+
+    indices = (pd.DatetimeIndex(dates, name=DATES), pd.Index(tickers, name=TICKERS), pd.Index(fields, name=FIELDS))
+    squeezed_dimensions = (got_single_date, got_single_ticker, got_single_field)
+    remaining_indices = [index for index, squeezed in zip(indices, squeezed_dimensions) if not squeezed]
+    squeezed_values = values[tuple(0 if squeezed else slice(None) for squeezed in squeezed_dimensions)]
+
+    num_of_dimensions = len(remaining_indices)
+    if num_of_dimensions == 0:
+        return squeezed_values.item()
+    elif num_of_dimensions == 1:
+        series_type = PricesSeries if use_prices_types else QFSeries
+        return series_type(data=squeezed_values, index=remaining_indices[0], name=name)
+    elif num_of_dimensions == 2:
+        data_frame_type = PricesDataFrame if use_prices_types else QFDataFrame
+        return data_frame_type(data=squeezed_values, index=remaining_indices[0], columns=remaining_indices[1])
+    else:
+        return QFDataArray.create(indices[0], tickers, fields, values, name)
+
+
+def _has_requested_labels_order(data_array, tickers, fields) -> bool:
+    """
+    Returns True if the data_array contains float values and exactly the requested tickers and fields in the requested
+    order, so that it can be normalized without reindexing.
+    """
+    return data_array.dims == (DATES, TICKERS, FIELDS) and np.issubdtype(data_array.dtype, np.floating) \
+        and _labels_equal(data_array.tickers.values, tickers) and _labels_equal(data_array.fields.values, fields)
+
+
+def _labels_equal(labels, requested_labels) -> bool:
+    return len(labels) == len(requested_labels) and all(
+        label == requested_label for label, requested_label in zip(labels, requested_labels))
+
+
 def squeeze_data_array(original_data_array, got_single_date, got_single_ticker, got_single_field):
     original_shape = original_data_array.shape
 
@@ -12,7 +12,7 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 from datetime import datetime
-from typing import Sequence, Union, Dict
+from typing import Sequence, Union, Dict, Optional, Tuple, List
 
 from qf_lib.common.enums.expiration_date_field import ExpirationDateField
 from qf_lib.common.enums.frequency import Frequency
@@ -21,6 +21,8 @@ from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.miscellaneous.to_list_conversion import convert_to_list
 from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
 from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.data_bundle_cache import DataBundleCache
 from qf_lib.data_providers.preset_data_provider import PresetDataProvider
 from qf_lib.data_providers.data_provider import DataProvider
 
@@ -48,16 +50,44 @@ class PrefetchingDataProvider(PresetDataProvider):
         last date to be downlaoded
     frequency: Frequency
         frequency od the data
+    use_array_storage: bool
+        if True, the prefetched data is served from a columnar, numpy-based storage (see PresetDataProvider)
+    cache_directory: str
+        if provided, the downloaded data is stored in the persistent DataBundleCache in this directory and only
+        the data missing in the cache is downloaded from the data_provider
+    cache_namespace: str
+        namespace of the data in the DataBundleCache; needs to be provided if different data providers of the same type
+        (e.g. connected to different databases) use the same cache_directory
     """
 
     def __init__(self, data_provider: DataProvider,
                  tickers: Union[Ticker, Sequence[Ticker]],
                  fields: Union[PriceField, Sequence[PriceField]],
                  start_date: datetime, end_date: datetime,
-                 frequency: Frequency):
+                 frequency: Frequency, use_array_storage: bool = False, cache_directory: Optional[str] = None,
+                 cache_namespace: Optional[str] = None):
         # Convert fields into list in order to return a QFDataArray as the result of get_price function
         fields, _ = convert_to_list(fields, PriceField)
+        cache = DataBundleCache(cache_directory, cache_namespace) if cache_directory is not None else None
 
+        all_tickers, exp_dates = self._get_tickers_and_futures_chains(data_provider, tickers, end_date, cache)
+        data_array = self._download_prices(data_provider, all_tickers, fields, start_date, end_date, frequency, cache)
+
+        super().__init__(data=data_array,
+                         exp_dates=exp_dates,
+                         start_date=start_date,
+                         end_date=end_date,
+                         frequency=frequency,
+                         use_array_storage=use_array_storage)
+
+    @staticmethod
+    def _get_tickers_and_futures_chains(data_provider: DataProvider, tickers: Union[Ticker, Sequence[Ticker]],
+                                        end_date: datetime, cache: Optional[DataBundleCache]) \
+            -> Tuple[List[Ticker], Optional[Dict[FutureTicker, QFDataFrame]]]:
+        """
+        Returns the list of all tickers, which should be downloaded (the given tickers, with FutureTickers replaced by
+        the specific tickers of their futures chains) and the futures chains of all FutureTickers.
+        """
         tickers, _ = convert_to_list(tickers, Ticker)
         future_tickers = [ticker for ticker in tickers if isinstance(ticker, FutureTicker)]
         non_future_tickers = [ticker for ticker in tickers if not isinstance(ticker, FutureTicker)]
@@ -66,7 +96,12 @@ class PrefetchingDataProvider(PresetDataProvider):
         exp_dates = None
 
         if future_tickers:
-            exp_dates = data_provider.get_futures_chain_tickers(future_tickers, ExpirationDateField.all_dates())  # type: Dict[FutureTicker, QFDataFrame]
+            if cache is not None:
+                exp_dates = cache.get_futures_chain_tickers(data_provider, future_tickers,
+                                                            ExpirationDateField.all_dates(), end_date)
+            else:
+                exp_dates = data_provider.get_futures_chain_tickers(
+                    future_tickers, ExpirationDateField.all_dates())  # type: Dict[FutureTicker, QFDataFrame]
             # Filter out all theses specific future contracts, which expired before start_date
             all_futures_tickers = [
                 ticker for specific_tickers in exp_dates.values() for ticker in specific_tickers.index
@@ -74,10 +109,15 @@ class PrefetchingDataProvider(PresetDataProvider):
 
             all_tickers += all_futures_tickers
 
-        data_array = data_provider.get_price(all_tickers, fields, start_date, end_date, frequency)
+        return all_tickers, exp_dates
 
-        super().__init__(data=data_array,
-                         exp_dates=exp_dates,
-                         start_date=start_date,
-                         end_date=end_date,
-                         frequency=frequency)
+    def _download_prices(self, data_provider: DataProvider, tickers: Sequence[Ticker], fields: Sequence[PriceField],
+                         start_date: datetime, end_date: datetime, frequency: Frequency,
+                         cache: Optional[DataBundleCache]) -> QFDataArray:
+        """
+        Downloads the prices, which should be stored in the data bundle.
+        """
+        if cache is not None:
+            return cache.get_price(data_provider, tickers, fields, start_date, end_date, frequency)
+        else:
+            return data_provider.get_price(tickers, fields, start_date, end_date, frequency)
@@ -12,8 +12,10 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import os
+import pickle
 from datetime import datetime
-from typing import Union, Sequence, Set, Type, Dict, FrozenSet
+from typing import Union, Sequence, Set, Type, Dict, FrozenSet, Optional
 import numpy as np
 import pandas as pd
 
@@ -31,7 +33,8 @@ from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
 from qf_lib.containers.qf_data_array import QFDataArray
 from qf_lib.containers.series.prices_series import PricesSeries
 from qf_lib.containers.series.qf_series import QFSeries
-from qf_lib.data_providers.helpers import normalize_data_array
+from qf_lib.data_providers.array_data_bundle import ArrayDataBundle
+from qf_lib.data_providers.helpers import normalize_data_array, normalize_array_values
 from qf_lib.data_providers.data_provider import DataProvider
 
 
@@ -52,27 +55,99 @@ class PresetDataProvider(DataProvider):
     exp_dates
         dictionary mapping FutureTickers to QFDataFrame of contracts expiration dates, belonging to the certain
         future ticker family
+    use_array_storage
+        if True, the data is additionally stored in a columnar ArrayDataBundle (contiguous float64 numpy array with
+        precomputed tickers and fields positions) and all the queries, which do not require data aggregation,
+        are served from it instead of using the label-based indexing of the QFDataArray. It requires the data to be
+        numeric and the dates index to be sorted.
     """
 
     def __init__(
             self, data: QFDataArray, start_date: datetime, end_date: datetime, frequency: Frequency,
-            exp_dates: Dict[FutureTicker, QFDataFrame] = None):
-        self._data_bundle = data
+            exp_dates: Dict[FutureTicker, QFDataFrame] = None, use_array_storage: bool = False):
+        self._use_array_storage = use_array_storage
+        self._set_data_bundle(data)
         self._frequency = frequency
         self._exp_dates = exp_dates
 
-        self._tickers_cached_set = frozenset(data.tickers.values)
         self._future_tickers_cached_set = frozenset(exp_dates.keys()) if exp_dates is not None else None
-        self._fields_cached_set = frozenset(data.fields.values)
         self._start_date = start_date
         self._end_date = end_date
 
+    def _set_data_bundle(self, data: QFDataArray):
+        self._data_bundle = data
+        self._array_data_bundle = ArrayDataBundle(data) if self._use_array_storage else None
+
+        self._tickers_cached_set = frozenset(data.tickers.values)
+        self._fields_cached_set = frozenset(data.fields.values)
         self._ticker_types = {type(ticker) for ticker in data.tickers.values}
 
+    def save_memory_mapped_bundle(self, directory: str):
+        """
+        Saves the data bundle into the given directory, so that it can be opened as a memory-mapped
+        PresetDataProvider (see from_memory_mapped_bundle). The values of the bundle are saved in a single .npy file
+        (float64 array of dates x tickers x fields) and the dates, tickers, fields and futures chains are saved
+        separately.
+
+        Parameters
+        ----------
+        directory
+            path to the directory, in which the bundle should be saved (it is created if it does not exist)
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "values.npy"),
+                np.ascontiguousarray(self._data_bundle.values, dtype=np.float64))
+        np.save(os.path.join(directory, "dates.npy"), self._data_bundle.dates.values.astype("datetime64[ns]"))
+
+        exp_dates = None
+        if self._exp_dates is not None:
+            # the timer and data provider of the initialized FutureTickers should not be serialized with the bundle
+            exp_dates = {ticker.uninitialized_copy(): chain for ticker, chain in self._exp_dates.items()}
+
+        labels = {
+            "tickers": list(self._data_bundle.tickers.values),
+            "fields": list(self._data_bundle.fields.values),
+            "name": self._data_bundle.name,
+            "start_date": self._start_date,
+            "end_date": self._end_date,
+            "frequency": self._frequency,
+            "exp_dates": exp_dates
+        }
+        with open(os.path.join(directory, "labels.pkl"), "wb") as file:
+            pickle.dump(labels, file)
+
+    @classmethod
+    def from_memory_mapped_bundle(cls, directory: str, use_array_storage: bool = False) -> "PresetDataProvider":
+        """
+        Opens the data bundle saved with save_memory_mapped_bundle as a PresetDataProvider. The values of the bundle
+        are memory-mapped in the read-only mode instead of being loaded into memory, so all the processes which open
+        the same bundle share its pages through the page cache of the operating system.
+
+        Parameters
+        ----------
+        directory
+            path to the directory, in which the bundle was saved
+        use_array_storage
+            see PresetDataProvider (the ArrayDataBundle uses the memory-mapped values directly, without copying them)
+        """
+        values = np.load(os.path.join(directory, "values.npy"), mmap_mode="r")
+        dates = np.load(os.path.join(directory, "dates.npy"))
+        with open(os.path.join(directory, "labels.pkl"), "rb") as file:
+            labels = pickle.load(file)
+
+        data = QFDataArray.create(pd.DatetimeIndex(dates, name=DATES), labels["tickers"], labels["fields"], values,
+                                  labels["name"])
+        return cls(data, labels["start_date"], labels["end_date"], labels["frequency"], labels["exp_dates"],
+                   use_array_storage)
+
     @property
     def data_bundle(self):
         return self._data_bundle
 
+    @property
+    def array_data_bundle(self) -> Optional[ArrayDataBundle]:
+        return self._array_data_bundle
+
     @property
     def frequency(self) -> Frequency:
         return self._frequency
@@ -145,17 +220,23 @@ class PresetDataProvider(DataProvider):
 
         self._check_if_cached_data_available(specific_tickers, fields, start_date, end_date)
 
-        data_array = self._data_bundle.loc[start_date:end_date, specific_tickers, fields]
+        if self._array_data_bundle is not None and frequency == self._frequency:
+            normalized_result = self._get_normalized_array_data(
+                specific_tickers, fields, start_date, end_date, got_single_date, got_single_ticker, got_single_field,
+                use_prices_types=True
+            )
+        else:
+            data_array = self._data_bundle.loc[start_date:end_date, specific_tickers, fields]
 
-        # Data aggregation (allowed only for the Intraday Data and in case if more then 1 data point is found)
-        if frequency < self._frequency and len(data_array[DATES]) > 0:
-            data_array = self._aggregate_intraday_data(data_array, start_date, end_date,
-                                                       specific_tickers, fields, frequency)
+            # Data aggregation (allowed only for the Intraday Data and in case if more then 1 data point is found)
+            if frequency < self._frequency and len(data_array[DATES]) > 0:
+                data_array = self._aggregate_intraday_data(data_array, start_date, end_date,
+                                                           specific_tickers, fields, frequency)
 
-        normalized_result = normalize_data_array(
-            data_array, specific_tickers, fields, got_single_date, got_single_ticker, got_single_field,
-            use_prices_types=True
-        )
+            normalized_result = normalize_data_array(
+                data_array, specific_tickers, fields, got_single_date, got_single_ticker, got_single_field,
+                use_prices_types=True
+            )
 
         # Map the specific tickers onto the tickers given by the tickers_mapping array
         if isinstance(normalized_result, QFDataArray):
@@ -218,11 +299,17 @@ class PresetDataProvider(DataProvider):
 
         self._check_if_cached_data_available(specific_tickers, fields, start_date, end_date)
 
-        data_array = self._data_bundle.loc[start_date:end_date, specific_tickers, fields]
+        if self._array_data_bundle is not None:
+            normalized_result = self._get_normalized_array_data(
+                specific_tickers, fields, start_date, end_date, got_single_date, got_single_ticker, got_single_field,
+                use_prices_types=False
+            )
+        else:
+            data_array = self._data_bundle.loc[start_date:end_date, specific_tickers, fields]
 
-        normalized_result = normalize_data_array(data_array, specific_tickers, fields, got_single_date,
-                                                 got_single_ticker,
-                                                 got_single_field, use_prices_types=False)
+            normalized_result = normalize_data_array(data_array, specific_tickers, fields, got_single_date,
+                                                     got_single_ticker,
+                                                     got_single_field, use_prices_types=False)
 
         # Map the specific tickers onto the tickers given by the tickers_mapping array
         if isinstance(normalized_result, QFDataArray):
@@ -237,6 +324,15 @@ class PresetDataProvider(DataProvider):
 
         return normalized_result
 
+    def _get_normalized_array_data(self, tickers, fields, start_date, end_date, got_single_date, got_single_ticker,
+                                   got_single_field, use_prices_types):
+        """
+        Slices the columnar ArrayDataBundle and builds the result container directly from the numpy array.
+        """
+        dates, values = self._array_data_bundle.get_values(start_date, end_date, tickers, fields)
+        return normalize_array_values(values, dates, tickers, fields, got_single_date, got_single_ticker,
+                                      got_single_field, use_prices_types, self._array_data_bundle.name)
+
     def get_futures_chain_tickers(self, tickers: Union[FutureTicker, Sequence[FutureTicker]],
                                   expiration_date_fields: Union[ExpirationDateField, Sequence[ExpirationDateField]]) \
             -> Dict[FutureTicker, Union[QFSeries, QFDataFrame]]:
@@ -0,0 +1,246 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import datetime
+import hashlib
+import os
+import pickle
+import re
+import uuid
+from collections import OrderedDict
+from enum import Enum
+from types import FunctionType, MethodType, CodeType
+from typing import Optional, Dict, Any, Tuple
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.documents_utils.document_exporting.element.chart import ChartElement
+
+_UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+
+
+class ChartRenderCache(object):
+    """
+    Persistent cache of the rendered charts. The base64 images of the charts are stored in files in the cache
+    directory, under the hash of the chart's content: its data element series, decorators and settings together with
+    the figsize, dpi and the matplotlib settings used for rendering. Thus a chart, whose content has not changed since
+    it was rendered for the last time (e.g. in yesterday's report), does not need to be rendered again.
+
+    The total size of the cached images is bounded. After the limit is exceeded, the least recently used images are
+    removed from the cache.
+
+    Parameters
+    ----------
+    cache_directory: str
+        directory, in which the rendered images are stored
+    max_size: int
+        maximal total size (in bytes) of the images stored in the cache directory (by default 500 MB)
+    """
+
+    FILE_EXTENSION = ".b64"
+
+    def __init__(self, cache_directory: str, max_size: int = 500 * 1024 ** 2):
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+        self._cache_directory = cache_directory
+        self._max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+
+        # sizes of the cached files, ordered from the least to the most recently used one
+        self._file_sizes = OrderedDict()  # type: Dict[str, int]
+        self._total_size = 0
+
+        if not os.path.exists(cache_directory):
+            os.makedirs(cache_directory)
+
+        cached_files = []
+        for file_name in os.listdir(cache_directory):
+            if file_name.endswith(self.FILE_EXTENSION):
+                file_stat = os.stat(os.path.join(cache_directory, file_name))
+                cached_files.append((file_stat.st_mtime_ns, file_name, file_stat.st_size))
+
+        for _, file_name, file_size in sorted(cached_files):
+            self._file_sizes[file_name] = file_size
+            self._total_size += file_size
+
+    @property
+    def hit_ratio(self) -> float:
+        """ Fraction of the charts served from the cache (nan if the cache was not used yet). """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else float("nan")
+
+    @property
+    def size(self) -> int:
+        """ Total size (in bytes) of the images stored in the cache. """
+        return self._total_size
+
+    def get_key(self, chart_element: ChartElement) -> Optional[str]:
+        """
+        Computes the key of the chart element, under which its image is cached. The key has to be computed before
+        the chart is rendered.
+
+        Returns
+        -------
+        hash of the chart's content or None if the chart cannot be cached (e.g. it was already plotted)
+        """
+        if chart_element.chart.figure is not None:
+            # the chart was already plotted, so its image would not depend only on its content
+            return None
+
+        try:
+            chart_hash = hashlib.sha256()
+            rc_params = sorted(((key, value) for key, value in mpl.rcParams.items() if key != "backend"),
+                               key=lambda item: item[0])
+            _update_hash(chart_hash, (mpl.__version__, repr(rc_params), chart_element.figsize, chart_element.dpi,
+                                      chart_element.optimise), {})
+            _update_hash(chart_hash, chart_element.chart, {})
+        except Exception as ex:
+            self.logger.debug("Chart will not be cached: {}".format(ex))
+            return None
+
+        return chart_hash.hexdigest()
+
+    def load(self, key: Optional[str], chart_element: ChartElement) -> bool:
+        """
+        Looks up the image cached under the given key. If it is found, it is set as the rendered image
+        of the chart element.
+
+        Returns
+        -------
+        True if the image was found in the cache, False otherwise
+        """
+        file_name = self._file_name(key)
+        if file_name is None or file_name not in self._file_sizes:
+            self.misses += 1
+            return False
+
+        try:
+            with open(os.path.join(self._cache_directory, file_name), "r") as file:
+                chart_element.set_rendered_image(file.read())
+        except OSError:
+            self.logger.warning("Could not read the cached chart {}".format(file_name))
+            self._remove(file_name)
+            self.misses += 1
+            return False
+
+        self._file_sizes.move_to_end(file_name)
+        os.utime(os.path.join(self._cache_directory, file_name))
+        self.hits += 1
+        return True
+
+    def store(self, key: Optional[str], chart_element: ChartElement):
+        """
+        Stores the rendered image of the chart element in the cache under the given key and removes the least
+        recently used images, if the size limit of the cache is exceeded.
+        """
+        file_name = self._file_name(key)
+        if file_name is None or chart_element.rendered_image is None:
+            return
+
+        file_path = os.path.join(self._cache_directory, file_name)
+        temporary_file_path = "{}.{}.tmp".format(file_path, uuid.uuid4())
+        with open(temporary_file_path, "w") as file:
+            file.write(chart_element.rendered_image)
+        os.replace(temporary_file_path, file_path)
+
+        if file_name in self._file_sizes:
+            self._total_size -= self._file_sizes.pop(file_name)
+        self._file_sizes[file_name] = os.path.getsize(file_path)
+        self._total_size += self._file_sizes[file_name]
+
+        while self._total_size > self._max_size and self._file_sizes:
+            self._remove(next(iter(self._file_sizes)))
+
+    def _file_name(self, key: Optional[str]) -> Optional[str]:
+        return key + self.FILE_EXTENSION if key is not None else None
+
+    def _remove(self, file_name: str):
+        self._total_size -= self._file_sizes.pop(file_name)
+        try:
+            os.remove(os.path.join(self._cache_directory, file_name))
+        except OSError:
+            pass
+
+
+def _update_hash(chart_hash, obj: Any, visited_objects: Dict[int, Tuple[int, Any]]):
+    """
+    Updates the hash with the content of the object. The uuids contained in the strings (e.g. randomly generated keys
+    of the decorators, such as "point_emphasis_<uuid>") are ignored, as they are different every time the chart
+    is created. The visited objects are kept in the dictionary (together with their ordinal numbers), so that their ids
+    are not reused by other objects.
+    """
+    def update(*values):
+        for value in values:
+            chart_hash.update(str(value).encode("utf-8"))
+            chart_hash.update(b"\0")
+
+    if obj is None or isinstance(obj, (bool, int, float, complex, np.number, np.bool_)):
+        update(type(obj).__name__, repr(obj))
+    elif isinstance(obj, str):
+        update("str", _UUID_PATTERN.sub("<uuid>", obj))
+    elif isinstance(obj, bytes):
+        update("bytes", len(obj))
+        chart_hash.update(obj)
+    elif isinstance(obj, (datetime.datetime, datetime.date, datetime.timedelta, Enum)):
+        update(type(obj).__name__, repr(obj))
+    elif id(obj) in visited_objects:
+        update("visited", visited_objects[id(obj)][0])
+    else:
+        visited_objects[id(obj)] = (len(visited_objects), obj)
+
+        if isinstance(obj, pd.Index):
+            update(type(obj).__name__, obj.dtype, len(obj), repr(obj.names))
+            chart_hash.update(pd.util.hash_pandas_object(obj).values.tobytes())
+        elif isinstance(obj, (pd.Series, pd.DataFrame)):
+            update(type(obj).__name__, repr(obj.dtypes) if isinstance(obj, pd.DataFrame) else obj.dtype, obj.shape)
+            _update_hash(chart_hash, obj.index, visited_objects)
+            if isinstance(obj, pd.DataFrame):
+                _update_hash(chart_hash, obj.columns, visited_objects)
+            else:
+                _update_hash(chart_hash, obj.name, visited_objects)
+            chart_hash.update(pd.util.hash_pandas_object(obj, index=False).values.tobytes())
+        elif isinstance(obj, np.ndarray):
+            update("ndarray", obj.dtype, obj.shape)
+            chart_hash.update(pickle.dumps(obj) if obj.dtype.hasobject else np.ascontiguousarray(obj).tobytes())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            update(type(obj).__name__, len(obj))
+            items = sorted(obj, key=repr) if isinstance(obj, (set, frozenset)) else obj
+            for item in items:
+                _update_hash(chart_hash, item, visited_objects)
+        elif isinstance(obj, dict):
+            update(type(obj).__name__, len(obj))
+            for key, value in obj.items():
+                _update_hash(chart_hash, key, visited_objects)
+                _update_hash(chart_hash, value, visited_objects)
+        elif isinstance(obj, CodeType):
+            update("code", obj.co_name)
+            chart_hash.update(obj.co_code)
+            _update_hash(chart_hash, (obj.co_consts, obj.co_names), visited_objects)
+        elif isinstance(obj, (FunctionType, MethodType)):
+            function = obj.__func__ if isinstance(obj, MethodType) else obj
+            update("function", function.__module__, function.__qualname__)
+            _update_hash(chart_hash, function.__code__, visited_objects)
+            _update_hash(chart_hash, [cell.cell_contents for cell in function.__closure__ or ()], visited_objects)
+            if isinstance(obj, MethodType):
+                _update_hash(chart_hash, obj.__self__, visited_objects)
+        elif hasattr(obj, "__dict__"):
+            update(type(obj).__module__, type(obj).__qualname__)
+            _update_hash(chart_hash, sorted(vars(obj).items(), key=lambda item: item[0]), visited_objects)
+        else:
+            # objects, which do not expose their state (e.g. implemented in C), are hashed using their pickled content
+            update(type(obj).__module__, type(obj).__qualname__)
+            chart_hash.update(pickle.dumps(obj))
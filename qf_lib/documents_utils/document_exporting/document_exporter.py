@@ -14,23 +14,45 @@
 
 import os
 from os.path import join
-from typing import Sequence
+from typing import Sequence, Optional, List, Tuple
 
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.documents_utils.document_exporting.chart_render_cache import ChartRenderCache
 from qf_lib.documents_utils.document_exporting.document import Document
+from qf_lib.documents_utils.document_exporting.element.chart import ChartElement
 from qf_lib.documents_utils.document_exporting.element.front_page import FrontPage
 from qf_lib.documents_utils.document_exporting.element.header import HeaderElement
 from qf_lib.documents_utils.document_exporting.element.index import IndexElement
+from qf_lib.documents_utils.document_exporting.parallel_chart_renderer import ParallelChartRenderer, \
+    get_chart_elements_to_render, render_chart_in_isolation
 from qf_lib.settings import Settings
 from qf_lib.starting_dir import get_starting_dir_abs_path
 
 
 class DocumentExporter(object):
     """
-    Abstract class for document_exporting of documents.
+    Abstract class for document_exporting of documents. If there is a "chart_rendering_processes" attribute set in
+    the Settings, then the charts of the exported documents are rendered concurrently, using the given number
+    of processes (see ParallelChartRenderer). If there is a "chart_render_cache_directory" attribute set in
+    the Settings, then the rendered charts are cached in this directory (see ChartRenderCache), with the total size
+    limited by the optional "chart_render_cache_max_size" attribute (in bytes).
     """
 
     def __init__(self, settings: Settings):
         self._output_root_dir = join(get_starting_dir_abs_path(), settings.output_directory)
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+        self._chart_renderer = None  # type: Optional[ParallelChartRenderer]
+        if hasattr(settings, 'chart_rendering_processes'):
+            self._chart_renderer = ParallelChartRenderer(settings.chart_rendering_processes)
+
+        self.chart_render_cache = None  # type: Optional[ChartRenderCache]
+        if hasattr(settings, 'chart_render_cache_directory'):
+            cache_directory = join(get_starting_dir_abs_path(), settings.chart_render_cache_directory)
+            if hasattr(settings, 'chart_render_cache_max_size'):
+                self.chart_render_cache = ChartRenderCache(cache_directory, settings.chart_render_cache_max_size)
+            else:
+                self.chart_render_cache = ChartRenderCache(cache_directory)
 
     def get_output_dir(self, export_dir: str) -> str:
         """
@@ -54,6 +76,61 @@ class DocumentExporter(object):
 
         return output_dir
 
+    def _render_charts(self, documents: Sequence[Document]) -> List[Tuple[ChartElement, Optional[str]]]:
+        """
+        Loads the charts of all documents from the cache (if the chart render cache is enabled) and renders the
+        remaining ones beforehand (concurrently if the parallel chart rendering is enabled, otherwise one by one
+        in isolation, see render_chart_in_isolation). If neither is enabled, the charts are rendered while the HTML
+        of the documents is generated.
+
+        Returns
+        -------
+        chart elements (together with their cache keys), which were not loaded from the cache and should be stored
+        in it after the HTML is generated
+        """
+        if self._chart_renderer is None and self.chart_render_cache is None:
+            return []
+
+        chart_elements = [(element, None) for element in get_chart_elements_to_render(documents)]
+        if self.chart_render_cache is not None:
+            chart_elements = [(element, self.chart_render_cache.get_key(element)) for element, _ in chart_elements]
+            chart_elements = [(element, key) for element, key in chart_elements
+                              if not self.chart_render_cache.load(key, element)]
+
+        if self._chart_renderer is not None:
+            self._chart_renderer.render_chart_elements([element for element, _ in chart_elements])
+        else:
+            self._render_charts_in_isolation([element for element, _ in chart_elements])
+
+        return chart_elements
+
+    def _render_charts_in_isolation(self, chart_elements: Sequence[ChartElement]):
+        """
+        Renders the charts, which will be stored in the cache, so that their images do not depend on the charts
+        rendered before. The charts, which fail to render, are rendered again while the HTML is generated.
+        """
+        for chart_element in chart_elements:
+            try:
+                chart_element.set_rendered_image(render_chart_in_isolation(
+                    chart_element.chart, chart_element.figsize, chart_element.dpi, chart_element.optimise))
+            except Exception as ex:
+                self.logger.warning("Chart will be rendered while the HTML is generated: {}".format(ex))
+            finally:
+                chart_element.chart.close()
+
+    def _store_rendered_charts(self, chart_elements: Sequence[Tuple[ChartElement, Optional[str]]]):
+        """
+        Stores the rendered charts in the cache, if the chart render cache is enabled.
+        """
+        if self.chart_render_cache is None:
+            return
+
+        for chart_element, key in chart_elements:
+            self.chart_render_cache.store(key, chart_element)
+
+        self.logger.info("Chart render cache: {} hits, {} misses (hit ratio: {:.2%})".format(
+            self.chart_render_cache.hits, self.chart_render_cache.misses, self.chart_render_cache.hit_ratio))
+
     @staticmethod
     def _merge_documents(documents: Sequence[Document], filename: str) -> Document:
         """
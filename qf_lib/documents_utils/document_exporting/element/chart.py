@@ -13,7 +13,7 @@
 #     limitations under the License.
 
 import uuid
-from typing import Tuple
+from typing import Tuple, Optional
 
 from jinja2 import Template
 
@@ -60,6 +60,22 @@ class ChartElement(Element):
         self.grid_proportion = grid_proportion
         self.comment = comment
         self.logger = qf_logger.getChild(self.__class__.__name__)
+        self._rendered_image = None  # type: Optional[str]
+
+    @property
+    def chart(self) -> Chart:
+        return self._chart
+
+    @property
+    def rendered_image(self) -> Optional[str]:
+        return self._rendered_image
+
+    def set_rendered_image(self, base64_image: str):
+        """
+        Sets the base64 image of the chart, which was rendered beforehand (e.g. by the ParallelChartRenderer or loaded
+        from the ChartRenderCache). The image is then used instead of rendering the chart while the HTML is generated.
+        """
+        self._rendered_image = base64_image
 
     def get_grid_proportion_css_class(self) -> str:
         return str(self.grid_proportion)
@@ -73,9 +89,12 @@ class ChartElement(Element):
         -------
         A string with the base64 image (with encoding prefix) of the chart.
         """
+        if self._rendered_image is not None:
+            return "data:image/png;base64," + self._rendered_image
+
         try:
-            result = "data:image/png;base64," + self._chart.render_as_base64_image(
-                self.figsize, self.dpi, self.optimise)
+            self._rendered_image = self._chart.render_as_base64_image(self.figsize, self.dpi, self.optimise)
+            result = "data:image/png;base64," + self._rendered_image
         except Exception as ex:
             self.logger.exception('Chart generation error:')
             result = "error: Chart generation error: " + str(ex)
@@ -88,19 +107,23 @@ class ChartElement(Element):
         Generates the HTML necessary to display the underlying chart in a PDF document. The chart is rendered in
         memory, then encoded to base64 and embedded in the HTML
         """
+        is_rendered_now = self._rendered_image is None
         try:
-            base64 = self._chart.render_as_base64_image(self.figsize, self.dpi, self.optimise)
+            if is_rendered_now:
+                self._rendered_image = self._chart.render_as_base64_image(self.figsize, self.dpi, self.optimise)
 
             env = templates.environment
             template = env.get_template("chart.html")
-            result = template.render(data=base64, width="100%")
+            result = template.render(data=self._rendered_image, width="100%")
 
         except Exception as ex:
             self.logger.error('Chart generation error:')
             self.logger.error(ex)
             result = "<h2 class='chart-render-failure'>Failed to render chart</h1>"
-        # Close the chart's figure as we are no longer going to be using it.
-        self._chart.close()
+
+        if is_rendered_now:
+            # Close the chart's figure as we are no longer going to be using it.
+            self._chart.close()
         # Add the optional comment.
         result += self._create_html_comment()
 
@@ -43,6 +43,8 @@ class HTMLExporter(DocumentExporter):
         if filename is not None:
             documents = [self._merge_documents(documents, filename)]
 
+        chart_elements = self._render_charts(documents)
+
         for document in documents:
             self.logger.info("Generating: {}".format(document.name))
             if include_table_of_contents:
@@ -63,4 +65,5 @@ class HTMLExporter(DocumentExporter):
 
             result.append(output_filename)
 
+        self._store_rendered_charts(chart_elements)
         return result
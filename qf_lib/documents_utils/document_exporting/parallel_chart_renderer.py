@@ -0,0 +1,152 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence, Optional, Tuple, Dict, Any, Iterable, List
+
+import matplotlib as mpl
+from matplotlib.text import Text
+
+from qf_lib.common.utils.logging.qf_parent_logger import qf_logger
+from qf_lib.documents_utils.document_exporting.document import Document
+from qf_lib.documents_utils.document_exporting.element import Element
+from qf_lib.documents_utils.document_exporting.element.chart import ChartElement
+from qf_lib.documents_utils.document_exporting.element.grid import GridElement
+from qf_lib.plotting.charts.chart import Chart
+
+
+class ParallelChartRenderer(object):
+    """
+    Renders the charts of all ChartElements of the documents concurrently, in a pool of processes. The rendered images
+    are stored in the ChartElements, so that the charts are not rendered again while the HTML of the documents
+    is generated. Each chart is rendered with the matplotlib settings, which are used in the main process at the time
+    of calling render, therefore the generated HTML is the same as if the charts were rendered one by one. If rendering
+    of a chart changes the matplotlib settings (e.g. LineChart with the secondary axes), the changes are applied in
+    the main process and all the following charts are rendered in the main process (in the order of the documents),
+    as they would be affected by the changed settings.
+
+    Charts, which cannot be sent to another process (e.g. containing lambda functions) or which fail to render,
+    are left untouched and rendered in the main process while the HTML is generated.
+
+    Parameters
+    ----------
+    max_workers: int
+        maximal number of processes used for rendering. If None, the number of processors of the machine is used
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._max_workers = max_workers
+        self.logger = qf_logger.getChild(self.__class__.__name__)
+
+    def render(self, documents: Sequence[Document]):
+        """
+        Renders all charts of the given documents, which were not rendered yet.
+        """
+        self.render_chart_elements(get_chart_elements_to_render(documents))
+
+    def render_chart_elements(self, chart_elements: Sequence[ChartElement]):
+        """
+        Renders the charts of the given chart elements.
+        """
+        pickled_charts = []  # type: List[Tuple[ChartElement, bytes]]
+        for chart_element in chart_elements:
+            try:
+                pickled_charts.append((chart_element, pickle.dumps(chart_element.chart)))
+            except Exception as ex:
+                self.logger.debug("Chart will be rendered in the main process: {}".format(ex))
+
+        if not pickled_charts:
+            return
+
+        self.logger.info("Rendering {} charts...".format(len(pickled_charts)))
+        rc_params = {key: value for key, value in mpl.rcParams.items() if key != "backend"}
+
+        with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [(chart_element, executor.submit(_render_chart, pickled_chart, chart_element.figsize,
+                                                       chart_element.dpi, chart_element.optimise, rc_params))
+                       for chart_element, pickled_chart in pickled_charts]
+
+            for chart_element, future in futures:
+                try:
+                    rendered_image, changed_rc_params = future.result()
+                except Exception as ex:
+                    self.logger.warning("Chart will be rendered in the main process: {}".format(ex))
+                    continue
+
+                chart_element.set_rendered_image(rendered_image)
+                if changed_rc_params:
+                    self.logger.debug("Matplotlib settings changed while rendering a chart, the following charts "
+                                      "will be rendered in the main process: {}".format(list(changed_rc_params)))
+                    dict.update(mpl.rcParams, changed_rc_params)
+                    break
+
+            for _, future in futures:
+                future.cancel()
+
+
+def get_chart_elements_to_render(documents: Sequence[Document]) -> List[ChartElement]:
+    """
+    Returns all chart elements of the documents (including the ones placed in grids), which were not rendered yet.
+    """
+    def chart_elements(elements: Iterable[Element]) -> Iterable[ChartElement]:
+        for element in elements:
+            if isinstance(element, ChartElement):
+                if element.rendered_image is None:
+                    yield element
+            elif isinstance(element, GridElement):
+                yield from chart_elements(element.elements)
+
+    return list(chart_elements(element for document in documents for element in document.elements))
+
+
+def render_chart_in_isolation(chart: Chart, figsize: Optional[Tuple[float, float]], dpi: int, optimise: bool) -> str:
+    """
+    Renders the chart as the base64 image, which does not depend on the charts rendered before. Matplotlib caches
+    the layouts of texts with the weak references to renderers as a part of the keys. After a renderer of a closed
+    figure is released, a new renderer may be created at the same address and the layout of a text from another chart
+    may be reused (e.g. shifting the tick labels). The cache (available in the matplotlib versions, which keep it in
+    Text._cached) is cleared before rendering, so that the images rendered in parallel or stored in the ChartRenderCache
+    are the same regardless of the process and the order, in which they were rendered.
+    """
+    cached_layouts = getattr(Text, "_cached", None)
+    if cached_layouts is not None:
+        cached_layouts.clear()
+        # matplotlib.cbook.maxdict keeps the keys in a separate list as well, in order to remove the oldest ones
+        killed_keys = getattr(cached_layouts, "_killkeys", None)
+        if killed_keys is not None:
+            killed_keys.clear()
+
+    return chart.render_as_base64_image(figsize, dpi, optimise)
+
+
+def _render_chart(pickled_chart: bytes, figsize: Optional[Tuple[float, float]], dpi: int, optimise: bool,
+                  rc_params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    # The charts are rendered only to PNG images, so that no interactive backend is needed (the backend is switched
+    # here and not in the initializer of the pool, as the initializers are not available in python 3.6)
+    if mpl.get_backend().lower() != "agg":
+        import matplotlib.pyplot as plt
+        plt.switch_backend("agg")
+
+    # Use the settings of the main process (and discard changes made while rendering the previous charts)
+    dict.update(mpl.rcParams, rc_params)
+
+    chart = pickle.loads(pickled_chart)
+    try:
+        rendered_image = render_chart_in_isolation(chart, figsize, dpi, optimise)
+    finally:
+        chart.close()
+
+    changed_rc_params = {key: value for key, value in mpl.rcParams.items()
+                         if key in rc_params and rc_params[key] != value}
+    return rendered_image, changed_rc_params
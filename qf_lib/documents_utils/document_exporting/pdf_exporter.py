@@ -92,9 +92,12 @@ class PDFExporter(DocumentExporter):
             if include_table_of_contents:
                 self._add_table_of_contents(document)
 
+            chart_elements = self._render_charts([document])
+
             # Generate the full document HTML
             self.logger.info("Generating HTML for PDF...")
             html = document.generate_html()
+            self._store_rendered_charts(chart_elements)
 
             # Automatically include all the css files in the `document_css/base` directory
             base_css = os.listdir(self._document_css_dir)
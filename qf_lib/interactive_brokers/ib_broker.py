@@ -21,7 +21,7 @@ from ibapi.order import Order as IBOrder
 
 from qf_lib.backtesting.broker.broker import Broker
 from qf_lib.backtesting.contract.contract import Contract
-from qf_lib.backtesting.order.execution_style import MarketOrder, StopOrder
+from qf_lib.backtesting.order.execution_style import MarketOrder, StopOrder, LimitOrder
 from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.portfolio.position import Position
@@ -212,3 +212,6 @@ class IBBroker(Broker):
         elif isinstance(execution_style, StopOrder):
             ib_order.orderType = "STP"
             ib_order.auxPrice = execution_style.stop_price
+        elif isinstance(execution_style, LimitOrder):
+            ib_order.orderType = "LMT"
+            ib_order.lmtPrice = execution_style.limit_price
@@ -23,7 +23,7 @@ from ibapi.utils import iswrapper, current_fn_name
 from ibapi.wrapper import EWrapper
 
 from qf_lib.backtesting.contract.contract import Contract
-from qf_lib.backtesting.order.execution_style import StopOrder, MarketOrder
+from qf_lib.backtesting.order.execution_style import StopOrder, MarketOrder, LimitOrder
 from qf_lib.backtesting.order.order import Order
 from qf_lib.backtesting.order.time_in_force import TimeInForce
 from qf_lib.backtesting.portfolio.broker_positon import BrokerPosition
@@ -115,6 +115,8 @@ class IBWrapper(EWrapper):
 
         if ib_order.orderType.upper() == 'STP':
             execution_style = StopOrder(ib_order.auxPrice)
+        elif ib_order.orderType.upper() == 'LMT':
+            execution_style = LimitOrder(ib_order.lmtPrice)
         elif ib_order.orderType.upper() == 'MKT':
             execution_style = MarketOrder()
         else:
@@ -0,0 +1,32 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+
+
+class CountingDataProvider(PresetDataProvider):
+    """ PresetDataProvider, which records all the requests. """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.price_requests = []
+        self.futures_chain_requests = []
+
+    def get_price(self, tickers, fields, start_date, end_date=None, frequency=Frequency.DAILY):
+        self.price_requests.append((list(tickers), list(fields), start_date, end_date))
+        return super().get_price(tickers, fields, start_date, end_date, frequency)
+
+    def get_futures_chain_tickers(self, tickers, expiration_date_fields):
+        self.futures_chain_requests.append(list(tickers))
+        return super().get_futures_chain_tickers(tickers, expiration_date_fields)
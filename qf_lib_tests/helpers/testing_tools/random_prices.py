@@ -0,0 +1,59 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from typing import Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+import qf_lib_tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import Ticker
+from qf_lib.containers.qf_data_array import QFDataArray
+
+
+def create_random_prices_array(dates: pd.DatetimeIndex, tickers: Sequence[Ticker], fields: Sequence[PriceField],
+                               seed: int, low: float = 10.0, high: float = 20.0) -> QFDataArray:
+    """
+    Creates the QFDataArray of prices (dates x tickers x fields), which values are drawn from the uniform distribution
+    between low and high. The values are reproducible for the given seed and they can be modified in place (e.g. set
+    to NaN) through the values attribute of the returned array, before it is passed to the data provider.
+    """
+    values = np.random.RandomState(seed).uniform(low, high, (len(dates), len(tickers), len(fields)))
+    return QFDataArray.create(dates, tickers, fields, values)
+
+
+def assert_same_prices(expected_prices: Union[QFDataArray, pd.DataFrame, pd.Series, float],
+                       actual_prices: Union[QFDataArray, pd.DataFrame, pd.Series, float]):
+    """
+    Asserts that the prices returned by two data providers are equal: the containers need to be of the same type
+    and contain the same labels and values (NaNs are considered equal).
+
+    The values of QFDataArrays are compared all at once, so that also the long, intraday arrays can be compared
+    quickly.
+    """
+    assert type(expected_prices) == type(actual_prices), \
+        "Expected {}, got {}".format(type(expected_prices).__name__, type(actual_prices).__name__)
+
+    if isinstance(expected_prices, QFDataArray):
+        assert expected_prices.dims == actual_prices.dims
+        assert expected_prices.tickers.values.tolist() == actual_prices.tickers.values.tolist()
+        assert expected_prices.fields.values.tolist() == actual_prices.fields.values.tolist()
+        np.testing.assert_array_equal(expected_prices.dates.values, actual_prices.dates.values)
+        np.testing.assert_array_equal(expected_prices.values, actual_prices.values)
+    elif isinstance(expected_prices, pd.DataFrame):
+        tt.assert_dataframes_equal(expected_prices, actual_prices, check_index_type=True, check_column_type=True)
+    elif isinstance(expected_prices, pd.Series):
+        tt.assert_series_equal(expected_prices, actual_prices, check_index_type=True)
+    else:
+        assert expected_prices == actual_prices, "Expected {}, got {}".format(expected_prices, actual_prices)
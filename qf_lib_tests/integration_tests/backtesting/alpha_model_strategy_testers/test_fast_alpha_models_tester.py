@@ -170,6 +170,59 @@ class TestFastAlphaModelsTester(TestCase):
         ])
         assert_series_equal(expected_returns, second_elem.returns_tms)
 
+    def test_alpha_models_tester_with_exposures_matrix(self):
+        parameter_lists = ((10, Exposure.LONG), (5, Exposure.SHORT))
+
+        expected_summary = FastAlphaModelTester(
+            DummyAlphaModel, parameter_lists, self.tickers, self.test_start_date, self.test_end_date,
+            self._price_provider_mock, self.timer, self._alpha_model_factory).test_alpha_models()
+        actual_summary = FastAlphaModelTester(
+            DummyVectorizedAlphaModel, parameter_lists, self.tickers, self.test_start_date, self.test_end_date,
+            self._price_provider_mock, self.timer, self._alpha_model_factory).test_alpha_models()
+
+        for expected_elem, actual_elem in zip(expected_summary.elements_list, actual_summary.elements_list):
+            self.assertEqual(expected_elem.model_parameters, actual_elem.model_parameters)
+            assert_frame_equal(expected_elem.trades_df, actual_elem.trades_df)
+            assert_series_equal(expected_elem.returns_tms, actual_elem.returns_tms)
+
+    def test_missing_exposures_in_exposures_matrix_are_logged(self):
+        parameter_lists = ((10, Exposure.LONG),)
+        tester = FastAlphaModelTester(
+            DummyIncompleteVectorizedAlphaModel, parameter_lists, self.tickers, self.test_start_date,
+            self.test_end_date, self._price_provider_mock, self.timer, self._alpha_model_factory)
+
+        with self.assertLogs(tester.logger, level="WARNING") as logs:
+            tester.test_alpha_models()
+
+        self.assertEqual(1, len(logs.records))
+        self.assertIn("returned no exposures for 5 of", logs.output[0])
+
+    def test_alpha_models_tester_in_parallel_mode(self):
+        parameter_lists = ((10, Exposure.LONG), (5, Exposure.SHORT), (3, Exposure.LONG), (7, Exposure.SHORT))
+
+        expected_summary = FastAlphaModelTester(
+            DummyAlphaModel, parameter_lists, self.tickers, self.test_start_date, self.test_end_date,
+            self._price_provider_mock, self.timer, self._alpha_model_factory).test_alpha_models()
+        actual_summary = FastAlphaModelTester(
+            DummyAlphaModel, parameter_lists, self.tickers, self.test_start_date, self.test_end_date,
+            self._price_provider_mock, self.timer, self._alpha_model_factory, num_of_workers=2).test_alpha_models()
+
+        self.assertEqual(len(expected_summary.elements_list), len(actual_summary.elements_list))
+        for expected_elem, actual_elem in zip(expected_summary.elements_list, actual_summary.elements_list):
+            self.assertEqual(expected_elem.model_parameters, actual_elem.model_parameters)
+            assert_frame_equal(expected_elem.trades_df, actual_elem.trades_df)
+            assert_series_equal(expected_elem.returns_tms, actual_elem.returns_tms)
+
+    def test_alpha_model_factory_is_sent_to_the_workers_once(self):
+        parameter_lists = tuple((period_length, Exposure.LONG) for period_length in range(1, 9))
+        alpha_model_factory = PickleCountingAlphaModelFactory(self.timer)
+
+        FastAlphaModelTester(
+            DummyAlphaModel, parameter_lists, self.tickers, self.test_start_date, self.test_end_date,
+            self._price_provider_mock, self.timer, alpha_model_factory, num_of_workers=2).test_alpha_models()
+
+        self.assertEqual(1, alpha_model_factory.num_of_pickles)
+
 
 class DummyAlphaModel(AlphaModel):
     def __init__(self, period_length: int, first_suggested_exposure: Exposure, timer: Timer):
@@ -199,14 +252,37 @@ class DummyAlphaModel(AlphaModel):
         return exposure
 
 
+class DummyVectorizedAlphaModel(DummyAlphaModel):
+    def calculate_exposures_matrix(self, tickers, prices_data_array):
+        self.timer = None  # the exposures should be generated without moving the timer
+        exposure_values = self._exposures.map(lambda exposure: exposure.value)
+        return pd.DataFrame({ticker: exposure_values for ticker in tickers}, columns=tickers)
+
+
+class DummyIncompleteVectorizedAlphaModel(DummyVectorizedAlphaModel):
+    def calculate_exposures_matrix(self, tickers, prices_data_array):
+        return super().calculate_exposures_matrix(tickers, prices_data_array).iloc[5:]
+
+
 class DummyAlphaModelFactory(object):
     def __init__(self, timer: Timer):
         self.timer = timer
 
     def make_model(self, model_type, *params):
-        assert model_type == DummyAlphaModel
+        assert issubclass(model_type, DummyAlphaModel)
         period_length, first_suggested_exposure = params
-        return DummyAlphaModel(period_length, first_suggested_exposure, self.timer)
+        return model_type(period_length, first_suggested_exposure, self.timer)
+
+
+
+class PickleCountingAlphaModelFactory(DummyAlphaModelFactory):
+    def __init__(self, timer: Timer):
+        super().__init__(timer)
+        self.num_of_pickles = 0
+
+    def __getstate__(self):
+        self.num_of_pickles += 1
+        return self.__dict__
 
 
 if __name__ == '__main__':
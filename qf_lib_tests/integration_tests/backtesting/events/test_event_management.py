@@ -14,6 +14,7 @@
 import datetime
 from typing import List, Tuple
 from unittest import TestCase
+from qf_lib.backtesting.events.backtest_event_manager import BacktestEventManager
 from qf_lib.backtesting.events.empty_queue_event.empty_queue_event import EmptyQueueEvent
 from qf_lib.backtesting.events.empty_queue_event.empty_queue_event_listener import EmptyQueueEventListener
 from qf_lib.backtesting.events.end_trading_event.end_trading_event import EndTradingEvent
@@ -116,14 +117,25 @@ class TestEventManagement(TestCase):
         AfterMarketCloseEvent.set_trigger_time({"hour": 21, "minute": 0, "second": 0, "microsecond": 0})
 
     def test_event_management(self):
+        self._test_event_management(use_precomputed_timeline=False)
+
+    def test_event_management_with_precomputed_timeline(self):
+        self._test_event_management(use_precomputed_timeline=True)
+
+    def test_backtest_event_management(self):
+        self._test_event_management(use_precomputed_timeline=False, event_manager_type=BacktestEventManager)
+
+    def _test_event_management(self, use_precomputed_timeline, event_manager_type=EventManager):
         timer = SettableTimer(initial_time=str_to_date("2018-04-10 00:00:00.000000", DateFormat.FULL_ISO))
         end_date = str_to_date("2018-04-10")
 
         notifiers = Notifiers(timer)
-        event_manager = self._create_event_manager(timer, notifiers)
-        BacktestTimeFlowController(
+        event_manager = self._create_event_manager(timer, notifiers, event_manager_type)
+        time_flow_controller = BacktestTimeFlowController(
             notifiers.scheduler, event_manager, timer, notifiers.empty_queue_event_notifier, end_date
         )
+        if use_precomputed_timeline:
+            time_flow_controller.use_precomputed_timeline()
 
         listener = DummyListener(notifiers, event_manager, timer)
 
@@ -168,8 +180,8 @@ class TestEventManagement(TestCase):
         for key in expected_single_time_events_data:
             self.assertEqual(expected_single_time_events_data[key], listener.registered_single_time_events[key])
 
-    def _create_event_manager(self, timer, notifiers):
-        event_manager = EventManager(timer)
+    def _create_event_manager(self, timer, notifiers, event_manager_type):
+        event_manager = event_manager_type(timer)
 
         event_manager.register_notifiers([
             notifiers.empty_queue_event_notifier,
@@ -0,0 +1,77 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+"""
+Micro-benchmark of normalize_data_array. It compares the fast path (used when the data array already contains the
+requested tickers and fields in the requested order) with the previous implementation, which always reindexed the
+data array and converted it using xarray, for the single ticker / single field, multiple tickers and full cube shapes.
+
+Usage: python qf_lib_tests/manual_tests/normalize_data_array_benchmark.py [number_of_repetitions]
+"""
+import sys
+from time import time
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.helpers import normalize_data_array, squeeze_data_array, cast_data_array_to_proper_type
+
+
+def legacy_normalize_data_array(data_array, tickers, fields, got_single_date, got_single_ticker, got_single_field,
+                                use_prices_types=False):
+    data_array = data_array.reindex(tickers=tickers, fields=fields)
+    data_array = data_array.dropna(DATES, how='all')
+    squeezed_result = squeeze_data_array(data_array, got_single_date, got_single_ticker, got_single_field)
+    return cast_data_array_to_proper_type(squeezed_result, use_prices_types)
+
+
+def measure(normalize_function, data_array, tickers, fields, got_single_ticker, got_single_field,
+            number_of_repetitions):
+    start_time = time()
+    for _ in range(number_of_repetitions):
+        normalize_function(data_array, tickers, fields, False, got_single_ticker, got_single_field, True)
+    return time() - start_time
+
+
+def main():
+    number_of_repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    dates = pd.bdate_range("2015-01-01", periods=252, name=DATES)
+    tickers = [BloombergTicker("Ticker{} Equity".format(i)) for i in range(50)]
+    fields = PriceField.ohlcv()
+    values = np.random.RandomState(1).uniform(size=(len(dates), len(tickers), len(fields)))
+    data_array = QFDataArray.create(dates, tickers, fields, values)
+
+    shapes = [
+        ("single ticker, single field", tickers[:1], fields[:1], True, True),
+        ("multiple tickers, single field", tickers, fields[:1], False, True),
+        ("full cube", tickers, fields, False, False),
+    ]
+
+    for shape_name, shape_tickers, shape_fields, got_single_ticker, got_single_field in shapes:
+        shape_data_array = data_array.loc[:, shape_tickers, shape_fields]
+        legacy_time = measure(legacy_normalize_data_array, shape_data_array, shape_tickers, shape_fields,
+                              got_single_ticker, got_single_field, number_of_repetitions)
+        fast_path_time = measure(normalize_data_array, shape_data_array, shape_tickers, shape_fields,
+                                 got_single_ticker, got_single_field, number_of_repetitions)
+
+        print("{:32s} legacy: {:6.2f} s, fast path: {:6.2f} s ({:.1f}x faster)".format(
+            shape_name, legacy_time, fast_path_time, legacy_time / fast_path_time))
+
+
+if __name__ == '__main__':
+    main()
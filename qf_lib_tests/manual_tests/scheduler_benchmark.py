@@ -0,0 +1,122 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+"""
+Micro-benchmark of the Scheduler. It generates all the time events of a one year long backtest with 1-minute bars
+(the way BacktestTimeFlowController does it) using the current Scheduler and the previous implementation, which
+computed the next trigger times of all the events on every call. The Scheduler is tested both with and without
+the precomputed timeline.
+
+Usage: python qf_lib_tests/manual_tests/scheduler_benchmark.py [number_of_days]
+"""
+import operator
+import sys
+from datetime import datetime
+from time import time
+
+from qf_lib.backtesting.events.time_event.periodic_event.intraday_bar_event import IntradayBarEvent
+from qf_lib.backtesting.events.time_event.periodic_event.periodic_event import PeriodicEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.after_market_close_event import AfterMarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.before_market_open_event import BeforeMarketOpenEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.events.time_event.scheduler import Scheduler
+from qf_lib.backtesting.events.time_event.single_time_event.schedule_order_execution_event import \
+    ScheduleOrderExecutionEvent
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+
+
+class LegacyScheduler(Scheduler):
+    """ Scheduler computing the next trigger times of all the events on every call (previous implementation). """
+
+    def get_next_time_events(self):
+        now = self.timer.now()
+
+        times_and_events = [
+            (time_event.next_trigger_time(now), time_event) for time_event in self._time_event_type_to_object.values()
+            if time_event.next_trigger_time(now) is not None
+        ]
+
+        next_trigger_time, _ = min(times_and_events, key=operator.itemgetter(0))
+        next_time_events = [event for time, event in times_and_events if time == next_trigger_time]
+        next_time_events.sort(key=lambda ev: self._time_events_priority.get(type(ev), float('inf')))
+        return next_time_events, next_trigger_time
+
+
+class Periodic15MinutesEvent(PeriodicEvent):
+    frequency = Frequency.MIN_15
+    start_time = {"hour": 13, "minute": 30, "second": 0, "microsecond": 0}
+    end_time = {"hour": 20, "minute": 0, "second": 0, "microsecond": 0}
+
+    def notify(self, listener) -> None:
+        pass
+
+
+class Periodic60MinutesEvent(PeriodicEvent):
+    frequency = Frequency.MIN_60
+    start_time = {"hour": 13, "minute": 30, "second": 0, "microsecond": 0}
+    end_time = {"hour": 20, "minute": 0, "second": 0, "microsecond": 0}
+
+    def notify(self, listener) -> None:
+        pass
+
+
+def run_backtest_time_flow(scheduler_type, start_date: datetime, end_date: datetime,
+                           use_precomputed_timeline: bool = False):
+    timer = SettableTimer(start_date)
+    scheduler = scheduler_type(timer)
+
+    for event_type in (BeforeMarketOpenEvent, MarketOpenEvent, MarketCloseEvent, AfterMarketCloseEvent,
+                       IntradayBarEvent, Periodic15MinutesEvent, Periodic60MinutesEvent, ScheduleOrderExecutionEvent):
+        scheduler.subscribe(event_type, listener=None)
+
+    generated_events = []
+    start_time = time()
+    if use_precomputed_timeline:
+        scheduler.use_precomputed_timeline(end_date)
+
+    while timer.now() < end_date:
+        time_events, next_time = scheduler.get_next_time_events()
+        timer.set_current_time(next_time)
+        generated_events.append((next_time, [type(event) for event in time_events]))
+
+    return time() - start_time, generated_events
+
+
+def main():
+    number_of_days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+
+    BeforeMarketOpenEvent.set_trigger_time({"hour": 8, "minute": 0, "second": 0, "microsecond": 0})
+    MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+    MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+    AfterMarketCloseEvent.set_trigger_time({"hour": 21, "minute": 0, "second": 0, "microsecond": 0})
+
+    start_date = datetime(2018, 1, 1)
+    end_date = start_date + RelativeDelta(days=number_of_days)
+
+    legacy_time, legacy_events = run_backtest_time_flow(LegacyScheduler, start_date, end_date)
+    heap_time, heap_events = run_backtest_time_flow(Scheduler, start_date, end_date)
+    timeline_time, timeline_events = run_backtest_time_flow(Scheduler, start_date, end_date, True)
+
+    assert legacy_events == heap_events, "Schedulers generated different time events"
+    assert legacy_events == timeline_events, "Schedulers generated different time events"
+    print("{} days, {} time events generated".format(number_of_days, len(heap_events)))
+    print("Legacy scheduler: {:8.2f} s".format(legacy_time))
+    print("Heap scheduler:   {:8.2f} s ({:.1f}x faster)".format(heap_time, legacy_time / heap_time))
+    print("Timeline:         {:8.2f} s ({:.1f}x faster)".format(timeline_time, legacy_time / timeline_time))
+
+
+if __name__ == '__main__':
+    main()
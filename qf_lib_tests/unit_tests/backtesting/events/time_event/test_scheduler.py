@@ -18,7 +18,12 @@ from unittest import TestCase
 
 from mockito import mock, when, verify, ANY
 
+from qf_lib.backtesting.events.time_event.periodic_event.intraday_bar_event import IntradayBarEvent
 from qf_lib.backtesting.events.time_event.periodic_event.periodic_event import PeriodicEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.after_market_close_event import AfterMarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.before_market_open_event import BeforeMarketOpenEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
 from qf_lib.backtesting.events.time_event.single_time_event.single_time_event import SingleTimeEvent
 from qf_lib.backtesting.events.time_event.scheduler import Scheduler
 from qf_lib.backtesting.events.time_event.time_event import TimeEvent
@@ -207,6 +212,111 @@ class TestScheduler(TestCase):
         time_events_list_types = [type(event) for event in time_events_list]
         self.assertCountEqual(time_events_list_types, [self.PeriodicEvent15Minutes, SingleTimeEvent])
 
+    def test_get_next_time_events_equal_to_not_cached_trigger_times(self):
+        for event_type in (BeforeMarketOpenEvent, MarketOpenEvent, MarketCloseEvent, AfterMarketCloseEvent):
+            # restore the trigger times used by other tests
+            self.addCleanup(setattr, event_type, "_trigger_time", event_type._trigger_time)
+            self.addCleanup(setattr, event_type, "_trigger_time_rule", event_type._trigger_time_rule)
+
+        BeforeMarketOpenEvent.set_trigger_time({"hour": 8, "minute": 0, "second": 0, "microsecond": 0})
+        MarketOpenEvent.set_trigger_time({"hour": 9, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 11, "minute": 0, "second": 0, "microsecond": 0})
+        AfterMarketCloseEvent.set_trigger_time({"hour": 11, "minute": 15, "second": 0, "microsecond": 0})
+
+        listener = mock()
+        event_types = [BeforeMarketOpenEvent, MarketOpenEvent, MarketCloseEvent, AfterMarketCloseEvent,
+                       IntradayBarEvent, self.PeriodicEvent15Minutes, self.PeriodicEvent30Minutes, SingleTimeEvent]
+        for event_type in event_types:
+            self.scheduler.subscribe(event_type, listener)
+        events = [event_type() for event_type in event_types]
+
+        self.addCleanup(SingleTimeEvent.clear)
+        SingleTimeEvent.schedule_new_event(str_to_date("2018-01-03 10:17:30.000000", DateFormat.FULL_ISO), {})
+        SingleTimeEvent.schedule_new_event(str_to_date("2018-01-04 10:00:00.000000", DateFormat.FULL_ISO), {})
+
+        def assert_expected_time_events(now):
+            self.timer.set_current_time(now)
+            trigger_times = [event.next_trigger_time(now) for event in events]
+            expected_time = min(time for time in trigger_times if time is not None)
+            expected_events = [event for event, time in zip(events, trigger_times) if time == expected_time]
+
+            time_events_list, time = self.scheduler.get_next_time_events()
+            self.assertEqual(expected_time, time)
+            self.assertCountEqual(expected_events, time_events_list)
+            return time
+
+        now = str_to_date("2018-01-01 07:00:00.000000", DateFormat.FULL_ISO)
+        end_date = str_to_date("2018-01-09")
+        while now < end_date:
+            now = assert_expected_time_events(now)
+
+        # the time moved backwards
+        assert_expected_time_events(str_to_date("2018-01-03 10:10:00.000000", DateFormat.FULL_ISO))
+
+    def test_get_next_time_events_with_precomputed_timeline(self):
+        self.timer.set_current_time(str_to_date("2018-01-01 10:00:00.000000", DateFormat.FULL_ISO))
+        listener = mock()
+        self.scheduler.subscribe(self.PeriodicEvent15Minutes, listener)
+        self.scheduler.subscribe(self.PeriodicEvent30Minutes, listener)
+        self.scheduler.subscribe(SingleTimeEvent, listener)
+        self.addCleanup(SingleTimeEvent.clear)
+
+        scheduler = Scheduler(self.timer)
+        scheduler.subscribe(self.PeriodicEvent15Minutes, listener)
+        scheduler.subscribe(self.PeriodicEvent30Minutes, listener)
+        scheduler.subscribe(SingleTimeEvent, listener)
+        scheduler.use_precomputed_timeline(str_to_date("2018-01-05"))
+
+        SingleTimeEvent.schedule_new_event(str_to_date("2018-01-02 10:17:30.000000", DateFormat.FULL_ISO), {})
+        SingleTimeEvent.schedule_new_event(str_to_date("2018-01-03 10:00:00.000000", DateFormat.FULL_ISO), {})
+
+        end_date = str_to_date("2018-01-10")
+        while self.timer.now() < end_date:
+            expected_time_events, expected_time = self.scheduler.get_next_time_events()
+            actual_time_events, actual_time = scheduler.get_next_time_events()
+
+            self.assertEqual(expected_time, actual_time)
+            self.assertEqual(expected_time_events, actual_time_events)
+            self.timer.set_current_time(actual_time)
+
+    def test_precomputed_timeline_skips_non_trading_days(self):
+        self.timer.set_current_time(str_to_date("2018-01-01 12:00:00.000000", DateFormat.FULL_ISO))
+        self.scheduler.subscribe(self.PeriodicEvent30Minutes, mock())
+
+        trading_dates = [str_to_date("2018-01-01"), str_to_date("2018-01-03")]
+        end_time = str_to_date("2018-01-04 23:59:59.000000", DateFormat.FULL_ISO)
+        self.scheduler.use_precomputed_timeline(end_time, trading_dates)
+
+        trigger_times = []
+        while self.timer.now() < str_to_date("2018-01-05"):
+            _, time = self.scheduler.get_next_time_events()
+            trigger_times.append(time)
+            self.timer.set_current_time(time)
+
+        expected_trigger_times = [str_to_date(time, DateFormat.FULL_ISO) for time in (
+            "2018-01-03 09:30:00.000000", "2018-01-03 10:00:00.000000", "2018-01-03 10:30:00.000000",
+            "2018-01-05 09:30:00.000000")]
+        self.assertEqual(expected_trigger_times, trigger_times)
+
+    def test_trigger_times_are_recomputed_after_trigger_settings_change(self):
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+        self.timer.set_current_time(str_to_date("2018-01-01 10:00:00.000000", DateFormat.FULL_ISO))
+
+        self.scheduler.subscribe(MarketOpenEvent, mock())
+        scheduler_with_timeline = Scheduler(self.timer)
+        scheduler_with_timeline.subscribe(MarketOpenEvent, mock())
+        scheduler_with_timeline.use_precomputed_timeline(str_to_date("2018-01-05"))
+
+        expected_time = str_to_date("2018-01-01 13:30:00.000000", DateFormat.FULL_ISO)
+        self.assertEqual(expected_time, self.scheduler.get_next_time_events()[1])
+        self.assertEqual(expected_time, scheduler_with_timeline.get_next_time_events()[1])
+
+        MarketOpenEvent.set_trigger_time({"hour": 12, "minute": 0, "second": 0, "microsecond": 0})
+
+        expected_time = str_to_date("2018-01-01 12:00:00.000000", DateFormat.FULL_ISO)
+        self.assertEqual(expected_time, self.scheduler.get_next_time_events()[1])
+        self.assertEqual(expected_time, scheduler_with_timeline.get_next_time_events()[1])
+
     @staticmethod
     def _get_listeners_mock():
         listener = mock(strict=True)
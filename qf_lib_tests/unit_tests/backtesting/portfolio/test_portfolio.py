@@ -47,6 +47,9 @@ class ContractTickerMapperMock(object):
 
 
 class TestPortfolio(unittest.TestCase):
+    use_position_book = False
+    use_columnar_log = False
+    use_columnar_positions_history = False
 
     @classmethod
     def setUpClass(cls):
@@ -637,6 +640,12 @@ class TestPortfolio(unittest.TestCase):
         self.assertEqual(t.price, 271)
         self.assertEqual(t.quantity, -20)
 
+        transactions_frame = portfolio.transactions_frame()
+        self.assertEqual(list(transactions.index), list(transactions_frame.index))
+        self.assertEqual([t.quantity for t in transactions], transactions_frame["quantity"].tolist())
+        self.assertEqual([t.price for t in transactions], transactions_frame["price"].tolist())
+        self.assertEqual([t.contract for t in transactions], transactions_frame["contract"].tolist())
+
     def test_portfolio_trade_list(self):
         # empty portfolio
         portfolio, dh, timer = self.get_portfolio_and_data_handler()
@@ -693,6 +702,11 @@ class TestPortfolio(unittest.TestCase):
         t = trades[4]
         self.assertEqual(t.pnl, 7491.6)
 
+        trades_frame = portfolio.trades_frame()
+        self.assertEqual(10, len(trades_frame))
+        self.assertAlmostEqual(7491.6, trades_frame["pnl"].iloc[4])
+        self.assertEqual([trade.contract for trade in trades], trades_frame["contract"].tolist())
+
     def test_trades_commissions(self):
         portfolio, dh, timer = self.get_portfolio_and_data_handler()
         dh.set_prices(self.prices_series)
@@ -786,9 +800,22 @@ class TestPortfolio(unittest.TestCase):
         timer = SettableTimer()
         timer.set_current_time(self.start_time)
 
-        portfolio = Portfolio(data_handler, self.initial_cash, timer, contract_mapper)
+        portfolio = Portfolio(data_handler, self.initial_cash, timer, contract_mapper, self.use_position_book,
+                              self.use_columnar_log, self.use_columnar_positions_history)
         return portfolio, data_handler, timer
 
 
+class TestPortfolioWithPositionBook(TestPortfolio):
+    use_position_book = True
+
+
+class TestPortfolioWithColumnarLog(TestPortfolio):
+    use_columnar_log = True
+
+
+class TestPortfolioWithColumnarPositionsHistory(TestPortfolio):
+    use_columnar_positions_history = True
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,114 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+
+import numpy as np
+
+from demo_scripts.common.utils.dummy_ticker import DummyTicker
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.portfolio.portfolio import Portfolio
+from qf_lib.backtesting.portfolio.positions_history import PositionsHistory
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.string_to_date import str_to_date
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib_tests.helpers.testing_tools.containers_comparison import assert_dataframes_equal
+from qf_lib_tests.unit_tests.backtesting.portfolio.test_portfolio import DataHandlerMock, ContractTickerMapperMock
+
+
+class TestPositionBook(unittest.TestCase):
+    def setUp(self):
+        self.contracts = [Contract('STK{} US Equity'.format(i), security_type='STK', exchange='NYSE')
+                          for i in range(40)]
+        self.contracts += [Contract('FUT{} Comdty'.format(i), security_type='FUT', exchange='CME', contract_size=50)
+                           for i in range(40)]
+        self.tickers = [DummyTicker(contract.symbol) for contract in self.contracts]
+        self.random_state = np.random.RandomState(5)
+
+        self.timer = SettableTimer(str_to_date('2017-01-01'))
+        self.data_handler = DataHandlerMock()
+        contract_mapper = ContractTickerMapperMock()
+
+        # noinspection PyTypeChecker
+        self.portfolio = Portfolio(self.data_handler, 1000000, self.timer, contract_mapper)
+        # noinspection PyTypeChecker
+        self.book_portfolio = Portfolio(self.data_handler, 1000000, self.timer, contract_mapper, use_position_book=True,
+                                        use_columnar_positions_history=True)
+
+    def test_position_book_portfolio_equal_to_default_one(self):
+        for day in range(30):
+            self.timer.set_current_time(self.timer.now() + RelativeDelta(days=1))
+            prices = self.random_state.uniform(50, 150, len(self.tickers))
+            self.data_handler.set_prices(QFSeries(data=prices, index=self.tickers))
+
+            # open, extend, reduce, close and reverse the positions
+            for i in self.random_state.choice(len(self.contracts), 20, replace=False):
+                position = self.portfolio.open_positions_dict.get(self.contracts[i])
+                if position is not None and self.random_state.rand() < 0.3:
+                    quantity = -position.quantity()
+                else:
+                    quantity = int(self.random_state.choice([-20, -10, 10, 20]))
+
+                transaction = Transaction(self.timer.now(), self.contracts[i], quantity, prices[i], 1.0)
+                self.portfolio.transact_transaction(transaction)
+                self.book_portfolio.transact_transaction(transaction)
+
+            self.portfolio.update(record=True)
+            self.book_portfolio.update(record=True)
+            self._assert_portfolios_equal()
+
+    def test_positions_without_prices_are_removed(self):
+        prices = QFSeries(data=self.random_state.uniform(50, 150, len(self.tickers)), index=self.tickers)
+        self.data_handler.set_prices(prices)
+
+        for contract, ticker in zip(self.contracts, self.tickers):
+            transaction = Transaction(self.timer.now(), contract, 10, prices[ticker], 1.0)
+            self.portfolio.transact_transaction(transaction)
+            self.book_portfolio.transact_transaction(transaction)
+
+        self.portfolio.update()
+        self.book_portfolio.update()
+
+        prices_with_nans = prices.copy()
+        prices_with_nans.iloc[[0, 3, 41, 79]] = np.nan
+        self.data_handler.set_prices(prices_with_nans)
+        self.portfolio.update(record=True)
+        self.book_portfolio.update(record=True)
+
+        self.assertEqual(len(self.contracts) - 4, len(self.book_portfolio.open_positions_dict))
+        self._assert_portfolios_equal()
+
+    def _assert_portfolios_equal(self):
+        self.assertAlmostEqual(self.portfolio.current_cash, self.book_portfolio.current_cash, places=6)
+        self.assertAlmostEqual(self.portfolio.net_liquidation, self.book_portfolio.net_liquidation, places=6)
+        self.assertAlmostEqual(self.portfolio.gross_exposure_of_positions,
+                               self.book_portfolio.gross_exposure_of_positions, places=6)
+
+        self.assertEqual(self.portfolio.open_positions_dict.keys(), self.book_portfolio.open_positions_dict.keys())
+        for contract, position in self.portfolio.open_positions_dict.items():
+            book_position = self.book_portfolio.open_positions_dict[contract]
+            self.assertEqual(position.quantity(), book_position.quantity())
+            self.assertEqual(position.current_price, book_position.current_price)
+            self.assertEqual(position.market_value(), book_position.market_value())
+
+        for field in PositionsHistory.FIELDS:
+            # the order of contracts in the positions history depends on the order of positions in the portfolio
+            expected_values = self.portfolio.positions_eod_values(field)
+            actual_values = self.book_portfolio.positions_eod_values(field)[expected_values.columns]
+            assert_dataframes_equal(expected_values, actual_values, absolute_tolerance=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.portfolio.backtest_position import BacktestPositionSummary
+from qf_lib.backtesting.portfolio.position_factory import BacktestPositionFactory
+from qf_lib.backtesting.portfolio.positions_history import PositionsHistory
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+
+
+class TestPositionsHistory(unittest.TestCase):
+    def setUp(self):
+        self.contracts = [
+            Contract('AAPL US Equity', security_type='STK', exchange='NYSE'),
+            Contract('MSFT US Equity', security_type='STK', exchange='NYSE'),
+            Contract('CTZ9 Comdty', security_type='FUT', exchange='CME', contract_size=75)
+        ]
+        self.dates = [datetime(2017, 1, day) for day in range(2, 7)]
+
+        # each of the dates contains the positions open at that time (contract index -> (quantity, price))
+        self.open_positions = [
+            {},
+            {0: (10, 100.0)},
+            {0: (10, 105.0), 2: (-3, 250.0)},
+            {1: (5, 20.0), 2: (-3, 240.0)},
+            {0: (7, 110.0), 1: (5, 21.0), 2: (-3, 260.0)},
+        ]
+
+    def _record_history(self, chunk_size):
+        positions_history = PositionsHistory(chunk_size)
+        expected_history = []
+
+        for date, positions in zip(self.dates, self.open_positions):
+            current_positions = []
+            for contract_index, (quantity, price) in positions.items():
+                contract = self.contracts[contract_index]
+                position = BacktestPositionFactory.create_position(contract, date)
+                position.transact_transaction(Transaction(date, contract, quantity, 100.0, 0.0))
+                position.update_price(price, price)
+                current_positions.append(position)
+
+            positions_history.record(date, current_positions)
+            expected_history.append({p.contract(): BacktestPositionSummary(p) for p in current_positions})
+
+        return positions_history, expected_history
+
+    def test_values_frames(self):
+        for chunk_size in (1, 2, 100):
+            positions_history, expected_history = self._record_history(chunk_size)
+            self.assertEqual(self.dates, positions_history.dates)
+            self.assertEqual(len(self.dates), len(positions_history))
+
+            exposures = positions_history.to_frame("total_exposure")
+            self.assertEqual([self.contracts[0], self.contracts[2], self.contracts[1]], list(exposures.columns))
+            self.assertEqual(self.dates, list(exposures.index))
+
+            for date, expected_positions in zip(self.dates, expected_history):
+                for contract in exposures.columns:
+                    summary = expected_positions.get(contract)
+                    if summary is None:
+                        self.assertTrue(np.isnan(exposures.loc[date, contract]))
+                    else:
+                        self.assertEqual(summary.total_exposure, exposures.loc[date, contract])
+
+            quantities = positions_history.to_frame("quantity")
+            self.assertEqual(-3, quantities.loc[self.dates[3], self.contracts[2]])
+            directions = positions_history.to_frame("direction")
+            self.assertEqual(-1, directions.loc[self.dates[3], self.contracts[2]])
+
+    def test_summaries_frame_equal_to_frame_of_dicts(self):
+        positions_history, expected_history = self._record_history(chunk_size=2)
+
+        summaries = positions_history.to_summaries_frame()
+        expected_summaries = QFDataFrame(data=expected_history, index=self.dates)
+        self.assertEqual(expected_summaries.shape, summaries.shape)
+
+        for date in self.dates:
+            for contract in expected_summaries.columns:
+                expected_summary = expected_summaries.loc[date, contract]
+                summary = summaries.loc[date, contract]
+                if isinstance(expected_summary, BacktestPositionSummary):
+                    self.assertEqual(expected_summary.__dict__, summary.__dict__)
+                else:
+                    self.assertTrue(np.isnan(summary))
+
+    def test_empty_history(self):
+        positions_history = PositionsHistory()
+        positions_history.record(self.dates[0], [])
+
+        self.assertEqual((1, 0), positions_history.to_frame("market_value").shape)
+        self.assertEqual((1, 0), positions_history.to_summaries_frame().shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
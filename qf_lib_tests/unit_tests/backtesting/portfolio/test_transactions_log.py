@@ -0,0 +1,75 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.portfolio.trade import Trade
+from qf_lib.backtesting.portfolio.transaction import Transaction
+from qf_lib.backtesting.portfolio.transactions_log import TransactionsLog, TradesLog
+
+
+class TestTransactionsLog(unittest.TestCase):
+    def setUp(self):
+        self.contracts = [Contract("AAA US Equity", "STK", "NYSE"), Contract("CTZ9 Comdty", "FUT", "CME", 50)]
+        self.transactions = [
+            Transaction(datetime(2019, 1, i + 1, 13, 30), self.contracts[i % 2], (-1) ** i * (i + 1), 100.5 + i, 0.5 * i)
+            for i in range(10)
+        ]
+        self.transactions.append(Transaction(datetime(2019, 1, 20), self.contracts[0], 2.5, 10.0, 0.0))
+
+    def test_transactions_are_restored(self):
+        transactions_log = TransactionsLog(initial_capacity=1)
+        for transaction in self.transactions:
+            transactions_log.append(transaction)
+
+        self.assertEqual(len(self.transactions), len(transactions_log))
+        self.assertEqual(self.transactions, list(transactions_log))
+        self.assertEqual(self.transactions[-1], transactions_log[-1])
+        self.assertEqual(self.contracts, transactions_log.contracts)
+
+        # integer quantities are restored as integers
+        self.assertIsInstance(transactions_log[0].quantity, int)
+        self.assertIsInstance(transactions_log[0].time, datetime)
+
+    def test_transactions_frame(self):
+        transactions_log = TransactionsLog()
+        for transaction in self.transactions:
+            transactions_log.append(transaction)
+
+        transactions_frame = transactions_log.to_frame()
+        self.assertEqual([t.time for t in self.transactions], list(transactions_frame.index))
+        self.assertEqual([t.contract for t in self.transactions], transactions_frame["contract"].tolist())
+        self.assertEqual([t.quantity for t in self.transactions], transactions_frame["quantity"].tolist())
+        self.assertEqual([t.contract.contract_size for t in self.transactions],
+                         transactions_frame["contract_size"].tolist())
+
+    def test_trades(self):
+        trades = [
+            Trade(datetime(2019, 1, 1), datetime(2019, 1, 5), self.contracts[1], -3, 20.0, 18.5, 1.5, 0.02),
+            Trade(datetime(2019, 1, 2), datetime(2019, 1, 3), self.contracts[0], 10, 100.0, 101.0, 0.0)
+        ]
+        trades_log = TradesLog(initial_capacity=1)
+        for trade in trades:
+            trades_log.append(trade)
+
+        restored_trades = list(trades_log)
+        self.assertEqual([trade.pnl for trade in trades], [trade.pnl for trade in restored_trades])
+        self.assertEqual([trade.start_time for trade in trades], [trade.start_time for trade in restored_trades])
+        self.assertEqual(0.02, restored_trades[0].risk_as_percent)
+        self.assertEqual([trade.pnl for trade in trades], trades_log.to_frame()["pnl"].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from itertools import count
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from mockito import mock
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.execution_handler.commission_models.fixed_commission_model import FixedCommissionModel
+from qf_lib.backtesting.execution_handler.limit_orders_executor import LimitOrdersExecutor
+from qf_lib.backtesting.execution_handler.order_book import OrderBook
+from qf_lib.backtesting.execution_handler.slippage.price_based_slippage import PriceBasedSlippage
+from qf_lib.backtesting.order.execution_style import LimitOrder, MarketOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib_tests.unit_tests.backtesting.simulated_execution_handler.test_stop_loss_execution_style import \
+    _MonitorMock
+from qf_lib_tests.unit_tests.backtesting.simulated_execution_handler.test_stop_orders_executor import \
+    _DataHandlerMock
+
+
+class TestOrderBook(TestCase):
+    def setUp(self):
+        self.ticker = BloombergTicker("A US Equity")
+        self.order_book = OrderBook()
+        # buy limit orders
+        self.order_book.add(1, self.ticker, 95.0, True)
+        self.order_book.add(2, self.ticker, 99.0, True)
+        self.order_book.add(3, self.ticker, 97.0, True)
+        # sell limit orders
+        self.order_book.add(4, self.ticker, 105.0, False)
+        self.order_book.add(5, self.ticker, 101.0, False)
+        self.order_book.add(6, self.ticker, 101.0, False)
+
+    def test_only_orders_inside_the_bar_range_are_triggered(self):
+        self.assertEqual([3, 2, 5, 6], self.order_book.triggered_orders_ids(self.ticker, 97.0, 101.0))
+        self.assertEqual([], self.order_book.triggered_orders_ids(self.ticker, 99.5, 100.5))
+        self.assertEqual([1, 3, 2, 5, 6, 4], self.order_book.triggered_orders_ids(self.ticker, 90.0, 110.0))
+        self.assertEqual([], self.order_book.triggered_orders_ids(BloombergTicker("B US Equity"), 90.0, 110.0))
+
+    def test_remove(self):
+        self.assertTrue(self.order_book.remove(3))
+        self.assertTrue(self.order_book.remove(5))
+        self.assertFalse(self.order_book.remove(5))
+
+        self.assertEqual(4, len(self.order_book))
+        self.assertEqual([2, 6], self.order_book.triggered_orders_ids(self.ticker, 97.0, 101.0))
+
+        for order_id in (1, 2, 4, 6):
+            self.order_book.remove(order_id)
+        self.assertEqual([], self.order_book.tickers())
+
+
+class TestLimitOrdersExecutor(TestCase):
+    def setUp(self):
+        self.random_state = np.random.RandomState(11)
+        self.tickers_str = ["A US Equity", "B US Equity", "C US Equity", "D US Equity"]
+        self.contracts = [Contract(ticker_str, security_type='STK', exchange='TEST') for ticker_str in self.tickers_str]
+        self.tickers = [BloombergTicker(ticker_str) for ticker_str in self.tickers_str]
+
+        self.data_handler = _DataHandlerMock()
+        self.monitor = _MonitorMock()
+        contracts_to_tickers_mapper = DummyBloombergContractTickerMapper()
+        slippage_model = PriceBasedSlippage(0.0, None, contracts_to_tickers_mapper)
+
+        self.executor = LimitOrdersExecutor(contracts_to_tickers_mapper, self.data_handler, self.monitor,
+                                            mock(), SettableTimer(datetime(2019, 1, 2, 15)), count(start=1),
+                                            FixedCommissionModel(0.0), slippage_model)
+
+    def _create_orders(self, number_of_orders):
+        orders = []
+        for _ in range(number_of_orders):
+            contract = self.contracts[self.random_state.randint(len(self.contracts))]
+            quantity = int(self.random_state.choice([-1, 1]) * self.random_state.randint(1, 100))
+            limit_price = float(np.round(self.random_state.uniform(90, 110), 1))
+            time_in_force = self.random_state.choice([TimeInForce.DAY, TimeInForce.GTC])
+            orders.append(Order(contract, quantity, LimitOrder(limit_price), time_in_force))
+
+        self.executor.assign_order_ids(orders)
+        return orders
+
+    def _create_bars(self):
+        open_prices = np.round(self.random_state.uniform(95, 105, len(self.tickers)), 1)
+        low_prices = open_prices - np.round(self.random_state.uniform(0, 5, len(self.tickers)), 1)
+        high_prices = open_prices + np.round(self.random_state.uniform(0, 5, len(self.tickers)), 1)
+
+        bars = pd.DataFrame({
+            PriceField.Open: open_prices, PriceField.High: high_prices, PriceField.Low: low_prices,
+            PriceField.Close: open_prices, PriceField.Volume: 1000.0
+        }, index=self.tickers).astype(object)
+
+        # bar which is not available yet
+        bars.loc[self.tickers[3], :] = None
+        return bars
+
+    def test_order_book_gives_the_same_results_as_scanning_all_orders(self):
+        orders = self._create_orders(500)
+        self.executor.accept_orders(orders)
+        self.data_handler.current_bars = self._create_bars()
+
+        for market_close in (False, True):
+            open_orders, tickers = self.executor._get_open_orders_and_tickers()
+            expected_result = self.executor._get_orders_with_fill_prices_without_slippage(
+                open_orders, tickers, False, market_close)
+            actual_result = self.executor._match_orders(False, market_close)
+
+            self.assertEqual(expected_result, actual_result)
+            self.assertGreater(len(actual_result[1]), 0)
+
+    def test_fill_prices(self):
+        buy_order = Order(self.contracts[0], 10, LimitOrder(100.0), TimeInForce.GTC)
+        sell_order = Order(self.contracts[0], -10, LimitOrder(103.0), TimeInForce.GTC)
+        gap_sell_order = Order(self.contracts[1], -10, LimitOrder(95.0), TimeInForce.DAY)
+        not_reached_order = Order(self.contracts[1], 10, LimitOrder(90.0), TimeInForce.DAY)
+        orders = [buy_order, sell_order, gap_sell_order, not_reached_order]
+        self.executor.assign_order_ids(orders)
+        self.executor.accept_orders(orders)
+
+        self.data_handler.current_bars = pd.DataFrame({
+            PriceField.Open: [101.0, 98.0], PriceField.High: [104.0, 99.0], PriceField.Low: [99.0, 97.0],
+            PriceField.Close: [102.0, 98.0], PriceField.Volume: [1000.0, 1000.0]
+        }, index=self.tickers[:2])
+
+        self.executor.execute_orders(market_close=True)
+
+        self.assertEqual([(10, 100.0), (-10, 103.0), (-10, 98.0)],
+                         [(transaction.quantity, transaction.price) for transaction in self.monitor.transactions])
+        # the not reached DAY order expired
+        self.assertEqual([], self.executor.get_open_orders())
+        self.assertEqual(0, len(self.executor._order_book))
+
+    def test_cancelled_orders_are_removed_from_order_book(self):
+        orders = self._create_orders(10)
+        self.executor.accept_orders(orders)
+
+        self.executor.cancel_order(orders[0].id)
+        self.assertEqual(9, len(self.executor._order_book))
+        self.executor.cancel_all_open_orders()
+        self.assertEqual(0, len(self.executor._order_book))
+
+    def test_only_limit_orders_are_accepted(self):
+        with self.assertRaises(AssertionError):
+            self.executor.assign_order_ids([Order(self.contracts[0], 10, MarketOrder(), TimeInForce.GTC)])
+        with self.assertRaises(AssertionError):
+            self.executor.assign_order_ids([Order(self.contracts[0], 10, LimitOrder(10.0), TimeInForce.OPG)])
@@ -0,0 +1,188 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+from datetime import datetime
+from itertools import count
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from mockito import mock
+
+from qf_lib.backtesting.contract.contract import Contract
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.execution_handler.commission_models.fixed_commission_model import FixedCommissionModel
+from qf_lib.backtesting.execution_handler.slippage.price_based_slippage import PriceBasedSlippage
+from qf_lib.backtesting.execution_handler.stop_orders_executor import StopOrdersExecutor
+from qf_lib.backtesting.order.execution_style import StopOrder
+from qf_lib.backtesting.order.order import Order
+from qf_lib.backtesting.order.time_in_force import TimeInForce
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib_tests.unit_tests.backtesting.simulated_execution_handler.test_stop_loss_execution_style import \
+    _MonitorMock
+
+
+def calculate_no_slippage_fill_price(current_bar: pd.Series, order: Order):
+    """ Fill price of a single stop order, computed order by order (the way it was always done before). """
+    price_bar = tuple(current_bar.loc[[PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close]])
+    if None in price_bar:
+        return None
+
+    open_price, high_price, low_price, close_price = price_bar
+    stop_price = order.execution_style.stop_price
+
+    if order.quantity < 0:
+        if open_price <= stop_price:
+            return open_price
+        elif low_price <= stop_price:
+            return stop_price
+    else:
+        if open_price >= stop_price:
+            return open_price
+        elif high_price >= stop_price:
+            return stop_price
+
+    return None
+
+
+class _DataHandlerMock(object):
+    def __init__(self):
+        self.current_bars = None
+
+    def get_current_bar(self, tickers):
+        return self.current_bars.loc[tickers, :]
+
+
+class TestStopOrdersExecutor(TestCase):
+    def setUp(self):
+        self.random_state = np.random.RandomState(7)
+        self.tickers_str = ["A US Equity", "B US Equity", "C US Equity", "D US Equity", "E US Equity"]
+        self.contracts = [Contract(ticker_str, security_type='STK', exchange='TEST') for ticker_str in self.tickers_str]
+        self.tickers = [BloombergTicker(ticker_str) for ticker_str in self.tickers_str]
+
+        self.data_handler = _DataHandlerMock()
+        self.monitor = _MonitorMock()
+        self.portfolio = mock()
+        contracts_to_tickers_mapper = DummyBloombergContractTickerMapper()
+        slippage_model = PriceBasedSlippage(0.0, None, contracts_to_tickers_mapper)
+
+        self.executor = StopOrdersExecutor(contracts_to_tickers_mapper, self.data_handler, self.monitor,
+                                           self.portfolio, SettableTimer(datetime(2019, 1, 2, 15)), count(start=1),
+                                           FixedCommissionModel(0.0), slippage_model)
+
+    def _create_orders(self, number_of_orders):
+        orders = []
+        for _ in range(number_of_orders):
+            contract = self.contracts[self.random_state.randint(len(self.contracts))]
+            quantity = int(self.random_state.choice([-1, 1]) * self.random_state.randint(1, 100))
+            stop_price = float(np.round(self.random_state.uniform(90, 110), 1))
+            time_in_force = self.random_state.choice([TimeInForce.DAY, TimeInForce.GTC])
+            orders.append(Order(contract, quantity, StopOrder(stop_price), time_in_force))
+
+        for order in orders:
+            order.id = next(self.executor._order_id_generator)
+
+        return orders
+
+    def _create_bars(self):
+        open_prices = np.round(self.random_state.uniform(95, 105, len(self.tickers)), 1)
+        low_prices = open_prices - np.round(self.random_state.uniform(0, 5, len(self.tickers)), 1)
+        high_prices = open_prices + np.round(self.random_state.uniform(0, 5, len(self.tickers)), 1)
+        close_prices = self.random_state.uniform(low_prices, high_prices)
+
+        bars = pd.DataFrame(index=self.tickers,
+                            columns=[PriceField.Open, PriceField.High, PriceField.Low, PriceField.Close,
+                                     PriceField.Volume])
+        bars[PriceField.Open] = open_prices
+        bars[PriceField.High] = high_prices
+        bars[PriceField.Low] = low_prices
+        bars[PriceField.Close] = close_prices
+        bars[PriceField.Volume] = 1000.0
+
+        # bar which is not available yet (containing Nones) and a bar with missing open price
+        bars = bars.astype(object)
+        bars.loc[self.tickers[3], :] = None
+        bars.loc[self.tickers[4], PriceField.Open] = np.nan
+        return bars
+
+    def _expected_fill_prices(self, orders, bars, market_close):
+        expected_fill_prices = []
+        expected_orders = []
+        expected_expired_orders = []
+
+        for order in orders:
+            ticker = BloombergTicker(order.contract.symbol)
+            fill_price = calculate_no_slippage_fill_price(bars.loc[ticker, :], order)
+            if fill_price is not None:
+                expected_orders.append(order)
+                expected_fill_prices.append(fill_price)
+            elif market_close and order.time_in_force != TimeInForce.GTC:
+                expected_expired_orders.append(order.id)
+
+        return expected_fill_prices, expected_orders, expected_expired_orders
+
+    def test_vectorized_matching_gives_the_same_results(self):
+        orders = self._create_orders(500)
+        self.executor.accept_orders(orders)
+        bars = self._create_bars()
+        self.data_handler.current_bars = bars
+
+        for market_close in (False, True):
+            open_orders, tickers = self.executor._get_open_orders_and_tickers()
+            actual_result = self.executor._get_orders_with_fill_prices_without_slippage(
+                open_orders, tickers, False, market_close)
+            expected_result = self._expected_fill_prices(orders, bars, market_close)
+
+            self.assertEqual(expected_result[0], actual_result[0])
+            self.assertEqual(expected_result[1], actual_result[1])
+            self.assertEqual(expected_result[2], actual_result[2])
+
+    def test_executed_and_expired_orders_are_removed(self):
+        orders = self._create_orders(50)
+        self.executor.accept_orders(orders)
+        bars = self._create_bars()
+        self.data_handler.current_bars = bars
+        expected_fill_prices, expected_orders, expected_expired_orders = self._expected_fill_prices(orders, bars, True)
+
+        self.executor.execute_orders(market_close=True)
+
+        self.assertEqual(expected_fill_prices, [transaction.price for transaction in self.monitor.transactions])
+        self.assertEqual([order.quantity for order in expected_orders],
+                         [transaction.quantity for transaction in self.monitor.transactions])
+
+        removed_orders_ids = {order.id for order in expected_orders}.union(expected_expired_orders)
+        self.assertEqual([order for order in orders if order.id not in removed_orders_ids],
+                         self.executor.get_open_orders())
+
+    def test_cached_orders_are_updated(self):
+        orders = self._create_orders(20)
+        self.executor.accept_orders(orders[:10])
+        bars = self._create_bars()
+        self.data_handler.current_bars = bars
+
+        self.executor.cancel_order(orders[0].id)
+        self.executor.accept_orders(orders[10:])
+        open_orders, tickers = self.executor._get_open_orders_and_tickers()
+        self.assertEqual(orders[1:], open_orders)
+
+        _, actual_orders, _ = self.executor._get_orders_with_fill_prices_without_slippage(
+            open_orders, tickers, False, False)
+        _, expected_orders, _ = self._expected_fill_prices(orders[1:], bars, False)
+        self.assertEqual(expected_orders, actual_orders)
+
+        self.executor.cancel_all_open_orders()
+        self.executor.execute_orders()
+        self.assertEqual([], self.monitor.transactions)
@@ -0,0 +1,108 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from typing import Sequence, Dict
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.backtesting.alpha_model.alpha_model import AlphaModel
+from qf_lib.backtesting.alpha_model.exposure_enum import Exposure
+from qf_lib.backtesting.data_handler.daily_data_handler import DailyDataHandler
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker, Ticker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.random_prices import create_random_prices_array
+
+
+class TestAlphaModelBatchSignals(TestCase):
+    def setUp(self):
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity"), BloombergTicker("C Equity")]
+        fields = PriceField.ohlcv()
+
+        dates = pd.bdate_range(datetime(2017, 1, 2), datetime(2017, 3, 31), name=DATES)
+        data = create_random_prices_array(dates, self.tickers, fields, seed=7)
+        # the third ticker is not quoted on some of the days
+        data.values[::3, 2, :] = np.nan
+
+        data_provider = PresetDataProvider(data, dates[0], dates[-1], Frequency.DAILY)
+        self.timer = SettableTimer(datetime(2017, 3, 1, 8))
+        self.data_handler = DailyDataHandler(data_provider, self.timer)
+        self.current_exposures = {ticker: Exposure.OUT for ticker in self.tickers}
+
+    def test_batch_fractions_at_risk_equal_to_single_ticker_ones(self):
+        model = PerTickerAlphaModel(0.5, self.data_handler)
+
+        for date in pd.bdate_range(datetime(2017, 2, 1), datetime(2017, 3, 1)):
+            self.timer.set_current_time(date + MarketOpenEvent.trigger_time())
+
+            fractions_at_risk = model.calculate_fractions_at_risk(self.tickers)
+            for ticker in self.tickers:
+                self.assertEqual(model.calculate_fraction_at_risk(ticker), fractions_at_risk[ticker])
+
+    def test_get_signals_uses_single_ticker_calculations_by_default(self):
+        model = PerTickerAlphaModel(0.5, self.data_handler)
+        signals = model.get_signals(self.tickers, self.current_exposures)
+
+        self.assertEqual(self.tickers, [signal.ticker for signal in signals])
+        self.assertEqual(self.tickers, model.exposure_calls)
+
+    def test_get_signals_uses_batch_calculations(self):
+        model = BatchAlphaModel(0.5, self.data_handler)
+        signals = model.get_signals(self.tickers, self.current_exposures)
+
+        self.assertEqual(self.tickers, [signal.ticker for signal in signals])
+        last_close_prices = self.data_handler.historical_price(self.tickers, PriceField.Close, 1).iloc[-1]
+        expected_exposures = [Exposure.LONG if last_close_prices[t] > 15 else Exposure.SHORT for t in self.tickers]
+        self.assertEqual(expected_exposures, [signal.suggested_exposure for signal in signals])
+        self.assertEqual([self.tickers], model.batch_calls)
+
+        for signal in signals:
+            self.assertEqual(model.calculate_fraction_at_risk(signal.ticker), signal.fraction_at_risk)
+
+
+class PerTickerAlphaModel(AlphaModel):
+    def __init__(self, risk_estimation_factor, data_handler):
+        super().__init__(risk_estimation_factor, data_handler)
+        self.exposure_calls = []
+
+    def calculate_exposure(self, ticker: Ticker, current_exposure: Exposure) -> Exposure:
+        self.exposure_calls.append(ticker)
+        return Exposure.LONG
+
+
+class BatchAlphaModel(PerTickerAlphaModel):
+    def __init__(self, risk_estimation_factor, data_handler):
+        super().__init__(risk_estimation_factor, data_handler)
+        self.batch_calls = []
+
+    def calculate_exposures(self, tickers: Sequence[Ticker], current_exposures: Dict[Ticker, Exposure]) \
+            -> Dict[Ticker, Exposure]:
+        self.batch_calls.append(list(tickers))
+        close_prices = self.data_handler.historical_price(tickers, PriceField.Close, 1)
+        return {ticker: Exposure.LONG if close_prices[ticker].iloc[-1] > 15 else Exposure.SHORT for ticker in tickers}
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
+
+from qf_lib.backtesting.contract.contract_to_ticker_conversion.bloomberg_mapper import \
+    DummyBloombergContractTickerMapper
+from qf_lib.backtesting.data_handler.daily_data_handler import DailyDataHandler
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.backtesting.execution_handler.slippage.square_root_market_impact_slippage import \
+    SquareRootMarketImpactSlippage
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.containers_comparison import assert_dataframes_equal
+from qf_lib_tests.helpers.testing_tools.random_prices import create_random_prices_array
+
+
+class TestDataHandlerMarketSnapshot(TestCase):
+    def setUp(self):
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity"), BloombergTicker("C Equity")]
+        self.fields = PriceField.ohlcv()
+
+        dates = pd.bdate_range(datetime(2017, 1, 2), datetime(2017, 12, 29), name=DATES)
+        data = create_random_prices_array(dates, self.tickers, self.fields, seed=5)
+        values = data.values
+        values[:, :, 4] *= 1000
+        values[20:25, :, :] = np.nan
+        values[30:70, 1, :] = np.nan
+        values[np.random.RandomState(6).uniform(size=values.shape) < 0.05] = np.nan
+        values[[40, 50], 2, 4] = -1
+
+        self.data_provider = PresetDataProvider(data, dates[0], dates[-1], Frequency.DAILY)
+        self.timer = SettableTimer()
+        self.data_handler = DailyDataHandler(self.data_provider, self.timer)
+        self.data_handler.use_market_snapshot()
+        self.market_snapshot = self.data_handler.market_snapshot
+
+        self.price_requests = []
+        get_price = self.data_provider.get_price
+
+        def get_price_and_count(tickers, fields, start_date, end_date=None, frequency=None):
+            self.price_requests.append((tickers, start_date, end_date))
+            return get_price(tickers, fields, start_date, end_date, frequency)
+
+        self.data_provider.get_price = get_price_and_count
+
+    def test_statistics_are_the_same_as_in_slippage_model(self):
+        contract_ticker_mapper = DummyBloombergContractTickerMapper()
+        slippage_model = SquareRootMarketImpactSlippage(0.1, self.data_provider, contract_ticker_mapper)
+        snapshot_slippage_model = SquareRootMarketImpactSlippage(0.1, self.data_provider, contract_ticker_mapper)
+        snapshot_slippage_model.set_market_snapshot(self.market_snapshot)
+        fill_volumes = np.array([100, -200, 300])
+
+        for date in pd.bdate_range(datetime(2017, 3, 6), datetime(2017, 7, 3)):
+            self.timer.set_current_time(date + MarketCloseEvent.trigger_time())
+            tickers = self.tickers if date.day % 2 == 0 else self.tickers[:2]
+
+            expected_market_impact = slippage_model._compute_market_impact(self.timer.now(), tickers,
+                                                                           fill_volumes[:len(tickers)])
+            actual_market_impact = snapshot_slippage_model._compute_market_impact(self.timer.now(), tickers,
+                                                                                  fill_volumes[:len(tickers)])
+            assert_allclose(expected_market_impact, actual_market_impact, rtol=1e-10)
+
+    def test_only_new_daily_bars_are_downloaded(self):
+        self.timer.set_current_time(datetime(2017, 4, 3, 13, 30))
+        self.market_snapshot.volatility(self.tickers[:2])
+        self.market_snapshot.average_daily_volume(self.tickers[:2])
+        self.timer.set_current_time(datetime(2017, 4, 3, 20))
+        self.market_snapshot.average_daily_volume(self.tickers[:2])
+        self.assertEqual(1, len(self.price_requests))
+
+        self.timer.set_current_time(datetime(2017, 4, 4, 13, 30))
+        self.market_snapshot.volatility(self.tickers)
+        self.assertEqual(3, len(self.price_requests))
+        self.assertEqual([(self.tickers[:2], datetime(2017, 4, 3)), (self.tickers[2:], datetime(2017, 2, 3))],
+                         [(tickers, start_date) for tickers, start_date, _ in self.price_requests[1:]])
+
+    def test_current_bar(self):
+        self.timer.set_current_time(datetime(2017, 3, 1, 20, 30))
+        expected_bars = self.data_handler.get_current_bar(self.tickers)
+
+        assert_dataframes_equal(expected_bars.loc[self.tickers[1:]], self.market_snapshot.current_bar(self.tickers[1:]))
+        assert_dataframes_equal(expected_bars, self.market_snapshot.current_bar(self.tickers))
+        assert_dataframes_equal(expected_bars.loc[self.tickers[:1]], self.market_snapshot.current_bar(self.tickers[:1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
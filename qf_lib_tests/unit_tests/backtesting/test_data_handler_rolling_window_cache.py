@@ -0,0 +1,122 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from mockito import spy2, verify, ANY, unstub
+
+from qf_lib.backtesting.data_handler.daily_data_handler import DailyDataHandler
+from qf_lib.backtesting.data_handler.rolling_window_buffer import RollingWindowBuffer
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.containers_comparison import assert_series_equal
+from qf_lib_tests.helpers.testing_tools.random_prices import create_random_prices_array, assert_same_prices
+
+
+class TestDataHandlerRollingWindowCache(TestCase):
+    def setUp(self):
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+
+        self.tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity")]
+        self.fields = PriceField.ohlcv()
+
+        dates = pd.bdate_range(datetime(2017, 1, 2), datetime(2017, 12, 29), name=DATES)
+        data = create_random_prices_array(dates, self.tickers, self.fields, seed=3)
+        data.values[20:25, :, :] = np.nan
+        data.values[30:40, 1, :] = np.nan
+
+        data_provider = PresetDataProvider(data, dates[0], dates[-1], Frequency.DAILY)
+
+        self.timer = SettableTimer()
+        self.cached_data_handler = DailyDataHandler(data_provider, self.timer, use_rolling_window_cache=True)
+        self.data_handler = DailyDataHandler(data_provider, self.timer)
+
+    def tearDown(self):
+        unstub()
+
+    def _assert_same_bars_every_day(self, tickers, fields, nr_of_bars):
+        for date in pd.date_range(datetime(2017, 2, 1), datetime(2017, 3, 1)):
+            for time in (MarketOpenEvent.trigger_time(), MarketCloseEvent.trigger_time()):
+                self.timer.set_current_time(date + time)
+                try:
+                    expected = self.data_handler.historical_price(tickers, fields, nr_of_bars)
+                except ValueError:
+                    # not enough data points - the cached data handler should not return any bars either
+                    with self.assertRaises(ValueError):
+                        self.cached_data_handler.historical_price(tickers, fields, nr_of_bars)
+                    continue
+
+                actual = self.cached_data_handler.historical_price(tickers, fields, nr_of_bars)
+                assert_same_prices(expected, actual)
+
+    def test_historical_price_single_ticker_single_field(self):
+        self._assert_same_bars_every_day(self.tickers[1], PriceField.Close, 10)
+
+    def test_historical_price_multiple_tickers_single_field(self):
+        self._assert_same_bars_every_day(self.tickers, PriceField.Close, 10)
+
+    def test_historical_price_single_ticker_multiple_fields(self):
+        self._assert_same_bars_every_day(self.tickers[0], self.fields, 5)
+
+    def test_historical_price_multiple_tickers_multiple_fields(self):
+        self._assert_same_bars_every_day(self.tickers, self.fields, 15)
+
+    def test_historical_price_when_timer_moves_backwards(self):
+        self.timer.set_current_time(datetime(2017, 6, 1, 21))
+        self.cached_data_handler.historical_price(self.tickers, PriceField.Close, 10)
+
+        self.timer.set_current_time(datetime(2017, 3, 1, 21))
+        expected = self.data_handler.historical_price(self.tickers, PriceField.Close, 10)
+        actual = self.cached_data_handler.historical_price(self.tickers, PriceField.Close, 10)
+        assert_same_prices(expected, actual)
+
+    def test_only_new_bars_are_downloaded(self):
+        data_provider = self.cached_data_handler.data_provider
+        spy2(data_provider.get_price)
+
+        self.timer.set_current_time(datetime(2017, 6, 1, 21))
+        self.cached_data_handler.historical_price(self.tickers, PriceField.Close, 10)
+        self.timer.set_current_time(datetime(2017, 6, 2, 21))
+        self.cached_data_handler.historical_price(self.tickers, PriceField.Close, 10)
+
+        last_market_close = datetime(2017, 6, 1, 20)
+        verify(data_provider, times=1).get_price(self.tickers, PriceField.Close,
+                                                 last_market_close + RelativeDelta(microseconds=1), ANY, ANY)
+
+    def test_bars_already_in_buffer_are_not_appended(self):
+        # data providers with daily granularity return the bar of the end_date of the previous query once again
+        data_provider = self.data_handler.data_provider
+        bars = data_provider.get_price(self.tickers[0], PriceField.Close, datetime(2017, 6, 1), datetime(2017, 6, 14))
+        rolling_window = RollingWindowBuffer(bars.loc[:datetime(2017, 6, 12)].tail(5), datetime(2017, 6, 12))
+
+        rolling_window.append(bars.loc[datetime(2017, 6, 12):], datetime(2017, 6, 14))
+        assert_series_equal(bars.tail(5), rolling_window.to_container())
+
+        rolling_window.append(bars.loc[datetime(2017, 6, 14):], datetime(2017, 6, 15))
+        assert_series_equal(bars.tail(5), rolling_window.to_container())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from qf_lib.backtesting.fast_alpha_model_tester.monte_carlo_simulator import MonteCarloSimulator
+from qf_lib.common.utils.returns.max_drawdown import max_drawdown
+from qf_lib.containers.dataframe.simple_returns_dataframe import SimpleReturnsDataFrame
+
+
+class TestMonteCarloSimulator(unittest.TestCase):
+    def setUp(self):
+        self.trade_rets = np.random.RandomState(7).normal(0.01, 0.1, 50)
+        self.thresholds = np.linspace(0.1, 0.9, 9)
+        self.scenarios_length = 30
+        self.num_of_scenarios = 1000
+
+    def test_results_are_the_same_as_computed_on_dataframes(self):
+        results = MonteCarloSimulator(seed=3, chunk_size=self.num_of_scenarios).simulate(
+            self.trade_rets, self.scenarios_length, self.num_of_scenarios, self.thresholds, self.num_of_scenarios)
+
+        # draw the same returns and compute the statistics the way it is done with the ScenariosGenerator
+        returns_indices = np.random.RandomState(3).randint(
+            0, len(self.trade_rets), (self.num_of_scenarios, self.scenarios_length)).T
+        scenarios_df = SimpleReturnsDataFrame(self.trade_rets[returns_indices]).to_prices()
+
+        assert_array_almost_equal(scenarios_df.values, results.paths.values)
+        assert_array_almost_equal((scenarios_df.iloc[-1] / scenarios_df.iloc[0] - 1.0).values,
+                                  results.total_returns.values)
+        assert_array_almost_equal(max_drawdown(scenarios_df).values, results.max_drawdowns.values)
+
+        for threshold in self.thresholds:
+            _, scenarios_above_threshold = scenarios_df.where(scenarios_df > (1.0 - threshold)).dropna(axis=1).shape
+            expected_probability = (self.num_of_scenarios - scenarios_above_threshold) / self.num_of_scenarios
+            self.assertAlmostEqual(expected_probability, results.breach_probabilities[threshold])
+
+    def test_chunking_does_not_change_the_results(self):
+        results = MonteCarloSimulator(seed=5, chunk_size=self.num_of_scenarios).simulate(
+            self.trade_rets, self.scenarios_length, self.num_of_scenarios, self.thresholds, num_of_paths=10)
+        chunked_results = MonteCarloSimulator(seed=5, chunk_size=300).simulate(
+            self.trade_rets, self.scenarios_length, self.num_of_scenarios, self.thresholds, num_of_paths=10)
+
+        self.assertEqual(self.num_of_scenarios, chunked_results.num_of_scenarios)
+        self.assertEqual((self.scenarios_length + 1, 10), chunked_results.paths.shape)
+        assert_array_equal(results.paths.values, chunked_results.paths.values)
+        assert_array_equal(results.total_returns.values, chunked_results.total_returns.values)
+        assert_array_equal(results.max_drawdowns.values, chunked_results.max_drawdowns.values)
+        assert_array_equal(results.breach_probabilities.values, chunked_results.breach_probabilities.values)
+
+    def test_simulation_is_reproducible(self):
+        first_results = MonteCarloSimulator(seed=11, chunk_size=128).simulate(
+            self.trade_rets, self.scenarios_length, self.num_of_scenarios, self.thresholds)
+        second_results = MonteCarloSimulator(seed=11, chunk_size=128).simulate(
+            self.trade_rets, self.scenarios_length, self.num_of_scenarios, self.thresholds)
+
+        assert_array_equal(first_results.total_returns.values, second_results.total_returns.values)
+        assert_array_equal(first_results.max_drawdowns.values, second_results.max_drawdowns.values)
+        assert_array_equal(first_results.breach_probabilities.values, second_results.breach_probabilities.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -155,6 +155,28 @@ class TestVolumeOrdersFilter(unittest.TestCase):
                                Order(contract, 115, StopOrder(1.0), TimeInForce.GTC)]
         self.assertCountEqual(new_orders, expected_sell_order)
 
+    def test_volume_orders_filter__market_snapshot(self):
+        """Tests if VolumeOrdersVerifier uses the average daily volume computed by the MarketSnapshot."""
+        dates = pd.date_range(str_to_date("2019-10-01"), str_to_date("2020-01-30"), freq='D')
+        volumes = [100.0 if date.day % 2 == 0 else 200.0 for date in dates]
+        prices_data_frame = QFDataFrame(data={PriceField.Close: [1.0] * len(dates), PriceField.Volume: volumes},
+                                        index=dates)
+        prices_data_array = tickers_dict_to_data_array({
+            self.ticker: prices_data_frame,
+        }, [self.ticker], [PriceField.Close, PriceField.Volume])
+
+        data_provider = PresetDataProvider(prices_data_array, dates[0], dates[-1], Frequency.DAILY)
+        data_handler = DailyDataHandler(data_provider, SettableTimer(dates[-1]))
+        data_handler.use_market_snapshot(window_length=10)
+        volume_orders_verifier = VolumeOrdersFilter(data_handler, self.contract_ticker_mapper, 0.1,
+                                                    use_market_snapshot=True)
+
+        contract = self.contract_ticker_mapper.ticker_to_contract(self.ticker)
+        new_orders = volume_orders_verifier.adjust_orders([Order(contract, 100, MarketOrder(), TimeInForce.GTC)])
+
+        # average volume of the last 10 days before today is equal to 150
+        self.assertEqual([Order(contract, 15, MarketOrder(), TimeInForce.GTC)], new_orders)
+
     def _setup_data_handler(self, volume_value: Optional[float]) -> DataHandler:
         dates = pd.date_range(str_to_date("2020-01-01"), str_to_date("2020-01-30"), freq='D')
         prices_data_frame = QFDataFrame(data={PriceField.Volume: [volume_value] * len(dates)},
@@ -13,6 +13,9 @@
 #     limitations under the License.
 import unittest
 
+import pandas as pd
+
+from qf_lib.common.exceptions.future_contracts_exceptions import NoValidTickerException
 from qf_lib.common.tickers.tickers import Ticker
 from qf_lib.common.utils.dateutils.string_to_date import str_to_date
 from qf_lib.common.utils.dateutils.timer import SettableTimer
@@ -123,6 +126,56 @@ class TestSeries(unittest.TestCase):
         # '2017-12-05' + 45 days = '2018-01-19' - the front contract will be equal to CustomTicker:D
         self.assertEqual(future_ticker.get_current_specific_ticker(), CustomTicker("E"))
 
+    def test_specific_tickers_for_date_range(self):
+        dates = pd.date_range(str_to_date('2017-10-01'), str_to_date('2018-06-01'), freq='13H')
+        for N, days_before_exp_date in [(1, 5), (2, 5), (1, 45), (3, 1)]:
+            future_ticker = CustomFutureTicker("Custom", "CT{} Custom", N, days_before_exp_date, 500)
+            future_ticker.initialize_data_provider(self.timer, self.bbg_provider)
+            specific_tickers = future_ticker.get_specific_tickers(dates)
+
+            self.assertEqual(dates.tolist(), specific_tickers.index.tolist())
+            # go back in time to check if the cached ticker is not returned for the earlier dates
+            for date in list(dates) + list(reversed(dates)):
+                self.timer.set_current_time(date)
+                try:
+                    expected_ticker = future_ticker.get_current_specific_ticker()
+                except NoValidTickerException:
+                    expected_ticker = None
+                self.assertEqual(expected_ticker, specific_tickers[date])
+
+    def test_no_valid_ticker(self):
+        future_ticker = CustomFutureTicker("Custom", "CT{} Custom", 1, 5, 500)
+        future_ticker.initialize_data_provider(self.timer, self.bbg_provider)
+
+        self.timer.set_current_time(str_to_date('2017-11-07'))
+        with self.assertRaises(NoValidTickerException):
+            future_ticker.get_current_specific_ticker()
+
+        self.timer.set_current_time(str_to_date('2017-11-10'))
+        self.assertEqual(future_ticker.get_current_specific_ticker(), CustomTicker("B"))
+
+        self.timer.set_current_time(str_to_date('2018-05-09'))
+        with self.assertRaises(NoValidTickerException):
+            future_ticker.get_current_specific_ticker()
+
+    def test_uninitialized_copy(self):
+        future_ticker = CustomFutureTicker("Custom", "CT{} Custom", 1, 5, 500)
+        future_ticker.initialize_data_provider(self.timer, self.bbg_provider)
+        self.timer.set_current_time(str_to_date('2017-12-05'))
+        future_ticker.get_current_specific_ticker()
+
+        ticker_copy = future_ticker.uninitialized_copy()
+        self.assertEqual(future_ticker, ticker_copy)
+        self.assertIsNone(ticker_copy._data_provider)
+        self.assertIsNone(ticker_copy._timer)
+        self.assertIsNone(ticker_copy._ticker)
+        # the original ticker stays initialized
+        self.assertEqual(future_ticker.get_current_specific_ticker(), CustomTicker("B"))
+
+        timer = SettableTimer(initial_time=str_to_date('2017-12-11'))
+        ticker_copy.initialize_data_provider(timer, self.bbg_provider)
+        self.assertEqual(ticker_copy.get_current_specific_ticker(), CustomTicker("C"))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,136 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import qf_lib_tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.futures.future_tickers.future_ticker import FutureTicker
+from qf_lib.containers.futures.futures_adjustment_method import FuturesAdjustmentMethod
+from qf_lib.containers.futures.futures_chain import FuturesChain
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.containers.series.qf_series import QFSeries
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.counting_data_provider import CountingDataProvider
+
+EXPIRATION_DATES = pd.date_range("2017-02-15", periods=24, freq="MS") + pd.Timedelta(days=14)
+CONTRACTS = [BloombergTicker("CT{} Comdty".format(i)) for i in range(len(EXPIRATION_DATES))]
+
+
+class CustomFutureTicker(FutureTicker, BloombergTicker):
+    def belongs_to_family(self, ticker: BloombergTicker) -> bool:
+        return ticker in CONTRACTS
+
+    def _get_futures_chain_tickers(self):
+        return QFSeries(data=CONTRACTS, index=EXPIRATION_DATES)
+
+
+class TestFuturesChain(unittest.TestCase):
+    def setUp(self):
+        self.fields = PriceField.ohlcv()
+        dates = pd.bdate_range("2017-01-02", "2018-06-29", name=DATES)
+
+        random_state = np.random.RandomState(5)
+        values = np.empty((len(dates), len(CONTRACTS), len(self.fields)))
+        for i in range(len(CONTRACTS)):
+            close = 100 + 10 * i + np.cumsum(random_state.normal(0, 1, len(dates)))
+            open = close + random_state.normal(0, 0.5, len(dates))
+            volume = random_state.randint(1, 100, len(dates))
+            values[:, i, :] = np.stack([open, np.maximum(open, close) + 1, np.minimum(open, close) - 1, close, volume],
+                                       axis=1)
+            values[dates > EXPIRATION_DATES[i], i, :] = np.nan
+
+        # single missing prices, which are not used to compute the back adjustment offsets
+        values[random_state.uniform(size=values.shape) < 0.05] = np.nan
+        values[:, :, self.fields.index(PriceField.Open)] = values[:, :, self.fields.index(PriceField.Close)] + 0.5
+
+        self.data = QFDataArray.create(dates, CONTRACTS, self.fields, values)
+        self.timer = SettableTimer(dates[0])
+        self.data_provider = PresetDataProvider(self.data, dates[0], dates[-1], Frequency.DAILY)
+
+    def _create_futures_chain(self, N, days_before_exp_date, method, incremental):
+        future_ticker = CustomFutureTicker("Custom", "CT{} Comdty", N, days_before_exp_date)
+        future_ticker.initialize_data_provider(self.timer, self.data_provider)
+        return FuturesChain(future_ticker, self.data_provider, method, incremental)
+
+    def test_incremental_chain_gives_the_same_results(self):
+        fields = [PriceField.Open, PriceField.High, PriceField.Close, PriceField.Volume]
+        for N, days_before_exp_date, method in [(1, 5, FuturesAdjustmentMethod.BACK_ADJUSTED),
+                                                (2, 1, FuturesAdjustmentMethod.BACK_ADJUSTED),
+                                                (1, 3, FuturesAdjustmentMethod.NTH_NEAREST)]:
+            futures_chain = self._create_futures_chain(N, days_before_exp_date, method, False)
+            incremental_futures_chain = self._create_futures_chain(N, days_before_exp_date, method, True)
+
+            for date in pd.bdate_range("2017-04-03", "2017-12-29"):
+                self.timer.set_current_time(date)
+                start_date = date - RelativeDelta(days=60)
+
+                expected_prices = futures_chain.get_price(fields, start_date, date)
+                actual_prices = incremental_futures_chain.get_price(fields, start_date, date)
+                tt.assert_dataframes_equal(expected_prices, actual_prices, check_names=False,
+                                           absolute_tolerance=1e-8)
+
+            # single field is taken from the already generated chain (the dates with no prices depend on the fields
+            # downloaded while generating the chain)
+            expected_close = self._create_futures_chain(N, days_before_exp_date, method, False).get_price(
+                PriceField.Close, start_date, date)
+            actual_close = incremental_futures_chain.get_price(PriceField.Close, start_date, date)
+            tt.assert_series_equal(expected_close.dropna(), actual_close.dropna(), absolute_tolerance=1e-8)
+
+    def test_rolls_are_applied_without_regenerating_the_chain(self):
+        self.data_provider = CountingDataProvider(self.data, self.data_provider.start_date,
+                                                  self.data_provider.end_date, Frequency.DAILY)
+        futures_chain = self._create_futures_chain(1, 5, FuturesAdjustmentMethod.BACK_ADJUSTED, True)
+        for date in pd.bdate_range("2017-04-03", "2017-12-29"):
+            self.timer.set_current_time(date)
+            futures_chain.get_price(PriceField.Close, date - RelativeDelta(days=60), date)
+
+        # the chain is generated once, afterwards only the prices of the current contract (or of the two contracts
+        # in case of a roll) since the last date in the chain are downloaded
+        first_request, *next_requests = self.data_provider.price_requests
+        self.assertEqual(datetime(2017, 2, 2), first_request[2])
+        self.assertTrue(all(start_date >= datetime(2017, 4, 3) for _, _, start_date, _ in next_requests))
+        self.assertTrue(all(len(tickers) <= 2 for tickers, _, _, _ in next_requests))
+        self.assertEqual(9, sum(len(tickers) == 2 for tickers, _, _, _ in next_requests))
+
+    def test_roll_with_no_prices_of_the_new_contract(self):
+        # the new contract is not quoted during a few days after the roll
+        roll_date = EXPIRATION_DATES[5] - pd.Timedelta(days=4)
+        new_contract_dates = (self.data.dates.to_index() >= roll_date) & \
+                             (self.data.dates.to_index() < roll_date + pd.Timedelta(days=5))
+        self.data.loc[new_contract_dates, CONTRACTS[6], :] = np.nan
+
+        futures_chain = self._create_futures_chain(1, 5, FuturesAdjustmentMethod.BACK_ADJUSTED, True)
+        for date in pd.bdate_range(roll_date - pd.Timedelta(days=10), roll_date + pd.Timedelta(days=20)):
+            self.timer.set_current_time(date)
+            start_date = date - RelativeDelta(days=60)
+            actual_prices = futures_chain.get_price([PriceField.Open, PriceField.Close], start_date, date)
+
+            # compare with the chain generated from scratch
+            expected_prices = self._create_futures_chain(1, 5, FuturesAdjustmentMethod.BACK_ADJUSTED, False) \
+                .get_price([PriceField.Open, PriceField.Close], start_date, date)
+            tt.assert_dataframes_equal(expected_prices.dropna(how="all"), actual_prices.dropna(how="all"),
+                                       check_names=False, absolute_tolerance=1e-8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,241 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_array_equal
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+
+try:
+    import blpapi
+    from qf_lib.data_providers.bloomberg.historical_data_provider import HistoricalDataProvider
+    is_blpapi_installed = True
+except ImportError:
+    is_blpapi_installed = False
+
+
+class FakeElement(object):
+    """ Element of a Bloomberg message, containing either the named sub-elements or an array of values. """
+
+    def __init__(self, elements=None, values=None):
+        self._elements = elements or {}
+        self._values = values or []
+
+    def hasElement(self, name):
+        return str(name) in self._elements
+
+    def getElement(self, name):
+        return self._elements[str(name)]
+
+    def getElementAsFloat(self, name):
+        return self._elements[str(name)]
+
+    def getElementAsDatetime(self, name):
+        return self._elements[str(name)]
+
+    def getElementAsString(self, name):
+        return self._elements[str(name)]
+
+    def numValues(self):
+        return len(self._values)
+
+    def getValueAsElement(self, index):
+        return self._values[index]
+
+    def appendValue(self, value):
+        self._values.append(value)
+
+    def setValue(self, value):
+        self._values = [value]
+
+
+class FakeMessage(object):
+    def __init__(self, correlation_id, element):
+        self._correlation_id = correlation_id
+        self._element = element
+
+    def correlationIds(self):
+        return [blpapi.CorrelationId(self._correlation_id)]
+
+    def asElement(self):
+        return self._element
+
+    def getElement(self, name):
+        return self._element.getElement(name)
+
+
+class FakeEvent(object):
+    def __init__(self, event_type, messages):
+        self._event_type = event_type
+        self._messages = messages
+
+    def eventType(self):
+        return self._event_type
+
+    def __iter__(self):
+        return iter(self._messages)
+
+
+class FakeRequest(object):
+    def __init__(self, request_type):
+        self.request_type = request_type
+        self.parameters = {}
+        self.elements = {"securities": FakeElement(), "security": FakeElement(), "fields": FakeElement()}
+
+    def set(self, name, value):
+        self.parameters[str(name)] = value
+
+    def getElement(self, name):
+        return self.elements[str(name)]
+
+
+class FakeSession(object):
+    """
+    Local replacement of the Bloomberg session. The responses are split into two messages (partial and final response)
+    and the messages of all outstanding requests are returned in random order.
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._random_state = np.random.RandomState(5)
+        self._outstanding_events = {}
+        self.requests = []
+        self.max_outstanding_requests = 0
+
+    def getService(self, _):
+        return self
+
+    def createRequest(self, request_type):
+        return FakeRequest(request_type)
+
+    def sendRequest(self, request, correlationId):
+        self.requests.append(request)
+        correlation_id = correlationId.value()
+
+        if request.request_type == "IntradayBarRequest":
+            ticker = request.getElement("security").getValueAsElement(0)
+            start_date, end_date = request.parameters["startDateTime"], request.parameters["endDateTime"]
+            messages = [self._bar_data_message(correlation_id, ticker, dates_values)
+                        for dates_values in self._split(self._data[ticker].loc[start_date:end_date])]
+        else:
+            start_date = pd.to_datetime(request.parameters["startDate"])
+            end_date = pd.to_datetime(request.parameters["endDate"])
+            messages = [self._security_data_message(correlation_id, ticker, dates_values)
+                        for ticker in request.getElement("securities")._values
+                        for dates_values in self._split(self._data[ticker].loc[start_date:end_date])]
+
+        events = [FakeEvent(blpapi.event.Event.PARTIAL_RESPONSE, [message]) for message in messages[:-1]]
+        events.append(FakeEvent(blpapi.event.Event.RESPONSE, messages[-1:]))
+        self._outstanding_events[correlation_id] = events
+        self.max_outstanding_requests = max(self.max_outstanding_requests, len(self._outstanding_events))
+
+    def nextEvent(self):
+        correlation_id = self._random_state.choice(sorted(self._outstanding_events.keys()))
+        events = self._outstanding_events[correlation_id]
+        event = events.pop(0)
+        if not events:
+            del self._outstanding_events[correlation_id]
+
+        return event
+
+    @staticmethod
+    def _split(dates_values):
+        middle = len(dates_values) // 2
+        return [dates_values.iloc[:middle], dates_values.iloc[middle:]]
+
+    @staticmethod
+    def _values_elements(dates_values, date_field_name):
+        return [FakeElement(dict(values.dropna().to_dict(), **{date_field_name: date.to_pydatetime()}))
+                for date, values in dates_values.iterrows()]
+
+    def _bar_data_message(self, correlation_id, ticker, dates_values):
+        bar_tick_data = FakeElement(values=self._values_elements(dates_values, "time"))
+        return FakeMessage(correlation_id, FakeElement({"barData": FakeElement({"barTickData": bar_tick_data})}))
+
+    def _security_data_message(self, correlation_id, ticker, dates_values):
+        field_data = FakeElement(values=self._values_elements(dates_values, "date"))
+        security_data = FakeElement({"security": ticker, "fieldData": field_data})
+        return FakeMessage(correlation_id, FakeElement({"securityData": security_data}))
+
+
+@unittest.skipIf(not is_blpapi_installed, "No Bloomberg API installed")
+class TestHistoricalDataProvider(unittest.TestCase):
+    def setUp(self):
+        self.tickers = ["A Equity", "B Equity", "C Equity"]
+        self.fields = ["open", "close"]
+        self.random_state = np.random.RandomState(3)
+
+    def _create_data(self, dates):
+        data = {}
+        for ticker in self.tickers:
+            values = self.random_state.uniform(10, 20, (len(dates), len(self.fields)))
+            values[self.random_state.uniform(size=values.shape) < 0.1] = np.nan
+            data[ticker] = pd.DataFrame(values, index=dates, columns=self.fields)
+
+        return data
+
+    def _assert_data_array_equal(self, data, start_date, end_date, data_array):
+        expected_dates = pd.DatetimeIndex(
+            sorted(set().union(*(data[ticker].loc[start_date:end_date].index for ticker in self.tickers))))
+        assert_array_equal(expected_dates.values, data_array.dates.values)
+        self.assertEqual([BloombergTicker(ticker) for ticker in self.tickers], data_array.tickers.values.tolist())
+
+        for ticker_index, ticker in enumerate(self.tickers):
+            expected_values = data[ticker].reindex(expected_dates).values
+            assert_array_equal(expected_values, data_array.values[:, ticker_index, :])
+
+    def test_pipelined_intraday_requests(self):
+        data = self._create_data(pd.date_range(datetime(2019, 1, 1), datetime(2019, 1, 6), freq="1min"))
+        start_date, end_date = datetime(2019, 1, 1, 13), datetime(2019, 1, 5, 15)
+
+        session = FakeSession(data)
+        provider = HistoricalDataProvider(session, max_pending_requests=4, chunk_length=RelativeDelta(days=1))
+        data_array = provider.get(self.tickers, self.fields, start_date, end_date, Frequency.MIN_1)
+
+        self._assert_data_array_equal(data, start_date, end_date, data_array)
+        self.assertEqual(len(self.tickers) * 5, len(session.requests))
+        self.assertEqual(4, session.max_outstanding_requests)
+
+    def test_batched_historical_requests(self):
+        data = self._create_data(pd.bdate_range(datetime(2018, 1, 1), datetime(2019, 12, 31)))
+        start_date, end_date = datetime(2018, 3, 1), datetime(2019, 6, 30)
+
+        session = FakeSession(data)
+        provider = HistoricalDataProvider(session, max_pending_requests=3, tickers_batch_size=2,
+                                          chunk_length=RelativeDelta(months=6))
+        data_array = provider.get(self.tickers, self.fields, start_date, end_date, Frequency.DAILY)
+
+        self._assert_data_array_equal(data, start_date, end_date, data_array)
+        self.assertEqual(2 * 3, len(session.requests))
+
+    def test_sequential_requests(self):
+        data = self._create_data(pd.bdate_range(datetime(2018, 1, 1), datetime(2019, 12, 31)))
+        start_date, end_date = datetime(2018, 3, 1), datetime(2019, 6, 30)
+
+        session = FakeSession(data)
+        provider = HistoricalDataProvider(session)
+        data_array = provider.get(self.tickers, self.fields, start_date, end_date, Frequency.DAILY)
+
+        self._assert_data_array_equal(data, start_date, end_date, data_array)
+        self.assertEqual(1, len(session.requests))
+        self.assertEqual(1, session.max_outstanding_requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.relative_delta import RelativeDelta
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.data_providers.chunked_prefetching_data_provider import ChunkedPrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.counting_data_provider import CountingDataProvider
+from qf_lib_tests.helpers.testing_tools.random_prices import create_random_prices_array, assert_same_prices
+
+
+class TestChunkedPrefetchingDataProvider(unittest.TestCase):
+    def setUp(self):
+        self.tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity")]
+        self.fields = [PriceField.Open, PriceField.Close]
+        self.start_date = datetime(2017, 1, 1)
+        self.end_date = datetime(2017, 3, 1)
+
+        dates = pd.date_range(self.start_date, self.end_date, freq="5min", name=DATES)
+        data = create_random_prices_array(dates, self.tickers, self.fields, seed=2)
+
+        self.data_provider = CountingDataProvider(data, self.start_date, self.end_date, Frequency.MIN_5)
+        self.reference_data_provider = PresetDataProvider(data, self.start_date, self.end_date, Frequency.MIN_5)
+
+        self.chunked_data_provider = ChunkedPrefetchingDataProvider(
+            self.data_provider, self.tickers, self.fields, self.start_date, self.end_date, Frequency.MIN_5,
+            chunk_length=RelativeDelta(days=10))
+
+    def _get_price_and_compare(self, start_date, end_date):
+        actual_array = self.chunked_data_provider.get_price(self.tickers, self.fields, start_date, end_date,
+                                                            Frequency.MIN_5)
+        expected_array = self.reference_data_provider.get_price(self.tickers, self.fields, start_date, end_date,
+                                                                Frequency.MIN_5)
+        assert_same_prices(expected_array, actual_array)
+
+    def test_nothing_is_downloaded_at_startup(self):
+        self.assertEqual([], self.data_provider.price_requests)
+        self.assertEqual([], self.chunked_data_provider.loaded_chunks_dates)
+
+    def test_chunks_are_loaded_and_removed_while_moving_forward(self):
+        current_time = datetime(2017, 1, 2)
+        while current_time < self.end_date:
+            self._get_price_and_compare(current_time - RelativeDelta(days=1), current_time)
+            # at most the chunk containing the last day and the chunk before it are loaded
+            self.assertLessEqual(len(self.chunked_data_provider.loaded_chunks_dates), 2)
+            current_time += RelativeDelta(hours=7)
+
+        # every chunk was downloaded only once
+        downloaded_chunks = [start_date for _, _, start_date, _ in self.data_provider.price_requests]
+        self.assertEqual(6, len(downloaded_chunks))
+        self.assertEqual(sorted(set(downloaded_chunks)), downloaded_chunks)
+
+    def test_next_chunk_is_prefetched(self):
+        self._get_price_and_compare(datetime(2017, 1, 2), datetime(2017, 1, 3))
+        self.chunked_data_provider._prefetched_chunk.result()
+
+        self.assertEqual([datetime(2017, 1, 1), datetime(2017, 1, 11)],
+                         [start_date for _, _, start_date, _ in self.data_provider.price_requests])
+        self.assertEqual([datetime(2017, 1, 1)], self.chunked_data_provider.loaded_chunks_dates)
+
+        self._get_price_and_compare(datetime(2017, 1, 10), datetime(2017, 1, 12))
+        self.assertEqual([datetime(2017, 1, 1), datetime(2017, 1, 11)],
+                         self.chunked_data_provider.loaded_chunks_dates)
+
+    def test_longest_lookback_is_kept_in_memory(self):
+        self._get_price_and_compare(datetime(2017, 1, 2), datetime(2017, 1, 25))
+        self._get_price_and_compare(datetime(2017, 2, 19), datetime(2017, 2, 20))
+        # the lookback of 23 days reaches back to the chunk starting on 21 January, while the last requested date
+        # is the first date of the last chunk
+        self.assertEqual([datetime(2017, 1, 21), datetime(2017, 1, 31), datetime(2017, 2, 10), datetime(2017, 2, 20)],
+                         self.chunked_data_provider.loaded_chunks_dates)
+
+        self._get_price_and_compare(datetime(2017, 1, 27), datetime(2017, 2, 28))
+        self._get_price_and_compare(datetime(2017, 2, 1), datetime(2017, 3, 1))
+
+    def test_get_price_without_start_date(self):
+        actual_array = self.chunked_data_provider.get_price(self.tickers, self.fields, None, datetime(2017, 1, 13),
+                                                            Frequency.MIN_5)
+        expected_array = self.reference_data_provider.get_price(self.tickers, self.fields, self.start_date,
+                                                                datetime(2017, 1, 13), Frequency.MIN_5)
+        assert_same_prices(expected_array, actual_array)
+
+    def test_prefetching_thread_is_stopped(self):
+        self._get_price_and_compare(datetime(2017, 1, 2), datetime(2017, 1, 3))
+        executor = self.chunked_data_provider._executor
+        self.chunked_data_provider.close()
+        self.assertTrue(executor._shutdown)
+        self.assertIsNone(self.chunked_data_provider._executor)
+
+        # the thread is not needed anymore, when the last chunk is loaded
+        self._get_price_and_compare(datetime(2017, 2, 25), datetime(2017, 3, 1))
+        self.assertIsNone(self.chunked_data_provider._executor)
+
+
+if __name__ == '__main__':
+    unittest.main()
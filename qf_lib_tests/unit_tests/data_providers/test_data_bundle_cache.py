@@ -0,0 +1,170 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import qf_lib_tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.common.enums.expiration_date_field import ExpirationDateField
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.futures.future_tickers.bloomberg_future_ticker import BloombergFutureTicker
+from qf_lib.data_providers import data_bundle_cache
+from qf_lib.data_providers.data_bundle_cache import DataBundleCache
+from qf_lib.data_providers.prefetching_data_provider import PrefetchingDataProvider
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.counting_data_provider import CountingDataProvider
+from qf_lib_tests.helpers.testing_tools.random_prices import create_random_prices_array, assert_same_prices
+
+
+class TestDataBundleCache(unittest.TestCase):
+    def setUp(self):
+        self.tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity"), BloombergTicker("C Equity"),
+                        BloombergTicker("CTZ9 Comdty"), BloombergTicker("CTH0 Comdty")]
+        self.fields = PriceField.ohlcv()
+        dates = pd.bdate_range(datetime(2017, 1, 2), datetime(2017, 12, 29), name=DATES)
+
+        data = create_random_prices_array(dates, self.tickers, self.fields, seed=3)
+        data.values[:50, 1, :] = np.nan  # the second ticker is not quoted in the beginning of the year
+
+        self.future_ticker = BloombergFutureTicker("Cotton", "CT{} Comdty", 1, 3)
+        exp_dates = QFDataFrame(data={
+            ExpirationDateField.FirstNotice: [datetime(2019, 11, 25), datetime(2020, 2, 24)],
+            ExpirationDateField.LastTradeableDate: [datetime(2019, 12, 6), datetime(2020, 3, 9)]
+        }, index=self.tickers[3:])
+
+        self.data_provider = CountingDataProvider(data, dates[0], dates[-1], Frequency.DAILY,
+                                                  {self.future_ticker: exp_dates})
+        self.reference_data_provider = PresetDataProvider(data, dates[0], dates[-1], Frequency.DAILY)
+
+        cache_directory = TemporaryDirectory()
+        self.addCleanup(cache_directory.cleanup)
+        self.cache = DataBundleCache(cache_directory.name)
+
+    def _get_price_and_compare(self, tickers, fields, start_date, end_date):
+        actual_array = self.cache.get_price(self.data_provider, tickers, fields, start_date, end_date,
+                                            Frequency.DAILY)
+        expected_array = self.reference_data_provider.get_price(tickers, fields, start_date, end_date,
+                                                                Frequency.DAILY)
+        assert_same_prices(expected_array, actual_array)
+
+    def test_cached_data_is_not_downloaded_again(self):
+        tickers = self.tickers[:2]
+        self._get_price_and_compare(tickers, self.fields, datetime(2017, 3, 1), datetime(2017, 6, 30))
+        self.assertEqual(1, len(self.data_provider.price_requests))
+
+        self._get_price_and_compare(tickers, self.fields, datetime(2017, 3, 1), datetime(2017, 6, 30))
+        self._get_price_and_compare(tickers, [PriceField.Close], datetime(2017, 4, 1), datetime(2017, 5, 31))
+        self.assertEqual(1, len(self.data_provider.price_requests))
+
+    def test_only_missing_data_is_downloaded(self):
+        self._get_price_and_compare(self.tickers[:2], self.fields, datetime(2017, 3, 1), datetime(2017, 6, 30))
+
+        # extend the dates range and add a new ticker
+        self.data_provider.price_requests.clear()
+        self._get_price_and_compare(self.tickers[:3], self.fields, datetime(2017, 1, 2), datetime(2017, 9, 29))
+        self.assertCountEqual([
+            (self.tickers[:2], self.fields, datetime(2017, 1, 2), datetime(2017, 3, 1)),
+            (self.tickers[:2], self.fields, datetime(2017, 6, 30), datetime(2017, 9, 29)),
+            ([self.tickers[2]], self.fields, datetime(2017, 1, 2), datetime(2017, 9, 29))
+        ], self.data_provider.price_requests)
+
+        self.data_provider.price_requests.clear()
+        self._get_price_and_compare(self.tickers[:3], self.fields, datetime(2017, 2, 1), datetime(2017, 8, 31))
+        self.assertEqual([], self.data_provider.price_requests)
+
+    def test_missing_fields_are_downloaded(self):
+        self._get_price_and_compare(self.tickers[:2], [PriceField.Close], datetime(2017, 3, 1), datetime(2017, 6, 30))
+
+        self.data_provider.price_requests.clear()
+        self._get_price_and_compare(self.tickers[:2], [PriceField.Open, PriceField.Close],
+                                    datetime(2017, 3, 1), datetime(2017, 6, 30))
+        self.assertEqual([(self.tickers[:2], [PriceField.Close, PriceField.Open], datetime(2017, 3, 1),
+                           datetime(2017, 6, 30))], self.data_provider.price_requests)
+
+    def test_data_is_not_shared_between_namespaces(self):
+        self._get_price_and_compare(self.tickers[:2], self.fields, datetime(2017, 3, 1), datetime(2017, 6, 30))
+
+        other_cache = DataBundleCache(self.cache.cache_directory, namespace="other_database")
+        other_cache.get_price(self.data_provider, self.tickers[:2], self.fields, datetime(2017, 3, 1),
+                              datetime(2017, 6, 30), Frequency.DAILY)
+        other_cache.get_futures_chain_tickers(
+            self.data_provider, [self.future_ticker], ExpirationDateField.all_dates(), datetime(2017, 12, 29))
+        self.cache.get_futures_chain_tickers(
+            self.data_provider, [self.future_ticker], ExpirationDateField.all_dates(), datetime(2017, 12, 29))
+
+        self.assertEqual(2, len(self.data_provider.price_requests))
+        self.assertEqual(2, len(self.data_provider.futures_chain_requests))
+
+    def test_futures_chains_are_cached(self):
+        futures_chains = self.cache.get_futures_chain_tickers(
+            self.data_provider, [self.future_ticker], ExpirationDateField.all_dates(), datetime(2017, 12, 29))
+        cached_futures_chains = self.cache.get_futures_chain_tickers(
+            self.data_provider, [self.future_ticker], ExpirationDateField.all_dates(), datetime(2017, 12, 29))
+
+        self.assertEqual([[self.future_ticker]], self.data_provider.futures_chain_requests)
+        tt.assert_dataframes_equal(futures_chains[self.future_ticker], cached_futures_chains[self.future_ticker])
+
+        # the cached futures chain ends before the requested end date, so it is downloaded again
+        self.cache.get_futures_chain_tickers(
+            self.data_provider, [self.future_ticker], ExpirationDateField.all_dates(), datetime(2020, 6, 30))
+        self.assertEqual(2, len(self.data_provider.futures_chain_requests))
+
+    def test_bars_which_are_not_closed_are_downloaded_again(self):
+        tickers = self.tickers[:2]
+        start_date, end_date = datetime(2017, 6, 1), datetime(2017, 6, 30)
+
+        # today's bar is not final yet
+        final_values = self.data_provider.data_bundle.loc[datetime(2017, 6, 15)].values.copy()
+        self.data_provider.data_bundle.loc[datetime(2017, 6, 15)] = 0.0
+        with patch.object(data_bundle_cache, "datetime", wraps=datetime) as datetime_mock:
+            datetime_mock.now.return_value = datetime(2017, 6, 15, 12)
+            actual_array = self.cache.get_price(self.data_provider, tickers, self.fields, start_date, end_date,
+                                                Frequency.DAILY)
+            self.assertTrue((actual_array.loc[datetime(2017, 6, 15)].values == 0.0).all())
+
+            # on the next day the bar is downloaded again
+            self.data_provider.data_bundle.loc[datetime(2017, 6, 15)] = final_values
+            datetime_mock.now.return_value = datetime(2017, 6, 16, 12)
+            self._get_price_and_compare(tickers, self.fields, start_date, end_date)
+            self.assertEqual(2, len(self.data_provider.price_requests))
+
+            # the bars, which are already closed, are not downloaded again
+            self._get_price_and_compare(tickers, self.fields, start_date, datetime(2017, 6, 15))
+            self.assertEqual(2, len(self.data_provider.price_requests))
+
+    def test_prefetching_data_provider_with_cache(self):
+        start_date, end_date = datetime(2017, 3, 1), datetime(2017, 6, 30)
+        for _ in range(2):
+            prefetching_data_provider = PrefetchingDataProvider(
+                self.data_provider, [self.tickers[0], self.future_ticker], self.fields, start_date, end_date,
+                Frequency.DAILY, cache_directory=self.cache.cache_directory)
+
+        self.assertEqual(1, len(self.data_provider.price_requests))
+        self.assertEqual(1, len(self.data_provider.futures_chain_requests))
+
+        expected_array = self.reference_data_provider.get_price(
+            [self.tickers[0]] + self.tickers[3:], self.fields, start_date, end_date, Frequency.DAILY)
+        assert_same_prices(expected_array, prefetching_data_provider.data_bundle)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,10 +12,11 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import time
 import unittest
 
 import pandas as pd
-from mockito import mock, when
+from mockito import mock, when, verify
 
 from qf_lib.common.enums.frequency import Frequency
 from qf_lib.common.enums.price_field import PriceField
@@ -109,7 +110,9 @@ class TestGeneralPriceProviderMock(unittest.TestCase):
         )
         when(ccy).supported_ticker_types().thenReturn({CcyTicker})
 
+        self.bloomberg, self.quandl = bloomberg, quandl
         self.price_provider = GeneralPriceProvider(bloomberg, quandl, haver, ccy)
+        self.concurrent_price_provider = GeneralPriceProvider(bloomberg, quandl, haver, ccy, max_workers=4)
 
     # =========================== Test get_price method ==========================================================
 
@@ -129,6 +132,58 @@ class TestGeneralPriceProviderMock(unittest.TestCase):
         self.assertEqual(data.shape, (self.NUM_OF_DATES, len(tickers)))
         self.assertEqual(list(data.columns), tickers)
 
+    def test_price_interleaved_tickers_call_each_provider_once(self):
+        tickers = [ticker for tickers_pair in zip(self.BBG_TICKERS, self.QUANDL_TICKERS) for ticker in tickers_pair]
+        data = self.price_provider.get_price(tickers=tickers, fields=self.SINGLE_PRICE_FIELD,
+                                             start_date=self.START_DATE, end_date=self.END_DATE)
+        self.assertEqual(list(data.columns), tickers)
+        verify(self.bloomberg, times=1).get_price(...)
+        verify(self.quandl, times=1).get_price(...)
+
+    def test_price_multiple_providers_concurrently(self):
+        tickers = self.BBG_TICKERS + self.QUANDL_TICKERS + self.HAVER_TICKERS + self.CCY_TICKERS
+        expected_data = self.price_provider.get_price(tickers=tickers, fields=self.SINGLE_PRICE_FIELD,
+                                                      start_date=self.START_DATE, end_date=self.END_DATE)
+        data = self.concurrent_price_provider.get_price(tickers=tickers, fields=self.SINGLE_PRICE_FIELD,
+                                                        start_date=self.START_DATE, end_date=self.END_DATE)
+        self.assertEqual(type(data), PricesDataFrame)
+        self.assertTrue(expected_data.equals(data))
+
+    def test_price_provider_timeout(self):
+        class SlowDataProvider(object):
+            def supported_ticker_types(self):
+                return {HaverTicker}
+
+            def get_price(self, *args, **kwargs):
+                time.sleep(1)
+
+        price_provider = GeneralPriceProvider(self.bloomberg, haver=SlowDataProvider(), max_workers=2, timeout=0.1)
+        with self.assertRaises(TimeoutError):
+            price_provider.get_price(tickers=self.BBG_TICKERS + self.HAVER_TICKERS, fields=self.SINGLE_PRICE_FIELD,
+                                     start_date=self.START_DATE, end_date=self.END_DATE)
+
+    def test_price_provider_timeout_is_shared_by_all_providers(self):
+        class SlowDataProvider(object):
+            def __init__(self, ticker_type, delay):
+                self.ticker_type = ticker_type
+                self.delay = delay
+
+            def supported_ticker_types(self):
+                return {self.ticker_type}
+
+            def get_price(self, *args, **kwargs):
+                time.sleep(self.delay)
+
+        # the timeout applies to the whole request, not to the time of waiting for each of the data providers
+        price_provider = GeneralPriceProvider(quandl=SlowDataProvider(QuandlTicker, 0.4),
+                                              haver=SlowDataProvider(HaverTicker, 0.8),
+                                              max_workers=2, timeout=0.6)
+        start_time = time.time()
+        with self.assertRaises(TimeoutError):
+            price_provider.get_price(tickers=self.QUANDL_TICKERS + self.HAVER_TICKERS, fields=self.SINGLE_PRICE_FIELD,
+                                     start_date=self.START_DATE, end_date=self.END_DATE)
+        self.assertLess(time.time() - start_time, 0.8)
+
 
 if __name__ == '__main__':
     unittest.main()
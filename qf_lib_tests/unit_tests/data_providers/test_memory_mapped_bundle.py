@@ -0,0 +1,116 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+
+import qf_lib_tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.backtesting.data_handler.daily_data_handler import DailyDataHandler
+from qf_lib.backtesting.events.time_event.regular_time_event.market_close_event import MarketCloseEvent
+from qf_lib.backtesting.events.time_event.regular_time_event.market_open_event import MarketOpenEvent
+from qf_lib.common.enums.expiration_date_field import ExpirationDateField
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.common.utils.dateutils.timer import SettableTimer
+from qf_lib.containers.dataframe.qf_dataframe import QFDataFrame
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.futures.future_tickers.bloomberg_future_ticker import BloombergFutureTicker
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.random_prices import create_random_prices_array, assert_same_prices
+
+
+class TestMemoryMappedBundle(unittest.TestCase):
+    def setUp(self):
+        self.tickers = [BloombergTicker("A Equity"), BloombergTicker("CTZ9 Comdty"), BloombergTicker("CTH0 Comdty")]
+        self.fields = PriceField.ohlcv()
+        self.dates = pd.bdate_range(datetime(2017, 1, 2), datetime(2017, 6, 30), name=DATES)
+        data = create_random_prices_array(self.dates, self.tickers, self.fields, seed=11)
+
+        self.future_ticker = BloombergFutureTicker("Cotton", "CT{} Comdty", 1, 3)
+        exp_dates = QFDataFrame(data={
+            ExpirationDateField.FirstNotice: [datetime(2019, 11, 25), datetime(2020, 2, 24)],
+            ExpirationDateField.LastTradeableDate: [datetime(2019, 12, 6), datetime(2020, 3, 9)]
+        }, index=self.tickers[1:])
+
+        self.data_provider = PresetDataProvider(data, self.dates[0], self.dates[-1], Frequency.DAILY,
+                                                {self.future_ticker: exp_dates})
+        self.future_ticker.initialize_data_provider(SettableTimer(datetime(2017, 3, 1)), self.data_provider)
+
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.data_provider.save_memory_mapped_bundle(self.directory)
+
+    def test_memory_mapped_bundle_equal_to_original_one(self):
+        for use_array_storage in (False, True):
+            memory_mapped_provider = PresetDataProvider.from_memory_mapped_bundle(self.directory, use_array_storage)
+
+            self.assertEqual(self.data_provider.start_date, memory_mapped_provider.start_date)
+            self.assertEqual(self.data_provider.end_date, memory_mapped_provider.end_date)
+            self.assertEqual(Frequency.DAILY, memory_mapped_provider.frequency)
+            assert_same_prices(self.data_provider.data_bundle, memory_mapped_provider.data_bundle)
+
+            expected_prices = self.data_provider.get_price(self.tickers, PriceField.Close, datetime(2017, 2, 1),
+                                                           datetime(2017, 3, 1))
+            actual_prices = memory_mapped_provider.get_price(self.tickers, PriceField.Close, datetime(2017, 2, 1),
+                                                             datetime(2017, 3, 1))
+            assert_same_prices(expected_prices, actual_prices)
+
+    def test_values_are_memory_mapped_and_read_only(self):
+        memory_mapped_provider = PresetDataProvider.from_memory_mapped_bundle(self.directory, use_array_storage=True)
+
+        for values in (memory_mapped_provider.data_bundle.values, memory_mapped_provider.array_data_bundle.values):
+            self.assertFalse(values.flags.writeable)
+            self.assertFalse(values.flags.owndata)
+
+            base = values
+            while not isinstance(base, np.memmap) and base.base is not None:
+                base = base.base
+            self.assertIsInstance(base, np.memmap)
+
+    def test_futures_chains_are_saved_without_data_provider(self):
+        memory_mapped_provider = PresetDataProvider.from_memory_mapped_bundle(self.directory)
+        future_ticker = next(iter(memory_mapped_provider.exp_dates.keys()))
+
+        self.assertEqual(self.future_ticker, future_ticker)
+        self.assertIsNone(future_ticker._data_provider)
+        tt.assert_dataframes_equal(self.data_provider.exp_dates[self.future_ticker],
+                                   memory_mapped_provider.get_futures_chain_tickers(
+                                       self.future_ticker, ExpirationDateField.all_dates())[self.future_ticker])
+
+    def test_data_handler_with_memory_mapped_bundle(self):
+        for event_type in (MarketOpenEvent, MarketCloseEvent):
+            self.addCleanup(setattr, event_type, "_trigger_time", event_type._trigger_time)
+            self.addCleanup(setattr, event_type, "_trigger_time_rule", event_type._trigger_time_rule)
+        MarketOpenEvent.set_trigger_time({"hour": 13, "minute": 30, "second": 0, "microsecond": 0})
+        MarketCloseEvent.set_trigger_time({"hour": 20, "minute": 0, "second": 0, "microsecond": 0})
+
+        timer = SettableTimer(datetime(2017, 3, 1, 22))
+        data_handler = DailyDataHandler(self.data_provider, timer)
+        data_handler.use_memory_mapped_data_bundle(self.directory)
+
+        self.assertTrue(data_handler.is_optimised)
+        self.assertIsNot(self.data_provider, data_handler.data_provider)
+        last_prices = data_handler.get_last_available_price(self.tickers)
+        expected_prices = self.data_provider.get_price(self.tickers, PriceField.Close, datetime(2017, 3, 1),
+                                                       datetime(2017, 3, 1))
+        self.assertEqual(expected_prices.tolist(), last_prices.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+import qf_lib_tests.helpers.testing_tools.containers_comparison as tt
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.containers.qf_data_array import QFDataArray
+from qf_lib.data_providers.helpers import normalize_data_array, squeeze_data_array, \
+    cast_data_array_to_proper_type
+
+
+def normalize_data_array_with_reindex(data_array, tickers, fields, got_single_date, got_single_ticker,
+                                      got_single_field, use_prices_types):
+    """ Normalization without the fast path (the way it was always done before). """
+    data_array = data_array.reindex(tickers=tickers, fields=fields)
+    data_array = data_array.dropna(DATES, how='all')
+    squeezed_result = squeeze_data_array(data_array, got_single_date, got_single_ticker, got_single_field)
+    return cast_data_array_to_proper_type(squeezed_result, use_prices_types)
+
+
+class TestNormalizeDataArray(unittest.TestCase):
+    def setUp(self):
+        self.dates = pd.bdate_range("2018-01-01", periods=10, name=DATES)
+        self.tickers = [BloombergTicker("A Equity"), BloombergTicker("B Equity")]
+        self.fields = [PriceField.Open, PriceField.Close]
+
+        values = np.random.RandomState(4).uniform(size=(len(self.dates), len(self.tickers), len(self.fields)))
+        values[3, :, :] = np.nan  # row containing only nans
+        values[5, 0, :] = np.nan
+        self.data_array = QFDataArray.create(self.dates, self.tickers, self.fields, values)
+
+    def _assert_results_equal(self, expected_result, actual_result):
+        self.assertEqual(type(expected_result), type(actual_result))
+        if isinstance(expected_result, pd.Series):
+            tt.assert_series_equal(expected_result, actual_result)
+            self.assertEqual(expected_result.name, actual_result.name)
+        elif isinstance(expected_result, pd.DataFrame):
+            tt.assert_dataframes_equal(expected_result, actual_result)
+            self.assertEqual(expected_result.index.name, actual_result.index.name)
+            self.assertEqual(expected_result.columns.name, actual_result.columns.name)
+        elif isinstance(expected_result, QFDataArray):
+            tt.assert_dataarrays_equal(expected_result, actual_result)
+        else:
+            self.assertEqual(expected_result, actual_result)
+
+    def test_fast_path_gives_the_same_results(self):
+        for number_of_dates, single_ticker, single_field, use_prices_types in product(
+                (1, 2, 10), (True, False), (True, False), (True, False)):
+            tickers = self.tickers[:1] if single_ticker else self.tickers
+            fields = self.fields[:1] if single_field else self.fields
+            data_array = self.data_array[:number_of_dates, :len(tickers), :len(fields)]
+            got_single_date = number_of_dates == 1
+
+            expected_result = normalize_data_array_with_reindex(
+                data_array, tickers, fields, got_single_date, single_ticker, single_field, use_prices_types)
+            actual_result = normalize_data_array(
+                data_array, tickers, fields, got_single_date, single_ticker, single_field, use_prices_types)
+            self._assert_results_equal(expected_result, actual_result)
+
+    def test_all_nan_rows_are_removed(self):
+        result = normalize_data_array(self.data_array, self.tickers, self.fields, False, False, False)
+        self.assertEqual(len(self.dates) - 1, len(result.dates))
+        self.assertNotIn(self.dates[3], result.dates.values)
+
+    def test_reindexing_with_different_labels_order(self):
+        tickers = [self.tickers[1], self.tickers[0], BloombergTicker("C Equity")]
+        fields = [PriceField.Close]
+        expected_result = normalize_data_array_with_reindex(
+            self.data_array, tickers, fields, False, False, True, True)
+        actual_result = normalize_data_array(self.data_array, tickers, fields, False, False, True, True)
+        self._assert_results_equal(expected_result, actual_result)
+
+
+if __name__ == '__main__':
+    unittest.main()
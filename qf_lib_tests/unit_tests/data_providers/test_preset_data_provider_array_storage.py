@@ -0,0 +1,80 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.frequency import Frequency
+from qf_lib.common.enums.price_field import PriceField
+from qf_lib.common.tickers.tickers import BloombergTicker
+from qf_lib.containers.dimension_names import DATES
+from qf_lib.data_providers.preset_data_provider import PresetDataProvider
+from qf_lib_tests.helpers.testing_tools.random_prices import create_random_prices_array, assert_same_prices
+
+
+class TestPresetDataProviderArrayStorage(unittest.TestCase):
+    def setUp(self):
+        self.start_date = datetime(2018, 2, 1)
+        self.end_date = datetime(2018, 2, 28)
+        self.tickers = [BloombergTicker("MSFT US Equity"), BloombergTicker("GOOGL US Equity"),
+                        BloombergTicker("AAPL US Equity")]
+        self.fields = PriceField.ohlcv()
+
+        dates = pd.bdate_range(self.start_date, self.end_date, name=DATES)
+        data_array = create_random_prices_array(dates, self.tickers, self.fields, seed=5, low=100, high=200)
+        # a day without any data and a ticker without data in the first days
+        data_array.values[3, :, :] = np.nan
+        data_array.values[:5, 2, :] = np.nan
+
+        self.xarray_provider = PresetDataProvider(data_array, self.start_date, self.end_date, Frequency.DAILY)
+        self.array_provider = PresetDataProvider(data_array, self.start_date, self.end_date, Frequency.DAILY,
+                                                 use_array_storage=True)
+
+    def _assert_same_results(self, tickers, fields, start_date, end_date):
+        expected = self.xarray_provider.get_price(tickers, fields, start_date, end_date)
+        actual = self.array_provider.get_price(tickers, fields, start_date, end_date)
+        assert_same_prices(expected, actual)
+
+    def test_get_price_all_shapes(self):
+        start_date = datetime(2018, 2, 3)
+        end_date = datetime(2018, 2, 20)
+
+        self._assert_same_results(self.tickers, self.fields, start_date, end_date)
+        self._assert_same_results(self.tickers, PriceField.Close, start_date, end_date)
+        self._assert_same_results(self.tickers[0], self.fields, start_date, end_date)
+        self._assert_same_results(self.tickers[2], PriceField.Close, start_date, end_date)
+        self._assert_same_results(self.tickers[::-1], [PriceField.Volume, PriceField.Open], start_date, end_date)
+
+    def test_get_price_single_date(self):
+        date = datetime(2018, 2, 12)
+
+        self._assert_same_results(self.tickers, self.fields, date, date)
+        self._assert_same_results(self.tickers, PriceField.Close, date, date)
+        self._assert_same_results(self.tickers[1], self.fields, date, date)
+        self._assert_same_results(self.tickers[1], PriceField.Close, date, date)
+
+    def test_get_price_dates_without_data(self):
+        # the whole range contains only NaNs
+        date = datetime(2018, 2, 6)
+        self._assert_same_results(self.tickers, self.fields, date, date + pd.Timedelta(hours=1))
+        self._assert_same_results(self.tickers[2], PriceField.Close, self.start_date, datetime(2018, 2, 5))
+
+    def test_get_price_dates_between_index_labels(self):
+        self._assert_same_results(self.tickers, self.fields, datetime(2018, 2, 3, 12), datetime(2018, 2, 13, 12))
+
+
+if __name__ == '__main__':
+    unittest.main()
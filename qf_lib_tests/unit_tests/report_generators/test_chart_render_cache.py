@@ -0,0 +1,164 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import os
+import subprocess
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from qf_lib.common.enums.plotting_mode import PlottingMode
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.documents_utils.document_exporting.chart_render_cache import ChartRenderCache
+from qf_lib.documents_utils.document_exporting.document import Document
+from qf_lib.documents_utils.document_exporting.element.chart import ChartElement
+from qf_lib.documents_utils.document_exporting.element.grid import GridElement
+from qf_lib.documents_utils.document_exporting.html_exporter import HTMLExporter
+from qf_lib.plotting.charts.line_chart import LineChart
+from qf_lib.plotting.decorators.data_element_decorator import DataElementDecorator
+from qf_lib.plotting.decorators.legend_decorator import LegendDecorator
+from qf_lib.plotting.helpers.create_line_chart import create_line_chart
+from qf_lib.settings import Settings
+
+
+class TestChartRenderCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        plt.switch_backend("Agg")
+
+    def setUp(self):
+        dates = pd.bdate_range("2018-01-01", periods=100)
+        random_state = np.random.RandomState(8)
+        self.series = [PricesSeries(100 + random_state.normal(size=len(dates)).cumsum(), index=dates)
+                       for _ in range(3)]
+
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.cache_directory = os.path.join(self.directory, "cache")
+
+    def _create_chart_element(self, series: PricesSeries, dpi: int = 50) -> ChartElement:
+        chart = LineChart()
+        data_element = DataElementDecorator(series)
+        chart.add_decorator(data_element)
+        legend = LegendDecorator()
+        legend.add_entry(data_element, "Series")
+        chart.add_decorator(legend)
+        return ChartElement(chart, figsize=(4, 2), dpi=dpi)
+
+    def _create_document(self, series) -> Document:
+        document = Document("Test")
+        document.add_element(self._create_chart_element(series[0]))
+
+        grid = GridElement(mode=PlottingMode.PDF)
+        for chart_series in series[1:]:
+            grid.add_element(self._create_chart_element(chart_series))
+        document.add_element(grid)
+        return document
+
+    def test_key_depends_only_on_the_content_of_the_chart(self):
+        cache = ChartRenderCache(self.cache_directory)
+        key = cache.get_key(self._create_chart_element(self.series[0]))
+
+        self.assertEqual(key, cache.get_key(self._create_chart_element(self.series[0].copy())))
+        self.assertNotEqual(key, cache.get_key(self._create_chart_element(self.series[0], dpi=60)))
+
+        changed_series = self.series[0].copy()
+        changed_series.iloc[-1] += 0.01
+        self.assertNotEqual(key, cache.get_key(self._create_chart_element(changed_series)))
+
+        chart_element = self._create_chart_element(self.series[0])
+        chart_element.generate_html(Document("Test"))
+        self.assertIsNone(cache.get_key(chart_element))
+
+    def test_key_is_the_same_in_different_processes(self):
+        # decorators created by create_line_chart have keys containing uuids, which differ between the processes
+        script = "import sys; from {} import get_line_chart_key; print(get_line_chart_key(sys.argv[1]))".format(
+            __name__ if __name__ != "__main__" else "test_chart_render_cache")
+        project_directory = os.path.dirname(os.path.dirname(os.path.abspath(sys.modules["qf_lib"].__file__)))
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(
+            [project_directory, os.path.dirname(os.path.abspath(__file__)), os.environ.get("PYTHONPATH", "")]))
+
+        keys = [subprocess.run([sys.executable, "-c", script, self.cache_directory], stdout=subprocess.PIPE,
+                               check=True, env=environment).stdout.decode().strip() for _ in range(2)]
+        self.assertEqual(64, len(keys[0]))
+        self.assertEqual(keys[0], keys[1])
+
+    @patch.dict(os.environ, {"QF_STARTING_DIRECTORY": ""})
+    def test_unchanged_charts_are_loaded_from_the_cache(self):
+        # all paths in the settings are absolute, so that they do not depend on the starting directory
+        settings = Settings(None, init_properties=False)
+        settings.output_directory = self.directory
+        settings.chart_render_cache_directory = self.cache_directory
+
+        expected_html = self._create_document(self.series).generate_html()
+
+        exporter = HTMLExporter(settings)
+        exporter.generate([self._create_document(self.series)], "output", "first")
+        self.assertEqual((0, 3), (exporter.chart_render_cache.hits, exporter.chart_render_cache.misses))
+
+        # the new exporter reads the charts cached on disk
+        exporter = HTMLExporter(settings)
+        changed_series = [self.series[0], self.series[1], self.series[2].copy()]
+        changed_series[2].iloc[-1] += 0.01
+        exporter.generate([self._create_document(changed_series)], "output", "second")
+        self.assertEqual((2, 1), (exporter.chart_render_cache.hits, exporter.chart_render_cache.misses))
+
+        document = self._create_document(self.series)
+        exporter.generate([document], "output", "third")
+        self.assertEqual((5, 1), (exporter.chart_render_cache.hits, exporter.chart_render_cache.misses))
+        self.assertAlmostEqual(5 / 6, exporter.chart_render_cache.hit_ratio)
+        self.assertEqual(expected_html, document.generate_html())
+
+    def test_least_recently_used_charts_are_removed(self):
+        chart_elements = [self._create_chart_element(series) for series in self.series]
+        cache = ChartRenderCache(self.cache_directory)
+        keys = [cache.get_key(chart_element) for chart_element in chart_elements]
+        for chart_element in chart_elements:
+            chart_element.set_rendered_image("0" * 100)
+
+        cache = ChartRenderCache(self.cache_directory, max_size=250)
+        cache.store(keys[0], chart_elements[0])
+        cache.store(keys[1], chart_elements[1])
+        self.assertTrue(cache.load(keys[0], self._create_chart_element(self.series[0])))
+
+        cache.store(keys[2], chart_elements[2])
+        self.assertEqual(200, cache.size)
+        self.assertEqual(["{}.b64".format(keys[0]), "{}.b64".format(keys[2])],
+                         sorted(os.listdir(self.cache_directory), key=lambda name: name != "{}.b64".format(keys[0])))
+
+        # the order of usage is restored from the disk
+        cache = ChartRenderCache(self.cache_directory, max_size=250)
+        cache.store(keys[1], chart_elements[1])
+        self.assertFalse(cache.load(keys[0], self._create_chart_element(self.series[0])))
+        self.assertTrue(cache.load(keys[2], self._create_chart_element(self.series[2])))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+
+def get_line_chart_key(cache_directory: str) -> str:
+    plt.switch_backend("Agg")
+    dates = pd.bdate_range("2018-01-01", periods=100)
+    random_state = np.random.RandomState(8)
+    series = [PricesSeries(100 + random_state.normal(size=len(dates)).cumsum(), index=dates) for _ in range(2)]
+
+    chart = create_line_chart(series, ["First", "Second", None], title="Line chart", horizontal_lines_list=[100])
+    return ChartRenderCache(cache_directory).get_key(ChartElement(chart, figsize=(4, 2), dpi=50))
+
+
+if __name__ == '__main__':
+    unittest.main()
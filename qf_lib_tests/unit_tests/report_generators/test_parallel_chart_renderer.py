@@ -0,0 +1,116 @@
+#     Copyright 2016-present CERN – European Organization for Nuclear Research
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+import unittest
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.text import Text
+from matplotlib.ticker import FuncFormatter
+
+from qf_lib.common.enums.plotting_mode import PlottingMode
+from qf_lib.containers.series.prices_series import PricesSeries
+from qf_lib.documents_utils.document_exporting.document import Document
+from qf_lib.documents_utils.document_exporting.element.chart import ChartElement
+from qf_lib.documents_utils.document_exporting.element.grid import GridElement
+from qf_lib.documents_utils.document_exporting.element.paragraph import ParagraphElement
+from qf_lib.documents_utils.document_exporting.parallel_chart_renderer import ParallelChartRenderer, \
+    render_chart_in_isolation
+from qf_lib.plotting.charts.line_chart import LineChart
+from qf_lib.plotting.decorators.axes_formatter_decorator import AxesFormatterDecorator
+from qf_lib.plotting.decorators.data_element_decorator import DataElementDecorator
+from qf_lib.plotting.decorators.title_decorator import TitleDecorator
+
+
+class TestParallelChartRenderer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        plt.switch_backend("Agg")
+
+    def setUp(self):
+        dates = pd.bdate_range("2018-01-01", periods=100)
+        random_state = np.random.RandomState(6)
+        self.series = [PricesSeries(100 + random_state.normal(size=len(dates)).cumsum(), index=dates)
+                       for _ in range(4)]
+
+    def _create_document(self) -> Document:
+        document = Document("Test")
+
+        grid = GridElement(mode=PlottingMode.PDF, figsize=(3, 2), dpi=50)
+        for series in self.series[2:]:
+            chart = LineChart()
+            chart.add_decorator(DataElementDecorator(series))
+            grid.add_chart(chart)
+        document.add_element(grid)
+        document.add_element(ParagraphElement("Paragraph"))
+
+        # chart containing a lambda function, which cannot be sent to another process
+        chart = LineChart()
+        chart.add_decorator(DataElementDecorator(self.series[3]))
+        chart.add_decorator(AxesFormatterDecorator(y_major=FuncFormatter(lambda value, _: "{:.0f}$".format(value))))
+        document.add_element(ChartElement(chart, figsize=(5, 3), dpi=50, optimise=True))
+
+        # chart with the secondary axes changes the matplotlib settings used by all the following charts
+        chart = LineChart()
+        chart.add_decorator(DataElementDecorator(self.series[0]))
+        chart.add_decorator(DataElementDecorator(self.series[1], use_secondary_axes=True))
+        chart.add_decorator(TitleDecorator("Secondary axes", key="title"))
+        document.add_element(ChartElement(chart, figsize=(5, 3), dpi=50))
+
+        chart = LineChart()
+        chart.add_decorator(DataElementDecorator(self.series[2]))
+        document.add_element(ChartElement(chart, figsize=(5, 3), dpi=50))
+
+        return document
+
+    def test_parallel_rendering_gives_the_same_document(self):
+        with mpl.rc_context():
+            self.assertFalse(mpl.rcParams['axes.spines.right'])
+            expected_html = self._create_document().generate_html()
+            self.assertTrue(mpl.rcParams['axes.spines.right'])
+
+        with mpl.rc_context():
+            document = self._create_document()
+            ParallelChartRenderer(max_workers=2).render([document])
+            self.assertTrue(mpl.rcParams['axes.spines.right'])
+
+            chart_elements = document.elements[0].elements + document.elements[2:]
+            self.assertTrue(all(element.rendered_image is not None for element in chart_elements[:2]))
+            self.assertIsNone(chart_elements[2].rendered_image)
+            self.assertIsNotNone(chart_elements[3].rendered_image)
+            self.assertIsNone(chart_elements[4].rendered_image)
+
+            html = document.generate_html()
+
+        self.assertNotIn("chart-render-failure", expected_html)
+        self.assertEqual(expected_html, html)
+
+    @unittest.skipUnless(hasattr(Text, "_cached"), "matplotlib does not cache the layouts of texts in Text._cached")
+    def test_text_layout_cache_is_cleared_before_rendering_in_isolation(self):
+        # the cache has to be usable after it is cleared (also after it is filled up to its maximal size)
+        for iteration in range(2):
+            for number in range(Text._cached.maxsize + 1):
+                Text._cached["stale layout {}.{}".format(iteration, number)] = None
+
+            chart = LineChart()
+            chart.add_decorator(DataElementDecorator(self.series[0]))
+            render_chart_in_isolation(chart, (3, 2), 50, False)
+            chart.close()
+
+            self.assertNotIn("stale layout {}.1".format(iteration), Text._cached)
+
+
+if __name__ == '__main__':
+    unittest.main()